@@ -264,6 +264,22 @@ class ComponentParameterChildRelationship(Base):
         )
 
 
+class ComponentCatalogVersion(Base):
+    """
+    Version of the catalog of components, bumped by the seeding so that the servers
+    rebuild the catalog they memoize.
+    """
+
+    __tablename__ = "component_catalog_version"
+
+    id = mapped_column(Integer, primary_key=True, default=1)
+    version = mapped_column(Integer, nullable=False, default=0)
+    updated_at = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __str__(self):
+        return f"ComponentCatalogVersion({self.version})"
+
+
 class ComponentInstance(Base):
     """Configured instances of components."""
 
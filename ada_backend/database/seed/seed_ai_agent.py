@@ -163,6 +163,32 @@ def seed_ai_agent_components(session: Session):
                 ).model_dump(exclude_unset=True, exclude_none=True),
                 is_advanced=True,
             ),
+            db.ComponentParameterDefinition(
+                id=UUID("7c09fdd4-84a8-4bad-b902-92cf46e62173"),
+                component_id=base_ai_agent.id,
+                name="max_history_tokens",
+                type=ParameterType.INTEGER,
+                nullable=True,
+                ui_component=UIComponent.TEXTFIELD,
+                ui_component_properties=UIComponentProperties(
+                    label="Maximum number of tokens of the messages history sent to the model.",
+                    placeholder="Leave empty to only limit the number of messages",
+                ).model_dump(exclude_unset=True, exclude_none=True),
+                is_advanced=True,
+            ),
+            db.ComponentParameterDefinition(
+                id=UUID("b21071b5-b344-4a2e-8e6d-56c1f0ce503a"),
+                component_id=base_ai_agent.id,
+                name="max_tool_message_tokens",
+                type=ParameterType.INTEGER,
+                nullable=True,
+                ui_component=UIComponent.TEXTFIELD,
+                ui_component_properties=UIComponentProperties(
+                    label="Maximum number of tokens kept from each tool output.",
+                    placeholder="Leave empty to keep tool outputs whole",
+                ).model_dump(exclude_unset=True, exclude_none=True),
+                is_advanced=True,
+            ),
             *build_llm_config_definitions(
                 component_id=base_ai_agent.id,
                 params_to_seed=[
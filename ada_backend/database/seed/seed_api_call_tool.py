@@ -102,6 +102,20 @@ def seed_api_call_components(session: Session):
                 placeholder='{"api_version": "v2", "format": "json"}',
             ).model_dump(exclude_unset=True, exclude_none=True),
         ),
+        ComponentParameterDefinition(
+            id=UUID("9fd4cb3a-ebab-4b27-ac4c-c64ae3ae98c6"),
+            component_id=api_call_component.id,
+            name="cache_ttl",
+            type=ParameterType.INTEGER,
+            nullable=True,
+            ui_component=UIComponent.TEXTFIELD,
+            ui_component_properties=UIComponentProperties(
+                label="Cache duration (seconds)",
+                placeholder="Leave empty to disable caching",
+                description="How long the responses of GET requests are reused for identical calls.",
+            ).model_dump(exclude_unset=True, exclude_none=True),
+            is_advanced=True,
+        ),
     ]
 
     upsert_components_parameter_definitions(session, api_call_parameter_definitions)
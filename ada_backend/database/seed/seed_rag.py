@@ -54,6 +54,12 @@ def seed_rag_components(session: Session):
         description="Cohere API-based Reranker",
         release_stage=db.ReleaseStage.PUBLIC,
     )
+    bm25_reranker = db.Component(
+        id=COMPONENT_UUIDS["bm25_reranker"],
+        name="BM25Reranker",
+        description="Local lexical (BM25) Reranker",
+        release_stage=db.ReleaseStage.BETA,
+    )
     rag_formatter = db.Component(
         id=COMPONENT_UUIDS["formatter"],
         name="Formatter",
@@ -68,6 +74,7 @@ def seed_rag_components(session: Session):
             chunk_selector,
             retriever,
             cohere_reranker,
+            bm25_reranker,
             rag_formatter,
         ],
     )
@@ -149,6 +156,11 @@ def seed_rag_components(session: Session):
                 component_parameter_definition_id=rag_reranker_param.id,
                 child_component_id=cohere_reranker.id,
             ),
+            db.ComponentParameterChildRelationship(
+                id=UUID("3fa1ab1f-0e39-4b7e-baad-4448f60d1b10"),
+                component_parameter_definition_id=rag_reranker_param.id,
+                child_component_id=bm25_reranker.id,
+            ),
             db.ComponentParameterChildRelationship(
                 id=UUID("5f021860-3db6-4e9d-9069-8de9eaf6d267"),
                 component_parameter_definition_id=rag_synthesizer_param.id,
@@ -204,6 +216,20 @@ def seed_rag_components(session: Session):
         type=ParameterType.COMPONENT,
         nullable=True,
     )
+    hybrid_rag_max_concurrent_image_analyses_param = db.ComponentParameterDefinition(
+        id=UUID("0dd779af-9828-454b-ba68-9e9705664e03"),
+        component_id=hybrid_rag_agent.id,
+        name="max_concurrent_image_analyses",
+        type=ParameterType.INTEGER,
+        nullable=True,
+        default="5",
+        ui_component=UIComponent.TEXTFIELD,
+        ui_component_properties=UIComponentProperties(
+            label="Max Concurrent Image Analyses",
+            description="The maximum number of images analysed in parallel by the hybrid synthesizer.",
+        ).model_dump(exclude_unset=True, exclude_none=True),
+        is_advanced=True,
+    )
     upsert_components_parameter_definitions(
         session=session,
         component_parameter_definitions=[
@@ -213,6 +239,7 @@ def seed_rag_components(session: Session):
             hybrid_rag_hybrid_synthesizer_param,
             hybrid_rag_relevant_chunk_selector_param,
             hybrid_rag_formatter_param,
+            hybrid_rag_max_concurrent_image_analyses_param,
         ],
     )
     upsert_components_parameter_child_relationships(
@@ -233,6 +260,11 @@ def seed_rag_components(session: Session):
                 component_parameter_definition_id=hybrid_rag_reranker_param.id,
                 child_component_id=cohere_reranker.id,
             ),
+            db.ComponentParameterChildRelationship(
+                id=UUID("12549a23-9f68-4403-8379-57e4bd4c9926"),
+                component_parameter_definition_id=hybrid_rag_reranker_param.id,
+                child_component_id=bm25_reranker.id,
+            ),
             db.ComponentParameterChildRelationship(
                 id=UUID("285f3e6c-0557-4ab7-bf9b-b1d645ab81b1"),
                 component_parameter_definition_id=hybrid_rag_hybrid_synthesizer_param.id,
@@ -251,6 +283,29 @@ def seed_rag_components(session: Session):
         ],
     )
 
+    # Cohere Reranker
+    cohere_reranker_first_pass_reranker_param = db.ComponentParameterDefinition(
+        id=UUID("ea6b7627-83b3-49df-b98b-aceaddaba42e"),
+        component_id=cohere_reranker.id,
+        name="first_pass_reranker",
+        type=ParameterType.COMPONENT,
+        nullable=True,
+    )
+    upsert_components_parameter_definitions(
+        session=session,
+        component_parameter_definitions=[cohere_reranker_first_pass_reranker_param],
+    )
+    upsert_components_parameter_child_relationships(
+        session=session,
+        component_parameter_child_relationships=[
+            db.ComponentParameterChildRelationship(
+                id=UUID("066d22c5-09a9-412c-b504-e6dcbd8b67b7"),
+                component_parameter_definition_id=cohere_reranker_first_pass_reranker_param.id,
+                child_component_id=bm25_reranker.id,
+            ),
+        ],
+    )
+
     # Retriever
     retriever_collection_name_param = db.ComponentParameterDefinition(
         id=UUID("2caba92f-421b-43a4-a197-9b53d9da79be"),
@@ -371,6 +426,57 @@ def seed_rag_components(session: Session):
         ).model_dump(exclude_unset=True, exclude_none=True),
         is_advanced=True,
     )
+    retriever_enable_hybrid_search_param = db.ComponentParameterDefinition(
+        id=UUID("be3f6d1f-59b9-4cef-ac8c-ac2c001a6133"),
+        component_id=retriever.id,
+        name="enable_hybrid_search",
+        type=ParameterType.BOOLEAN,
+        nullable=True,
+        default="False",
+        ui_component=UIComponent.CHECKBOX,
+        ui_component_properties=UIComponentProperties(
+            label="Hybrid search (keywords + semantic)",
+            description="Combine the semantic search with a keyword search, which finds exact codes, "
+            "part numbers and acronyms. Only for data sources ingested with keyword vectors.",
+        ).model_dump(exclude_unset=True, exclude_none=True),
+        is_advanced=True,
+    )
+    retriever_dense_weight_param = db.ComponentParameterDefinition(
+        id=UUID("a82a69d7-23c1-4e6c-8897-4a16859b7b49"),
+        component_id=retriever.id,
+        name="dense_weight",
+        type=ParameterType.FLOAT,
+        nullable=True,
+        default="1.0",
+        ui_component=UIComponent.SLIDER,
+        ui_component_properties=UIComponentProperties(
+            min=0.0,
+            max=2.0,
+            step=0.1,
+            marks=True,
+            label="Semantic search weight",
+            description="Weight of the semantic search results when merging them with the keyword search.",
+        ).model_dump(exclude_unset=True, exclude_none=True),
+        is_advanced=True,
+    )
+    retriever_sparse_weight_param = db.ComponentParameterDefinition(
+        id=UUID("5ef9be7d-1f2c-474c-926b-d283fabbb005"),
+        component_id=retriever.id,
+        name="sparse_weight",
+        type=ParameterType.FLOAT,
+        nullable=True,
+        default="1.0",
+        ui_component=UIComponent.SLIDER,
+        ui_component_properties=UIComponentProperties(
+            min=0.0,
+            max=2.0,
+            step=0.1,
+            marks=True,
+            label="Keyword search weight",
+            description="Weight of the keyword search results when merging them with the semantic search.",
+        ).model_dump(exclude_unset=True, exclude_none=True),
+        is_advanced=True,
+    )
 
     upsert_components_parameter_definitions(
         session=session,
@@ -382,6 +488,9 @@ def seed_rag_components(session: Session):
             retriever_default_penalty_rate_param,
             retriever_metadata_date_key_param,
             retriever_max_retrieved_chunks_after_penalty_param,
+            retriever_enable_hybrid_search_param,
+            retriever_dense_weight_param,
+            retriever_sparse_weight_param,
         ],
     )
 
@@ -471,6 +580,55 @@ def seed_rag_components(session: Session):
                 ).model_dump(exclude_unset=True, exclude_none=True),
                 is_advanced=False,
             ),
+            # BM25 Reranker
+            db.ComponentParameterDefinition(
+                id=UUID("534927c0-9a95-4f5d-89d9-44fc8c5c3670"),
+                component_id=bm25_reranker.id,
+                name="num_doc_reranked",
+                type=ParameterType.INTEGER,
+                nullable=True,
+                default="5",
+                ui_component=UIComponent.SLIDER,
+                ui_component_properties=UIComponentProperties(
+                    min=1,
+                    max=50,
+                    step=1,
+                    marks=True,
+                    label="Number of Documents Reranked",
+                    description="Keep it higher than the next reranker's when used as a first pass.",
+                ).model_dump(exclude_unset=True, exclude_none=True),
+                is_advanced=False,
+            ),
+            db.ComponentParameterDefinition(
+                id=UUID("e9faf1da-6419-4289-a79d-416b8438282a"),
+                component_id=bm25_reranker.id,
+                name="score_threshold",
+                type=ParameterType.FLOAT,
+                nullable=True,
+                default="0.0",
+                ui_component=UIComponent.TEXTFIELD,
+                ui_component_properties=UIComponentProperties(
+                    label="Score Threshold",
+                    description="Minimum BM25 score of a kept chunk. BM25 scores are not bounded.",
+                ).model_dump(exclude_unset=True, exclude_none=True),
+                is_advanced=True,
+            ),
+            db.ComponentParameterDefinition(
+                id=UUID("91111491-2783-402e-8d69-d6e44d6dba20"),
+                component_id=bm25_reranker.id,
+                name="language",
+                type=ParameterType.STRING,
+                nullable=True,
+                ui_component=UIComponent.SELECT,
+                ui_component_properties=UIComponentProperties(
+                    options=[
+                        SelectOption(value="english", label="English"),
+                        SelectOption(value="french", label="French"),
+                    ],
+                    label="Stopwords Language",
+                ).model_dump(exclude_unset=True, exclude_none=True),
+                is_advanced=True,
+            ),
             # Synthesizer
             db.ComponentParameterDefinition(
                 id=UUID("373dc6d2-e12d-495c-936f-e07d1c27e254"),
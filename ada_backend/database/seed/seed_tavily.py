@@ -3,7 +3,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
-from ada_backend.database.models import ParameterType
+from ada_backend.database.models import ParameterType, UIComponent, UIComponentProperties
 from ada_backend.database.component_definition_seeding import (
     upsert_components,
     upsert_components_parameter_child_relationships,
@@ -61,6 +61,35 @@ def seed_tavily_components(session: Session):
         session=session,
         component_parameter_definitions=[
             # Tavily Agent
+            db.ComponentParameterDefinition(
+                id=UUID("2b528d0b-f606-427a-a3da-7a1afbab789d"),
+                component_id=tavily_agent.id,
+                name="timeout",
+                type=ParameterType.INTEGER,
+                nullable=True,
+                default="60",
+                ui_component=UIComponent.SLIDER,
+                ui_component_properties=UIComponentProperties(
+                    label="Timeout (seconds)",
+                    min=1,
+                    max=120,
+                    step=1,
+                ).model_dump(exclude_unset=True, exclude_none=True),
+                is_advanced=True,
+            ),
+            db.ComponentParameterDefinition(
+                id=UUID("8bd14bab-fa26-4392-94ac-a2864fd281f0"),
+                component_id=tavily_agent.id,
+                name="cache_ttl",
+                type=ParameterType.INTEGER,
+                nullable=True,
+                ui_component=UIComponent.TEXTFIELD,
+                ui_component_properties=UIComponentProperties(
+                    label="Cache duration (seconds)",
+                    placeholder="Leave empty to disable caching",
+                ).model_dump(exclude_unset=True, exclude_none=True),
+                is_advanced=True,
+            ),
             *build_llm_config_definitions(
                 component_id=tavily_agent.id,
                 params_to_seed=[
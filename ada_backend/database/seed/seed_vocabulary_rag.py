@@ -125,6 +125,11 @@ def seed_vocabulary_rag_components(session: Session):
                 component_parameter_definition_id=vocab_rag_reranker_param.id,
                 child_component_id=COMPONENT_UUIDS["cohere_reranker"],
             ),
+            db.ComponentParameterChildRelationship(
+                id=UUID("ab4671f4-a40f-4224-81f0-9a7d34db2003"),
+                component_parameter_definition_id=vocab_rag_reranker_param.id,
+                child_component_id=COMPONENT_UUIDS["bm25_reranker"],
+            ),
             db.ComponentParameterChildRelationship(
                 id=UUID("14f50ab4-49d4-4b02-999e-2591888a8454"),
                 component_parameter_definition_id=vocab_rag_formatter_param.id,
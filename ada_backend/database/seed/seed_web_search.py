@@ -3,6 +3,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
+from ada_backend.database.models import ParameterType, UIComponent, UIComponentProperties
 from ada_backend.database.component_definition_seeding import (
     upsert_components,
     upsert_components_parameter_definitions,
@@ -35,6 +36,19 @@ def seed_web_search_components(session: Session):
         session=session,
         component_parameter_definitions=[
             # Web Search OpenAI Agent
+            db.ComponentParameterDefinition(
+                id=UUID("206587e1-1c27-4f14-a3a8-00895bd4ac3d"),
+                component_id=web_search_openai_agent.id,
+                name="cache_ttl",
+                type=ParameterType.INTEGER,
+                nullable=True,
+                ui_component=UIComponent.TEXTFIELD,
+                ui_component_properties=UIComponentProperties(
+                    label="Cache duration (seconds)",
+                    placeholder="Leave empty to disable caching",
+                ).model_dump(exclude_unset=True, exclude_none=True),
+                is_advanced=True,
+            ),
             *build_llm_config_definitions(
                 component_id=web_search_openai_agent.id,
                 params_to_seed=[
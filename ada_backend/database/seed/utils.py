@@ -12,6 +12,7 @@ COMPONENT_UUIDS: dict[str, UUID] = {
     "synthesizer": UUID("6f790dd1-06f6-4489-a655-1a618763a114"),
     "retriever": UUID("8baf68a9-1671-4ed5-8374-6ec218f5d9a6"),
     "cohere_reranker": UUID("dfdc8b87-610f-4ce0-8cf1-276e80bec32b"),
+    "bm25_reranker": UUID("d1db0378-7f7e-4e98-9f82-01d3c9bfa3de"),
     "vocabulary_search": UUID("323cfc43-76d9-4ae1-b950-2791faf798c2"),
     "vocabulary_enhanced_synthesizer": UUID("954856e7-bfaa-485a-a053-d4b9b9cf6804"),
     "formatter": UUID("079512c6-28e2-455f-af2c-f196015534bd"),
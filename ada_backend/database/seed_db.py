@@ -26,6 +26,7 @@ from ada_backend.database.seed.seed_vocabulary_rag import seed_vocabulary_rag_co
 from ada_backend.database.seed.seed_web_search import seed_web_search_components
 from ada_backend.database.seed.seed_tool_description import seed_tool_description
 from ada_backend.database.seed.utils import COMPONENT_UUIDS
+from ada_backend.repositories.component_repository import bump_component_catalog_version
 
 LOGGER = logging.getLogger(__name__)
 
@@ -56,6 +57,9 @@ def seed_db(session: Session):
             component = session.query(db.Component).filter_by(id=uuid_value).first()
             if not component:
                 raise ValueError(f"Component {name} with ID {uuid_value} was not properly seeded")
+
+        # The servers rebuild their catalog of components on the next request
+        bump_component_catalog_version(session)
     finally:
         session.close()
 
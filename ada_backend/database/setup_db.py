@@ -1,10 +1,19 @@
+import threading
 from contextlib import contextmanager
+from typing import Optional
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from ada_backend.database.models import Base
 from settings import settings
 
+# asyncio driver of each dialect of the database
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
 
 def get_db_url() -> str:
     if not settings.ADA_DB_URL:
@@ -12,20 +21,69 @@ def get_db_url() -> str:
     return settings.ADA_DB_URL
 
 
-engine = create_engine(get_db_url(), echo=False)
+def get_async_db_url() -> str:
+    url = make_url(get_db_url())
+    if url.get_backend_name() not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver for the database {url.get_backend_name()}.")
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]).render_as_string(hide_password=False)
+
+
+def get_pool_options(db_url: str) -> dict:
+    """Sizing of the connection pool, SQLite keeps the pool chosen by SQLAlchemy."""
+    if make_url(db_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.ADA_DB_POOL_SIZE,
+        "max_overflow": settings.ADA_DB_MAX_OVERFLOW,
+        "pool_timeout": settings.ADA_DB_POOL_TIMEOUT,
+        "pool_recycle": settings.ADA_DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+engine = create_engine(get_db_url(), echo=False, **get_pool_options(get_db_url()))
 
 
 # Enable SQLite foreign key support
-@event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
-    if engine.dialect.name == "sqlite":
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragma)
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions of the request paths that must not block the event loop. Their engine is created on first use,
+# so that alembic and the ingestion and engine code, which only use the synchronous engine, need no asyncio driver.
+_ASYNC_ENGINE: Optional[AsyncEngine] = None
+_ASYNC_SESSION_LOCAL: Optional[async_sessionmaker[AsyncSession]] = None
+_ASYNC_ENGINE_LOCK = threading.Lock()
+
+
+def get_async_session_local() -> async_sessionmaker[AsyncSession]:
+    """Return the asyncio session factory, creating its engine on the first call."""
+    global _ASYNC_ENGINE, _ASYNC_SESSION_LOCAL
+    with _ASYNC_ENGINE_LOCK:
+        if _ASYNC_SESSION_LOCAL is None:
+            _ASYNC_ENGINE = create_async_engine(get_async_db_url(), echo=False, **get_pool_options(get_db_url()))
+            if _ASYNC_ENGINE.dialect.name == "sqlite":
+                event.listen(_ASYNC_ENGINE.sync_engine, "connect", set_sqlite_pragma)
+            _ASYNC_SESSION_LOCAL = async_sessionmaker(bind=_ASYNC_ENGINE, autoflush=False, expire_on_commit=False)
+        return _ASYNC_SESSION_LOCAL
+
+
+async def dispose_async_engine() -> None:
+    """Close the connections of the asyncio engine, if it was created, e.g. on application shutdown."""
+    global _ASYNC_ENGINE, _ASYNC_SESSION_LOCAL
+    with _ASYNC_ENGINE_LOCK:
+        async_engine, _ASYNC_ENGINE, _ASYNC_SESSION_LOCAL = _ASYNC_ENGINE, None, None
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 def init_db():
     """Initialize the database by creating tables."""
@@ -41,6 +99,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Provide a scoped asyncio session for FastAPI dependency injection."""
+    async with get_async_session_local()() as db:
+        yield db
+
+
 @contextmanager
 def get_db_session():
     """Context manager for database sessions."""
@@ -1,8 +1,11 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import start_http_server
 
 from ada_backend.admin.admin import setup_admin
+from ada_backend.database.setup_db import dispose_async_engine
 from ada_backend.routers.project_router import router as project_router
 from ada_backend.routers.auth_router import router as auth_router
 from ada_backend.routers.source_router import router as source_router
@@ -11,6 +14,7 @@ from ada_backend.routers.components_router import router as components_router
 from ada_backend.routers.graph_router import router as graph_router
 from ada_backend.graphql.schema import graphql_router
 from ada_backend.routers.organization_router import router as org_router
+from engine.agent.api_tools.http_client import close_http_client
 from settings import settings
 from logger import setup_logging
 
@@ -18,7 +22,16 @@ from logger import setup_logging
 setup_logging()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Connections of the HTTP client shared by the API tools, and of the asyncio database engine
+    await close_http_client()
+    await dispose_async_engine()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Ada Backend",
     description="API for managing and running LLM agents",
     version="0.1.0",
@@ -1,6 +1,8 @@
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -25,15 +27,10 @@ def create_api_key(
     return new_api_key.id
 
 
-def get_api_key_by_hashed_key(session: Session, hashed_key: str) -> Optional[db.ApiKey]:
-    """Retrieves an API key by its public key."""
-    return (
-        session.query(db.ApiKey)
-        .filter(
-            db.ApiKey.public_key == hashed_key,
-        )
-        .first()
-    )
+async def get_api_key_by_hashed_key_async(session: AsyncSession, hashed_key: str) -> Optional[db.ApiKey]:
+    """Retrieves an API key by its public key, without blocking the event loop."""
+    result = await session.execute(select(db.ApiKey).where(db.ApiKey.public_key == hashed_key).limit(1))
+    return result.scalars().first()
 
 
 def get_api_keys_by_project_id(session: Session, project_id: UUID) -> list[db.ApiKey]:
@@ -58,19 +55,20 @@ def deactivate_api_key(session: Session, key_id: UUID, revoker_user_id: UUID) ->
     return key_id
 
 
-def get_project_by_api_key(
-    session: Session,
+async def get_project_by_api_key_async(
+    session: AsyncSession,
     hashed_key: str,
 ) -> Optional[db.Project]:
     """
-    Retrieves the project associated with an API key.
+    Retrieves the project associated with an API key, without blocking the event loop.
     """
-    return (
-        session.query(db.Project)
+    result = await session.execute(
+        select(db.Project)
         .join(
             db.ApiKey,
             db.ApiKey.project_id == db.Project.id,
         )
-        .filter(db.ApiKey.public_key == hashed_key)
-        .first()
+        .where(db.ApiKey.public_key == hashed_key)
+        .limit(1)
     )
+    return result.scalars().first()
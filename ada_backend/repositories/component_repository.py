@@ -3,7 +3,8 @@ from uuid import UUID
 import logging
 from dataclasses import dataclass
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from ada_backend.database import models as db
 from ada_backend.database.models import ParameterType, UIComponent
@@ -110,6 +111,109 @@ def get_component_instance_by_id(
     )
 
 
+def get_components_by_ids(
+    session: Session,
+    component_ids: set[UUID],
+) -> list[db.Component]:
+    """
+    Retrieves the components with the given IDs.
+    """
+    if not component_ids:
+        return []
+    return session.query(db.Component).filter(db.Component.id.in_(component_ids)).all()
+
+
+def get_component_parameter_definitions_by_component_ids(
+    session: Session,
+    component_ids: set[UUID],
+) -> list[db.ComponentParameterDefinition]:
+    """
+    Retrieves all parameter definitions of the given components.
+    """
+    if not component_ids:
+        return []
+    return (
+        session.query(db.ComponentParameterDefinition)
+        .filter(
+            db.ComponentParameterDefinition.component_id.in_(component_ids),
+        )
+        .all()
+    )
+
+
+def get_component_instances_by_ids(
+    session: Session,
+    component_instance_ids: set[UUID],
+) -> list[db.ComponentInstance]:
+    """
+    Retrieves the component instances with the given IDs, with their basic parameters.
+    """
+    if not component_instance_ids:
+        return []
+    return (
+        session.query(db.ComponentInstance)
+        .options(selectinload(db.ComponentInstance.basic_parameters))
+        .filter(
+            db.ComponentInstance.id.in_(component_instance_ids),
+        )
+        .all()
+    )
+
+
+def get_sub_component_inputs_by_parent_ids(
+    session: Session,
+    parent_component_instance_ids: set[UUID],
+) -> list[db.ComponentSubInput]:
+    """
+    Retrieves the sub-component inputs of the given parent component instances.
+    """
+    if not parent_component_instance_ids:
+        return []
+    return (
+        session.query(db.ComponentSubInput)
+        .filter(
+            db.ComponentSubInput.parent_component_instance_id.in_(parent_component_instance_ids),
+        )
+        .all()
+    )
+
+
+def get_sub_component_inputs_of_tree(
+    session: Session,
+    component_instance_ids: set[UUID],
+) -> list[db.ComponentSubInput]:
+    """
+    Retrieves the sub-component inputs of the given component instances, and recursively
+    those of their sub-components, in a single query.
+    """
+    if not component_instance_ids:
+        return []
+    tree = (
+        select(db.ComponentSubInput.id, db.ComponentSubInput.child_component_instance_id)
+        .where(db.ComponentSubInput.parent_component_instance_id.in_(component_instance_ids))
+        .cte(recursive=True)
+    )
+    tree = tree.union(
+        select(db.ComponentSubInput.id, db.ComponentSubInput.child_component_instance_id).join(
+            tree,
+            db.ComponentSubInput.parent_component_instance_id == tree.c.child_component_instance_id,
+        )
+    )
+    return session.query(db.ComponentSubInput).filter(db.ComponentSubInput.id.in_(select(tree.c.id))).all()
+
+
+def get_tool_descriptions_by_names(
+    session: Session,
+    names: set[str],
+) -> list[db.ToolDescription]:
+    """
+    Retrieves the tool descriptions with the given names.
+    """
+    if not names:
+        return []
+    return session.query(db.ToolDescription).filter(db.ToolDescription.name.in_(names)).all()
+
+
 def get_component_basic_parameters(
     session: Session,
     component_instance_id: UUID,
@@ -230,6 +334,14 @@ def get_tool_parameter_by_component_id(
     )
 
 
+def get_component_catalog_version(session: Session) -> int:
+    """
+    Retrieves the version of the catalog of components, 0 if the components were never seeded.
+    """
+    version = session.query(db.ComponentCatalogVersion.version).filter(db.ComponentCatalogVersion.id == 1).scalar()
+    return version or 0
+
+
 def get_all_components_with_parameters(
     session: Session,
 ) -> List[ComponentWithParametersDTO]:
@@ -245,21 +357,27 @@ def get_all_components_with_parameters(
         List[ComponentWithParametersDTO]: A list of DTOs containing components,
         their tools (component parameters) and other parameter definitions.
     """
-    # Get all components
-    components = session.query(db.Component).all()
+    # Get all components, with their parameter definitions and tool descriptions in a fixed number of queries
+    components = (
+        session.query(db.Component)
+        .options(
+            joinedload(db.Component.default_tool_description),
+            selectinload(db.Component.definitions).selectinload(db.ComponentParameterDefinition.child_components),
+        )
+        .all()
+    )
 
     # For each component, get its parameter definitions and build result
     result = []
     for component in components:
-        parameters = get_component_parameter_definition_by_component_id(
-            session,
-            component.id,
-        )
+        parameters = component.definitions
 
-        subcomponent_params = get_subcomponent_param_def_by_component_id(
-            session,
-            component.id,
-        )
+        subcomponent_params = [
+            (param, param_child_def)
+            for param in parameters
+            if param.type == ParameterType.COMPONENT
+            for param_child_def in param.child_components
+        ]
 
         parameters_to_fill = []
         tool_param_name = None
@@ -288,7 +406,7 @@ def get_all_components_with_parameters(
                     )
                 )
 
-        default_tool_description_db = get_tool_description_component(session=session, component_id=component.id)
+        default_tool_description_db = component.default_tool_description
         tool_description = (
             ToolDescription(
                 name=default_tool_description_db.name,
@@ -545,6 +663,18 @@ def upsert_tool_description(
     return tool_description
 
 
+def bump_component_catalog_version(session: Session) -> None:
+    """
+    Increments the version of the catalog of components, so that the servers rebuild it.
+    """
+    catalog_version = session.get(db.ComponentCatalogVersion, 1)
+    if catalog_version is None:
+        session.add(db.ComponentCatalogVersion(id=1, version=1))
+    else:
+        catalog_version.version = db.ComponentCatalogVersion.version + 1
+    session.commit()
+
+
 # --- DELETE operations ---
 def delete_component_instances(
     session: Session,
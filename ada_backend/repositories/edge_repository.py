@@ -23,6 +23,13 @@ def get_edges(session: Session, graph_runner_id: UUID) -> list[db.GraphRunnerEdg
     return session.query(db.GraphRunnerEdge).filter(db.GraphRunnerEdge.graph_runner_id == graph_runner_id).all()
 
 
+def get_edges_by_ids(session: Session, edge_ids: set[UUID]) -> list[db.GraphRunnerEdge]:
+    """Retrieves the edges with the given IDs."""
+    if not edge_ids:
+        return []
+    return session.query(db.GraphRunnerEdge).filter(db.GraphRunnerEdge.id.in_(edge_ids)).all()
+
+
 def upsert_edge(
     session: Session,
     id: UUID,
@@ -2,8 +2,9 @@ from typing import Optional
 from uuid import UUID
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select, exists
+from sqlalchemy import select, exists, insert, or_
 
 from ada_backend.database import models as db
 from ada_backend.database.seed.utils import COMPONENT_UUIDS
@@ -42,6 +43,23 @@ def get_graph_runner_for_env(session: Session, project_id: UUID, env: db.EnvType
     )
 
 
+async def get_graph_runner_for_env_async(session: AsyncSession, project_id: UUID, env: db.EnvType) -> db.GraphRunner:
+    """Returns the GraphRunner bound to the given project and environment, without blocking the event loop."""
+    result = await session.execute(
+        select(db.GraphRunner)
+        .join(
+            db.ProjectEnvironmentBinding,
+            db.GraphRunner.id == db.ProjectEnvironmentBinding.graph_runner_id,
+        )
+        .where(
+            db.ProjectEnvironmentBinding.project_id == project_id,
+            db.ProjectEnvironmentBinding.environment == env,
+        )
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 def insert_graph_runner(
     session: Session,
     graph_id: UUID,
@@ -76,6 +94,33 @@ def insert_graph_runner_and_bind_to_project(
     session.commit()
 
 
+def insert_graph_runner_with_rows(
+    session: Session,
+    graph_id: UUID,
+    rows: list[tuple[type[db.Base], list[dict]]],
+) -> None:
+    """
+    Inserts a new GraphRunner with the rows of its graph, in a single transaction and with one
+    bulk insert per table.
+
+    Args:
+        session (Session): SQLAlchemy session.
+        graph_id (UUID): ID of the new GraphRunner.
+        rows (list[tuple[type[db.Base], list[dict]]]): Values of the rows to insert for each model,
+            in an order that respects the foreign keys between them.
+    """
+    try:
+        session.add(db.GraphRunner(id=graph_id))
+        session.flush()
+        for model, values in rows:
+            if values:
+                session.execute(insert(model), values)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
 def upsert_component_node(
     session: Session, graph_runner_id: UUID, component_instance_id: UUID, is_start_node: bool = False
 ) -> None:
@@ -107,6 +152,24 @@ def graph_runner_exists(session: Session, graph_id: UUID) -> bool:
     return session.execute(stmt).scalar()
 
 
+async def graph_runner_exists_async(session: AsyncSession, graph_id: UUID) -> bool:
+    """Check if a GraphRunner with the given ID exists, without blocking the event loop."""
+    stmt = select(exists().where((db.GraphRunner.id == graph_id)))
+    return (await session.execute(stmt)).scalar()
+
+
+def get_existing_graph_runner_ids(session: Session, graph_ids: set[UUID]) -> set[UUID]:
+    """Return the IDs among `graph_ids` that are GraphRunners."""
+    if not graph_ids:
+        return set()
+    return set(session.execute(select(db.GraphRunner.id).where(db.GraphRunner.id.in_(graph_ids))).scalars())
+
+
+def get_nodes_by_graph_runner_id(session: Session, graph_runner_id: UUID) -> list[db.GraphRunnerNode]:
+    """Retrieves the nodes of a graph runner."""
+    return session.query(db.GraphRunnerNode).filter(db.GraphRunnerNode.graph_runner_id == graph_runner_id).all()
+
+
 def get_component_nodes(session: Session, graph_runner_id: UUID) -> list[ComponentNodeDTO]:
     """
     Retrieves the component nodes associated with a graph.
@@ -209,6 +272,52 @@ def delete_node(session: Session, node_id: UUID):
         raise ValueError(f"Node with ID {node_id} does not exist in the graph runner.")
 
 
+def save_graph_changes(
+    session: Session,
+    new_rows: list[db.Base],
+    deleted_rows: list[db.Base],
+    deleted_node_ids: set[UUID],
+) -> None:
+    """
+    Saves the changes of a graph in a single transaction: the new rows, the deleted rows, the changes
+    made to the rows loaded in the session, and the deletion of the nodes with their component
+    instances, parameters, sub-inputs and edges.
+
+    Args:
+        session (Session): SQLAlchemy session.
+        new_rows (list[db.Base]): Rows to insert.
+        deleted_rows (list[db.Base]): Rows loaded in the session to delete.
+        deleted_node_ids (set[UUID]): IDs of the component nodes to delete.
+    """
+    try:
+        session.add_all(new_rows)
+        for row in deleted_rows:
+            session.delete(row)
+        if deleted_node_ids:
+            LOGGER.info(f"Deleting nodes with ids {deleted_node_ids}")
+            session.query(db.GraphRunnerEdge).filter(
+                or_(
+                    db.GraphRunnerEdge.source_node_id.in_(deleted_node_ids),
+                    db.GraphRunnerEdge.target_node_id.in_(deleted_node_ids),
+                )
+            ).delete()
+            session.query(db.ComponentSubInput).filter(
+                or_(
+                    db.ComponentSubInput.parent_component_instance_id.in_(deleted_node_ids),
+                    db.ComponentSubInput.child_component_instance_id.in_(deleted_node_ids),
+                )
+            ).delete()
+            session.query(db.BasicParameter).filter(
+                db.BasicParameter.component_instance_id.in_(deleted_node_ids),
+            ).delete()
+            session.query(db.ComponentInstance).filter(db.ComponentInstance.id.in_(deleted_node_ids)).delete()
+            session.query(db.GraphRunnerNode).filter(db.GraphRunnerNode.node_id.in_(deleted_node_ids)).delete()
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
 def delete_graph_runner(session: Session, graph_id: UUID) -> None:
     """Delete a GraphRunner with the given ID."""
     LOGGER.info(f"Deleting graph runner with id {graph_id}")
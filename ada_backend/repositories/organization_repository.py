@@ -3,6 +3,8 @@ from uuid import UUID
 import logging
 from dataclasses import dataclass
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -55,6 +57,28 @@ def get_organization_secrets(
     ]
 
 
+async def get_organization_secrets_async(
+    session: AsyncSession,
+    organization_id: UUID,
+) -> list[OrganizationSecretDTO]:
+    """
+    Retrieves all the secrets of an organization, without blocking the event loop.
+    """
+    result = await session.execute(
+        select(db.OrganizationSecret).where(db.OrganizationSecret.organization_id == organization_id)
+    )
+    return [
+        OrganizationSecretDTO(
+            id=secret.id,
+            organization_id=organization_id,
+            key=secret.key,
+            secret=secret.get_secret(),
+            secret_type=secret.secret_type,
+        )
+        for secret in result.scalars()
+    ]
+
+
 def get_organization_secrets_from_project_id(
     sessin: Session,
     project_id: UUID,
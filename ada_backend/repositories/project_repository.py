@@ -2,6 +2,7 @@ from typing import Optional
 from uuid import UUID
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -34,6 +35,13 @@ def get_project(
     raise ValueError("Either project_id or project_name must be provided")
 
 
+async def get_project_async(session: AsyncSession, project_id: UUID) -> Optional[db.Project]:
+    """
+    Retrieves a specific project by ID, without blocking the event loop.
+    """
+    return await session.get(db.Project, project_id)
+
+
 def get_project_with_details(
     session: Session,
     project_id: UUID,
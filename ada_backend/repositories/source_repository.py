@@ -1,4 +1,4 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 from typing import Optional
 import logging
 
@@ -61,8 +61,10 @@ def create_source(
     qdrant_collection_name: Optional[str] = None,
     qdrant_schema: Optional[dict] = None,
     embedding_model_name: Optional[str] = None,
+    source_id: Optional[UUID] = None,
 ) -> UUID:
     source_data_create = db.DataSource(
+        id=source_id or uuid4(),
         name=source_name,
         type=source_type,
         organization_id=organization_id,
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Annotated
 from uuid import UUID
@@ -6,11 +7,12 @@ from enum import Enum
 from fastapi import APIRouter, Depends, HTTPException, Header, Body, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from supabase import Client, create_client
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ada_backend.repositories.project_repository import get_project
+from ada_backend.repositories.project_repository import get_project_async
 from settings import settings
-from ada_backend.database.setup_db import get_db
+from ada_backend.database.setup_db import get_async_db, get_db
 from ada_backend.services.api_key_service import (
     get_api_keys_service,
     generate_api_key,
@@ -63,7 +65,8 @@ async def get_user_from_supabase_token(
     supabase_token = authorization.credentials
 
     try:
-        user_response = supabase.auth.get_user(supabase_token)
+        # The Supabase client is synchronous
+        user_response = await asyncio.to_thread(supabase.auth.get_user, supabase_token)
         if not user_response or not user_response.user:
             raise HTTPException(status_code=401, detail="Invalid Supabase token")
 
@@ -85,10 +88,10 @@ def user_has_access_to_project_dependency(allowed_roles: set[str]):
     async def wrapper(
         project_id: UUID,
         user: Annotated[SupabaseUser, Depends(get_user_from_supabase_token)],
-        session: Session = Depends(get_db),
+        session: AsyncSession = Depends(get_async_db),
     ) -> SupabaseUser:
         try:
-            project = get_project(session, project_id)
+            project = await get_project_async(session, project_id)
             if not project:
                 raise HTTPException(status_code=404, detail="Project not found")
             access = await get_user_access_to_organization(
@@ -167,6 +170,7 @@ async def get_api_keys(
 async def create_api_key(
     user: Annotated[SupabaseUser, Depends(get_user_from_supabase_token)],
     session: Session = Depends(get_db),
+    async_session: AsyncSession = Depends(get_async_db),
     api_key_create: ApiKeyCreateRequest = Body(...),
 ) -> ApiKeyCreatedResponse:
     """
@@ -192,7 +196,7 @@ async def create_api_key(
         allowed_roles=set(UserRights.USER.value),
     )
     # Check if user has access to project. If not, a 403 is raised
-    user = await _is_user(project_id=api_key_create.project_id, user=user, session=session)
+    user = await _is_user(project_id=api_key_create.project_id, user=user, session=async_session)
 
     try:
         return generate_api_key(
@@ -244,7 +248,7 @@ async def delete_api_key_route(
 
 async def verify_api_key_dependency(
     x_api_key: str = Header(..., alias="X-API-Key"),
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ) -> VerifiedApiKey:
     """
     Dependency to verify an API key from the 'X-API-Key' header.
@@ -255,7 +259,7 @@ async def verify_api_key_dependency(
     cleaned_x_api_key = x_api_key.replace("\\n", "\n").strip('"')
 
     try:
-        return verify_api_key(session, private_key=cleaned_x_api_key)
+        return await verify_api_key(session, private_key=cleaned_x_api_key)
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e)) from e
 
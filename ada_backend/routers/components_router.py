@@ -1,6 +1,6 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from ada_backend.database.setup_db import get_db
@@ -10,11 +10,18 @@ from ada_backend.routers.auth_router import (
     user_has_access_to_organization_dependency,
     UserRights,
 )
-from ada_backend.services.components_service import get_all_components_endpoint
+from ada_backend.services.components_service import get_components_catalog
 
 router = APIRouter(prefix="/components", tags=["Components"])
 
 
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
 @router.get("/{organization_id}", response_model=ComponentsResponse)
 def get_all_components(
     organization_id: UUID,
@@ -22,11 +29,17 @@ def get_all_components(
         SupabaseUser, Depends(user_has_access_to_organization_dependency(allowed_roles=UserRights.READER.value))
     ],
     session: Session = Depends(get_db),
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
     if not user.id:
         raise HTTPException(status_code=400, detail="User ID not found")
     try:
-        return get_all_components_endpoint(session)
+        catalog = get_components_catalog(session)
     except Exception as e:
         print(e)
         raise HTTPException(status_code=500, detail="Internal Server Error") from e
+    # The editor revalidates its copy of the catalog on each load
+    headers = {"ETag": catalog.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(catalog.etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
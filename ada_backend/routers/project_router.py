@@ -1,11 +1,13 @@
+import asyncio
 from typing import Annotated, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Body
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import logging
 
 from ada_backend.database.models import EnvType
-from ada_backend.database.setup_db import get_db
+from ada_backend.database.setup_db import get_async_db, get_db
 from ada_backend.schemas.auth_schema import SupabaseUser
 from ada_backend.schemas.chart_schema import ChartsResponse
 from ada_backend.schemas.monitor_schema import KPISResponse
@@ -158,7 +160,7 @@ async def run_env_agent_endpoint(
             ]
         },
     ),
-    sqlaclhemy_db_session: Session = Depends(get_db),
+    sqlaclhemy_db_session: AsyncSession = Depends(get_async_db),
     verified_api_key: VerifiedApiKey = Depends(verify_api_key_dependency),
 ) -> ChatResponse:
     if verified_api_key.project_id != project_id:
@@ -204,7 +206,7 @@ async def get_project_trace(
     if not user.id:
         raise HTTPException(status_code=400, detail="User ID not found")
     try:
-        response = get_trace_by_project(project_id, duration)
+        response = await asyncio.to_thread(get_trace_by_project, project_id, duration)
         return response
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
@@ -221,7 +223,7 @@ async def get_project_monitoring_kpi(
     if not user.id:
         raise HTTPException(status_code=400, detail="User ID not found")
     try:
-        response = get_monitoring_kpis_by_project(project_id, duration)
+        response = await asyncio.to_thread(get_monitoring_kpis_by_project, project_id, duration)
         return response
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
@@ -249,7 +251,7 @@ async def chat(
             ]
         },
     ),
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ) -> ChatResponse:
     if not user.id:
         raise HTTPException(status_code=400, detail="User ID not found")
@@ -287,7 +289,7 @@ async def chat_env(
             ]
         },
     ),
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ) -> ChatResponse:
     if not user.id:
         raise HTTPException(status_code=400, detail="User ID not found")
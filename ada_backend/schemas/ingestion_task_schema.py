@@ -24,6 +24,9 @@ class SourceAttributes(BaseModel):
     metadata_column_names: Optional[list[str]] = None
     timestamp_column_name: Optional[str] = None
     is_sync_enabled: Optional[bool] = False
+    embedding_dimensions: Optional[int] = None
+    vector_quantization: Optional[str] = None
+    vectors_on_disk: Optional[bool] = False
 
 
 class IngestionTaskUpdate(IngestionTask):
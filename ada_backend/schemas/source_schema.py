@@ -6,6 +6,7 @@ from ada_backend.database import models as db
 
 
 class DataSourceSchema(BaseModel):
+    id: Optional[UUID] = None
     name: str
     type: db.SourceType
     database_schema: Optional[str] = None
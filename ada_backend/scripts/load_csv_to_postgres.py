@@ -2,64 +2,39 @@
 import argparse
 import csv
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 import psycopg2
 import psycopg2.extras
 
+# Size of the blocks of the CSV file sent to COPY
+COPY_BUFFER_SIZE = 1024 * 1024
+DEFAULT_WORKERS = 4
+
 
 def load_csv_to_table(conn, csv_path, table_name, disable_triggers=False):
+    """Stream the CSV file into the table with COPY, and return the number of rows loaded."""
     cursor = conn.cursor()
 
     if disable_triggers:
         cursor.execute(f"ALTER TABLE {table_name} DISABLE TRIGGER ALL;")
 
-    # Get columns from CSV header
-    with open(csv_path, "r") as f:
-        reader = csv.reader(f)
-        columns = next(reader)
-
-    # Check schema for not-null columns to handle properly
-    not_null_columns = get_not_null_columns(conn, table_name)
-    not_null_indices = [i for i, col in enumerate(columns) if col in not_null_columns]
-
-    # Build INSERT statement
-    placeholders = ",".join(["%s"] * len(columns))
-    columns_str = ",".join(f'"{col}"' for col in columns)  # Quote column names to handle reserved keywords
-    insert_query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
-
-    # Read and insert data
-    with open(csv_path, "r") as f:
-        reader = csv.reader(f)
-        next(reader)  # Skip header
-
-        batch = []
-        batch_size = 1000
-        row_count = 0
-
-        for row in reader:
-            # Convert empty strings to None for most columns, but to empty string for not-null text columns
-            cleaned_row = []
-            for i, val in enumerate(row):
-                if val == "":
-                    if i in not_null_indices:
-                        # For not-null columns, use empty string instead of null
-                        cleaned_row.append("")
-                    else:
-                        # For nullable columns, use null
-                        cleaned_row.append(None)
-                else:
-                    cleaned_row.append(val)
-
-            batch.append(cleaned_row)
-            row_count += 1
-
-            if len(batch) >= batch_size:
-                cursor.executemany(insert_query, batch)
-                batch = []
-
-        if batch:
-            cursor.executemany(insert_query, batch)
+    with open(csv_path, "r", newline="") as f:
+        # Get columns from CSV header, the rest of the file is streamed to COPY
+        columns = next(csv.reader([f.readline()]))
+
+        # Empty values are loaded as NULL, except in NOT NULL columns where they stay empty strings
+        not_null_columns = set(get_not_null_columns(conn, table_name))
+        options = ["FORMAT csv", "NULL ''"]
+        force_not_null = [col for col in columns if col in not_null_columns]
+        if force_not_null:
+            options.append(f"FORCE_NOT_NULL ({quote_columns(force_not_null)})")
+
+        copy_query = f"COPY {table_name} ({quote_columns(columns)}) FROM STDIN WITH ({', '.join(options)})"
+        cursor.copy_expert(copy_query, f, size=COPY_BUFFER_SIZE)
+        row_count = cursor.rowcount
 
     if disable_triggers:
         cursor.execute(f"ALTER TABLE {table_name} ENABLE TRIGGER ALL;")
@@ -68,6 +43,87 @@ def load_csv_to_table(conn, csv_path, table_name, disable_triggers=False):
     return row_count
 
 
+def quote_columns(columns):
+    # Quote column names to handle reserved keywords
+    return ",".join(f'"{col}"' for col in columns)
+
+
+def load_table(connection_string, csv_path, table_name, disable_triggers=False):
+    """Load a table on its own connection, and return the number of rows loaded and the duration."""
+    start = time.perf_counter()
+    conn = psycopg2.connect(connection_string)
+    try:
+        if disable_triggers:
+            conn.cursor().execute("SET session_replication_role = 'replica';")
+        row_count = load_csv_to_table(conn, csv_path, table_name, disable_triggers)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return row_count, time.perf_counter() - start
+
+
+def get_table_dependencies(conn, tables):
+    """Map each table to the other tables among `tables` that its foreign keys reference."""
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT DISTINCT child.relname, parent.relname FROM pg_constraint
+        JOIN pg_class child ON child.oid = pg_constraint.conrelid
+        JOIN pg_class parent ON parent.oid = pg_constraint.confrelid
+        WHERE pg_constraint.contype = 'f' AND child.relname = ANY(%s) AND parent.relname = ANY(%s)
+        """,
+        (list(tables), list(tables)),
+    )
+    dependencies = {table_name: set() for table_name in tables}
+    for table_name, referenced_table in cursor.fetchall():
+        if table_name != referenced_table:
+            dependencies[table_name].add(referenced_table)
+    return dependencies
+
+
+def load_tables(connection_string, csv_files, dependencies, workers, stop_on_error=True, disable_triggers=False):
+    """
+    Load the tables in parallel connections, each table once the tables it references are loaded.
+    Return the number of rows and the duration of each table loaded, and the tables that failed.
+    """
+    loaded = {}
+    failed = []
+    pending = dict(dependencies)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            if not (failed and stop_on_error):
+                for table_name in [table for table, references in pending.items() if references <= loaded.keys()]:
+                    del pending[table_name]
+                    future = executor.submit(
+                        load_table, connection_string, csv_files[table_name], table_name, disable_triggers
+                    )
+                    running[future] = table_name
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table_name = running.pop(future)
+                try:
+                    row_count, seconds = loaded[table_name] = future.result()
+                except Exception as e:
+                    print(f"Error importing table '{table_name}': {e}", file=sys.stderr)
+                    failed.append(table_name)
+                    continue
+                print(
+                    f"Imported table '{table_name}' with {row_count} rows in {seconds:.2f}s "
+                    f"({rate(row_count, seconds)})"
+                )
+    return loaded, failed
+
+
+def rate(row_count, seconds):
+    return f"{row_count / seconds:,.0f} rows/s" if seconds > 0 else "- rows/s"
+
+
 def get_not_null_columns(conn, table_name):
     """Get list of column names that are defined as NOT NULL in the database."""
     cursor = conn.cursor()
@@ -112,6 +168,9 @@ def main():
     parser.add_argument("--pg_password", type=str, required=True, help="PostgreSQL password")
     parser.add_argument("--disable_triggers", action="store_true", help="Disable triggers during import")
     parser.add_argument("--clear", action="store_true", help="Clear existing data before import")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help="Number of tables loaded in parallel connections"
+    )
 
     args = parser.parse_args()
 
@@ -168,58 +227,45 @@ def main():
             conn.close()
             return 1
 
-    # Temporarily disable foreign key constraints
-    if args.disable_triggers:
-        cursor = conn.cursor()
-        cursor.execute("SET session_replication_role = 'replica';")
-        print("Foreign key constraints temporarily disabled")
-
     # Get list of CSV files (excluding tables.csv)
     csv_files = [f for f in csv_dir.iterdir() if f.is_file() and f.suffix == ".csv" and f.name != "tables.csv"]
     csv_file_dict = {f.stem: f for f in csv_files}
+    for table_name in table_order:
+        if table_name not in csv_file_dict:
+            print(f"Warning: No CSV file found for table '{table_name}'")
+    tables = [table_name for table_name in table_order if table_name in csv_file_dict]
 
-    # Load each table in order
-    total_tables = 0
-    try:
-        for table_name in table_order:
-            if table_name in csv_file_dict:
-                csv_file = csv_file_dict[table_name]
-                try:
-                    row_count = load_csv_to_table(conn, csv_file, table_name, args.disable_triggers)
-                    print(f"Imported table '{table_name}' with {row_count} rows")
-                    total_tables += 1
-                except Exception as e:
-                    print(f"Error importing table '{table_name}': {e}", file=sys.stderr)
-                    if not args.disable_triggers:
-                        print("Consider using --disable_triggers to ignore foreign key constraints")
-                        raise
-            else:
-                print(f"Warning: No CSV file found for table '{table_name}'")
-    except Exception:
-        conn.rollback()
-        print("Transaction rolled back due to error")
-    else:
-        conn.commit()
-        print("All data imported and committed successfully")
-
-    # Re-enable foreign key constraints
+    # Tables are loaded once the tables they reference are, unless foreign key constraints are disabled
     if args.disable_triggers:
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SET session_replication_role = 'origin';")
-            print("Foreign key constraints re-enabled")
-        except psycopg2.Error:
-            # If there was an error, we might need a fresh cursor
-            conn.rollback()
-            cursor = conn.cursor()
-            cursor.execute("SET session_replication_role = 'origin';")
-            print("Foreign key constraints re-enabled (after rollback)")
-
+        dependencies = {table_name: set() for table_name in tables}
+        print("Foreign key constraints temporarily disabled")
+    else:
+        dependencies = get_table_dependencies(conn, tables)
     conn.close()
 
+    start = time.perf_counter()
+    loaded, failed = load_tables(
+        connection_string,
+        csv_file_dict,
+        dependencies,
+        args.workers,
+        stop_on_error=not args.disable_triggers,
+        disable_triggers=args.disable_triggers,
+    )
+    seconds = time.perf_counter() - start
+    not_loaded = [table_name for table_name in tables if table_name not in loaded and table_name not in failed]
+    if not_loaded:
+        print(f"Tables not imported: {', '.join(not_loaded)}", file=sys.stderr)
+    if failed and not args.disable_triggers:
+        print("Consider using --disable_triggers to ignore foreign key constraints")
+    if not failed and not not_loaded:
+        print("All data imported and committed successfully")
+
     # Print summary
     print("\nImport Summary:")
-    print(f"Total tables imported: {total_tables}")
+    print(f"Total tables imported: {len(loaded)}")
+    total_rows = sum(row_count for row_count, _ in loaded.values())
+    print(f"Total rows imported: {total_rows} in {seconds:.2f}s ({rate(total_rows, seconds)})")
 
     return 0
 
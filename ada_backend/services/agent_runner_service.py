@@ -1,5 +1,7 @@
+import asyncio
 from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import networkx as nx
 
@@ -10,14 +12,15 @@ from ada_backend.services.agent_builder_service import get_default_values_for_sa
 from engine.graph_runner.graph_runner import GraphRunner
 from ada_backend.repositories.graph_runner_repository import (
     get_component_nodes,
-    get_graph_runner_for_env,
+    get_graph_runner_for_env_async,
     get_input_component,
     get_start_components,
     graph_runner_exists,
+    graph_runner_exists_async,
 )
 from engine.agent.agent import Agent
-from ada_backend.repositories.project_repository import get_project, get_project_with_details
-from ada_backend.repositories.organization_repository import get_organization_secrets
+from ada_backend.repositories.project_repository import get_project, get_project_async
+from ada_backend.repositories.organization_repository import get_organization_secrets_async
 from ada_backend.services.trace_service import get_token_usage
 from engine.graph_runner.runnable import Runnable
 from engine.trace.trace_manager import TraceManager
@@ -25,7 +28,7 @@ from engine.trace.trace_manager import TraceManager
 TOKEN_LIMIT = 2000000
 
 
-async def build_graph_runner(
+def create_graph_runner(
     session: Session,
     graph_runner_id: UUID,
     project_id: UUID,
@@ -65,7 +68,7 @@ async def get_agent_for_project(
         raise ValueError(f"Project {project_id} not found.")
 
     if graph_runner_exists(session, graph_id=graph_runner_id):
-        return await build_graph_runner(
+        return create_graph_runner(
             session,
             graph_runner_id,
             project_id,
@@ -75,12 +78,12 @@ async def get_agent_for_project(
 
 
 async def run_env_agent(
-    session: Session,
+    session: AsyncSession,
     project_id: UUID,
     env: EnvType,
     input_data: dict,
 ) -> ChatResponse:
-    graph_runner = get_graph_runner_for_env(session=session, project_id=project_id, env=env)
+    graph_runner = await get_graph_runner_for_env_async(session=session, project_id=project_id, env=env)
     if not graph_runner:
         raise ValueError(f"{env} graph runner not found for project {project_id}.")
     return await run_agent(
@@ -89,22 +92,24 @@ async def run_env_agent(
 
 
 async def run_agent(
-    session: Session,
+    session: AsyncSession,
     project_id: UUID,
     graph_runner_id: UUID,
     input_data: dict,
 ) -> ChatResponse:
-    agent = await get_agent_for_project(
-        session,
-        project_id=project_id,
-        graph_runner_id=graph_runner_id,
-    )
-    project_details = get_project_with_details(session, project_id=project_id)
+    project = await get_project_async(session, project_id=project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found.")
+    if not await graph_runner_exists_async(session, graph_id=graph_runner_id):
+        raise ValueError("Graph runner does not exist")
+    # The components are instantiated with the synchronous repositories, whose queries are still
+    # awaited through the asyncio session
+    agent = await session.run_sync(create_graph_runner, graph_runner_id, project_id)
     agent.trace_manager.project_id = project_id
-    agent.trace_manager.organization_id = project_details.organization_id
-    organization_secrets = get_organization_secrets(
+    agent.trace_manager.organization_id = project.organization_id
+    organization_secrets = await get_organization_secrets_async(
         session,
-        organization_id=project_details.organization_id,
+        organization_id=project.organization_id,
     )
     agent.trace_manager.organization_llm_providers = str(
         (
@@ -117,7 +122,7 @@ async def run_agent(
             else []
         )
     )
-    token_usage = get_token_usage(organization_id=project_details.organization_id)
+    token_usage = await asyncio.to_thread(get_token_usage, organization_id=project.organization_id)
     # TODO: Fix when token limit is reached and user try to use their own key
     if token_usage.total_tokens > TOKEN_LIMIT:
         raise ValueError(
@@ -128,9 +133,9 @@ async def run_agent(
     # TODO : Add again the monitoring for frequently asked questions after parallelization of agent run
     # db_service = SQLLocalService(engine_url="sqlite:///ada_backend/database/monitor.db", dialect="sqlite")
     # asyncio.create_task(monitor_questions(db_service, project_id, input_data))
-    input_component = get_input_component(session, graph_runner_id=graph_runner_id)
+    input_component = await session.run_sync(get_input_component, graph_runner_id=graph_runner_id)
     if input_component:
-        input_data = get_default_values_for_sandbox(session, input_component.id, project_id, input_data)
+        input_data = await session.run_sync(get_default_values_for_sandbox, input_component.id, project_id, input_data)
     try:
         agent_output = await agent.run(input_data)
     except Exception as e:
@@ -3,6 +3,7 @@ import secrets
 import hashlib
 from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ada_backend.schemas.auth_schema import (
     ApiKeyCreatedResponse,
@@ -12,10 +13,10 @@ from ada_backend.schemas.auth_schema import (
 )
 from ada_backend.repositories.api_key_repository import (
     create_api_key,
-    get_api_key_by_hashed_key,
+    get_api_key_by_hashed_key_async,
     deactivate_api_key,
     get_api_keys_by_project_id,
-    get_project_by_api_key,
+    get_project_by_api_key_async,
 )
 from settings import settings
 
@@ -79,7 +80,7 @@ def generate_api_key(
     )
 
 
-def verify_api_key(session: Session, private_key: str) -> VerifiedApiKey:
+async def verify_api_key(session: AsyncSession, private_key: str) -> VerifiedApiKey:
     """
     Service function to verify an API key.
     """
@@ -88,13 +89,13 @@ def verify_api_key(session: Session, private_key: str) -> VerifiedApiKey:
     except ValueError as e:
         raise ValueError("Invalid API key") from e
 
-    api_key = get_api_key_by_hashed_key(session, hashed_key=hashed_key)
+    api_key = await get_api_key_by_hashed_key_async(session, hashed_key=hashed_key)
     if not api_key:
         raise ValueError("Invalid API key")
     if not api_key.is_active:
         raise ValueError("API key is not active")
 
-    project = get_project_by_api_key(session, hashed_key=hashed_key)
+    project = await get_project_by_api_key_async(session, hashed_key=hashed_key)
     if not project:
         raise ValueError("Project not found for the given API key")
     if project.id != api_key.project_id:
@@ -1,3 +1,4 @@
+import asyncio
 from collections import OrderedDict
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
@@ -107,10 +108,15 @@ def get_tokens_chart(project_id: UUID, duration_days: int) -> Chart:
 
 
 async def get_charts_by_project(project_id: UUID, duration_days: int) -> ChartsResponse:
+    # Prometheus and the traces database are queried in threads, not to block the event loop
+    agent_calls_chart, tokens_chart = await asyncio.gather(
+        asyncio.to_thread(get_prometheus_agent_calls_chart, project_id, duration_days),
+        asyncio.to_thread(get_tokens_chart, project_id, duration_days),
+    )
     response = ChartsResponse(
         charts=[
-            get_prometheus_agent_calls_chart(project_id, duration_days),
-            get_tokens_chart(project_id, duration_days),
+            agent_calls_chart,
+            tokens_chart,
             Chart(
                 id="resource-distribution",
                 type=ChartType.DOUGHNUT,
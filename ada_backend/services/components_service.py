@@ -1,13 +1,64 @@
+import hashlib
 import logging
+import threading
+import time
+from dataclasses import dataclass
 
+from sqlalchemy import Engine
 from sqlalchemy.orm import Session
 
-from ada_backend.repositories.component_repository import get_all_components_with_parameters
+from ada_backend.repositories.component_repository import (
+    get_all_components_with_parameters,
+    get_component_catalog_version,
+)
 from ada_backend.schemas.components_schema import ComponentsResponse
 
 LOGGER = logging.getLogger(__name__)
 
+# The catalog is rebuilt when the seeding bumps its version, and at least this often for the
+# components changed without seeding
+CATALOG_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class ComponentsCatalog:
+    version: int
+    response: ComponentsResponse
+    # JSON body of the response and its entity tag
+    body: bytes
+    etag: str
+    built_at: float
+
+
+# Catalogs memoized by database engine
+_CATALOGS: dict[Engine, ComponentsCatalog] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def get_components_catalog(session: Session) -> ComponentsCatalog:
+    """Return the catalog of components, memoized for as long as its version does not change."""
+    engine = session.get_bind().engine
+    version = get_component_catalog_version(session)
+    with _CATALOGS_LOCK:
+        catalog = _CATALOGS.get(engine)
+    if catalog and catalog.version == version and time.monotonic() - catalog.built_at < CATALOG_TTL_SECONDS:
+        return catalog
+
+    start = time.perf_counter()
+    response = ComponentsResponse(components=get_all_components_with_parameters(session))
+    body = response.model_dump_json().encode()
+    catalog = ComponentsCatalog(
+        version=version,
+        response=response,
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        built_at=time.monotonic(),
+    )
+    with _CATALOGS_LOCK:
+        _CATALOGS[engine] = catalog
+    LOGGER.info(f"Built catalog of components version {version} in {time.perf_counter() - start:.3f}s")
+    return catalog
+
 
 def get_all_components_endpoint(session: Session) -> ComponentsResponse:
-    components = get_all_components_with_parameters(session)
-    return ComponentsResponse(components=components)
+    return get_components_catalog(session).response
@@ -12,7 +12,8 @@ from engine.llm_services.llm_service import LLMService
 from engine.llm_services.openai_llm_service import OpenAILLMService
 from engine.llm_services.mistral_llm_service import MistralLLMService
 from engine.llm_services.google_llm_service import GoogleLLMService
-from engine.qdrant_service import QdrantService, QdrantCollectionSchema
+from engine.qdrant_service import QdrantCollectionSchema
+from engine.vector_store import get_vector_store
 
 from ada_backend.database.setup_db import get_db_session
 from ada_backend.repositories.source_repository import get_data_source_by_id
@@ -347,14 +348,14 @@ def build_qdrant_service_processor(
     trace_manager: TraceManager, target_name: str = "qdrant_service"
 ) -> ParameterProcessor:
     """
-    Creates a processor that builds a QdrantService from a source ID.
+    Creates a processor that builds the vector store of a source from its ID.
 
     Args:
         trace_manager (TraceManager): Trace manager for the LLM service.
-        target_name (str): Parameter name for the created QdrantService.
+        target_name (str): Parameter name for the created vector store.
 
     Returns:
-        ParameterProcessor: A processor function that handles QdrantService creation
+        ParameterProcessor: A processor function that handles the vector store creation
         and injects the collection name into the params dictionary.
     """
 
@@ -377,8 +378,9 @@ def build_qdrant_service_processor(
         llm_service = OpenAILLMService(
             trace_manager=trace_manager,
             embedding_model_name=embedding_model_name,
+            embedding_dimensions=qdrant_schema.embedding_dimensions,
         )
-        qdrant_service = QdrantService.from_defaults(
+        qdrant_service = get_vector_store(
             llm_service=llm_service,
             default_collection_schema=qdrant_schema,
         )
@@ -1,27 +1,31 @@
 import logging
+from collections import defaultdict
+from functools import cache
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy.orm import Session
 
+from ada_backend.database import models as db
 from ada_backend.database.models import EnvType
 from ada_backend.repositories.component_repository import (
-    get_component_instance_by_id,
-    get_component_parameter_definition_by_component_id,
-    upsert_sub_component_input,
+    get_component_instances_by_ids,
+    get_component_parameter_definitions_by_component_ids,
+    get_components_by_ids,
+    get_sub_component_inputs_by_parent_ids,
+    get_tool_descriptions_by_names,
 )
-from ada_backend.repositories.edge_repository import upsert_edge
+from ada_backend.repositories.edge_repository import get_edges_by_ids
 from ada_backend.repositories.graph_runner_repository import (
-    delete_node,
-    get_component_nodes,
+    get_existing_graph_runner_ids,
+    get_nodes_by_graph_runner_id,
     graph_runner_exists,
-    insert_graph_runner_and_bind_to_project,
-    upsert_component_node,
+    save_graph_changes,
 )
+from ada_backend.repositories.organization_repository import get_organization_secrets_from_project_id
 from ada_backend.schemas.pipeline.graph_schema import GraphUpdateResponse, GraphUpdateSchema
 from ada_backend.services.agent_runner_service import get_agent_for_project
-from ada_backend.services.graph.delete_graph_service import delete_component_instances_from_nodes
-from ada_backend.services.pipeline.update_pipeline_service import create_or_update_component_instance
+from ada_backend.services.pipeline.update_pipeline_service import get_basic_parameter_values
 
 LOGGER = logging.getLogger(__name__)
 
@@ -36,76 +40,172 @@ async def update_graph_service(
     """
     Creates or updates a complete graph runner including all component instances,
     their parameters, and relationships.
+
+    The stored graph is loaded in bulk and the whole new graph is validated against it first,
+    then only the rows that changed are written, in a single transaction.
     """
+    new_rows = []
+    deleted_rows = []
     if not graph_runner_exists(session, graph_runner_id):
         LOGGER.info("Creating new graph")
-        env = env if env else EnvType.DRAFT
-        insert_graph_runner_and_bind_to_project(session, graph_runner_id, project_id=project_id, env=env)
+        new_rows.append(db.GraphRunner(id=graph_runner_id))
+        new_rows.append(
+            db.ProjectEnvironmentBinding(
+                project_id=project_id, graph_runner_id=graph_runner_id, environment=env if env else EnvType.DRAFT
+            )
+        )
     # TODO: Add the get_graph_runner_nodes function when we will handle nested graphs
-    previous_graph_nodes = set(node.id for node in get_component_nodes(session, graph_runner_id))
+    previous_nodes = {node.node_id: node for node in get_nodes_by_graph_runner_id(session, graph_runner_id)}
 
-    # Create/update all component instances
-    instance_ids = set()
-    for instance in graph_project.component_instances:
-        instance_id = create_or_update_component_instance(session, instance, project_id)
-        upsert_component_node(
-            session,
-            graph_runner_id=graph_runner_id,
-            component_instance_id=instance.id,
-            is_start_node=instance.is_start_node,
+    instances = {instance.id or uuid4(): instance for instance in graph_project.component_instances}
+    components = {
+        component.id: component
+        for component in get_components_by_ids(session, {instance.component_id for instance in instances.values()})
+    }
+    param_definitions: dict[UUID, dict[str, db.ComponentParameterDefinition]] = defaultdict(dict)
+    for param_def in get_component_parameter_definitions_by_component_ids(session, set(components)):
+        param_definitions[param_def.component_id][param_def.name] = param_def
+    get_organization_secrets = cache(lambda: get_organization_secrets_from_project_id(session, project_id))
+
+    # Validate the whole graph before changing anything
+    parameter_values = {}
+    for instance_id, instance in instances.items():
+        if instance.component_id not in components:
+            raise ValueError(f"Component '{instance.component_id}' not found")
+        parameter_values[instance_id] = get_basic_parameter_values(
+            instance,
+            param_definitions[instance.component_id],
+            components[instance.component_id].name,
+            project_id,
+            get_organization_secrets,
         )
-        instance_ids.add(instance_id)
 
-    # Create relationships
+    relationships: dict[tuple[UUID, UUID, UUID], Optional[int]] = {}
     for relation in graph_project.relationships:
         # Validate that both components exist
         if not (
-            relation.parent_component_instance_id in instance_ids
-            and relation.child_component_instance_id in instance_ids
+            relation.parent_component_instance_id in instances and relation.child_component_instance_id in instances
         ):
             raise ValueError("Invalid relationship: component instance not found")
 
-        # Get parameter definition ID from name
-        parent = get_component_instance_by_id(session, relation.parent_component_instance_id)
-        if not parent:
-            raise ValueError("Invalid relationship: parent component instance not found")
-        # TODO: Refactor to repository function that takes name and component_id or with dictionary for faster lookup
-        param_defs = get_component_parameter_definition_by_component_id(session, parent.component_id)
-        param_def = next((p for p in param_defs if p.name == relation.parameter_name), None)
+        parent = instances[relation.parent_component_instance_id]
+        param_def = param_definitions[parent.component_id].get(relation.parameter_name)
         if not param_def:
             raise ValueError(
                 f"Parameter '{relation.parameter_name}' not found in "
-                f"component definitions for component '{parent.component.name}'"
+                f"component definitions for component '{components[parent.component_id].name}'"
             )
+        key = (relation.parent_component_instance_id, relation.child_component_instance_id, param_def.id)
+        relationships[key] = relation.order
 
-        # Create relationship
-        upsert_sub_component_input(
-            session=session,
-            parent_component_instance_id=relation.parent_component_instance_id,
-            child_component_instance_id=relation.child_component_instance_id,
-            parameter_definition_id=param_def.id,
-            order=relation.order,
-        )
-
-    for edge in graph_project.edges:
-        if graph_runner_exists(session, edge.destination) or graph_runner_exists(session, edge.origin):
-            raise ValueError("Nested graphs are not supported")
+    edge_node_ids = {edge.origin for edge in graph_project.edges} | {edge.destination for edge in graph_project.edges}
+    if get_existing_graph_runner_ids(session, edge_node_ids):
+        raise ValueError("Nested graphs are not supported")
 
-        upsert_edge(
+    # Load the stored rows of the graph, before any change is autoflushed
+    stored_instances = {instance.id: instance for instance in get_component_instances_by_ids(session, set(instances))}
+    tool_descriptions = {
+        tool_description.name: tool_description
+        for tool_description in get_tool_descriptions_by_names(
             session,
-            id=edge.id,
-            source_node_id=edge.origin,
-            target_node_id=edge.destination,
-            graph_runner_id=graph_runner_id,
-            order=edge.order,
+            {instance.tool_description.name for instance in instances.values() if instance.tool_description},
         )
+    }
+    stored_sub_inputs = {}
+    for sub_input in get_sub_component_inputs_by_parent_ids(session, set(instances)):
+        key = (sub_input.parent_component_instance_id, sub_input.child_component_instance_id)
+        stored_sub_inputs[(*key, sub_input.parameter_definition_id)] = sub_input
+    stored_edges = {edge.id: edge for edge in get_edges_by_ids(session, {edge.id for edge in graph_project.edges})}
 
-    nodes_to_delete = previous_graph_nodes - instance_ids
-    if len(nodes_to_delete) > 0:
-        delete_component_instances_from_nodes(session, nodes_to_delete)
+    # Create/update all component instances, with their parameters and nodes
+    for instance_id, instance in instances.items():
+        tool_description_id = None
+        if instance.tool_description:
+            tool_description = tool_descriptions.get(instance.tool_description.name)
+            if tool_description is None:
+                tool_description = db.ToolDescription(id=uuid4(), name=instance.tool_description.name)
+                tool_descriptions[tool_description.name] = tool_description
+                new_rows.append(tool_description)
+            tool_description.description = instance.tool_description.description
+            tool_description.tool_properties = instance.tool_description.tool_properties
+            tool_description.required_tool_properties = instance.tool_description.required_tool_properties
+            tool_description_id = tool_description.id
+
+        component_instance = stored_instances.get(instance_id)
+        stored_parameters = {}
+        if component_instance is None:
+            component_instance = db.ComponentInstance(id=instance_id)
+            new_rows.append(component_instance)
+        else:
+            for parameter in component_instance.basic_parameters:
+                key = (parameter.parameter_definition_id, parameter.order)
+                if key in stored_parameters:
+                    deleted_rows.append(parameter)
+                else:
+                    stored_parameters[key] = parameter
+        component_instance.component_id = instance.component_id
+        component_instance.name = instance.name
+        component_instance.ref = instance.ref
+        component_instance.tool_description_id = tool_description_id
+
+        # Parameters are fully replaced, keeping the rows of the parameters that are still set
+        values = {(value.parameter_definition_id, value.order): value for value in parameter_values[instance_id]}
+        for key, value in values.items():
+            parameter = stored_parameters.pop(key, None)
+            if parameter is None:
+                new_rows.append(
+                    db.BasicParameter(
+                        component_instance_id=instance_id,
+                        parameter_definition_id=value.parameter_definition_id,
+                        value=value.value,
+                        organization_secret_id=value.organization_secret_id,
+                        order=value.order,
+                    )
+                )
+            else:
+                parameter.value = value.value
+                parameter.organization_secret_id = value.organization_secret_id
+        deleted_rows.extend(stored_parameters.values())
+
+        node = previous_nodes.get(instance_id)
+        if node is None:
+            new_rows.append(
+                db.GraphRunnerNode(
+                    node_id=instance_id,
+                    graph_runner_id=graph_runner_id,
+                    node_type=db.NodeType.COMPONENT,
+                    is_start_node=instance.is_start_node,
+                )
+            )
+        else:
+            node.is_start_node = instance.is_start_node
+
+    # Create relationships
+    for (parent_id, child_id, parameter_definition_id), order in relationships.items():
+        sub_input = stored_sub_inputs.get((parent_id, child_id, parameter_definition_id))
+        if sub_input is None:
+            new_rows.append(
+                db.ComponentSubInput(
+                    parent_component_instance_id=parent_id,
+                    child_component_instance_id=child_id,
+                    parameter_definition_id=parameter_definition_id,
+                    order=order,
+                )
+            )
+        else:
+            sub_input.order = order
+
+    for edge in graph_project.edges:
+        stored_edge = stored_edges.get(edge.id)
+        if stored_edge is None:
+            stored_edge = stored_edges[edge.id] = db.GraphRunnerEdge(id=edge.id, graph_runner_id=graph_runner_id)
+            new_rows.append(stored_edge)
+        stored_edge.source_node_id = edge.origin
+        stored_edge.target_node_id = edge.destination
+        stored_edge.order = edge.order
 
-    for node_id in nodes_to_delete:
-        delete_node(session, node_id)
+    nodes_to_delete = set(previous_nodes) - set(instances)
+    save_graph_changes(session, new_rows, deleted_rows, nodes_to_delete)
     LOGGER.info("Deleted nodes: {}".format(len(nodes_to_delete)))
 
     await get_agent_for_project(
@@ -15,7 +15,10 @@ from ada_backend.schemas.ingestion_task_schema import (
     IngestionTaskUpdate,
     IngestionTaskResponse,
 )
+from ada_backend.repositories.source_repository import get_data_source_by_org_id
 from ada_backend.utils.redis_client import push_ingestion_task
+from ada_backend.database import models as db
+from engine.agent.rag.document_catalog import invalidate_document_catalog
 
 LOGGER = logging.getLogger(__name__)
 
@@ -109,7 +112,7 @@ def upsert_ingestion_task_by_organization_id(
 ) -> None:
     """Create a new source for an organization."""
     try:
-        return update_ingestion_task(
+        update_ingestion_task(
             session,
             organization_id,
             ingestion_task_data.source_id,
@@ -118,11 +121,25 @@ def upsert_ingestion_task_by_organization_id(
             ingestion_task_data.status,
             ingestion_task_data.id,
         )
+        if ingestion_task_data.status == db.TaskStatus.COMPLETED and ingestion_task_data.source_id:
+            invalidate_source_caches(session, organization_id, ingestion_task_data.source_id)
     except Exception as e:
         LOGGER.error(f"Error in upsert_ingestion_task_by_organization_id: {str(e)}")
         raise ValueError(f"Failed to upsert task: {str(e)}")
 
 
+def invalidate_source_caches(
+    session: Session,
+    organization_id: UUID,
+    source_id: UUID,
+) -> None:
+    """Drop the in-process caches built from a source once a new ingestion of it has finished."""
+    source = get_data_source_by_org_id(session, organization_id, source_id)
+    if source is None or not source.database_table_name:
+        return
+    invalidate_document_catalog(schema_name=source.database_schema, table_name=source.database_table_name)
+
+
 def delete_ingestion_task_by_id(
     session: Session,
     organization_id: UUID,
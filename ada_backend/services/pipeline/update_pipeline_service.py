@@ -1,10 +1,15 @@
 import json
+from dataclasses import dataclass
+from typing import Callable, Optional
 from uuid import UUID
 from logging import getLogger
 
 from sqlalchemy.orm import Session
 
-from ada_backend.repositories.organization_repository import get_organization_secrets_from_project_id
+from ada_backend.repositories.organization_repository import (
+    OrganizationSecretDTO,
+    get_organization_secrets_from_project_id,
+)
 from ada_backend.schemas.pipeline.base import ComponentInstanceSchema
 from ada_backend.database import models as db
 from ada_backend.repositories.component_repository import (
@@ -20,51 +25,31 @@ from ada_backend.services.registry import PARAM_MODEL_NAME_IN_DB
 LOGGER = getLogger(__name__)
 
 
-def create_or_update_component_instance(
-    session: Session,
-    instance_data: ComponentInstanceSchema,
-    project_id: UUID,
-) -> UUID:
-    """Creates or updates a component instance with its parameters"""
-    # Create tool description if needed
-    tool_description = None
-    if instance_data.tool_description:
-        tool_description = upsert_tool_description(
-            session=session,
-            name=instance_data.tool_description.name,
-            description=instance_data.tool_description.description,
-            tool_properties=instance_data.tool_description.tool_properties,
-            required_tool_properties=instance_data.tool_description.required_tool_properties,
-        )
-
-    # Create/update instance (will create new if id is None, or upsert if id exists)
-    component_instance = upsert_component_instance(
-        session=session,
-        component_id=instance_data.component_id,
-        name=instance_data.name,
-        ref=instance_data.ref,
-        tool_description_id=tool_description.id if tool_description else None,
-        id_=instance_data.id,  # Pass the ID if provided, None otherwise
-    )
-    instance_id = component_instance.id
-
-    component_name = component_instance.component.name
+@dataclass(frozen=True)
+class BasicParameterValue:
+    """Value of a basic parameter to store, either a value or a reference to an organization secret."""
 
-    # Delete existing parameters (full replacement)
-    delete_component_instance_parameters(session, instance_id)
+    parameter_definition_id: UUID
+    value: Optional[str] = None
+    organization_secret_id: Optional[UUID] = None
+    order: Optional[int] = None
 
-    # Get parameter definitions for validation
-    param_definitions: dict[str, db.ComponentParameterDefinition] = {
-        p.name: p
-        for p in get_component_parameter_definition_by_component_id(
-            session,
-            instance_data.component_id,
-        )
-    }
 
+def get_basic_parameter_values(
+    instance_data: ComponentInstanceSchema,
+    param_definitions: dict[str, db.ComponentParameterDefinition],
+    component_name: str,
+    project_id: UUID,
+    get_organization_secrets: Callable[[], list[OrganizationSecretDTO]],
+) -> list[BasicParameterValue]:
+    """
+    Validates the parameters of a component instance against the parameter definitions of its component,
+    and returns the basic parameters to store, with the LLM API keys and secrets of the organization.
+    """
+    values = []
     for param_name, param_def in param_definitions.items():
         if param_def.type == db.ParameterType.LLM_API_KEY:
-            organization_secrets = get_organization_secrets_from_project_id(session, project_id)
+            organization_secrets = get_organization_secrets()
             if not organization_secrets:
                 LOGGER.info(
                     f"No organization secrets found for project '{project_id}'. "
@@ -86,16 +71,11 @@ def create_or_update_component_instance(
                     "Skipping LLM API key parameter creation."
                 )
                 continue
-            upsert_basic_parameter(
-                session=session,
-                component_instance_id=instance_id,
-                parameter_definition_id=param_def.id,
-                org_secret_id=param_secret.id,
-                order=None,
+            values.append(
+                BasicParameterValue(parameter_definition_id=param_def.id, organization_secret_id=param_secret.id)
             )
             LOGGER.info(f"LLM API key parameter '{param_name}' upsert for component '{component_name}' ")
 
-    # Create/update parameters
     for param in instance_data.parameters:
         if param.name not in param_definitions:
             raise ValueError(
@@ -109,21 +89,16 @@ def create_or_update_component_instance(
                 raise ValueError(f"Data source parameter cannot be None in component '{component_name}'")
 
         if param_def.type == db.ParameterType.SECRETS:
-            organization_secrets = get_organization_secrets_from_project_id(session, project_id)
-            param_secret = None
-            for secret in organization_secrets:
-                if secret.key == param.name:
-                    param_secret = secret
-                    break
+            param_secret = next((s for s in get_organization_secrets() if s.key == param.name), None)
             if param_secret is None:
                 raise ValueError(f"Secret '{param.name}' not found in organization secrets for project '{project_id}'")
 
-            upsert_basic_parameter(
-                session=session,
-                component_instance_id=instance_id,
-                parameter_definition_id=param_def.id,
-                org_secret_id=param_secret.id,
-                order=param.order,
+            values.append(
+                BasicParameterValue(
+                    parameter_definition_id=param_def.id,
+                    organization_secret_id=param_secret.id,
+                    order=param.order,
+                )
             )
 
         elif param_def.type != db.ParameterType.LLM_API_KEY:
@@ -133,14 +108,75 @@ def create_or_update_component_instance(
                     f"because it is not nullable."
                 )
             elif param.value is not None:
-                upsert_basic_parameter(
-                    session=session,
-                    component_instance_id=instance_id,
-                    parameter_definition_id=param_def.id,
-                    value=(
-                        json.dumps(param.value) if isinstance(param.value, dict) else str(param.value)
-                    ),  # Convert to string for storage
-                    order=param.order,
+                values.append(
+                    BasicParameterValue(
+                        parameter_definition_id=param_def.id,
+                        value=(
+                            json.dumps(param.value) if isinstance(param.value, dict) else str(param.value)
+                        ),  # Convert to string for storage
+                        order=param.order,
+                    )
                 )
+    return values
+
+
+def create_or_update_component_instance(
+    session: Session,
+    instance_data: ComponentInstanceSchema,
+    project_id: UUID,
+) -> UUID:
+    """Creates or updates a component instance with its parameters"""
+    # Create tool description if needed
+    tool_description = None
+    if instance_data.tool_description:
+        tool_description = upsert_tool_description(
+            session=session,
+            name=instance_data.tool_description.name,
+            description=instance_data.tool_description.description,
+            tool_properties=instance_data.tool_description.tool_properties,
+            required_tool_properties=instance_data.tool_description.required_tool_properties,
+        )
+
+    # Create/update instance (will create new if id is None, or upsert if id exists)
+    component_instance = upsert_component_instance(
+        session=session,
+        component_id=instance_data.component_id,
+        name=instance_data.name,
+        ref=instance_data.ref,
+        tool_description_id=tool_description.id if tool_description else None,
+        id_=instance_data.id,  # Pass the ID if provided, None otherwise
+    )
+    instance_id = component_instance.id
+
+    component_name = component_instance.component.name
+
+    # Delete existing parameters (full replacement)
+    delete_component_instance_parameters(session, instance_id)
+
+    # Get parameter definitions for validation
+    param_definitions: dict[str, db.ComponentParameterDefinition] = {
+        p.name: p
+        for p in get_component_parameter_definition_by_component_id(
+            session,
+            instance_data.component_id,
+        )
+    }
+
+    # Create/update parameters
+    for parameter in get_basic_parameter_values(
+        instance_data,
+        param_definitions,
+        component_name,
+        project_id,
+        get_organization_secrets=lambda: get_organization_secrets_from_project_id(session, project_id),
+    ):
+        upsert_basic_parameter(
+            session=session,
+            component_instance_id=instance_id,
+            parameter_definition_id=parameter.parameter_definition_id,
+            value=parameter.value,
+            org_secret_id=parameter.organization_secret_id,
+            order=parameter.order,
+        )
 
     return instance_id
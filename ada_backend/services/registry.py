@@ -21,6 +21,7 @@ from engine.agent.rag.formatter import Formatter
 from engine.agent.rag.retriever import Retriever
 from engine.agent.rag.vocabulary_search import VocabularySearch
 from engine.agent.rag.cohere_reranker import CohereReranker
+from engine.agent.rag.bm25_reranker import BM25Reranker
 from engine.agent.api_tools.tavily_search_tool import TavilyApiTool
 from engine.agent.web_search_tool_openai import WebSearchOpenAITool
 from engine.agent.api_tools.api_call_tool import APICallTool
@@ -57,6 +58,7 @@ class SupportedEntityType(StrEnum):
     RETRIEVER = "Retriever"
     VOCABULARY_SEARCH = "VocabularySearch"
     COHERE_RERANKER = "CohereReranker"
+    BM25_RERANKER = "BM25Reranker"
     RAG_ANSWER_FORMATTER = "Formatter"
     SQL_DB_SERVICE = "SQLDBService"
     CHUNK_SELECTOR = "ChunkSelector"
@@ -248,6 +250,13 @@ def create_factory_registry() -> FactoryRegistry:
             parameter_processors=[trace_manager_processor],
         ),
     )
+    registry.register(
+        name=SupportedEntityType.BM25_RERANKER,
+        factory=EntityFactory(
+            entity_class=BM25Reranker,
+            parameter_processors=[trace_manager_processor],
+        ),
+    )
 
     registry.register(
         name=SupportedEntityType.RAG_ANSWER_FORMATTER,
@@ -16,8 +16,9 @@ from ada_backend.schemas.source_schema import (
     DataSourceSchemaResponse,
     DataSourceUpdateSchema,
 )
-from engine.qdrant_service import QdrantCollectionSchema, QdrantService
+from engine.qdrant_service import QdrantCollectionSchema
 from engine.storage_service.local_service import SQLLocalService
+from engine.vector_store import get_vector_store
 from settings import settings
 
 LOGGER = logging.getLogger(__name__)
@@ -68,6 +69,7 @@ def create_source_by_organization(
 ) -> UUID:
     """
     Create a new source for an organization.
+    A source created again with the same id, e.g. when a shared collection source is synced, is updated instead.
     Args:
         session (Session): SQLAlchemy session
         organization_id (UUID): ID of the organization
@@ -76,6 +78,22 @@ def create_source_by_organization(
         None
     """
     try:
+        if source_data.id and get_data_source_by_org_id(session, organization_id, source_data.id):
+            upsert_source(
+                session,
+                organization_id,
+                source_data.id,
+                source_data.name,
+                source_data.type,
+                source_data.database_table_name,
+                source_data.database_schema,
+                source_data.qdrant_collection_name,
+                source_data.qdrant_schema,
+                source_data.embedding_model_name,
+            )
+            LOGGER.info(f"Source {source_data.name} updated for organization {organization_id}")
+            return source_data.id
+
         source_id = create_source(
             session,
             organization_id,
@@ -86,6 +104,7 @@ def create_source_by_organization(
             source_data.qdrant_collection_name,
             source_data.qdrant_schema,
             source_data.embedding_model_name,
+            source_id=source_data.id,
         )
 
         LOGGER.info(f"Source {source_data.name} created for organization {organization_id}")
@@ -145,15 +164,18 @@ def delete_source_service(
         # TODO change snowflake to db service when ingestion script is updated
         # TODO enhance security by double checking deletion rights
         if source.qdrant_collection_name and source.qdrant_schema:
-            LOGGER.info(f"Deleting Qdrant collection {source.qdrant_collection_name}")
-            qdrant_service = QdrantService.from_defaults(
-                default_collection_schema=QdrantCollectionSchema(**source.qdrant_schema),
-            )
-
-            qdrant_service.delete_collection(
-                collection_name=source.qdrant_collection_name,
-            )
-            LOGGER.info(f"Qdrant collection {source.qdrant_collection_name} deleted")
+            qdrant_schema = QdrantCollectionSchema(**source.qdrant_schema)
+            qdrant_service = get_vector_store(default_collection_schema=qdrant_schema)
+            if qdrant_schema.tenant_fields:
+                # The collection is shared with other sources: only the points of this source are deleted
+                LOGGER.info(f"Deleting the points of source {source_id} in {source.qdrant_collection_name}")
+                qdrant_service.delete_tenant_points(collection_name=source.qdrant_collection_name)
+            else:
+                LOGGER.info(f"Deleting Qdrant collection {source.qdrant_collection_name}")
+                qdrant_service.delete_collection(
+                    collection_name=source.qdrant_collection_name,
+                )
+                LOGGER.info(f"Qdrant collection {source.qdrant_collection_name} deleted")
         if source.database_table_name:
             LOGGER.info(f"Deleting table {source.database_table_name}")
             db_service = SQLLocalService(engine_url=settings.INGESTION_DB_URL)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Load test of request handlers reading the ada_backend database while a slow query runs, with the
+synchronous session the routes used to get, and with the asyncio session of the hot paths. A slow
+query on the synchronous session blocks the event loop, so the other requests of the worker wait for it.
+Run with: python -m benchmarks.async_db_sessions
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+import numpy as np
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from ada_backend.database import models as db
+from ada_backend.repositories.project_repository import get_project, get_project_async
+
+
+def add_sleep_function(dbapi_connection, connection_record):
+    dbapi_connection.create_function("sleep", 1, lambda seconds: time.sleep(seconds) or seconds)
+
+
+def create_app(path: Path) -> FastAPI:
+    # Without pools, the requests held back by the blocked event loop cannot exhaust the connections
+    engine = create_engine(f"sqlite:///{path}", poolclass=NullPool)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    for _engine in (engine, async_engine.sync_engine):
+        event.listen(_engine, "connect", add_sleep_function)
+    SessionLocal = sessionmaker(bind=engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    db.Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        project = db.Project(id=uuid4(), name="Benchmark project", organization_id=uuid4())
+        session.add(project)
+        session.commit()
+        project_id = project.id
+
+    def get_db():
+        with SessionLocal() as session:
+            yield session
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    app = FastAPI()
+
+    @app.get("/sync/slow")
+    async def sync_slow(seconds: float, session: Session = Depends(get_db)):
+        return session.execute(text("SELECT sleep(:seconds)"), {"seconds": seconds}).scalar()
+
+    @app.get("/sync/project")
+    async def sync_project(session: Session = Depends(get_db)):
+        return get_project(session, project_id).name
+
+    @app.get("/async/slow")
+    async def async_slow(seconds: float, session: AsyncSession = Depends(get_async_db)):
+        return (await session.execute(text("SELECT sleep(:seconds)"), {"seconds": seconds})).scalar()
+
+    @app.get("/async/project")
+    async def async_project(session: AsyncSession = Depends(get_async_db)):
+        return (await get_project_async(session, project_id)).name
+
+    return app
+
+
+async def load_test(app: FastAPI, mode: str, requests: int, slow_seconds: float) -> np.ndarray:
+    """Latencies in ms of project requests arriving at a steady rate while a slow query runs."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+
+        async def get_project_ms(arrival: float) -> float:
+            await asyncio.sleep(arrival - time.perf_counter())
+            response = await client.get(f"/{mode}/project")
+            response.raise_for_status()
+            # A request waiting for the event loop is late from its arrival
+            return (time.perf_counter() - arrival) * 1000
+
+        # Warm up the application
+        await get_project_ms(time.perf_counter())
+        start = time.perf_counter()
+        slow_request = asyncio.create_task(client.get(f"/{mode}/slow", params={"seconds": slow_seconds}))
+        latencies = await asyncio.gather(
+            *(get_project_ms(start + slow_seconds * (i + 1) / (requests + 1)) for i in range(requests))
+        )
+        await slow_request
+    return np.array(latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test of the synchronous and asyncio database sessions")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--slow-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app(Path(directory) / "ada_backend.db")
+        for mode in ("sync", "async"):
+            latencies = asyncio.run(load_test(app, mode, args.requests, args.slow_seconds))
+            print(
+                f"{mode} session, {args.requests} requests behind a {args.slow_seconds:.1f}s query: "
+                f"p50 {np.median(latencies):.1f} ms, max {latencies.max():.1f} ms"
+            )
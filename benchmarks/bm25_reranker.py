@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Benchmark the latency of the local BM25 reranker on synthetic chunks.
+Run with: python -m benchmarks.bm25_reranker
+"""
+import argparse
+import random
+import string
+import time
+
+from engine.agent.agent import SourceChunk
+from engine.agent.rag.bm25_reranker import BM25Reranker
+from tests.mocks.trace_manager import MockTraceManager
+
+QUERIES = [
+    "What is the maintenance procedure for the hydraulic pump?",
+    "Which supplier agreement covers the voltage regulator?",
+    "How many days of holidays do employees get?",
+]
+
+
+def build_chunks(number_of_chunks: int, words_per_chunk: int, seed: int = 0) -> list[SourceChunk]:
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(5000)]
+    vocabulary += ["hydraulic", "pump", "maintenance", "supplier", "agreement", "voltage", "regulator", "holidays"]
+    return [
+        SourceChunk(
+            name=str(i),
+            document_name=f"document_{i}",
+            content=" ".join(rng.choices(vocabulary, k=words_per_chunk)),
+            metadata={},
+        )
+        for i in range(number_of_chunks)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the BM25 reranker")
+    parser.add_argument("--chunks", type=int, default=100)
+    parser.add_argument("--words", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--language", default="english")
+    args = parser.parse_args()
+
+    chunks = build_chunks(args.chunks, args.words)
+    reranker = BM25Reranker(trace_manager=MockTraceManager(project_name="benchmark"), language=args.language)
+
+    start = time.perf_counter()
+    for i in range(args.repeat):
+        reranker._rerank_without_trace(QUERIES[i % len(QUERIES)], chunks)
+    elapsed = (time.perf_counter() - start) / args.repeat
+    print(f"BM25 rerank of {args.chunks} chunks of {args.words} words: {elapsed * 1000:.2f} ms per query")
+    print(f"Per 100 chunks: {elapsed * 1000 * 100 / args.chunks:.2f} ms")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Measure the rows per second of the export of a collection to Parquet files and of its import back,
+with the page, file and batch sizes of the command line.
+With --backend qdrant, needs QDRANT_CLUSTER_URL and QDRANT_API_KEY.
+Run with: python -m benchmarks.collection_snapshot
+"""
+import argparse
+import tempfile
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from engine.collection_snapshot import export_collection, import_collection
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import QdrantCollectionSchema, QdrantService
+from settings import settings
+
+SCHEMA = QdrantCollectionSchema(chunk_id_field="chunk_id", content_field="content", file_id_field="file_id")
+
+
+def build_vector_store(backend: str, directory: str) -> QdrantService:
+    if backend == "local":
+        return LocalVectorStore(path=directory, default_schema=SCHEMA)
+    return QdrantService(
+        qdrant_api_key=settings.QDRANT_API_KEY,
+        qdrant_cluster_url=settings.QDRANT_CLUSTER_URL,
+        default_schema=SCHEMA,
+    )
+
+
+def fill_collection(vector_store: QdrantService, collection_name: str, args: argparse.Namespace) -> None:
+    if vector_store.collection_exists(collection_name):
+        vector_store.delete_collection(collection_name)
+    vector_store.create_collection(collection_name, vector_size=args.dimension)
+    rng = np.random.default_rng(0)
+    for offset in range(0, args.vectors, args.batch):
+        vectors = rng.standard_normal((min(args.batch, args.vectors - offset), args.dimension), dtype=np.float32)
+        points = [
+            {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_DNS, str(offset + i))),
+                "payload": {
+                    "chunk_id": str(offset + i),
+                    "content": f"content of the chunk {offset + i}",
+                    "file_id": f"file_{(offset + i) % 1000}",
+                },
+                "vector": vector.tolist(),
+            }
+            for i, vector in enumerate(vectors)
+        ]
+        vector_store.insert_points_in_collection(points, collection_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Parquet export and import of a collection")
+    parser.add_argument("--backend", choices=["local", "qdrant"], default="local")
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=1_000)
+    parser.add_argument("--rows-per-file", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        vector_store = build_vector_store(args.backend, str(Path(directory) / "store"))
+        fill_collection(vector_store, "benchmark_snapshot", args)
+        snapshot = Path(directory) / "snapshot"
+        export_stats = export_collection(
+            vector_store, "benchmark_snapshot", snapshot, page_size=args.page_size, rows_per_file=args.rows_per_file
+        )
+        print(f"Export: {export_stats}")
+        import_stats = import_collection(
+            vector_store, snapshot, "benchmark_snapshot_imported", batch_size=args.batch, max_workers=args.workers
+        )
+        print(f"Import: {import_stats}")
+        size_mb = sum(path.stat().st_size for path in snapshot.iterdir()) / 2**20
+        print(f"Snapshot size: {size_mb:.1f} MB")
+        vector_store.delete_collection("benchmark_snapshot")
+        vector_store.delete_collection("benchmark_snapshot_imported")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Measure the time to serve the catalog of components to the editor: the build of the catalog from the
+database, with and without the eager loading of the parameter definitions, and the memoized catalog that
+is served while the version of the catalog does not change.
+Run with: python -m benchmarks.components_catalog
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ada_backend.database.models import Base
+from ada_backend.database.seed_db import seed_db
+from ada_backend.repositories import component_repository
+from ada_backend.services import components_service
+
+
+def time_ms(function, repeat: int) -> np.ndarray:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return np.array(durations) * 1000
+
+
+def get_components_lazily(session):
+    """The catalog as it was built before, with queries for each component."""
+    for component in session.query(component_repository.db.Component).all():
+        component_repository.get_component_parameter_definition_by_component_id(session, component.id)
+        component_repository.get_subcomponent_param_def_by_component_id(session, component.id)
+        component_repository.get_tool_description_component(session=session, component_id=component.id)
+        session.expire_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the catalog of components")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'ada_backend.db'}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        seed_db(session)
+        components_service.get_components_catalog(session)
+
+        def build_catalog():
+            session.expire_all()
+            component_repository.get_all_components_with_parameters(session)
+
+        def serve_catalog():
+            components_service.get_components_catalog(session).body
+
+        for label, function in [
+            ("Queries per component (before)", lambda: get_components_lazily(session)),
+            ("Eager-loaded build", build_catalog),
+            ("Memoized catalog", serve_catalog),
+        ]:
+            durations = time_ms(function, args.repeat)
+            print(f"{label}: p50 {np.median(durations):.2f} ms, max {durations.max():.2f} ms")
+        session.close()
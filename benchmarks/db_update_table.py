@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Compare DBService.update_table, which merges the ids and timestamps of the table with the new rows in pandas,
+with the INSERT ... ON CONFLICT upsert of SQLLocalService, on a table of --rows rows where the new DataFrame
+updates, adds and removes a share of them. Uses a temporary SQLite file unless --db-url is given
+(e.g. the PostgreSQL ingestion database, where the upsert loads the rows with COPY).
+Run with: python -m benchmarks.db_update_table
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.storage_service.db_service import DBService
+from engine.storage_service.db_utils import PROCESSED_DATETIME_FIELD, DBColumn, DBDefinition
+from engine.storage_service.local_service import SQLLocalService
+
+TABLE_DEFINITION = DBDefinition(
+    columns=[
+        DBColumn(name=PROCESSED_DATETIME_FIELD, type="DATETIME", default="CURRENT_TIMESTAMP"),
+        DBColumn(name="chunk_id", type="VARCHAR", is_primary=True),
+        DBColumn(name="content", type="VARCHAR"),
+        DBColumn(name="last_edited_ts", type="VARCHAR"),
+    ]
+)
+
+
+def build_df(ids: np.ndarray, timestamp: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "chunk_id": [f"chunk_{i}" for i in ids],
+            "content": [f"content of the chunk {i}, edited {timestamp}" for i in ids],
+            "last_edited_ts": timestamp,
+        }
+    )
+
+
+def run(service: SQLLocalService, table_name: str, schema_name: Optional[str], native: bool, args) -> float:
+    if service.table_exists(table_name, schema_name):
+        service.drop_table(table_name, schema_name)
+    service.create_table(table_name, TABLE_DEFINITION, schema_name=schema_name)
+    service.insert_df_to_table(build_df(np.arange(args.rows), "2024-01-01"), table_name, schema_name=schema_name)
+
+    # The new data drops the first rows, edits some, keeps the others unchanged and adds new ones
+    changed, removed = int(args.rows * args.changed), int(args.rows * args.removed)
+    new_df = pd.concat(
+        [
+            build_df(np.arange(removed, removed + changed), "2025-01-01"),
+            build_df(np.arange(removed + changed, args.rows), "2024-01-01"),
+            build_df(np.arange(args.rows, args.rows + changed), "2025-01-01"),
+        ],
+        ignore_index=True,
+    )
+    update_table = service.update_table if native else DBService.update_table.__get__(service)
+    start = time.perf_counter()
+    update_table(
+        new_df,
+        table_name,
+        table_definition=TABLE_DEFINITION,
+        id_column_name="chunk_id",
+        schema_name=schema_name,
+        timestamp_column_name="last_edited_ts",
+        append_mode=False,
+    )
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DBService.update_table against the native upsert")
+    parser.add_argument("--db-url", default=None)
+    parser.add_argument("--schema", default=None)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--changed", type=float, default=0.1, help="Share of the rows edited, and of new rows")
+    parser.add_argument("--removed", type=float, default=0.05, help="Share of the rows removed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = SQLLocalService(engine_url=args.db_url or f"sqlite:///{Path(directory) / 'benchmark.db'}")
+        if args.schema:
+            service.create_schema(args.schema)
+        for native in [False, True]:
+            seconds = run(service, "benchmark_update_table", args.schema, native, args)
+            label = "INSERT ... ON CONFLICT" if native else "pandas merge"
+            print(f"{label}: {seconds:.1f}s for {args.rows} rows ({args.rows / seconds:.0f} rows/s)")
+        service.drop_table("benchmark_update_table", args.schema)
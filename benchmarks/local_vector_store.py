@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Benchmark the query latency of the embedded vector store on random vectors.
+Run with: python -m benchmarks.local_vector_store
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import QdrantCollectionSchema
+
+COLLECTION_NAME = "benchmark"
+SCHEMA = QdrantCollectionSchema(chunk_id_field="chunk_id", content_field="content", file_id_field="file_id")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the local vector store")
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        vector_store = LocalVectorStore(path=directory, default_schema=SCHEMA)
+        vector_store.create_collection(COLLECTION_NAME, vector_size=args.dimension)
+
+        start = time.perf_counter()
+        for offset in range(0, args.vectors, args.batch):
+            vectors = rng.standard_normal((min(args.batch, args.vectors - offset), args.dimension), dtype=np.float32)
+            points = [
+                {
+                    "id": str(offset + i),
+                    "payload": {"chunk_id": str(offset + i), "file_id": f"file_{(offset + i) % 100}"},
+                    "vector": vector.tolist(),
+                }
+                for i, vector in enumerate(vectors)
+            ]
+            vector_store.insert_points_in_collection(points, COLLECTION_NAME)
+        print(f"Inserted {args.vectors} vectors of dimension {args.dimension} in {time.perf_counter() - start:.1f} s")
+
+        queries = rng.standard_normal((args.queries, args.dimension), dtype=np.float32)
+        for label, filter in [
+            ("unfiltered", None),
+            ("filtered", {"must": [{"key": "file_id", "match": {"any": ["file_1", "file_2"]}}]}),
+        ]:
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                vector_store.search_vectors(query.tolist(), COLLECTION_NAME, filter=filter, limit=args.limit)
+                latencies.append(time.perf_counter() - start)
+            latencies_ms = np.array(latencies) * 1000
+            print(
+                f"Top-{args.limit} {label} search: p50 {np.percentile(latencies_ms, 50):.1f} ms, "
+                f"p95 {np.percentile(latencies_ms, 95):.1f} ms"
+            )
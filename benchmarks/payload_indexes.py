@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Compare the latency of filtered searches on collections with and without payload indexes on the filtered
+fields. The filters select a few files among many, as the Retriever does with folder or file filters.
+With --backend qdrant, needs QDRANT_CLUSTER_URL and QDRANT_API_KEY.
+Run with: python -m benchmarks.payload_indexes
+"""
+import argparse
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import QdrantCollectionSchema, QdrantService
+from settings import settings
+
+SCHEMA = QdrantCollectionSchema(
+    chunk_id_field="chunk_id",
+    content_field="content",
+    file_id_field="file_id",
+    metadata_fields_to_keep={"folder"},
+)
+
+
+def build_vector_store(backend: str, directory: str) -> QdrantService:
+    if backend == "local":
+        return LocalVectorStore(path=directory, default_schema=SCHEMA)
+    return QdrantService(
+        qdrant_api_key=settings.QDRANT_API_KEY,
+        qdrant_cluster_url=settings.QDRANT_CLUSTER_URL,
+        default_schema=SCHEMA,
+    )
+
+
+def fill_collection(
+    vector_store: QdrantService,
+    collection_name: str,
+    args: argparse.Namespace,
+    with_indexes: bool,
+) -> None:
+    if vector_store.collection_exists(collection_name):
+        vector_store.delete_collection(collection_name)
+    if not with_indexes:
+        # Skip the declaration of the payload indexes of the schema
+        vector_store.ensure_payload_indexes = lambda collection_name: []
+    vector_store.create_collection(collection_name, vector_size=args.dimension)
+
+    rng = np.random.default_rng(0)
+    for offset in range(0, args.vectors, args.batch):
+        vectors = rng.standard_normal((min(args.batch, args.vectors - offset), args.dimension), dtype=np.float32)
+        points = [
+            {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_DNS, str(offset + i))),
+                "payload": {
+                    "chunk_id": str(offset + i),
+                    "file_id": f"file_{(offset + i) % args.files}",
+                    "folder": f"folder_{(offset + i) % 20}",
+                },
+                "vector": vector.tolist(),
+            }
+            for i, vector in enumerate(vectors)
+        ]
+        vector_store.insert_points_in_collection(points, collection_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark filtered searches with and without payload indexes")
+    parser.add_argument("--backend", choices=["local", "qdrant"], default="local")
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--files", type=int, default=1_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    filters = {
+        "2 files": {"must": [{"key": "file_id", "match": {"any": ["file_1", "file_2"]}}]},
+        "1 folder, 1 file": {
+            "must": [
+                {"key": "folder", "match": {"any": ["folder_1"]}},
+                {"key": "file_id", "match": {"any": ["file_1", "file_21"]}},
+            ]
+        },
+    }
+    queries = np.random.default_rng(1).standard_normal((args.queries, args.dimension), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as directory:
+        for with_indexes in [False, True]:
+            vector_store = build_vector_store(args.backend, directory)
+            collection_name = f"benchmark_payload_indexes_{'with' if with_indexes else 'without'}"
+            fill_collection(vector_store, collection_name, args, with_indexes)
+            for label, filter in filters.items():
+                latencies = []
+                for query in queries:
+                    start = time.perf_counter()
+                    vector_store.search_vectors(query.tolist(), collection_name, filter=filter, limit=args.limit)
+                    latencies.append(time.perf_counter() - start)
+                latencies_ms = np.array(latencies) * 1000
+                print(
+                    f"{'With' if with_indexes else 'Without'} indexes, {label}: "
+                    f"p50 {np.percentile(latencies_ms, 50):.1f} ms, p95 {np.percentile(latencies_ms, 95):.1f} ms"
+                )
+            vector_store.delete_collection(collection_name)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Compare the recall and latency of Qdrant collections created with reduced embedding dimensions,
+int8 scalar quantization, on-disk vectors and HNSW options, against exact search on full-size vectors.
+Needs QDRANT_CLUSTER_URL and QDRANT_API_KEY. With --texts, the paragraphs of the given files are embedded
+with text-embedding-3-large (needs OPENAI_API_KEY); otherwise synthetic vectors are used, whose variance
+decreases along the dimensions like shortened text-embedding-3 embeddings.
+Run with: python -m benchmarks.qdrant_collection_options
+"""
+import argparse
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from engine.qdrant_service import QdrantCollectionSchema, QdrantService
+from settings import settings
+
+FULL_DIMENSIONS = 3072
+CONFIGURATIONS = {
+    "3072": {},
+    "3072-int8": {"quantization": "int8", "oversampling": 2.0},
+    "3072-int8-on-disk": {"quantization": "int8", "on_disk": True, "oversampling": 2.0},
+    "1024": {"embedding_dimensions": 1024},
+    "1024-int8": {"embedding_dimensions": 1024, "quantization": "int8", "oversampling": 2.0},
+    "1024-int8-no-oversampling": {"embedding_dimensions": 1024, "quantization": "int8"},
+    "256": {"embedding_dimensions": 256},
+    "256-m32": {"embedding_dimensions": 256, "hnsw_m": 32, "hnsw_ef_construct": 200},
+}
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def synthetic_vectors(number_of_vectors: int, number_of_queries: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    scales = 1 / np.sqrt(np.arange(1, FULL_DIMENSIONS + 1))
+    centers = rng.standard_normal((number_of_vectors // 20 + 1, FULL_DIMENSIONS)) * scales
+    vectors = centers[rng.integers(len(centers), size=number_of_vectors)]
+    vectors = vectors + 0.5 * rng.standard_normal(vectors.shape) * scales
+    queries = vectors[rng.integers(number_of_vectors, size=number_of_queries)]
+    queries = queries + 0.3 * rng.standard_normal(queries.shape) * scales
+    return normalize(vectors).astype(np.float32), normalize(queries).astype(np.float32)
+
+
+def embedded_vectors(paths: list[str], number_of_queries: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    from engine.llm_services.openai_llm_service import OpenAILLMService
+    from engine.trace.trace_manager import TraceManager
+
+    paragraphs = [
+        paragraph.strip()
+        for path in paths
+        for paragraph in Path(path).read_text().split("\n\n")
+        if len(paragraph.strip()) > 40
+    ]
+    llm_service = OpenAILLMService(trace_manager=TraceManager(project_name="benchmark"))
+    embeddings = [
+        data.embedding for i in range(0, len(paragraphs), 100) for data in llm_service.embed(paragraphs[i : i + 100])
+    ]
+    vectors = np.array(embeddings, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.integers(len(vectors), size=number_of_queries)]
+    return vectors, normalize(queries + 0.02 * rng.standard_normal(queries.shape)).astype(np.float32)
+
+
+def truncate(vectors: np.ndarray, dimensions: int) -> np.ndarray:
+    """Shorten embeddings the way the `dimensions` parameter of text-embedding-3 does: truncate and renormalize."""
+    return normalize(vectors[:, :dimensions])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Qdrant collection options")
+    parser.add_argument("--vectors", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--texts", nargs="*", help="Text files whose paragraphs are embedded with OpenAI")
+    parser.add_argument("--configurations", nargs="*", default=list(CONFIGURATIONS))
+    args = parser.parse_args()
+
+    if args.texts:
+        vectors, queries = embedded_vectors(args.texts, args.queries)
+    else:
+        vectors, queries = synthetic_vectors(args.vectors, args.queries)
+    ground_truth = np.argsort(-(queries @ vectors.T), axis=1)[:, : args.limit]
+    point_ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+
+    print(f"{'configuration':<24}{'recall@' + str(args.limit):>10}{'p50 ms':>10}{'p95 ms':>10}{'vector MB':>12}")
+    for name in args.configurations:
+        options = CONFIGURATIONS[name]
+        schema = QdrantCollectionSchema(
+            chunk_id_field="chunk_id", content_field="content", file_id_field="file_id", **options
+        )
+        qdrant_service = QdrantService(
+            qdrant_api_key=settings.QDRANT_API_KEY,
+            qdrant_cluster_url=settings.QDRANT_CLUSTER_URL,
+            default_schema=schema,
+        )
+        collection_name = f"benchmark_collection_options_{name}"
+        if qdrant_service.collection_exists(collection_name):
+            qdrant_service.delete_collection(collection_name)
+        qdrant_service.create_collection(collection_name)
+
+        dimensions = options.get("embedding_dimensions", FULL_DIMENSIONS)
+        stored_vectors = truncate(vectors, dimensions)
+        for i in range(0, len(stored_vectors), 500):
+            points = [
+                {"id": point_ids[j], "payload": {"position": j}, "vector": stored_vectors[j].tolist()}
+                for j in range(i, min(i + 500, len(stored_vectors)))
+            ]
+            qdrant_service.insert_points_in_collection(points, collection_name)
+
+        position_by_id = {point_id: position for position, point_id in enumerate(point_ids)}
+        hits, latencies = 0, []
+        for query, expected in zip(truncate(queries, dimensions), ground_truth):
+            start = time.perf_counter()
+            results = qdrant_service.search_vectors(query.tolist(), collection_name, limit=args.limit)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len({position_by_id[point_id] for point_id, _ in results} & set(expected))
+        recall = hits / (len(queries) * args.limit)
+        # Vectors held in RAM for searching: quantized ones when enabled, originals unless they are on disk
+        bytes_per_vector = dimensions if options.get("quantization") else 0
+        if not options.get("on_disk"):
+            bytes_per_vector += 4 * dimensions
+        print(
+            f"{name:<24}{recall:>10.3f}{np.percentile(latencies, 50):>10.1f}{np.percentile(latencies, 95):>10.1f}"
+            f"{bytes_per_vector * len(vectors) / 1e6:>12.1f}"
+        )
+        qdrant_service.delete_collection(collection_name)
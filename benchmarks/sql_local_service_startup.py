@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Measure the construction time of SQLLocalService, and of its first queries, on a SQLite database with
+many tables, as the shared ingestion database has tables for every organization. The reflection of the
+whole database, which the service used to do at startup, is timed for comparison.
+Run with: python -m benchmarks.sql_local_service_startup
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import sqlalchemy
+
+from engine.storage_service.local_service import SQLLocalService
+
+
+def create_tables(path: Path, tables: int) -> None:
+    with sqlite3.connect(path) as connection:
+        for i in range(tables):
+            connection.execute(
+                f"CREATE TABLE table_{i} (chunk_id VARCHAR PRIMARY KEY, content VARCHAR, last_edited_ts VARCHAR)"
+            )
+        connection.execute("INSERT INTO table_0 VALUES ('1', 'content', '2024-01-01')")
+
+
+def time_ms(function, repeat: int) -> np.ndarray:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return np.array(durations) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the construction of SQLLocalService")
+    parser.add_argument("--tables", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "tables.db"
+        create_tables(path, args.tables)
+        engine_url = f"sqlite:///{path}"
+
+        def reflect_database():
+            sqlalchemy.MetaData().reflect(bind=sqlalchemy.create_engine(engine_url))
+
+        def construct_and_query():
+            service = SQLLocalService(engine_url=engine_url)
+            service.get_table_df("table_0")
+
+        for label, function, repeat in [
+            ("Reflection of the whole database", reflect_database, min(args.repeat, 3)),
+            ("SQLLocalService() + get_table_df", construct_and_query, args.repeat),
+            ("SQLLocalService()", lambda: SQLLocalService(engine_url=engine_url), args.repeat),
+        ]:
+            durations = time_ms(function, repeat)
+            print(f"{label}, {args.tables} tables: p50 {np.median(durations):.1f} ms, max {durations.max():.1f} ms")
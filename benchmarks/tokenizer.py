@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Benchmark token counting through the shared tokenizer against on-demand tiktoken encoders.
+Run with: python -m benchmarks.tokenizer
+"""
+import argparse
+import random
+import string
+import time
+
+import tiktoken
+
+from engine.llm_services.tokenizer import Tokenizer, get_tokenizer
+
+
+def build_texts(number_of_texts: int, words_per_text: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(words_per_text))
+        for _ in range(number_of_texts)
+    ]
+
+
+def time_it(label: str, func) -> None:
+    start = time.perf_counter()
+    func()
+    print(f"{label:<45} {time.perf_counter() - start:8.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark token counting")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=300)
+    args = parser.parse_args()
+
+    texts = build_texts(args.texts, args.words)
+    tokenizer = get_tokenizer(args.model)
+    tokenizer.count("warm up")
+
+    time_it(
+        "encoding_for_model + encode per text",
+        lambda: [len(tiktoken.encoding_for_model(args.model).encode(text)) for text in texts],
+    )
+    time_it("shared tokenizer, count per text (cold)", lambda: [tokenizer.count(text) for text in texts])
+    time_it("shared tokenizer, count per text (warm)", lambda: [tokenizer.count(text) for text in texts])
+    # Fresh cache so that count_many has to encode every text
+    batch_tokenizer = Tokenizer(encoding=tokenizer.encoding)
+    time_it("shared tokenizer, count_many (cold)", lambda: batch_tokenizer.count_many(texts))
+    time_it("shared tokenizer, count_many (warm)", lambda: batch_tokenizer.count_many(texts))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Benchmark fuzzy vocabulary matching on synthetic vocabularies.
+Run with: python -m benchmarks.vocabulary_search
+"""
+import argparse
+import random
+import string
+import time
+
+from engine.agent.agent import TermDefinition
+from engine.agent.rag.vocabulary_index import VocabularyIndex
+
+QUERIES = [
+    "What is the maintenance procedure for the hydraulic pump?",
+    "Explain the meaning of the term voltage regulator in our catalog",
+    "Which documents mention the supplier agreement?",
+]
+
+
+def build_vocabulary(size: int, seed: int = 0) -> dict[str, TermDefinition]:
+    rng = random.Random(seed)
+    vocabulary = {}
+    while len(vocabulary) < size:
+        term = " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(rng.randint(1, 3))
+        )
+        vocabulary[term] = TermDefinition(term=term, definition=f"definition of {term}")
+    for term in ["hydraulic pump", "voltage regulator", "supplier agreement"]:
+        vocabulary[term] = TermDefinition(term=term, definition=f"definition of {term}")
+    return vocabulary
+
+
+def run_benchmark(size: int, repeat: int, use_trigram_prefilter: bool) -> None:
+    vocabulary = build_vocabulary(size)
+    start = time.perf_counter()
+    index = VocabularyIndex(vocabulary, use_trigram_prefilter=use_trigram_prefilter)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            index.search(query.lower(), limit=10, score_cutoff=90)
+    query_time = (time.perf_counter() - start) / (repeat * len(QUERIES))
+    print(
+        f"terms={size:>9,} prefilter={str(use_trigram_prefilter):<5} "
+        f"build={build_time:8.2f}s query={query_time * 1000:9.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark VocabularyIndex fuzzy matching")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for vocabulary_size in args.sizes:
+        for prefilter in (False, True):
+            run_benchmark(vocabulary_size, args.repeat, prefilter)
@@ -1,9 +1,9 @@
 import logging
 from functools import partial
 
-import tiktoken
 from llama_index.core.node_parser import SentenceSplitter
 
+from engine.llm_services.tokenizer import get_tokenizer
 from data_ingestion.markdown.markdown_parser import (
     MarkdownLevel,
     MarkdownNode,
@@ -69,16 +69,16 @@ class TreeChunker:
     def __init__(self, model_name: str = "gpt-4o-mini", chunk_size: int = 2048, chunk_overlap: int = 0):
         self._chunk_size = chunk_size
         self._chunk_overlap = chunk_overlap
-        self._encoding = tiktoken.encoding_for_model(model_name)
+        self._tokenizer = get_tokenizer(model_name)
 
     def _count_tokens(self, text: str) -> int:
-        return len(self._encoding.encode(text))
+        return self._tokenizer.count(text)
 
     def _split_text(self, chunk: TreeChunk) -> list[TreeChunk]:
         splitter = SentenceSplitter(
             chunk_size=self._chunk_size,
             chunk_overlap=self._chunk_overlap,
-            tokenizer=partial(self._encoding.encode, allowed_special="all"),
+            tokenizer=partial(self._tokenizer.encoding.encode, allowed_special="all"),
         )
         split_texts = splitter.split_text(chunk.content)
         split_chunks = [
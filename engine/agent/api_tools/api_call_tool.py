@@ -2,7 +2,7 @@ import logging
 import json
 from typing import Optional, Dict, Any
 
-import requests
+import httpx
 from openinference.semconv.trace import OpenInferenceSpanKindValues
 
 from engine.agent.agent import (
@@ -11,10 +11,13 @@ from engine.agent.agent import (
     AgentPayload,
     ToolDescription,
 )
+from engine.agent.api_tools.http_client import send_request
 from engine.trace.trace_manager import TraceManager
 
 LOGGER = logging.getLogger(__name__)
 
+CACHEABLE_METHODS = ["GET"]
+
 API_CALL_TOOL_DESCRIPTION = ToolDescription(
     name="api_call",
     description="A generic API tool that can make HTTP requests to any API endpoint.",
@@ -45,6 +48,7 @@ class APICallTool(Agent):
         timeout: int = 30,
         fixed_parameters: Optional[Dict[str, Any]] = None,
         tool_description: ToolDescription = API_CALL_TOOL_DESCRIPTION,
+        cache_ttl: Optional[int] = None,
     ) -> None:
         super().__init__(
             trace_manager=trace_manager,
@@ -57,8 +61,10 @@ class APICallTool(Agent):
         self.headers = headers or {}
         self.timeout = timeout
         self.fixed_parameters = fixed_parameters or {}
+        # Responses are only cached for idempotent methods
+        self.cache_ttl = cache_ttl if self.method in CACHEABLE_METHODS else None
 
-    def make_api_call(self, **kwargs) -> Dict[str, Any]:
+    async def make_api_call(self, **kwargs) -> Dict[str, Any]:
         """Make an HTTP request to the configured API endpoint."""
 
         # Prepare headers
@@ -70,6 +76,7 @@ class APICallTool(Agent):
             "method": self.method,
             "headers": request_headers,
             "timeout": self.timeout,
+            "cache_ttl": self.cache_ttl,
         }
 
         # Combine fixed parameters with dynamic parameters
@@ -84,7 +91,7 @@ class APICallTool(Agent):
             request_kwargs["json"] = all_parameters
 
         try:
-            response = requests.request(**request_kwargs)
+            response = await send_request(**request_kwargs)
             response.raise_for_status()
 
             # Try to parse JSON response, fall back to text
@@ -100,10 +107,10 @@ class APICallTool(Agent):
                 "success": True,
             }
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             LOGGER.error(f"API request failed: {str(e)}")
             return {
-                "status_code": getattr(e.response, "status_code", None) if hasattr(e, "response") else None,
+                "status_code": e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None,
                 "error": str(e),
                 "success": False,
             }
@@ -115,7 +122,7 @@ class APICallTool(Agent):
     ) -> AgentPayload:
 
         # Make the API call
-        api_response = self.make_api_call(**kwargs)
+        api_response = await self.make_api_call(**kwargs)
 
         # Format the API response as a readable message
         if api_response.get("success", False):
@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Optional
+
+import httpx
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HTTP_TIMEOUT_SECONDS = 30
+HTTP_CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+# httpx.AsyncClient connections are bound to the event loop that opened them, so one client is kept per loop.
+# In the backend there is a single loop, hence a single pool shared by every tool of the process.
+_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_HTTP_CLIENTS_LOCK = threading.Lock()
+
+_RESPONSE_CACHE: dict[tuple, tuple[float, Any]] = {}
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled HTTP client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _HTTP_CLIENTS_LOCK:
+        client = _HTTP_CLIENTS.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=HTTP_CLIENT_LIMITS,
+                timeout=DEFAULT_HTTP_TIMEOUT_SECONDS,
+                follow_redirects=True,
+            )
+            _HTTP_CLIENTS[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the pooled HTTP client of the running event loop, e.g. on application shutdown."""
+    loop = asyncio.get_running_loop()
+    with _HTTP_CLIENTS_LOCK:
+        client = _HTTP_CLIENTS.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def _hash_json(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def make_cache_key(
+    method: str,
+    url: str,
+    params: Optional[dict] = None,
+    json_body: Optional[Any] = None,
+    headers: Optional[dict] = None,
+) -> tuple:
+    # Headers are part of the key so that responses fetched with one set of credentials are never
+    # served to a caller using other credentials.
+    return (method.upper(), url, _hash_json(params), _hash_json(json_body), _hash_json(headers))
+
+
+def get_cached_response(cache_key: tuple) -> Optional[Any]:
+    with _RESPONSE_CACHE_LOCK:
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is None:
+            return None
+        expires_at, value = cached
+        if time.monotonic() >= expires_at:
+            del _RESPONSE_CACHE[cache_key]
+            return None
+        return value
+
+
+def cache_response(cache_key: tuple, value: Any, ttl: float) -> None:
+    with _RESPONSE_CACHE_LOCK:
+        if len(_RESPONSE_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            for key in [key for key, (expires_at, _) in _RESPONSE_CACHE.items() if expires_at <= now]:
+                del _RESPONSE_CACHE[key]
+            if len(_RESPONSE_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+                # Evict the entry expiring first
+                del _RESPONSE_CACHE[min(_RESPONSE_CACHE, key=lambda key: _RESPONSE_CACHE[key][0])]
+        _RESPONSE_CACHE[cache_key] = (time.monotonic() + ttl, value)
+
+
+def invalidate_response_cache() -> None:
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE.clear()
+
+
+async def send_request(
+    method: str,
+    url: str,
+    headers: Optional[dict[str, str]] = None,
+    params: Optional[dict[str, Any]] = None,
+    json: Optional[Any] = None,
+    timeout: float = DEFAULT_HTTP_TIMEOUT_SECONDS,
+    cache_ttl: Optional[float] = None,
+) -> httpx.Response:
+    """
+    Send a request through the pooled client of the running event loop.
+    When `cache_ttl` is set, successful responses are cached for that many seconds, keyed by method, URL,
+    params, body and headers. Only set it for idempotent calls (GET requests, searches).
+    """
+    cache_key = None
+    if cache_ttl:
+        cache_key = make_cache_key(method, url, params=params, json_body=json, headers=headers)
+        cached_response = get_cached_response(cache_key)
+        if cached_response is not None:
+            LOGGER.debug(f"Serving cached response for {method} {url}")
+            return cached_response
+
+    response = await get_http_client().request(
+        method,
+        url,
+        headers=headers,
+        params=params,
+        json=json,
+        timeout=timeout,
+    )
+    if cache_key is not None and response.is_success:
+        cache_response(cache_key, response, ttl=cache_ttl)
+    return response
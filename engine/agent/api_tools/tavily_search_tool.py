@@ -13,6 +13,7 @@ from engine.agent.agent import (
     SourceChunk,
     SourcedResponse,
 )
+from engine.agent.api_tools.http_client import send_request
 from engine.agent.synthesizer import Synthesizer
 from engine.trace.trace_manager import TraceManager
 from engine.llm_services.llm_service import LLMService
@@ -21,6 +22,8 @@ from settings import settings
 
 LOGGER = logging.getLogger(__name__)
 
+TAVILY_SEARCH_TIMEOUT_SECONDS = 60
+
 TAVILY_TOOL_DESCRIPTION = ToolDescription(
     name="tavily_api",
     description="Tavily is a search API that provides sources for the input query.",
@@ -66,6 +69,8 @@ class TavilyApiTool(Agent):
         tool_description: ToolDescription = TAVILY_TOOL_DESCRIPTION,
         tavily_api_key: str = settings.TAVILY_API_KEY,
         synthesizer: Optional[Synthesizer] = None,
+        timeout: int = TAVILY_SEARCH_TIMEOUT_SECONDS,
+        cache_ttl: Optional[int] = None,
     ) -> None:
         super().__init__(
             trace_manager=trace_manager,
@@ -73,20 +78,32 @@ class TavilyApiTool(Agent):
             component_instance_name=component_instance_name,
         )
         self.trace_manager = trace_manager
+        # The client is only used for its configuration, requests go through the shared connection pool
         self.tavily_client = TavilyClient(api_key=tavily_api_key)
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
         if synthesizer is None:
             synthesizer = Synthesizer(llm_service=llm_service, trace_manager=trace_manager)
         self._synthesizer = synthesizer
 
-    def search_results(
+    async def search_results(
         self, query: str, topic: str, days: int = 3, include_domains: Optional[list[str]] = None
     ) -> list[SourceChunk]:
-        results = self.tavily_client.search(
-            query,
-            topic=topic,
-            days=days,
-            include_domains=include_domains,
-        )["results"]
+        response = await send_request(
+            "POST",
+            f"{self.tavily_client.base_url}/search",
+            headers=self.tavily_client.headers,
+            json={
+                "query": query,
+                "topic": topic,
+                "days": days,
+                "include_domains": include_domains,
+            },
+            timeout=self.timeout,
+            cache_ttl=self.cache_ttl,
+        )
+        response.raise_for_status()
+        results = response.json()["results"]
         return [
             SourceChunk(
                 name=result["title"],
@@ -116,7 +133,7 @@ class TavilyApiTool(Agent):
         if content is None:
             raise ValueError("No content provided for the Tavily API tool.")
 
-        sources = self.search_results(query=content, topic=topic, days=days, include_domains=include_domains)
+        sources = await self.search_results(query=content, topic=topic, days=days, include_domains=include_domains)
 
         with self.trace_manager.start_span("TavilyApiSearchResults") as span:
             for i, source in enumerate(sources):
@@ -1,6 +1,4 @@
 from typing import Optional
-from pathlib import Path
-from collections import defaultdict
 
 from openinference.semconv.trace import OpenInferenceSpanKindValues, SpanAttributes
 
@@ -48,48 +46,6 @@ def build_context_from_documents_content(documents_content: list[DocumentContent
     return "\n".join([f"# Document {doc.document_name}: {doc.content_document}" for doc in documents_content])
 
 
-def nested_tree():
-    """Python function to create a nested dictionary structure.
-    When trying to call for instance tree['foo']['bar'], it will create the 'foo' and 'bar' keys
-    automatically
-    """
-    return defaultdict(nested_tree)
-
-
-def format_tree(node, prefix=""):
-    lines = []
-    entries = sorted(node.keys())
-    for i, entry in enumerate(entries):
-        is_last = i == len(entries) - 1
-        connector = "└── " if is_last else "├── "
-        lines.append(f"{prefix}{connector}{entry}")
-        extension = "    " if is_last else "│   "
-        lines.extend(format_tree(node[entry], prefix + extension))
-    return lines
-
-
-def build_ascii_tree(paths: list[str]) -> str:
-    """
-    Takes a list of file paths and builds an ASCII tree of folders and file names.
-
-    Args:
-        paths (list[str]): List of file paths (can be absolute or relative).
-
-    Returns:
-        str: ASCII tree representation of the folder structure.
-    """
-    root = nested_tree()
-
-    # Build nested dictionary
-    for path_str in paths:
-        parts = Path(path_str).parts
-        node = root
-        for part in parts:
-            node = node[part]
-
-    return "\n".join(format_tree(root))
-
-
 class DocumentEnhancedLLMCallAgent(Agent):
     TRACE_SPAN_KIND = OpenInferenceSpanKindValues.CHAIN.value
     """
@@ -113,13 +69,12 @@ class DocumentEnhancedLLMCallAgent(Agent):
         )
         self._synthesizer = synthesizer
         self._document_search = document_search
-        self.tree_of_documents = build_ascii_tree(self._document_search.get_documents_names())
-        self._update_description_tool(self._document_search)
+        documents_catalog = self._document_search.get_documents_catalog()
+        self.tree_of_documents = documents_catalog.tree_of_documents
+        self._update_description_tool(documents_catalog.document_names)
 
-    def _update_description_tool(self, document_search: DocumentSearch) -> ToolDescription:
-        self.tool_description.tool_properties["document_names"]["items"][
-            "enum"
-        ] = document_search.get_documents_names()
+    def _update_description_tool(self, document_names: list[str]) -> ToolDescription:
+        self.tool_description.tool_properties["document_names"]["items"]["enum"] = document_names
         self.tool_description.description = (
             self.tool_description.description
             + "\n\n Here is the list of documents available: \n\n"
@@ -1,19 +1,55 @@
+import logging
+from typing import Optional
+
 from engine.agent.agent import ChatMessage
+from engine.llm_services.tokenizer import Tokenizer, get_tokenizer
+
+LOGGER = logging.getLogger(__name__)
 
 MINIMAL_FIRST_MESSAGE_RETAINED = 1  # To retain the prompt system message
 MINIMAL_LAST_MESSAGE_RETAINED = 50
+# Approximate overhead of the chat format around each message (role, separators)
+TOKENS_PER_MESSAGE = 4
+TRUNCATED_CONTENT_SUFFIX = "\n[... content truncated ...]"
 
 
 class HistoryMessageHandler:
+    """
+    Trims a conversation history before it is sent to the LLM.
+
+    Messages are first trimmed by count (first and last messages kept). When a token budget is set,
+    the oldest turns between the system messages and the latest user turn are then dropped until
+    the history fits, and tool outputs longer than `max_tokens_per_tool_message` are cut.
+    """
+
     def __init__(
         self,
         number_first_messages: int = MINIMAL_FIRST_MESSAGE_RETAINED,
         number_last_messages: int = MINIMAL_LAST_MESSAGE_RETAINED,
+        max_history_tokens: Optional[int] = None,
+        max_tokens_per_tool_message: Optional[int] = None,
+        model_name: Optional[str] = None,
+        tokenizer: Optional[Tokenizer] = None,
     ):
         self.number_first_messages = number_first_messages
         self.number_last_messages = number_last_messages
+        self.max_history_tokens = max_history_tokens
+        self.max_tokens_per_tool_message = max_tokens_per_tool_message
+        if tokenizer is None and model_name is not None:
+            tokenizer = get_tokenizer(model_name)
+        if tokenizer is None and (max_history_tokens is not None or max_tokens_per_tool_message is not None):
+            raise ValueError("A model name or a tokenizer is required to truncate the history by tokens.")
+        self._tokenizer = tokenizer
 
     def get_truncated_messages_history(self, messages: list[ChatMessage]) -> list[ChatMessage]:
+        messages = self._truncate_by_count(messages)
+        if self.max_tokens_per_tool_message is not None:
+            messages = [self._cap_tool_message(message) for message in messages]
+        if self.max_history_tokens is not None:
+            messages = self._truncate_by_tokens(messages)
+        return messages
+
+    def _truncate_by_count(self, messages: list[ChatMessage]) -> list[ChatMessage]:
         if self.number_first_messages is None or self.number_last_messages is None:
             raise ValueError("No numbers of messages to find initial context and end of history were provided.")
 
@@ -31,3 +67,71 @@ class HistoryMessageHandler:
             # We still assume there is an alternating pattern of role and that last messages
             # have more than one message
             return first_part + last_part[1:]
+
+    def _cap_tool_message(self, message: ChatMessage) -> ChatMessage:
+        if message.role != "tool" or not isinstance(message.content, str):
+            return message
+        if self._tokenizer.count(message.content) <= self.max_tokens_per_tool_message:
+            return message
+        truncated_content = self._tokenizer.truncate(message.content, self.max_tokens_per_tool_message)
+        return message.model_copy(update={"content": truncated_content + TRUNCATED_CONTENT_SUFFIX})
+
+    def count_messages_tokens(self, messages: list[ChatMessage]) -> list[int]:
+        texts = [_get_message_text(message) for message in messages]
+        return [count + TOKENS_PER_MESSAGE for count in self._tokenizer.count_many(texts)]
+
+    def _truncate_by_tokens(self, messages: list[ChatMessage]) -> list[ChatMessage]:
+        message_tokens = self.count_messages_tokens(messages)
+        if sum(message_tokens) <= self.max_history_tokens:
+            return messages
+
+        # The leading system messages and the latest user turn (with the tool calls answering it) are always kept
+        head_end = 0
+        while head_end < len(messages) and messages[head_end].role == "system":
+            head_end += 1
+        tail_start = next(
+            (i for i in range(len(messages) - 1, head_end - 1, -1) if messages[i].role == "user"),
+            len(messages),
+        )
+        tail_start = max(tail_start, head_end)
+
+        middle_turns = _split_in_turns(list(range(head_end, tail_start)), messages)
+        total_tokens = sum(message_tokens)
+        while middle_turns and total_tokens > self.max_history_tokens:
+            dropped_turn = middle_turns.pop(0)
+            total_tokens -= sum(message_tokens[i] for i in dropped_turn)
+
+        if total_tokens > self.max_history_tokens:
+            LOGGER.warning(
+                f"History still uses {total_tokens} tokens after dropping older turns, "
+                f"above the budget of {self.max_history_tokens} tokens."
+            )
+        kept_indexes = list(range(head_end)) + [i for turn in middle_turns for i in turn]
+        kept_indexes += list(range(tail_start, len(messages)))
+        LOGGER.debug(f"Dropped {len(messages) - len(kept_indexes)} messages to fit the history token budget")
+        return [messages[i] for i in kept_indexes]
+
+
+def _get_message_text(message: ChatMessage) -> str:
+    if isinstance(message.content, str):
+        text = message.content
+    elif isinstance(message.content, list):
+        text = "\n".join(
+            part.get("text", "") for part in message.content if isinstance(part, dict) and part.get("type") == "text"
+        )
+    else:
+        text = ""
+    for tool_call in message.tool_calls or []:
+        text += f"\n{tool_call.function.name}({tool_call.function.arguments})"
+    return text
+
+
+def _split_in_turns(indexes: list[int], messages: list[ChatMessage]) -> list[list[int]]:
+    """Group messages in turns starting at each user message, so that tool calls are never split
+    from their tool outputs."""
+    turns: list[list[int]] = []
+    for i in indexes:
+        if not turns or messages[i].role == "user":
+            turns.append([])
+        turns[-1].append(i)
+    return turns
@@ -1,3 +1,7 @@
+import os
+import threading
+from collections import OrderedDict
+
 from pydantic import BaseModel
 
 from engine.agent.synthesizer_prompts import get_hybrid_synthetizer_prompt_template
@@ -7,6 +11,8 @@ from engine.trace.trace_manager import TraceManager
 from engine.agent.build_context import build_context_from_source_chunks
 from engine.agent.agent import SourceChunk, SourcedResponse
 
+DEFAULT_IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 
 class ResponseLLM(BaseModel):
     response: str
@@ -31,10 +37,37 @@ class HybridSynthesizer(Synthesizer):
         trace_manager: TraceManager,
         prompt_template: str = get_hybrid_synthetizer_prompt_template(),
         response_format: BaseModel = ResponseLLM,
+        image_cache_max_bytes: int = DEFAULT_IMAGE_CACHE_MAX_BYTES,
     ):
         super().__init__(llm_service, trace_manager)
         self._prompt_template = prompt_template
         self.response_format = response_format
+        # LRU of image bytes keyed by path, invalidated when the file's mtime changes
+        self._image_cache: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._image_cache_bytes = 0
+        self._image_cache_max_bytes = image_cache_max_bytes
+        self._image_cache_lock = threading.Lock()
+
+    def _load_image(self, image_id: str) -> bytes:
+        mtime = os.path.getmtime(image_id)
+        with self._image_cache_lock:
+            cached = self._image_cache.get(image_id)
+            if cached is not None and cached[0] == mtime:
+                self._image_cache.move_to_end(image_id)
+                return cached[1]
+        with open(image_id, "rb") as image_file:
+            encoded_image = image_file.read()
+        if len(encoded_image) <= self._image_cache_max_bytes:
+            with self._image_cache_lock:
+                previous = self._image_cache.pop(image_id, None)
+                if previous is not None:
+                    self._image_cache_bytes -= len(previous[1])
+                self._image_cache[image_id] = (mtime, encoded_image)
+                self._image_cache_bytes += len(encoded_image)
+                while self._image_cache_bytes > self._image_cache_max_bytes:
+                    _, (_, evicted_image) = self._image_cache.popitem(last=False)
+                    self._image_cache_bytes -= len(evicted_image)
+        return encoded_image
 
     def get_response(
         self,
@@ -46,8 +79,7 @@ class HybridSynthesizer(Synthesizer):
             sources=chunks,
             llm_metadata_keys=chunks[0].metadata.keys() if chunks else [],
         )
-        with open(image_id, "rb") as image_file:
-            encoded_image = image_file.read()
+        encoded_image = self._load_image(image_id)
 
         response_using_image = self._llm_service.get_image_description(
             image_content_list=[encoded_image],
@@ -0,0 +1,85 @@
+import logging
+import math
+from collections import Counter
+from typing import Optional
+
+from engine.agent.agent import SourceChunk
+from engine.lexical import tokenize
+from engine.agent.rag.reranker import Reranker
+from engine.trace.trace_manager import TraceManager
+
+LOGGER = logging.getLogger(__name__)
+
+BM25_MODEL_NAME = "bm25"
+
+
+def bm25_scores(
+    query_terms: list[str],
+    documents_terms: list[list[str]],
+    k1: float = 1.5,
+    b: float = 0.75,
+) -> list[float]:
+    """Okapi BM25 scores of documents for a query, with idf computed over the given documents."""
+    number_documents = len(documents_terms)
+    if number_documents == 0:
+        return []
+    documents_counters = [Counter(terms) for terms in documents_terms]
+    documents_lengths = [len(terms) for terms in documents_terms]
+    average_length = sum(documents_lengths) / number_documents or 1.0
+
+    scores = [0.0] * number_documents
+    for term in set(query_terms):
+        document_frequency = sum(1 for counter in documents_counters if term in counter)
+        if document_frequency == 0:
+            continue
+        idf = math.log((number_documents - document_frequency + 0.5) / (document_frequency + 0.5) + 1)
+        for i, counter in enumerate(documents_counters):
+            term_frequency = counter.get(term, 0)
+            if term_frequency == 0:
+                continue
+            length_norm = k1 * (1 - b + b * documents_lengths[i] / average_length)
+            scores[i] += idf * term_frequency * (k1 + 1) / (term_frequency + length_norm)
+    return scores
+
+
+class BM25Reranker(Reranker):
+    """
+    Local lexical reranker. It needs no API call, so it can replace an API reranker for short questions
+    or trim the candidates sent to one (see CohereReranker's first_pass_reranker).
+    """
+
+    def __init__(
+        self,
+        trace_manager: TraceManager,
+        num_doc_reranked: int = 5,
+        score_threshold: float = 0.0,
+        language: Optional[str] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        super().__init__(trace_manager, model=BM25_MODEL_NAME)
+        self._num_doc_reranked = num_doc_reranked
+        self._score_threshold = score_threshold
+        self._language = language
+        self._k1 = k1
+        self._b = b
+
+    def _rerank_without_trace(self, query, chunks: list[SourceChunk]) -> list[SourceChunk]:
+        if not chunks:
+            LOGGER.warning("No documents to rerank. The chunks list is empty.")
+            return []
+        scores = bm25_scores(
+            tokenize(query, language=self._language),
+            [tokenize(chunk.content, language=self._language) for chunk in chunks],
+            k1=self._k1,
+            b=self._b,
+        )
+        # sorted is stable: chunks with equal scores keep their retrieval order
+        ranking = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)[: self._num_doc_reranked]
+        reranked_chunks = []
+        for i in ranking:
+            if scores[i] >= self._score_threshold:
+                chunks[i].metadata["reranked_score"] = scores[i]
+                reranked_chunks.append(chunks[i])
+        LOGGER.info(f"Reranked {len(reranked_chunks)} chunks")
+        return reranked_chunks
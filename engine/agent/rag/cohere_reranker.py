@@ -19,6 +19,7 @@ class CohereReranker(Reranker):
         cohere_model: str = "rerank-multilingual-v3.0",
         num_doc_reranked: int = 5,
         score_threshold: float = 0.0,
+        first_pass_reranker: Optional[Reranker] = None,
     ):
         super().__init__(trace_manager, model=cohere_model)
         if cohere_api_key is None:
@@ -26,11 +27,17 @@ class CohereReranker(Reranker):
         self._cohere_client = cohere.ClientV2(cohere_api_key)
         self._num_doc_reranked = num_doc_reranked
         self._score_threshold = score_threshold
+        # A cheap local reranker (e.g. BM25Reranker) can trim the candidates before the API call
+        self._first_pass_reranker = first_pass_reranker
 
     def _rerank_without_trace(self, query, chunks: list[SourceChunk]) -> list[SourceChunk]:
         if not chunks:
             LOGGER.warning("No documents to rerank. The chunks list is empty.")
             return []
+        if self._first_pass_reranker is not None:
+            chunks = self._first_pass_reranker.rerank(query, chunks)
+            if not chunks:
+                return []
         response = self._cohere_client.rerank(
             model=self._model,
             query=query,
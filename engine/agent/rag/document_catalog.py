@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from engine.storage_service.db_service import DBService
+from engine.storage_service.db_utils import get_db_service_cache_key
+
+LOGGER = logging.getLogger(__name__)
+
+DOCUMENT_CATALOG_TTL_SECONDS = 300
+
+
+def nested_tree():
+    """Python function to create a nested dictionary structure.
+    When trying to call for instance tree['foo']['bar'], it will create the 'foo' and 'bar' keys
+    automatically
+    """
+    return defaultdict(nested_tree)
+
+
+def format_tree(node, prefix=""):
+    lines = []
+    entries = sorted(node.keys())
+    for i, entry in enumerate(entries):
+        is_last = i == len(entries) - 1
+        connector = "└── " if is_last else "├── "
+        lines.append(f"{prefix}{connector}{entry}")
+        extension = "    " if is_last else "│   "
+        lines.extend(format_tree(node[entry], prefix + extension))
+    return lines
+
+
+def build_folder_tree(paths: list[str]) -> defaultdict:
+    root = nested_tree()
+    for path_str in paths:
+        node = root
+        for part in Path(path_str).parts:
+            node = node[part]
+    return root
+
+
+def build_ascii_tree(paths: list[str]) -> str:
+    """
+    Takes a list of file paths and builds an ASCII tree of folders and file names.
+
+    Args:
+        paths (list[str]): List of file paths (can be absolute or relative).
+
+    Returns:
+        str: ASCII tree representation of the folder structure.
+    """
+    return "\n".join(format_tree(build_folder_tree(paths)))
+
+
+@dataclass
+class DocumentCatalog:
+    document_names: list[str]
+    folder_tree: defaultdict
+    tree_of_documents: str
+    loaded_at: float = field(default_factory=time.monotonic)
+    _document_names_set: frozenset[str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._document_names_set = frozenset(self.document_names)
+
+    @classmethod
+    def from_document_names(cls, document_names: list[str]) -> "DocumentCatalog":
+        folder_tree = build_folder_tree(document_names)
+        return cls(
+            document_names=document_names,
+            folder_tree=folder_tree,
+            tree_of_documents="\n".join(format_tree(folder_tree)),
+        )
+
+    def __contains__(self, document_name: str) -> bool:
+        return document_name in self._document_names_set
+
+
+_DOCUMENT_CATALOG_CACHE: dict[tuple, DocumentCatalog] = {}
+_DOCUMENT_CATALOG_CACHE_LOCK = threading.Lock()
+
+
+def get_document_catalog(
+    db_service: DBService,
+    schema_name: str,
+    table_name: str,
+    document_name_column: str,
+) -> DocumentCatalog:
+    """
+    Return the catalog of documents stored in a table, cached per source for DOCUMENT_CATALOG_TTL_SECONDS.
+    The cache is dropped explicitly by `invalidate_document_catalog` when an ingestion of the source finishes.
+    """
+    cache_key = (get_db_service_cache_key(db_service), schema_name, table_name, document_name_column)
+    with _DOCUMENT_CATALOG_CACHE_LOCK:
+        catalog = _DOCUMENT_CATALOG_CACHE.get(cache_key)
+    if catalog is not None and time.monotonic() - catalog.loaded_at < DOCUMENT_CATALOG_TTL_SECONDS:
+        return catalog
+
+    query = f"SELECT DISTINCT {document_name_column} FROM {schema_name}.{table_name}"
+    df_document = db_service._fetch_sql_query_as_dataframe(query)
+    catalog = DocumentCatalog.from_document_names(df_document[document_name_column].tolist())
+    with _DOCUMENT_CATALOG_CACHE_LOCK:
+        _DOCUMENT_CATALOG_CACHE[cache_key] = catalog
+    return catalog
+
+
+def invalidate_document_catalog(schema_name: Optional[str] = None, table_name: Optional[str] = None) -> None:
+    """Drop the cached catalogs of a source, or every cached catalog when no source is given."""
+    with _DOCUMENT_CATALOG_CACHE_LOCK:
+        for cache_key in list(_DOCUMENT_CATALOG_CACHE):
+            _, cached_schema_name, cached_table_name, _ = cache_key
+            if schema_name is not None and cached_schema_name != schema_name:
+                continue
+            if table_name is not None and cached_table_name != table_name:
+                continue
+            LOGGER.info(f"Invalidating document catalog of {cached_schema_name}.{cached_table_name}")
+            del _DOCUMENT_CATALOG_CACHE[cache_key]
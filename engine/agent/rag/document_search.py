@@ -7,6 +7,7 @@ from engine.agent.agent import SourceChunk
 from engine.trace.trace_manager import TraceManager
 from engine.storage_service.db_service import DBService
 from engine.agent.utils import fuzzy_matching
+from engine.agent.rag.document_catalog import DocumentCatalog, get_document_catalog
 
 NUMBER_DOCS_TO_DISPLAY_TRACE = 30
 
@@ -34,16 +35,23 @@ class DocumentSearch:
         self.content_document_column = content_document_column
         self.fuzzy_threshold = fuzzy_threshold
 
+    def get_documents_catalog(self) -> DocumentCatalog:
+        return get_document_catalog(
+            db_service=self.db_service,
+            schema_name=self.schema_name,
+            table_name=self.table_name,
+            document_name_column=self.document_name_column,
+        )
+
     def get_documents_names(self) -> list[str]:
-        query = f"SELECT DISTINCT {self.document_name_column} FROM {self.schema_name}.{self.table_name}"
-        df_document = self.db_service._fetch_sql_query_as_dataframe(query)
-        return df_document[self.document_name_column].tolist()
+        return self.get_documents_catalog().document_names
 
     def get_closest_documents_to_queried_documents_name(self, queried_documents):
         correct_documents = []
-        list_of_correct_documents = self.get_documents_names()
+        catalog = self.get_documents_catalog()
+        list_of_correct_documents = catalog.document_names
         for document in queried_documents:
-            if document in self.get_documents_names():
+            if document in catalog:
                 correct_documents.append(document)
             else:
                 matching_candidates = fuzzy_matching(document, list_of_correct_documents, fuzzy_matching_candidates=1)[
@@ -1,3 +1,4 @@
+import asyncio
 import re
 from typing import Optional
 
@@ -41,6 +42,7 @@ class HybridRAG(RAG):
         component_instance_name: str = "Hybrid RAG",
         filtering_condition: str = "OR",
         formatter: Optional[Formatter] = None,
+        max_concurrent_image_analyses: int = 5,
     ) -> None:
         super().__init__(
             trace_manager=trace_manager,
@@ -55,6 +57,7 @@ class HybridRAG(RAG):
         self._relevant_chunk_selector = relevant_chunk_selector
         self._filtering_condition = filtering_condition
         self._formatter = formatter
+        self._max_concurrent_image_analyses = max_concurrent_image_analyses
 
     async def _run_without_trace(
         self,
@@ -79,10 +82,11 @@ class HybridRAG(RAG):
             sources=chunks,
             chunk_selection_response=relevant_chunks,
         )
-        responses_hybrid_synthesizer = process_image_responses(
+        responses_hybrid_synthesizer = await process_image_responses(
             relevant_image_sources=relevant_image_sources,
             hybrid_synthesizer=self._hybrid_synthesizer,
             query_str=content,
+            max_concurrency=self._max_concurrent_image_analyses,
         )
         text_image_sources_for_synthesizer, images_to_show_user = get_all_sources_for_synthesizer(
             relevant_image_sources=relevant_image_sources,
@@ -146,22 +150,40 @@ def process_relevant_sources(
     return relevant_image_sources, relevant_text_sources
 
 
-def process_image_responses(
+async def process_image_responses(
     relevant_image_sources: list[SourceChunk],
     hybrid_synthesizer: HybridSynthesizer,
     query_str: str,
+    max_concurrency: int = 5,
 ) -> list[dict]:
-    useful_answers_images = []
-    for image_source in relevant_image_sources:
-        image_ids = image_source.metadata.get("image_ids", [])
-        for image_id in image_ids:
-            response = hybrid_synthesizer.get_response(
+    """Analyse every (image source, image id) pair concurrently.
+
+    Calls to the hybrid synthesizer are blocking, so they run in worker threads.
+    At most `max_concurrency` calls are in flight; answers are merged back in the
+    order of the sources so the final prompt stays deterministic.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def analyse_image(image_id: str, image_source: SourceChunk):
+        async with semaphore:
+            return await asyncio.to_thread(
+                hybrid_synthesizer.get_response,
                 image_id=image_id,
                 chunks=[image_source],
                 query_str=query_str,
             )
-            if response.score_image <= 2:
-                useful_answers_images.append({response.image_id: response.response})
+
+    tasks = [
+        analyse_image(image_id, image_source)
+        for image_source in relevant_image_sources
+        for image_id in image_source.metadata.get("image_ids", [])
+    ]
+    responses = await asyncio.gather(*tasks)
+
+    useful_answers_images = []
+    for response in responses:
+        if response.score_image <= 2:
+            useful_answers_images.append({response.image_id: response.response})
     return useful_answers_images
 
 
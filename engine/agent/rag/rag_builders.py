@@ -4,11 +4,12 @@ from typing import Optional
 from engine.agent.agent import ToolDescription
 from engine.agent.rag.rag import RAG, format_rag_tool_description
 from engine.agent.rag.retriever import Retriever, DummyRetriever
-from engine.qdrant_service import QdrantService, QdrantCollectionSchema
+from engine.qdrant_service import QdrantCollectionSchema
 from engine.trace.trace_manager import TraceManager
 from engine.agent.synthesizer import Synthesizer
 from engine.agent.synthesizer_prompts import get_synthetizer_prompt_template_slack
 from engine.llm_services.llm_service import LLMService
+from engine.vector_store import get_vector_store
 
 LOGGER = logging.getLogger(__name__)
 
@@ -34,7 +35,7 @@ def build_default_rag_agent(
         tool_description = format_rag_tool_description(source_name)
     if synthetizer_prompt is None:
         synthetizer_prompt = get_synthetizer_prompt_template_slack()
-    qdrant_service = QdrantService.from_defaults(
+    qdrant_service = get_vector_store(
         llm_service=llm_service,
         default_collection_schema=collection_schema,
     )
@@ -113,7 +114,7 @@ def build_s3_rag_agent(
             "FILE_NAME",
         },
     )
-    qdrant_service = QdrantService.from_defaults(
+    qdrant_service = get_vector_store(
         llm_service=llm_service,
         default_collection_schema=collection_schema,
     )
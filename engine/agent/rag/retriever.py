@@ -1,20 +1,48 @@
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import contextvars
 import json
+import logging
 
+import requests
 from opentelemetry import trace as trace_api
 from openinference.semconv.trace import OpenInferenceSpanKindValues, SpanAttributes
 
 from engine.agent.agent import SourceChunk
-from engine.qdrant_service import QdrantService
 from engine.trace.trace_manager import TraceManager
+from engine.vector_store import VectorStore
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RRF_K = 60
+# Shared by all retrievers: the dense and sparse searches of a query run side by side
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="retriever-search")
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[tuple[str, float]]],
+    weights: Optional[list[float]] = None,
+    k: int = DEFAULT_RRF_K,
+) -> list[tuple[str, float]]:
+    """
+    Merge ranked lists of (id, score) with weighted reciprocal rank fusion:
+    score(id) = sum over rankings of weight / (k + rank of id in the ranking).
+    """
+    if weights is None:
+        weights = [1.0] * len(rankings)
+    fused_scores: dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, (item_id, _) in enumerate(ranking, start=1):
+            fused_scores[item_id] = fused_scores.get(item_id, 0.0) + weight / (k + rank)
+    return sorted(fused_scores.items(), key=lambda item: item[1], reverse=True)
 
 
 class Retriever:
     def __init__(
         self,
         trace_manager: TraceManager,
-        qdrant_service: QdrantService,
+        qdrant_service: VectorStore,
         collection_name: str,
         max_retrieved_chunks: int,
         enable_date_penalty_for_chunks: bool = False,
@@ -22,6 +50,10 @@ class Retriever:
         default_penalty_rate: Optional[float] = None,
         metadata_date_key: Optional[str] = None,
         max_retrieved_chunks_after_penalty: Optional[int] = None,
+        enable_hybrid_search: bool = False,
+        dense_weight: float = 1.0,
+        sparse_weight: float = 1.0,
+        rrf_k: int = DEFAULT_RRF_K,
     ):
         self.trace_manager = trace_manager
         self.collection_name = collection_name
@@ -32,18 +64,57 @@ class Retriever:
         self.default_penalty_rate = default_penalty_rate
         self.metadata_date_key = metadata_date_key
         self.max_retrieved_chunks_after_penalty = max_retrieved_chunks_after_penalty
+        self.enable_hybrid_search = enable_hybrid_search
+        self.dense_weight = dense_weight
+        self.sparse_weight = sparse_weight
+        self.rrf_k = rrf_k
 
-    def _get_chunks_without_trace(
+    def _hybrid_search(
         self,
         query_text: str,
         filters: Optional[dict] = None,
     ) -> list[SourceChunk]:
-        chunks = self._vectorestore_service.retrieve_similar_chunks(
-            query_text=query_text,
-            collection_name=self.collection_name,
-            limit=self._max_retrieved_chunks,
-            filter=filters,
+        search_kwargs = {
+            "query_text": query_text,
+            "collection_name": self.collection_name,
+            "limit": self._max_retrieved_chunks,
+            "filter": filters,
+        }
+        dense_future = _SEARCH_EXECUTOR.submit(
+            contextvars.copy_context().run, self._vectorestore_service.search_similar_ids, **search_kwargs
+        )
+        sparse_future = _SEARCH_EXECUTOR.submit(
+            contextvars.copy_context().run, self._vectorestore_service.search_lexical_ids, **search_kwargs
         )
+        dense_results = dense_future.result()
+        try:
+            sparse_results = sparse_future.result()
+        except (ValueError, requests.exceptions.HTTPError) as e:
+            # e.g. a collection ingested before sparse vectors were enabled
+            LOGGER.warning(f"Sparse search failed on collection {self.collection_name}, using dense search only: {e}")
+            sparse_results = []
+
+        fused_results = reciprocal_rank_fusion(
+            [dense_results, sparse_results],
+            weights=[self.dense_weight, self.sparse_weight],
+            k=self.rrf_k,
+        )[: self._max_retrieved_chunks]
+        return self._vectorestore_service.get_chunks_by_ids(fused_results, collection_name=self.collection_name)
+
+    def _get_chunks_without_trace(
+        self,
+        query_text: str,
+        filters: Optional[dict] = None,
+    ) -> list[SourceChunk]:
+        if self.enable_hybrid_search:
+            chunks = self._hybrid_search(query_text, filters)
+        else:
+            chunks = self._vectorestore_service.retrieve_similar_chunks(
+                query_text=query_text,
+                collection_name=self.collection_name,
+                limit=self._max_retrieved_chunks,
+                filter=filters,
+            )
         if self.enable_chunk_penalization:
             chunks = self.apply_date_penalty_to_chunks(chunks)
 
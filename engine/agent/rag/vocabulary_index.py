@@ -0,0 +1,203 @@
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from rapidfuzz import fuzz, process, utils
+
+from engine.agent.agent import TermDefinition
+from engine.storage_service.db_service import DBService
+from engine.storage_service.db_utils import get_db_service_cache_key
+
+LOGGER = logging.getLogger(__name__)
+
+# Vocabularies above this size get a trigram prefilter so that only plausible terms are scored
+TRIGRAM_PREFILTER_MIN_TERMS = 100_000
+# Share of a term's trigrams that must appear in the query for the term to be scored
+TRIGRAM_PREFILTER_MIN_OVERLAP = 0.5
+# Cached vocabularies are revalidated against the database at most this often
+VOCABULARY_CACHE_REVALIDATE_SECONDS = 60
+# Cached vocabularies are reloaded unconditionally after this delay
+VOCABULARY_CACHE_TTL_SECONDS = 3600
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class VocabularyIndex:
+    """
+    Precompiled fuzzy index over a vocabulary.
+    Terms are normalized once at build time so queries only pay for the C++ scoring in rapidfuzz.
+    """
+
+    def __init__(
+        self,
+        vocabulary: dict[str, TermDefinition],
+        use_trigram_prefilter: Optional[bool] = None,
+    ):
+        self.vocabulary = vocabulary
+        self._keys = list(vocabulary.keys())
+        self._processed_terms = [utils.default_process(key) for key in self._keys]
+        if use_trigram_prefilter is None:
+            use_trigram_prefilter = len(self._keys) > TRIGRAM_PREFILTER_MIN_TERMS
+        self._trigram_index: Optional[dict[str, list[int]]] = None
+        self._min_overlaps: list[int] = []
+        self._short_terms: list[int] = []
+        if use_trigram_prefilter:
+            self._build_trigram_index()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _build_trigram_index(self) -> None:
+        trigram_index: dict[str, list[int]] = defaultdict(list)
+        for i, term in enumerate(self._processed_terms):
+            term_trigrams = _trigrams(term)
+            # Padding trigrams depend on the term boundaries, which partial matches do not respect
+            inner_trigrams = {trigram for trigram in term_trigrams if " " not in trigram}
+            if not inner_trigrams:
+                self._short_terms.append(i)
+                self._min_overlaps.append(0)
+                continue
+            self._min_overlaps.append(math.ceil(len(inner_trigrams) * TRIGRAM_PREFILTER_MIN_OVERLAP))
+            for trigram in inner_trigrams:
+                trigram_index[trigram].append(i)
+        self._trigram_index = dict(trigram_index)
+
+    def _candidate_indexes(self, processed_query: str) -> Optional[list[int]]:
+        if self._trigram_index is None:
+            return None
+        hits: Counter[int] = Counter()
+        for trigram in _trigrams(processed_query):
+            hits.update(self._trigram_index.get(trigram, ()))
+        candidates = [i for i, count in hits.items() if count >= self._min_overlaps[i]]
+        candidates.extend(self._short_terms)
+        return candidates
+
+    def search(self, query: str, limit: int, score_cutoff: float = 0) -> list[tuple[TermDefinition, float]]:
+        processed_query = utils.default_process(query)
+        candidate_indexes = self._candidate_indexes(processed_query)
+        if candidate_indexes is None:
+            choices = self._processed_terms
+        else:
+            # Sorted so that ties are ranked in vocabulary order, as in a full scan
+            choices = {i: self._processed_terms[i] for i in sorted(candidate_indexes)}
+        matches = process.extract(
+            processed_query,
+            choices,
+            scorer=fuzz.partial_ratio,
+            processor=None,
+            limit=limit,
+            score_cutoff=score_cutoff,
+        )
+        return [(self.vocabulary[self._keys[key]], score) for _, score, key in matches]
+
+
+@dataclass
+class _CachedVocabulary:
+    index: VocabularyIndex
+    fingerprint: tuple
+    loaded_at: float
+    validated_at: float = field(default=0.0)
+
+
+_VOCABULARY_CACHE: dict[tuple, _CachedVocabulary] = {}
+_VOCABULARY_CACHE_LOCK = threading.Lock()
+
+
+def _qualified_table_name(table_name: str, schema_name: Optional[str]) -> str:
+    return f"{schema_name}.{table_name}" if schema_name else table_name
+
+
+def _get_dialect_name(db_service: DBService) -> Optional[str]:
+    engine = getattr(db_service, "engine", None)
+    return engine.dialect.name if engine is not None else db_service.dialect
+
+
+def _get_fingerprint(
+    db_service: DBService,
+    table_name: str,
+    schema_name: Optional[str],
+    term_column: str,
+    definition_column: str,
+) -> tuple:
+    """
+    Summary of the terms and definitions of a vocabulary table that changes when they do, computed by the
+    database. PostgreSQL and Snowflake sum a hash of every row, so any insert, update or delete is detected.
+    Other databases only compare the row count and the total length of the terms and definitions.
+    """
+    dialect_name = _get_dialect_name(db_service)
+    if dialect_name == "postgresql":
+        checksum = (
+            f"SUM(('x' || SUBSTR(MD5(CONCAT_WS(CHR(31), {term_column}, {definition_column})), 1, 15))"
+            "::BIT(60)::BIGINT)"
+        )
+    elif dialect_name == "snowflake sql":
+        checksum = f"HASH_AGG({term_column}, {definition_column})"
+    else:
+        checksum = f"SUM(LENGTH({term_column})), SUM(LENGTH({definition_column}))"
+    df = db_service._fetch_sql_query_as_dataframe(
+        f"SELECT COUNT(*), {checksum} FROM {_qualified_table_name(table_name, schema_name)}"
+    )
+    return tuple(str(value) for value in df.iloc[0])
+
+
+def _load_vocabulary(
+    db_service: DBService,
+    table_name: str,
+    schema_name: Optional[str],
+    term_column: str,
+    definition_column: str,
+) -> VocabularyIndex:
+    vocabulary_df = db_service.get_table_df(table_name=table_name, schema_name=schema_name)
+    vocabulary = {
+        term.lower(): TermDefinition(term=term, definition=definition)
+        for term, definition in zip(vocabulary_df[term_column], vocabulary_df[definition_column])
+    }
+    return VocabularyIndex(vocabulary)
+
+
+def get_vocabulary_index(
+    db_service: DBService,
+    table_name: str,
+    schema_name: Optional[str],
+    term_column: str = "term",
+    definition_column: str = "definition",
+) -> VocabularyIndex:
+    """
+    Return the fuzzy index of a vocabulary table, shared across every VocabularySearch of the process.
+    A cached index is revalidated with a fingerprint of the table (see _get_fingerprint) at most every
+    VOCABULARY_CACHE_REVALIDATE_SECONDS, and rebuilt when it changed or after VOCABULARY_CACHE_TTL_SECONDS.
+    """
+    cache_key = (get_db_service_cache_key(db_service), schema_name, table_name, term_column, definition_column)
+    table_columns = (db_service, table_name, schema_name, term_column, definition_column)
+    now = time.monotonic()
+    with _VOCABULARY_CACHE_LOCK:
+        cached = _VOCABULARY_CACHE.get(cache_key)
+
+    if cached is not None and now - cached.loaded_at < VOCABULARY_CACHE_TTL_SECONDS:
+        if now - cached.validated_at < VOCABULARY_CACHE_REVALIDATE_SECONDS:
+            return cached.index
+        if _get_fingerprint(*table_columns) == cached.fingerprint:
+            cached.validated_at = now
+            return cached.index
+        LOGGER.info(f"Vocabulary table {_qualified_table_name(table_name, schema_name)} changed, reloading it")
+
+    # Taken before the load, so that a write during the load is seen at the next revalidation
+    fingerprint = _get_fingerprint(*table_columns)
+    index = _load_vocabulary(*table_columns)
+    with _VOCABULARY_CACHE_LOCK:
+        _VOCABULARY_CACHE[cache_key] = _CachedVocabulary(
+            index=index, fingerprint=fingerprint, loaded_at=now, validated_at=now
+        )
+    return index
+
+
+def invalidate_vocabulary_cache() -> None:
+    with _VOCABULARY_CACHE_LOCK:
+        _VOCABULARY_CACHE.clear()
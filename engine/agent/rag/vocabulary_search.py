@@ -4,7 +4,7 @@ from openinference.semconv.trace import OpenInferenceSpanKindValues, SpanAttribu
 from engine.agent.agent import TermDefinition
 from engine.trace.trace_manager import TraceManager
 from engine.storage_service.db_service import DBService
-from engine.agent.utils import fuzzy_matching
+from engine.agent.rag.vocabulary_index import VocabularyIndex, get_vocabulary_index
 
 NUMBER_CHUNKS_TO_DISPLAY_TRACE = 30
 
@@ -31,36 +31,32 @@ class VocabularySearch:
         self.definition_column = definition_column
         self.fuzzy_threshold = fuzzy_threshold
         self.fuzzy_matching_candidates = fuzzy_matching_candidates
-        self.vocabulary_information: dict[str, TermDefinition] = self._init_vocabulary_information()
+        # Warm the shared cache so the first query does not pay for loading the vocabulary
+        self._get_vocabulary_index()
 
-    def _init_vocabulary_information(self):
-        vocabulary_information = self.db_service.get_table_df(
+    def _get_vocabulary_index(self) -> VocabularyIndex:
+        return get_vocabulary_index(
+            db_service=self.db_service,
             table_name=self.table_name,
             schema_name=self.schema_name,
+            term_column=self.term_column,
+            definition_column=self.definition_column,
         )
-        map_vocabulary = {
-            row[self.term_column].lower(): TermDefinition(
-                term=row[self.term_column], definition=row[self.definition_column]
-            )
-            for _, row in vocabulary_information.iterrows()
-        }
-        return map_vocabulary
+
+    @property
+    def vocabulary_information(self) -> dict[str, TermDefinition]:
+        return self._get_vocabulary_index().vocabulary
 
     def _get_chunks_without_trace(
         self,
         query_text: str,
     ) -> list[TermDefinition]:
-        matching_vocabulary_chunks = fuzzy_matching(
+        matching_vocabulary_chunks = self._get_vocabulary_index().search(
             query_text.lower(),
-            [vocab for vocab in self.vocabulary_information.keys()],
-            fuzzy_matching_candidates=self.fuzzy_matching_candidates,
+            limit=self.fuzzy_matching_candidates,
+            score_cutoff=self.fuzzy_threshold,
         )
-        candidates_vocabulary_chunks = [
-            self.vocabulary_information[match[0]]
-            for match in matching_vocabulary_chunks
-            if match[1] >= self.fuzzy_threshold
-        ]
-        return candidates_vocabulary_chunks
+        return [term_definition for term_definition, _ in matching_vocabulary_chunks]
 
     def get_chunks(
         self,
@@ -42,6 +42,8 @@ class ReActAgent(Agent):
         input_data_field_for_messages_history: str = "messages",
         first_history_messages: int = 1,
         last_history_messages: int = 50,
+        max_history_tokens: Optional[int] = None,
+        max_tool_message_tokens: Optional[int] = None,
         allow_tool_shortcuts: bool = False,
     ) -> None:
         super().__init__(
@@ -59,7 +61,17 @@ class ReActAgent(Agent):
         self.fallback_react_answer = fallback_react_answer
         self._first_history_messages = first_history_messages
         self._last_history_messages = last_history_messages
-        self._memory_handling = HistoryMessageHandler(self._first_history_messages, self._last_history_messages)
+        self._memory_handling = HistoryMessageHandler(
+            self._first_history_messages,
+            self._last_history_messages,
+            max_history_tokens=max_history_tokens,
+            max_tokens_per_tool_message=max_tool_message_tokens,
+            model_name=(
+                llm_service._completion_model
+                if max_history_tokens is not None or max_tool_message_tokens is not None
+                else None
+            ),
+        )
         self._max_iterations = max_iterations
         self._max_tools_per_iteration = max_tools_per_iteration
         self._current_iteration = 0
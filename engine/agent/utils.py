@@ -3,17 +3,24 @@ import string
 from typing import Union
 import logging
 
-from fuzzywuzzy import fuzz, process
+from rapidfuzz import fuzz, process, utils
 
 LOGGER = logging.getLogger(__name__)
 
 
-def fuzzy_matching(query: str, list_of_entities: list[str], fuzzy_matching_candidates: int = 10):
+def fuzzy_matching(
+    query: str,
+    list_of_entities: list[str],
+    fuzzy_matching_candidates: int = 10,
+    score_cutoff: float = 0,
+) -> list[tuple[str, float, int]]:
     matching_entities = process.extract(
         query,
         list_of_entities,
         scorer=fuzz.partial_ratio,
+        processor=utils.default_process,
         limit=fuzzy_matching_candidates,
+        score_cutoff=score_cutoff,
     )
     return matching_entities
 
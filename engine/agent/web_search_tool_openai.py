@@ -1,6 +1,8 @@
+import asyncio
 from typing import Optional
 
 from engine.agent.agent import Agent, AgentPayload, ChatMessage, ToolDescription
+from engine.agent.api_tools.http_client import cache_response, get_cached_response, make_cache_key
 from engine.llm_services.llm_service import LLMService
 from engine.trace.trace_manager import TraceManager
 
@@ -25,6 +27,7 @@ class WebSearchOpenAITool(Agent):
         trace_manager: TraceManager,
         component_instance_name: str,
         tool_description: ToolDescription = DEFAULT_WEB_SEARCH_OPENAI_TOOL_DESCRIPTION,
+        cache_ttl: Optional[int] = None,
     ):
         super().__init__(
             trace_manager=trace_manager,
@@ -32,6 +35,7 @@ class WebSearchOpenAITool(Agent):
             component_instance_name=component_instance_name,
         )
         self._llm_service = llm_service
+        self.cache_ttl = cache_ttl
 
     async def _run_without_trace(
         self,
@@ -40,5 +44,15 @@ class WebSearchOpenAITool(Agent):
     ) -> AgentPayload:
         agent_input = inputs[0]
         query_str = query or agent_input.last_message.content
-        output = self._llm_service.web_search(query_str)
+        cache_key = make_cache_key(
+            "POST",
+            f"web_search:{self._llm_service.__class__.__name__}:{self._llm_service._completion_model}",
+            json_body={"query": query_str},
+        )
+        output = get_cached_response(cache_key) if self.cache_ttl else None
+        if output is None:
+            # The LLM service is synchronous, keep the event loop free while the search runs
+            output = await asyncio.to_thread(self._llm_service.web_search, query_str)
+            if self.cache_ttl:
+                cache_response(cache_key, output, ttl=self.cache_ttl)
         return AgentPayload(messages=[ChatMessage(role="assistant", content=output)])
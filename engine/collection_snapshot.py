@@ -0,0 +1,211 @@
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from engine.qdrant_service import QdrantService
+
+LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_MANIFEST = "collection.json"
+PART_FILE_FORMAT = "part-{:05d}.parquet"
+
+
+@dataclass
+class SnapshotStats:
+    """Counts of an export or an import of a collection snapshot."""
+
+    points: int = 0
+    files: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.points / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.points} points, {self.files} files in {self.seconds:.1f}s ({self.rows_per_second:.0f} rows/s)"
+
+
+def _get_dense_vector(vector: list[float] | dict) -> list[float]:
+    return vector[""] if isinstance(vector, dict) else vector
+
+
+def _get_sparse_vectors(vector: list[float] | dict) -> Optional[str]:
+    if not isinstance(vector, dict):
+        return None
+    return json.dumps({name: value for name, value in vector.items() if name != ""})
+
+
+def _snapshot_schema(vector_size: int) -> pa.Schema:
+    """
+    Schema of the Parquet files of a snapshot. Dense vectors are a fixed size list of float32,
+    payloads and sparse vectors are JSON strings to keep their exact structure.
+    """
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("vector", pa.list_(pa.float32(), vector_size)),
+            ("sparse_vectors", pa.string()),
+            ("payload", pa.string()),
+        ]
+    )
+
+
+def _to_table(points: list[dict], vector_size: int) -> pa.Table:
+    dense_vectors = np.asarray([_get_dense_vector(point["vector"]) for point in points], dtype=np.float32)
+    return pa.table(
+        {
+            "id": pa.array([str(point["id"]) for point in points], type=pa.string()),
+            "vector": pa.FixedSizeListArray.from_arrays(pa.array(dense_vectors.ravel()), vector_size),
+            "sparse_vectors": pa.array([_get_sparse_vectors(point["vector"]) for point in points], type=pa.string()),
+            "payload": pa.array([json.dumps(point.get("payload") or {}) for point in points], type=pa.string()),
+        },
+        schema=_snapshot_schema(vector_size),
+    )
+
+
+def _to_points(batch: pa.RecordBatch, vector_size: int) -> list[dict]:
+    ids = batch.column("id").to_pylist()
+    vectors = batch.column("vector").flatten().to_numpy().reshape(-1, vector_size).tolist()
+    sparse_vectors = batch.column("sparse_vectors").to_pylist()
+    payloads = batch.column("payload").to_pylist()
+    points = []
+    for point_id, vector, sparse, payload in zip(ids, vectors, sparse_vectors, payloads):
+        points.append(
+            {
+                # Qdrant ids are either unsigned integers or UUIDs
+                "id": int(point_id) if point_id.isdigit() else point_id,
+                "vector": {"": vector, **json.loads(sparse)} if sparse else vector,
+                "payload": json.loads(payload),
+            }
+        )
+    return points
+
+
+def _insert_points(vector_store: QdrantService, points: list[dict], collection_name: str) -> int:
+    if not vector_store.insert_points_in_collection(points, collection_name):
+        raise ValueError(f"Failed to upsert {len(points)} points in collection {collection_name}")
+    return len(points)
+
+
+def export_collection(
+    vector_store: QdrantService,
+    collection_name: str,
+    directory: str | Path,
+    page_size: int = 1000,
+    rows_per_file: int = 100_000,
+) -> SnapshotStats:
+    """
+    Export the points of a collection (ids, vectors and payloads) to Parquet files of at most
+    `rows_per_file` rows, read by pages of `page_size` points. Each page is written as a row group,
+    so only one page is held in memory. The parameters of the collection are written next to them
+    in collection.json. On a shared collection, only the points of the tenant of the vector store are exported.
+
+    Args:
+        vector_store (QdrantService): The vector store of the collection, Qdrant or local.
+        collection_name (str): The name of the collection to export.
+        directory (str | Path): The directory of the snapshot, created if needed.
+        page_size (int): The number of points read per scroll request.
+        rows_per_file (int): The maximum number of points per Parquet file.
+    """
+    start = time.perf_counter()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    params = vector_store.get_collection_params(collection_name)
+    vector_size = params["vectors"]["size"]
+    stats = SnapshotStats()
+    files, writer, rows_in_file, offset = [], None, 0, None
+    try:
+        while True:
+            points, offset = vector_store.scroll_points(
+                collection_name, limit=page_size, offset=offset, with_vectors=True
+            )
+            stats.points += len(points)
+            while points:
+                if writer is None:
+                    files.append(PART_FILE_FORMAT.format(len(files)))
+                    writer = pq.ParquetWriter(directory / files[-1], _snapshot_schema(vector_size))
+                    rows_in_file = 0
+                rows, points = points[: rows_per_file - rows_in_file], points[rows_per_file - rows_in_file :]
+                writer.write_table(_to_table(rows, vector_size))
+                rows_in_file += len(rows)
+                if rows_in_file >= rows_per_file:
+                    writer.close()
+                    writer = None
+            if offset is None:
+                break
+    finally:
+        if writer is not None:
+            writer.close()
+    manifest = {"collection_name": collection_name, "params": params, "points": stats.points, "files": files}
+    (directory / SNAPSHOT_MANIFEST).write_text(json.dumps(manifest, indent=2))
+    stats.files = len(files)
+    stats.seconds = time.perf_counter() - start
+    LOGGER.info(f"Exported collection {collection_name} to {directory}: {stats}")
+    return stats
+
+
+def import_collection(
+    vector_store: QdrantService,
+    directory: str | Path,
+    collection_name: Optional[str] = None,
+    batch_size: int = 500,
+    max_workers: int = 4,
+) -> SnapshotStats:
+    """
+    Import a snapshot written by export_collection, upserting its points by batches of `batch_size`
+    with `max_workers` requests in flight. The collection is created with the vector size and distance
+    of the snapshot if it does not exist.
+
+    Args:
+        vector_store (QdrantService): The vector store to import into, Qdrant or local.
+        directory (str | Path): The directory of the snapshot.
+        collection_name (Optional[str]): The collection to import into. Defaults to the exported collection.
+        batch_size (int): The number of points per upsert request.
+        max_workers (int): The number of upsert requests sent in parallel.
+    """
+    start = time.perf_counter()
+    directory = Path(directory)
+    manifest = json.loads((directory / SNAPSHOT_MANIFEST).read_text())
+    collection_name = collection_name or manifest["collection_name"]
+    vectors_params = manifest["params"]["vectors"]
+    collection_exists = vector_store.collection_exists(collection_name)
+    if collection_exists:
+        sparse_vector_names = set(vector_store.get_sparse_vector_names(collection_name))
+    else:
+        # Checked before the collection is created with the sparse vector of its schema, so that it is not left empty
+        sparse_vector_name = vector_store._get_schema(collection_name).sparse_vector_name
+        sparse_vector_names = {sparse_vector_name} if sparse_vector_name else set()
+    missing_sparse_vectors = set(manifest["params"].get("sparse_vectors") or {}) - sparse_vector_names
+    if missing_sparse_vectors:
+        raise ValueError(f"Collection {collection_name} has no sparse vectors {sorted(missing_sparse_vectors)}")
+    if not collection_exists:
+        vector_store.create_collection(
+            collection_name, vector_size=vectors_params["size"], distance=vectors_params["distance"]
+        )
+
+    stats = SnapshotStats(files=len(manifest["files"]))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Bound the batches held in memory while the upserts are in flight
+        pending: set[Future] = set()
+        for file_name in manifest["files"]:
+            for batch in pq.ParquetFile(directory / file_name).iter_batches(batch_size=batch_size):
+                if len(pending) >= 2 * max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stats.points += future.result()
+                points = _to_points(batch, vectors_params["size"])
+                pending.add(executor.submit(_insert_points, vector_store, points, collection_name))
+        for future in pending:
+            stats.points += future.result()
+    stats.seconds = time.perf_counter() - start
+    LOGGER.info(f"Imported {directory} into collection {collection_name}: {stats}")
+    return stats
@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+# SQLite limits the number of parameters of a query
+MAX_HASHES_PER_QUERY = 500
+
+# Stores opened on a same file share their connection
+_EMBEDDING_STORES: dict[Path, "EmbeddingStore"] = {}
+_EMBEDDING_STORES_LOCK = threading.Lock()
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EmbeddingStats:
+    """Counts of the chunk contents embedded by a vector store, to report the embeddings reused in a run."""
+
+    texts: int = 0
+    embedded_texts: int = 0
+    api_calls: int = 0
+
+    @property
+    def reused_texts(self) -> int:
+        return self.texts - self.embedded_texts
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused_texts / self.texts if self.texts else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.texts} chunks, {self.embedded_texts} embedded in {self.api_calls} API calls, "
+            f"{self.reused_texts} reused ({self.reuse_ratio:.1%})"
+        )
+
+
+class EmbeddingStore:
+    """
+    Embeddings persisted in a SQLite file, keyed by (model, dimensions, sha256 of the text), so that the chunks
+    whose text was already embedded, by a previous ingestion or elsewhere in the same one, are not embedded again.
+    Vectors are stored as float32 blobs.
+    """
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path).resolve()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self._path, check_same_thread=False)
+        # Several ingestion processes can share the file
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    dimensions INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, dimensions, content_hash)
+                )
+                """
+            )
+
+    def get_embeddings(
+        self, model: str, dimensions: Optional[int], content_hashes: list[str]
+    ) -> dict[str, list[float]]:
+        """
+        Return the stored embeddings of the given content hashes, by hash.
+
+        Args:
+            model (str): The embedding model.
+            dimensions (Optional[int]): The size of the shortened embeddings, None for the full size of the model.
+            content_hashes (list[str]): The sha256 of the texts.
+        """
+        embeddings = {}
+        content_hashes = list(content_hashes)
+        with self._lock:
+            for i in range(0, len(content_hashes), MAX_HASHES_PER_QUERY):
+                batch = content_hashes[i : i + MAX_HASHES_PER_QUERY]
+                rows = self._connection.execute(
+                    "SELECT content_hash, vector FROM embeddings WHERE model = ? AND dimensions = ? "
+                    f"AND content_hash IN ({', '.join('?' * len(batch))})",
+                    (model, dimensions or 0, *batch),
+                )
+                for content_hash, vector in rows:
+                    embeddings[content_hash] = np.frombuffer(vector, dtype=np.float32).tolist()
+        return embeddings
+
+    def add_embeddings(self, model: str, dimensions: Optional[int], embeddings: dict[str, list[float]]) -> None:
+        """Store embeddings given by content hash."""
+        rows = [
+            (model, dimensions or 0, content_hash, np.asarray(vector, dtype=np.float32).tobytes())
+            for content_hash, vector in embeddings.items()
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, dimensions, content_hash, vector) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+
+def get_embedding_store() -> Optional[EmbeddingStore]:
+    """Return the embedding store of the file set by EMBEDDING_STORE_PATH, or None when it is not set."""
+    if not settings.EMBEDDING_STORE_PATH:
+        return None
+    path = Path(settings.EMBEDDING_STORE_PATH).resolve()
+    with _EMBEDDING_STORES_LOCK:
+        if path not in _EMBEDDING_STORES:
+            LOGGER.info(f"Opening the embedding store {path}")
+            _EMBEDDING_STORES[path] = EmbeddingStore(path)
+        return _EMBEDDING_STORES[path]
@@ -0,0 +1,73 @@
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from typing import Optional
+
+WORD_REGEX = re.compile(r"\w+", re.UNICODE)
+SPARSE_K1 = 1.2
+
+STOPWORDS: dict[str, frozenset[str]] = {
+    "english": frozenset(
+        """
+        a about above after again against all am an and any are as at be because been before being below between
+        both but by can could did do does doing down during each few for from further had has have having he her
+        here hers herself him himself his how i if in into is it its itself just me more most my myself no nor not
+        now of off on once only or other our ours ourselves out over own same she should so some such than that the
+        their theirs them themselves then there these they this those through to too under until up very was we
+        were what when where which while who whom why will with would you your yours yourself yourselves
+        """.split()
+    ),
+    "french": frozenset(
+        """
+        a au aux avec ce ces cet cette dans de des du elle elles en est et etaient etait etre eu il ils je la le les
+        leur leurs lui ma mais me meme mes moi mon ne nos notre nous on ont ou par pas pour qu que quel quelle
+        quelles quels qui sa sans se ses son sont sur ta te tes toi ton tu un une vos votre vous y
+        """.split()
+    ),
+}
+
+
+def _strip_accents(text: str) -> str:
+    if text.isascii():
+        return text
+    return "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+
+
+def tokenize(text: str, language: Optional[str] = None) -> list[str]:
+    """
+    Split a text into lowercased, accent-free words for lexical matching.
+    When a language is given, its stopwords are removed.
+    """
+    if language is not None and language not in STOPWORDS:
+        raise ValueError(f"No stopwords for language '{language}'. Available: {sorted(STOPWORDS)}")
+    words = WORD_REGEX.findall(_strip_accents(text.lower()))
+    if language is None:
+        return words
+    stopwords = STOPWORDS[language]
+    return [word for word in words if word not in stopwords]
+
+
+def term_index(term: str) -> int:
+    """Stable 32-bit index of a term, used as dimension of sparse vectors."""
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def build_sparse_vector(
+    text: str,
+    language: Optional[str] = None,
+    is_query: bool = False,
+    k1: float = SPARSE_K1,
+) -> dict[str, list]:
+    """
+    Build a sparse term-weight vector of a text, in the Qdrant format {"indices": [...], "values": [...]}.
+    Documents get a BM25 saturated term frequency, queries a weight of 1 per term; the idf part of BM25
+    is applied by the vector store (Qdrant "idf" modifier).
+    """
+    counts = Counter(term_index(term) for term in tokenize(text, language=language))
+    indices = sorted(counts)
+    if is_query:
+        values = [1.0] * len(indices)
+    else:
+        values = [counts[index] * (k1 + 1) / (counts[index] + k1) for index in indices]
+    return {"indices": indices, "values": values}
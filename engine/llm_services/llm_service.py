@@ -8,6 +8,7 @@ from openinference.semconv.trace import OpenInferenceSpanKindValues, SpanAttribu
 
 from engine.trace.trace_manager import TraceManager
 from engine.agent.agent import ToolDescription
+from engine.llm_services.tokenizer import get_tokenizer
 
 
 class LLMService(abc.ABC):
@@ -18,6 +19,7 @@ class LLMService(abc.ABC):
         self.trace_manager = trace_manager
         self._completion_model: str = None
         self._embedding_model: str = None
+        self._embedding_dimensions: Optional[int] = None
         self._default_temperature: float = None
 
     @abc.abstractmethod
@@ -163,6 +165,8 @@ class LLMService(abc.ABC):
     ) -> str:
         pass
 
-    @abc.abstractmethod
     def get_token_size(self, content: str) -> int:
-        pass
+        return get_tokenizer(self._completion_model).count(content)
+
+    def get_token_sizes(self, contents: list[str]) -> list[int]:
+        return get_tokenizer(self._completion_model).count_many(contents)
@@ -2,10 +2,9 @@ from typing import Optional
 import json
 
 import base64
-import tiktoken
 from pydantic import BaseModel
 from openinference.semconv.trace import OpenInferenceSpanKindValues, SpanAttributes
-from openai import OpenAI
+from openai import NOT_GIVEN, OpenAI
 from openai.types import Embedding
 from openai.types.chat import ChatCompletion
 from tenacity import retry, wait_random_exponential, stop_after_attempt
@@ -30,6 +29,7 @@ class OpenAILLMService(LLMService):
         model_config_text_to_speech: dict[str, str] | None = None,
         base_url: Optional[str] = None,
         api_key: Optional[str] = None,
+        embedding_dimensions: Optional[int] = None,
     ):
         super().__init__(trace_manager=trace_manager)
         if model_config_text_to_speech is None:
@@ -39,6 +39,8 @@ class OpenAILLMService(LLMService):
         self._client = OpenAI(api_key=api_key, base_url=base_url)
         self._completion_model = model_name
         self._embedding_model = embedding_model_name
+        # Shortened embeddings, supported by the text-embedding-3 models
+        self._embedding_dimensions = embedding_dimensions
         self._default_temperature = default_temperature
         self._model_speech_to_text = model_speech_to_text
 
@@ -50,6 +52,7 @@ class OpenAILLMService(LLMService):
         return self._client.embeddings.create(
             input=input_text,
             model=self._embedding_model,
+            dimensions=self._embedding_dimensions if self._embedding_dimensions else NOT_GIVEN,
         ).data
 
     @retry(wait=wait_random_exponential(multiplier=1, max=60), stop=stop_after_attempt(5))
@@ -194,6 +197,3 @@ class OpenAILLMService(LLMService):
         temperature: float = None,
     ) -> str:
         raise NotImplementedError("This method is not implemented for OpenAI LLM service.")
-
-    def get_token_size(self, content: str) -> int:
-        return len(tiktoken.encoding_for_model(self._completion_model).encode(content))
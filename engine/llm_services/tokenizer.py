@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+import tiktoken
+
+LOGGER = logging.getLogger(__name__)
+
+# Encoding used for models unknown to tiktoken (e.g. Mistral or Gemini models)
+DEFAULT_ENCODING_NAME = "o200k_base"
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 4096
+DEFAULT_NUM_THREADS = 8
+
+
+class Encoding(Protocol):
+    def encode(self, text: str, **kwargs) -> list[int]:
+        pass
+
+    def encode_batch(self, texts: list[str], **kwargs) -> list[list[int]]:
+        pass
+
+    def decode(self, tokens: list[int]) -> str:
+        pass
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+
+
+class Tokenizer:
+    """
+    Token counter bound to one encoding.
+    Counts are memoized in a small LRU keyed by a hash of the text, so repeated strings
+    (system prompts, history messages, summaries) are only encoded once.
+    """
+
+    def __init__(
+        self,
+        encoding: Optional[Encoding] = None,
+        model_name: Optional[str] = None,
+        cache_size: int = DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+        num_threads: int = DEFAULT_NUM_THREADS,
+    ):
+        if encoding is None and model_name is None:
+            raise ValueError("Either an encoding or a model name must be provided to the tokenizer.")
+        self._encoding = encoding
+        self._model_name = model_name
+        self._cache_size = cache_size
+        self._num_threads = num_threads
+        self._counts: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self) -> Encoding:
+        # Resolved lazily: loading an encoding can require downloading its BPE file
+        if self._encoding is None:
+            self._encoding = get_encoding(self._model_name)
+        return self._encoding
+
+    def encode(self, text: str) -> list[int]:
+        return self.encoding.encode(text, disallowed_special=())
+
+    def _get_cached(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+            return count
+
+    def _set_cached(self, key: bytes, count: int) -> None:
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            while len(self._counts) > self._cache_size:
+                self._counts.popitem(last=False)
+
+    def count(self, text: str) -> int:
+        key = _text_key(text)
+        count = self._get_cached(key)
+        if count is None:
+            count = len(self.encode(text))
+            self._set_cached(key, count)
+        return count
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Keep the first `max_tokens` tokens of a text."""
+        if self.count(text) <= max_tokens:
+            return text
+        return self.encoding.decode(self.encode(text)[:max_tokens])
+
+    def count_many(self, texts: list[str]) -> list[int]:
+        keys = [_text_key(text) for text in texts]
+        counts = [self._get_cached(key) for key in keys]
+        missing_indexes = [i for i, count in enumerate(counts) if count is None]
+        if missing_indexes:
+            encoded_texts = self.encoding.encode_batch(
+                [texts[i] for i in missing_indexes],
+                num_threads=self._num_threads,
+                disallowed_special=(),
+            )
+            for i, tokens in zip(missing_indexes, encoded_texts):
+                counts[i] = len(tokens)
+                self._set_cached(keys[i], counts[i])
+        return counts
+
+
+_TOKENIZERS: dict[str, Tokenizer] = {}
+_TOKENIZERS_LOCK = threading.Lock()
+
+
+def get_encoding(model_name: str) -> Encoding:
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        LOGGER.debug(f"No tiktoken encoding for model {model_name}, using {DEFAULT_ENCODING_NAME}")
+        return tiktoken.get_encoding(DEFAULT_ENCODING_NAME)
+
+
+def get_tokenizer(model_name: str) -> Tokenizer:
+    """Return the process-wide tokenizer of a model. Its encoder is loaded on first use and then shared."""
+    tokenizer = _TOKENIZERS.get(model_name)
+    if tokenizer is None:
+        with _TOKENIZERS_LOCK:
+            tokenizer = _TOKENIZERS.get(model_name)
+            if tokenizer is None:
+                tokenizer = Tokenizer(model_name=model_name)
+                _TOKENIZERS[model_name] = tokenizer
+    return tokenizer
+
+
+def register_tokenizer(model_name: str, tokenizer: Tokenizer) -> None:
+    """Register a tokenizer for a model, e.g. for models with a custom encoding."""
+    with _TOKENIZERS_LOCK:
+        _TOKENIZERS[model_name] = tokenizer
+
+
+def count_tokens(text: str, model_name: str) -> int:
+    return get_tokenizer(model_name).count(text)
+
+
+def count_tokens_many(texts: list[str], model_name: str) -> list[int]:
+    return get_tokenizer(model_name).count_many(texts)
@@ -0,0 +1,838 @@
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+from uuid import uuid4
+
+import numpy as np
+
+from engine.embedding_store import EmbeddingStats, EmbeddingStore
+from engine.llm_services.llm_service import LLMService
+from engine.qdrant_service import (
+    DEFAULT_VECTOR_SIZE,
+    MAX_BATCH_SIZE_FOR_CHUNK_UPLOAD,
+    QdrantCollectionSchema,
+    QdrantService,
+)
+from settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+SUPPORTED_DISTANCES = ("Cosine", "Dot")
+# Payload index types for which exact-match lookups go through an inverted index
+INVERTED_INDEX_TYPES = ("keyword", "integer", "uuid", "bool")
+INITIAL_CAPACITY = 1024
+DATABASE_FILE_NAME = "payloads.sqlite3"
+COLLECTION_NAME_PATTERN = re.compile(r"^[\w\-.]+$")
+
+# Stores opened on a same directory share their connection and collections, as clients of a same Qdrant would.
+# The stores of other processes see the writes through the generation of the collections in SQLite.
+_STORAGES: dict[Path, dict[str, Any]] = {}
+_STORAGES_LOCK = threading.Lock()
+
+
+def to_sparse_terms(sparse_vectors: dict[str, dict[str, list]]) -> dict[str, dict[int, float]]:
+    """Convert named sparse vectors from the {"indices": [...], "values": [...]} format to term weights."""
+    return {name: dict(zip(vector["indices"], vector["values"])) for name, vector in sparse_vectors.items()}
+
+
+def _get_values(payload: dict, key: str) -> list:
+    """Non-null values of a (dotted) payload key, flattened like Qdrant does for arrays."""
+    if "." in key:
+        values = [payload]
+        for part in key.split("."):
+            values = [value.get(part) for value in values if isinstance(value, dict) and part in value]
+    else:
+        values = [payload[key]] if key in payload else []
+    flattened = []
+    for value in values:
+        if isinstance(value, list):
+            flattened.extend(value)
+        else:
+            flattened.append(value)
+    return [value for value in flattened if value is not None]
+
+
+RANGE_CHECKS = {
+    "gt": lambda value, bound: value > bound,
+    "gte": lambda value, bound: value >= bound,
+    "lt": lambda value, bound: value < bound,
+    "lte": lambda value, bound: value <= bound,
+}
+
+
+def _compile_condition(condition: dict) -> Callable[[str, dict], bool]:
+    if "must" in condition or "should" in condition or "must_not" in condition:
+        return compile_filter(condition)
+    if "has_id" in condition:
+        ids = {str(has_id) for has_id in condition["has_id"]}
+        return lambda point_id, payload: point_id in ids
+    if "is_empty" in condition:
+        key = condition["is_empty"]["key"]
+        return lambda point_id, payload: not _get_values(payload, key)
+    if "is_null" in condition:
+        key = condition["is_null"]["key"]
+        return lambda point_id, payload: key in payload and payload[key] is None
+    key = condition["key"]
+    match = condition.get("match", {})
+    if "value" in match:
+        expected = match["value"]
+        return lambda point_id, payload: expected in _get_values(payload, key)
+    if "any" in match:
+        accepted = set(match["any"])
+        return lambda point_id, payload: any(value in accepted for value in _get_values(payload, key))
+    if "except" in match:
+        excluded = set(match["except"])
+        return lambda point_id, payload: any(value not in excluded for value in _get_values(payload, key))
+    if "text" in match:
+        text = match["text"]
+        return lambda point_id, payload: any(
+            isinstance(value, str) and text in value for value in _get_values(payload, key)
+        )
+    if "range" in condition:
+        checks = [
+            (RANGE_CHECKS[name], bound)
+            for name, bound in condition["range"].items()
+            if name in RANGE_CHECKS and bound is not None
+        ]
+        return lambda point_id, payload: any(
+            all(check(value, bound) for check, bound in checks)
+            for value in _get_values(payload, key)
+            if isinstance(value, (int, float, str))
+        )
+    raise ValueError(f"Unsupported filter condition: {condition}")
+
+
+def compile_filter(filter: Optional[dict]) -> Callable[[str, dict], bool]:
+    """
+    Compile a Qdrant filter (must / should / must_not clauses) into a predicate on the id and payload of a point,
+    so that it is parsed once per query rather than once per point.
+    """
+    if not filter:
+        return lambda point_id, payload: True
+    clauses = {}
+    for clause in ["must", "should", "must_not"]:
+        conditions = filter.get(clause) or []
+        if isinstance(conditions, dict):
+            conditions = [conditions]
+        clauses[clause] = [_compile_condition(condition) for condition in conditions]
+    must, should, must_not = clauses["must"], clauses["should"], clauses["must_not"]
+    return lambda point_id, payload: (
+        all(condition(point_id, payload) for condition in must)
+        and (not should or any(condition(point_id, payload) for condition in should))
+        and not any(condition(point_id, payload) for condition in must_not)
+    )
+
+
+def match_filter(point_id: str, payload: dict, filter: Optional[dict]) -> bool:
+    """Evaluate a Qdrant filter against the payload of a point."""
+    return compile_filter(filter)(point_id, payload)
+
+
+def _get_index_type(field_schema: str | dict) -> str:
+    """Type of a payload index, declared either as a type name or as parameters, e.g. of a tenant index."""
+    return field_schema["type"] if isinstance(field_schema, dict) else field_schema
+
+
+def _hashable(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+class _LocalCollection:
+    """
+    Points of a collection, kept in memory and on disk.
+    Row i of the vectors file holds the vector of point_ids[i]: deletions move the last row into the hole,
+    so the live vectors are always the first `len(point_ids)` rows and a search is a single matrix product.
+    Writes to rows are staged in pending_vectors until write_pending_vectors, so that a failed write leaves
+    the vectors file untouched.
+    Payload indexes of keyword-like fields are inverted indexes (value -> point ids) used to narrow filters
+    before evaluating them.
+    """
+
+    def __init__(self, vectors_path: Path, vector_size: int, distance: str, config: dict, payload_schema: dict):
+        self.vectors_path = vectors_path
+        self.vector_size = vector_size
+        self.distance = distance
+        self.config = config
+        self.payload_schema = payload_schema
+        self.point_ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.payloads: list[dict] = []
+        # Term weights of the sparse vectors of each point, by vector name
+        self.sparse_terms: list[dict[str, dict[int, float]]] = []
+        self.inverted_indexes: dict[str, dict[Any, set[str]]] = {}
+        # Generation of the collection in SQLite the points were loaded at
+        self.generation = ""
+        self.pending_vectors: dict[int, np.ndarray] = {}
+        self.vectors = self._open_vectors(INITIAL_CAPACITY)
+
+    def _open_vectors(self, capacity: int) -> np.memmap:
+        mode = "r+" if self.vectors_path.exists() else "w+"
+        if mode == "r+":
+            row_bytes = self.vector_size * np.dtype(np.float32).itemsize
+            capacity = max(capacity, self.vectors_path.stat().st_size // row_bytes)
+            with open(self.vectors_path, "r+b") as vectors_file:
+                vectors_file.truncate(capacity * row_bytes)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode=mode, shape=(capacity, self.vector_size))
+
+    def _ensure_capacity(self, size: int) -> None:
+        capacity = self.vectors.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        self.vectors.flush()
+        del self.vectors
+        self.vectors = self._open_vectors(capacity)
+
+    def _get_vector(self, position: int) -> np.ndarray:
+        if position in self.pending_vectors:
+            return self.pending_vectors[position]
+        return np.array(self.vectors[position])
+
+    def write_pending_vectors(self) -> None:
+        for position, vector in self.pending_vectors.items():
+            self.vectors[position] = vector
+        self.pending_vectors.clear()
+        self.vectors.flush()
+
+    def prepare_vector(self, vector: list[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        if array.shape != (self.vector_size,):
+            raise ValueError(f"Expected a vector of size {self.vector_size}, got {array.shape}")
+        if self.distance == "Cosine":
+            norm = np.linalg.norm(array)
+            if norm > 0:
+                array = array / norm
+        return array
+
+    def create_inverted_index(self, field_name: str) -> None:
+        self.inverted_indexes[field_name] = {}
+        for point_id, payload in zip(self.point_ids, self.payloads):
+            self._index_field(field_name, point_id, payload)
+
+    def _index_field(self, field_name: str, point_id: str, payload: dict) -> None:
+        for value in _get_values(payload, field_name):
+            if _hashable(value):
+                self.inverted_indexes[field_name].setdefault(value, set()).add(point_id)
+
+    def _index_point(self, point_id: str, payload: dict) -> None:
+        for field_name in self.inverted_indexes:
+            self._index_field(field_name, point_id, payload)
+
+    def _unindex_point(self, point_id: str, payload: dict) -> None:
+        for field_name, index in self.inverted_indexes.items():
+            for value in _get_values(payload, field_name):
+                if _hashable(value) and value in index:
+                    index[value].discard(point_id)
+                    if not index[value]:
+                        del index[value]
+
+    def upsert(self, point_id: str, vector: np.ndarray, payload: dict, sparse_vectors: dict[str, dict]) -> int:
+        position = self.positions.get(point_id)
+        if position is not None:
+            self._unindex_point(point_id, self.payloads[position])
+        self._index_point(point_id, payload)
+        if position is None:
+            position = len(self.point_ids)
+            self._ensure_capacity(position + 1)
+            self.point_ids.append(point_id)
+            self.payloads.append(payload)
+            self.sparse_terms.append(to_sparse_terms(sparse_vectors))
+            self.positions[point_id] = position
+        else:
+            self.payloads[position] = payload
+            self.sparse_terms[position] = to_sparse_terms(sparse_vectors)
+        self.pending_vectors[position] = vector
+        return position
+
+    def set_payload(self, point_id: str, payload: dict) -> Optional[dict]:
+        """Overwrite fields of the payload of a point. Returns the new payload, or None if the point does not exist."""
+        position = self.positions.get(point_id)
+        if position is None:
+            return None
+        self._unindex_point(point_id, self.payloads[position])
+        self.payloads[position] = {**self.payloads[position], **payload}
+        self._index_point(point_id, self.payloads[position])
+        return self.payloads[position]
+
+    def delete(self, point_id: str) -> Optional[tuple[str, int]]:
+        """Remove a point. Returns the id and new position of the point moved into its row, if any."""
+        position = self.positions.pop(point_id, None)
+        if position is None:
+            return None
+        self._unindex_point(point_id, self.payloads[position])
+        last_position = len(self.point_ids) - 1
+        moved = None
+        if position != last_position:
+            moved_id = self.point_ids[last_position]
+            self.point_ids[position] = moved_id
+            self.payloads[position] = self.payloads[last_position]
+            self.sparse_terms[position] = self.sparse_terms[last_position]
+            self.pending_vectors[position] = self._get_vector(last_position)
+            self.positions[moved_id] = position
+            moved = (moved_id, position)
+        self.pending_vectors.pop(last_position, None)
+        self.point_ids.pop()
+        self.payloads.pop()
+        self.sparse_terms.pop()
+        return moved
+
+    def _indexed_ids(self, condition: dict) -> Optional[set[str]]:
+        """Ids of the points matching an exact-match condition on an indexed field, or None if not indexed."""
+        index = self.inverted_indexes.get(condition.get("key"))
+        match = condition.get("match", {})
+        if index is None or set(condition) != {"key", "match"}:
+            return None
+        if "value" in match and _hashable(match["value"]):
+            return set(index.get(match["value"], ()))
+        if "any" in match and all(_hashable(value) for value in match["any"]):
+            return set().union(*(index.get(value, ()) for value in match["any"]))
+        return None
+
+    def _candidate_ids(self, filter: dict) -> Optional[set[str]]:
+        """
+        Ids of a superset of the points matching the filter, from its indexed top-level conditions.
+        None when no condition is indexed and every point must be checked.
+        """
+        candidates = None
+        must = filter.get("must") or []
+        for condition in [must] if isinstance(must, dict) else must:
+            ids = self._indexed_ids(condition)
+            if ids is not None:
+                candidates = ids if candidates is None else candidates & ids
+        should = filter.get("should") or []
+        should = [should] if isinstance(should, dict) else should
+        if should:
+            should_ids = [self._indexed_ids(condition) for condition in should]
+            if all(ids is not None for ids in should_ids):
+                ids = set().union(*should_ids)
+                candidates = ids if candidates is None else candidates & ids
+        return candidates
+
+    def filter_positions(self, filter: Optional[dict]) -> Optional[np.ndarray]:
+        """Positions of the points matching the filter, or None when there is no filter."""
+        if not filter:
+            return None
+        predicate = compile_filter(filter)
+        candidate_ids = self._candidate_ids(filter)
+        if candidate_ids is None:
+            candidates = enumerate(zip(self.point_ids, self.payloads))
+        else:
+            candidate_positions = sorted(self.positions[point_id] for point_id in candidate_ids)
+            candidates = ((i, (self.point_ids[i], self.payloads[i])) for i in candidate_positions)
+        return np.array(
+            [position for position, (point_id, payload) in candidates if predicate(point_id, payload)],
+            dtype=np.int64,
+        )
+
+
+class LocalVectorStore(QdrantService):
+    """
+    Embedded vector store for tests, local development and small deployments.
+    Vectors are float32 rows of a memory-mapped numpy file per collection, payloads are stored in SQLite,
+    and searches are exact (brute force) top-k with numpy. Qdrant filters are evaluated in Python.
+    It keeps the QdrantService interface and chunk formatting, so it can replace it anywhere a VectorStore is used:
+    every method of QdrantService sending a request to Qdrant is overridden, none reaches its HTTP transport.
+    Several processes (e.g. the backend and an ingestion) can share a directory: writes hold the SQLite write lock
+    and bump the generation of the collection, and the other processes reload it on their next access.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        default_schema: QdrantCollectionSchema,
+        llm_service: Optional[LLMService] = None,
+        max_chunks_to_add: int = MAX_BATCH_SIZE_FOR_CHUNK_UPLOAD,
+        embedding_store: Optional[EmbeddingStore] = None,
+    ):
+        """
+        Initialize the local vector store.
+
+        Args:
+            - path (str | Path): The directory holding the SQLite database and the vectors files.
+            - default_schema (QdrantCollectionSchema): The schema configuration for the chunk data.
+            - embedding_store (Optional[EmbeddingStore]): Embeddings of chunk contents reused when adding chunks.
+        """
+        self._llm_service = llm_service
+        self._max_chunks_to_add = max_chunks_to_add
+        self._embedding_store = embedding_store
+        self.embedding_stats = EmbeddingStats()
+        self.default_schema = default_schema
+        self._schemas: dict[str, QdrantCollectionSchema] = {}
+        self._indexed_collections: set[str] = set()
+
+        self._path = Path(path).resolve()
+        with _STORAGES_LOCK:
+            if self._path not in _STORAGES:
+                self._path.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(self._path / DATABASE_FILE_NAME, check_same_thread=False)
+                connection.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS collections (
+                        name TEXT PRIMARY KEY,
+                        config TEXT NOT NULL,
+                        payload_schema TEXT NOT NULL,
+                        generation TEXT NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS points (
+                        collection TEXT NOT NULL,
+                        point_id TEXT NOT NULL,
+                        position INTEGER NOT NULL,
+                        payload TEXT NOT NULL,
+                        sparse_vectors TEXT NOT NULL,
+                        PRIMARY KEY (collection, point_id)
+                    );
+                    """
+                )
+                _STORAGES[self._path] = {"lock": threading.RLock(), "connection": connection, "collections": {}}
+        storage = _STORAGES[self._path]
+        self._lock: threading.RLock = storage["lock"]
+        self._connection: sqlite3.Connection = storage["connection"]
+        self._collections: dict[str, _LocalCollection] = storage["collections"]
+
+    @classmethod
+    def from_defaults(
+        cls,
+        llm_service: Optional[LLMService] = None,
+        default_collection_schema: Optional[QdrantCollectionSchema] = None,
+        embedding_store: Optional[EmbeddingStore] = None,
+    ) -> "LocalVectorStore":
+        """
+        Initialize the local vector store in the directory set by the LOCAL_VECTOR_STORE_PATH environment variable.
+        """
+        if not default_collection_schema:
+            default_collection_schema = QdrantCollectionSchema(
+                chunk_id_field="chunk_id",
+                content_field="content",
+                file_id_field="file_id",
+                url_id_field="url",
+                last_edited_ts_field="last_edited_ts",
+            )
+        if not settings.LOCAL_VECTOR_STORE_PATH:
+            raise ValueError("LOCAL_VECTOR_STORE_PATH environment variable is not set.")
+        return cls(
+            path=settings.LOCAL_VECTOR_STORE_PATH,
+            default_schema=default_collection_schema,
+            llm_service=llm_service,
+            embedding_store=embedding_store,
+        )
+
+    def _vectors_path(self, collection_name: str) -> Path:
+        return self._path / f"{collection_name}.f32"
+
+    def _forget_collection(self, collection_name: str) -> None:
+        """Drop the points of the collection kept in memory and close its vectors file."""
+        collection = self._collections.pop(collection_name, None)
+        if collection is not None:
+            del collection.vectors
+
+    @contextmanager
+    def _write_transaction(self, collection_name: str) -> Iterator[None]:
+        """
+        Run writes to a collection in a transaction holding the SQLite write lock, so that the writers
+        of other processes wait for it, and bump the generation of the collection when it commits.
+        The staged vectors are written once the SQLite statements succeeded, so on failure the vectors file
+        is untouched and the collection is reloaded from SQLite on its next access.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+                generation = uuid4().hex
+                self._connection.execute(
+                    "UPDATE collections SET generation = ? WHERE name = ?", (generation, collection_name)
+                )
+                collection = self._collections.get(collection_name)
+                if collection is not None:
+                    collection.write_pending_vectors()
+                    collection.generation = generation
+                self._connection.commit()
+            except BaseException:
+                self._connection.rollback()
+                self._forget_collection(collection_name)
+                raise
+
+    def _get_collection(self, collection_name: str) -> _LocalCollection:
+        """Return the collection, loading it from disk on first access and after another process wrote to it."""
+        row = self._connection.execute(
+            "SELECT config, payload_schema, generation FROM collections WHERE name = ?", (collection_name,)
+        ).fetchone()
+        if row is None:
+            self._forget_collection(collection_name)
+            raise ValueError(f"Collection {collection_name} does not exist.")
+        collection = self._collections.get(collection_name)
+        if collection is not None and collection.generation == row[2]:
+            return collection
+        # The collection was written, or deleted and created again, by another process
+        self._forget_collection(collection_name)
+        config = json.loads(row[0])
+        collection = _LocalCollection(
+            vectors_path=self._vectors_path(collection_name),
+            vector_size=config["vectors"]["size"],
+            distance=config["vectors"]["distance"],
+            config=config,
+            payload_schema=json.loads(row[1]),
+        )
+        collection.generation = row[2]
+        for point_id, payload, sparse_vectors in self._connection.execute(
+            "SELECT point_id, payload, sparse_vectors FROM points WHERE collection = ? ORDER BY position",
+            (collection_name,),
+        ):
+            collection.positions[point_id] = len(collection.point_ids)
+            collection.point_ids.append(point_id)
+            collection.payloads.append(json.loads(payload))
+            collection.sparse_terms.append(to_sparse_terms(json.loads(sparse_vectors)))
+        for field_name, field_schema in collection.payload_schema.items():
+            if _get_index_type(field_schema) in INVERTED_INDEX_TYPES:
+                collection.create_inverted_index(field_name)
+        self._collections[collection_name] = collection
+        return collection
+
+    def collection_exists(self, collection_name: str) -> bool:
+        with self._lock:
+            row = self._connection.execute("SELECT 1 FROM collections WHERE name = ?", (collection_name,)).fetchone()
+            return row is not None
+
+    def create_collection(
+        self,
+        collection_name: str,
+        vector_size: Optional[int] = None,
+        distance: str = "Cosine",
+    ) -> bool:
+        """
+        Create a new collection, with the sparse vector of its schema if it has one.
+        Searches are exact: the quantization and HNSW options of the schema are ignored.
+
+        Args:
+            collection_name (str): The name of the collection to create.
+            vector_size (Optional[int]): The size of the vectors to store in the collection.
+            Defaults to the embedding dimensions of the schema, or 3072.
+            distance (str): The distance metric to use for the collection, "Cosine" or "Dot".
+        """
+        if not COLLECTION_NAME_PATTERN.match(collection_name):
+            raise ValueError(f"Invalid collection name: {collection_name}")
+        if distance not in SUPPORTED_DISTANCES:
+            raise ValueError(f"Unsupported distance {distance}, expected one of {SUPPORTED_DISTANCES}")
+        with self._lock:
+            schema = self._get_schema(collection_name)
+            vector_size = vector_size or schema.embedding_dimensions or DEFAULT_VECTOR_SIZE
+            config = {"vectors": {"size": vector_size, "distance": distance}}
+            if schema.sparse_vector_name:
+                config["sparse_vectors"] = {schema.sparse_vector_name: {"modifier": "idf"}}
+            with self._write_transaction(collection_name):
+                if self.collection_exists(collection_name):
+                    LOGGER.error(f"Collection {collection_name} already exists.")
+                    return False
+                # Points of a collection of the same name deleted by another process
+                self._forget_collection(collection_name)
+                self._vectors_path(collection_name).unlink(missing_ok=True)
+                self._connection.execute(
+                    "INSERT INTO collections (name, config, payload_schema, generation) VALUES (?, ?, ?, ?)",
+                    (collection_name, json.dumps(config), json.dumps({}), ""),
+                )
+            LOGGER.info(f"Created local collection {collection_name}")
+            self._indexed_collections.discard(collection_name)
+            self.ensure_payload_indexes(collection_name)
+            return True
+
+    def get_collection_params(self, collection_name: str) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._get_collection(collection_name).config))
+
+    def get_collection_config(self, collection_name: str) -> dict:
+        return {"params": self.get_collection_params(collection_name)}
+
+    def check_vector_options(self, collection_name: str) -> list[str]:
+        """Searches are exact: the quantization, on_disk and HNSW options of the schema are ignored."""
+        return []
+
+    def get_sparse_vector_names(self, collection_name: str) -> list[str]:
+        with self._lock:
+            return list((self._get_collection(collection_name).config.get("sparse_vectors") or {}).keys())
+
+    def delete_collection(self, collection_name: str) -> bool:
+        with self._write_transaction(collection_name):
+            self._forget_collection(collection_name)
+            self._connection.execute("DELETE FROM points WHERE collection = ?", (collection_name,))
+            self._connection.execute("DELETE FROM collections WHERE name = ?", (collection_name,))
+            self._vectors_path(collection_name).unlink(missing_ok=True)
+        self._indexed_collections.discard(collection_name)
+        LOGGER.info(f"Deleted local collection {collection_name}")
+        return True
+
+    def list_collection_names(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT name FROM collections ORDER BY name")]
+
+    def get_payload_schema(self, collection_name: str) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._get_collection(collection_name).payload_schema)
+
+    def create_payload_index(
+        self, collection_name: str, field_name: str, field_schema: str | dict = "keyword"
+    ) -> None:
+        with self._write_transaction(collection_name):
+            collection = self._get_collection(collection_name)
+            collection.payload_schema[field_name] = field_schema
+            if _get_index_type(field_schema) in INVERTED_INDEX_TYPES:
+                collection.create_inverted_index(field_name)
+            self._connection.execute(
+                "UPDATE collections SET payload_schema = ? WHERE name = ?",
+                (json.dumps(collection.payload_schema), collection_name),
+            )
+
+    def insert_points_in_collection(
+        self,
+        points: list[dict],
+        collection_name: str,
+    ) -> bool:
+        """
+        Upsert points, in the same format as Qdrant: {"id": ..., "payload": {...}, "vector": [...]},
+        where "vector" can also be a dict of named vectors with the dense vector under the "" name.
+        """
+        with self._write_transaction(collection_name):
+            collection = self._get_collection(collection_name)
+            # Vectors are checked before any point is written, so a bad point does not leave half a batch
+            prepared_points = []
+            for point in points:
+                vector = point["vector"]
+                sparse_vectors = {}
+                if isinstance(vector, dict):
+                    sparse_vectors = {name: value for name, value in vector.items() if name != ""}
+                    vector = vector[""]
+                prepared_points.append(
+                    (str(point["id"]), collection.prepare_vector(vector), point.get("payload") or {}, sparse_vectors)
+                )
+            rows = []
+            for point_id, vector, payload, sparse_vectors in prepared_points:
+                position = collection.upsert(point_id, vector, payload, sparse_vectors)
+                rows.append((collection_name, point_id, position, json.dumps(payload), json.dumps(sparse_vectors)))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO points (collection, point_id, position, payload, sparse_vectors) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            LOGGER.info(f"Upserted {len(points)} points in local collection {collection_name}")
+            return True
+
+    def delete_points(
+        self,
+        point_ids: list[str],
+        collection_name: str,
+    ) -> bool:
+        if not point_ids:
+            LOGGER.error("No points provided")
+            return False
+        with self._write_transaction(collection_name):
+            collection = self._get_collection(collection_name)
+            moved_points = {}
+            for point_id in map(str, point_ids):
+                moved = collection.delete(point_id)
+                moved_points.pop(point_id, None)
+                if moved:
+                    moved_points[moved[0]] = moved[1]
+            self._connection.executemany(
+                "DELETE FROM points WHERE collection = ? AND point_id = ?",
+                [(collection_name, str(point_id)) for point_id in point_ids],
+            )
+            self._connection.executemany(
+                "UPDATE points SET position = ? WHERE collection = ? AND point_id = ?",
+                [(position, collection_name, point_id) for point_id, position in moved_points.items()],
+            )
+            LOGGER.info(f"Deleted {len(point_ids)} points from local collection {collection_name}")
+            return True
+
+    def delete_points_by_filter(self, filter: dict, collection_name: str) -> bool:
+        if not self._get_schema(collection_name).get_tenant_filter(filter):
+            raise ValueError("A filter is required to delete points.")
+        with self._lock:
+            point_ids = [point["id"] for point in self.get_points(collection_name, filter=filter)]
+            return not point_ids or self.delete_points(point_ids, collection_name)
+
+    def set_payloads(self, payloads: dict[str, dict], collection_name: str) -> bool:
+        with self._write_transaction(collection_name):
+            collection = self._get_collection(collection_name)
+            rows = []
+            for point_id, payload in payloads.items():
+                new_payload = collection.set_payload(str(point_id), payload)
+                if new_payload is not None:
+                    rows.append((json.dumps(new_payload), collection_name, str(point_id)))
+            self._connection.executemany(
+                "UPDATE points SET payload = ? WHERE collection = ? AND point_id = ?",
+                rows,
+            )
+            LOGGER.info(f"Updated the payload of {len(rows)} points in local collection {collection_name}")
+            return True
+
+    def count_points(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+    ) -> int:
+        filter = self._get_schema(collection_name).get_tenant_filter(filter)
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            positions = collection.filter_positions(filter)
+            return len(collection.point_ids) if positions is None else len(positions)
+
+    def get_points(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+    ) -> list[dict]:
+        filter = self._get_schema(collection_name).get_tenant_filter(filter)
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            positions = collection.filter_positions(filter)
+            if positions is None:
+                positions = range(len(collection.point_ids))
+            return [{"id": collection.point_ids[i], "payload": collection.payloads[i]} for i in positions]
+
+    def scroll_points(
+        self,
+        collection_name: str,
+        limit: int = 1000,
+        offset: Optional[str | int] = None,
+        filter: Optional[dict] = None,
+        with_vectors: bool = False,
+    ) -> tuple[list[dict], Optional[str | int]]:
+        """
+        Same as QdrantService.scroll_points, but points come in storage order and offsets are positions
+        among the matching points, so pages are consistent as long as the collection is not modified.
+        Cosine vectors are returned normalized, as Qdrant does.
+        """
+        filter = self._get_schema(collection_name).get_tenant_filter(filter)
+        start = int(offset or 0)
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            positions = collection.filter_positions(filter)
+            if positions is None:
+                positions = range(len(collection.point_ids))
+            page = positions[start : start + limit]
+            sparse_vector_names = list((collection.config.get("sparse_vectors") or {}).keys())
+            points = []
+            for i in page:
+                point = {"id": collection.point_ids[i], "payload": collection.payloads[i]}
+                if with_vectors:
+                    vector = collection.vectors[i].tolist()
+                    if sparse_vector_names:
+                        vector = {"": vector}
+                        for name in sparse_vector_names:
+                            terms = collection.sparse_terms[i].get(name, {})
+                            vector[name] = {"indices": list(terms.keys()), "values": list(terms.values())}
+                    point["vector"] = vector
+                points.append(point)
+            next_offset = start + limit if start + limit < len(positions) else None
+            return points, next_offset
+
+    def get_chunk_data_by_id(
+        self,
+        vector_ids: list[str],
+        collection_name: str,
+    ) -> list[dict]:
+        if not vector_ids:
+            raise ValueError("The list of point IDs cannot be empty.")
+        schema = self._get_schema(collection_name)
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            positions = [collection.positions.get(str(vector_id)) for vector_id in vector_ids]
+            return [
+                {"id": collection.point_ids[i], "payload": collection.payloads[i]}
+                for i in positions
+                if i is not None and schema.is_tenant_payload(collection.payloads[i])
+            ]
+
+    @staticmethod
+    def _top_k(
+        scores: np.ndarray,
+        positions: np.ndarray,
+        point_ids: list[str],
+        limit: int,
+        offset: int = 0,
+        score_threshold: Optional[float] = None,
+    ) -> list[tuple[str, float]]:
+        number_results = min(limit + offset, len(scores))
+        if number_results <= 0:
+            return []
+        best = np.argpartition(-scores, number_results - 1)[:number_results]
+        best = best[np.argsort(-scores[best], kind="stable")][offset:]
+        return [
+            (point_ids[positions[i]], float(scores[i]))
+            for i in best
+            if score_threshold is None or scores[i] >= score_threshold
+        ]
+
+    def search_vectors(
+        self,
+        query_vector: list[float],
+        collection_name: str,
+        filter: Optional[dict] = None,
+        limit: int = 10,
+        offset: int = 0,
+        score_threshold: Optional[float] = None,
+        **search_params,
+    ) -> list[tuple[str, float]]:
+        """Exact top-k search of the dense vectors. Qdrant-only search params (e.g. "params") are ignored."""
+        filter = self._get_schema(collection_name).get_tenant_filter(filter)
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            query = collection.prepare_vector(query_vector)
+            number_points = len(collection.point_ids)
+            # Scoring every point then selecting is faster than gathering the rows of the filtered points
+            scores = collection.vectors[:number_points] @ query
+            positions = collection.filter_positions(filter)
+            if positions is None:
+                positions = np.arange(number_points)
+            else:
+                scores = scores[positions]
+            return self._top_k(scores, positions, collection.point_ids, limit, offset, score_threshold)
+
+    def search_sparse_vectors(
+        self,
+        query_sparse_vector: dict[str, list],
+        collection_name: str,
+        filter: Optional[dict] = None,
+        limit: int = 10,
+        offset: int = 0,
+        score_threshold: Optional[float] = None,
+        **search_params,
+    ) -> list[tuple[str, float]]:
+        """Sparse search with the "idf" modifier: idf is computed over all the points of the collection."""
+        schema = self._get_schema(collection_name)
+        if not schema.sparse_vector_name:
+            raise ValueError(f"Collection {collection_name} has no sparse vector in its schema.")
+        if not query_sparse_vector["indices"]:
+            return []
+        filter = schema.get_tenant_filter(filter)
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            if schema.sparse_vector_name not in (collection.config.get("sparse_vectors") or {}):
+                raise ValueError(f"Collection {collection_name} has no sparse vector {schema.sparse_vector_name}.")
+            documents = [sparse_terms.get(schema.sparse_vector_name, {}) for sparse_terms in collection.sparse_terms]
+            number_points = len(documents)
+            query_weights = {}
+            for index, value in zip(query_sparse_vector["indices"], query_sparse_vector["values"]):
+                frequency = sum(1 for document in documents if index in document)
+                if frequency:
+                    idf = math.log((number_points - frequency + 0.5) / (frequency + 0.5) + 1)
+                    query_weights[index] = idf * value
+            positions = collection.filter_positions(filter)
+            if positions is None:
+                positions = np.arange(number_points)
+            scores = np.array(
+                [
+                    sum(weight * documents[position].get(index, 0.0) for index, weight in query_weights.items())
+                    for position in positions
+                ],
+                dtype=np.float32,
+            )
+            matching = scores > 0
+            return self._top_k(
+                scores[matching], positions[matching], collection.point_ids, limit, offset, score_threshold
+            )
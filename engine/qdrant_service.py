@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, Any
+from typing import Any, Callable, Optional
 from dataclasses import dataclass
 import uuid
 
@@ -7,19 +7,39 @@ import requests
 import pandas as pd
 
 from engine.agent.agent import SourceChunk
+from engine.embedding_store import EmbeddingStats, EmbeddingStore, get_content_hash
+from engine.lexical import build_sparse_vector
 from engine.llm_services.llm_service import LLMService
 from settings import settings
 
 LOGGER = logging.getLogger(__name__)
 
 DEFAULT_MAX_CHUNKS = 10
+DEFAULT_VECTOR_SIZE = 3072
 MAX_BATCH_SIZE_FOR_CHUNK_UPLOAD = 50
+MAX_PAYLOAD_OPERATIONS_PER_BATCH = 500
+DEFAULT_SPARSE_VECTOR_NAME = "text-sparse"
+SUPPORTED_QUANTIZATIONS = (None, "int8")
+SUPPORTED_PAYLOAD_INDEX_TYPES = ("keyword", "integer", "float", "bool", "datetime", "text", "uuid")
+# Candidates fetched per result with quantized vectors, before rescoring them with the original vectors
+DEFAULT_OVERSAMPLING = 2.0
+# Name of the unnamed (default) dense vector when a point also carries named vectors
+DEFAULT_DENSE_VECTOR_NAME = ""
+# HNSW graphs built per tenant rather than over the whole collection, as all searches are filtered by tenant
+TENANT_HNSW_CONFIG = {"payload_m": 16, "m": 0}
+
+
+def _values_differ(merged_df: pd.DataFrame, field: str) -> pd.Series:
+    """Compare the new and old values of a field in a merged DataFrame. Missing values are equal."""
+    new_values, old_values = merged_df[field + "_new"], merged_df[field + "_old"]
+    return (new_values != old_values) & ~(new_values.isna() & old_values.isna())
 
 
 @dataclass
 class QdrantCollectionSchema:
     """
-    Dataclass model for storing the names of the fields in a Qdrant collection.
+    Dataclass model for storing the names of the fields in a Qdrant collection,
+    and the options of its vectors.
 
     Args:
         - chunk_id_field (str): The name of the column in the Qdrant collection
@@ -34,6 +54,26 @@ class QdrantCollectionSchema:
             the timestamp of the last edit of the chunk.
         - metadata_fields_to_keep (Optional[set[str]]): A set of metadata field names
         to keep. If None, only the fields listed above will be kept.
+        - sparse_vector_name (Optional[str]): The name of the sparse vector holding the
+        lexical term weights of the chunk content. If None, the collection only has dense vectors.
+        - embedding_dimensions (Optional[int]): The size of the dense vectors, when the embedding model
+        is asked for shortened embeddings (e.g. 1024 or 256 for text-embedding-3-large). If None, the
+        model's full size is used.
+        - quantization (Optional[str]): "int8" to keep scalar quantized vectors in RAM next to the
+        original ones, which cuts the RAM used by searches by 4.
+        - on_disk (bool): Store the original vectors on disk (memmap) rather than in RAM.
+        - hnsw_m (Optional[int]), hnsw_ef_construct (Optional[int]): HNSW index parameters of the collection.
+        If None, Qdrant defaults are used.
+        The quantization, on_disk and HNSW options are options of the collection, set when it is created:
+        the sources of a shared collection all use the options of the source that created it.
+        - oversampling (Optional[float]): With quantization, fetch `oversampling * limit` candidates with
+        the quantized vectors and rescore them with the original ones at query time.
+        - payload_indexes (Optional[dict[str, str]]): Payload index types (e.g. "keyword", "integer", "datetime")
+        of fields used in filters. The chunk id and file id fields are always indexed as keywords,
+        the last edited timestamp as a datetime, and the other metadata fields as keywords unless listed here.
+        - tenant_fields (Optional[dict[str, str]]): Payload values identifying the owner of the chunks
+        (e.g. {"organization_id": ..., "source_id": ...}) when several sources share a collection. They are
+        written in every point and indexed as tenants, and every search, count and deletion is restricted to them.
     """
 
     chunk_id_field: str
@@ -42,13 +82,27 @@ class QdrantCollectionSchema:
     url_id_field: Optional[str] = None
     last_edited_ts_field: Optional[str] = None  # To keep compatibility with Juno data
     metadata_fields_to_keep: Optional[set[str]] = None  # To keep compatibility with Juno data
+    sparse_vector_name: Optional[str] = None
+    embedding_dimensions: Optional[int] = None
+    quantization: Optional[str] = None
+    on_disk: bool = False
+    hnsw_m: Optional[int] = None
+    hnsw_ef_construct: Optional[int] = None
+    oversampling: Optional[float] = None
+    payload_indexes: Optional[dict[str, str]] = None
+    tenant_fields: Optional[dict[str, str]] = None
 
     def __post_init__(self):
         """
         Validate field names after initialization.
         """
+        if self.quantization not in SUPPORTED_QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization: {self.quantization}")
+        for field_schema in (self.payload_indexes or {}).values():
+            if field_schema not in SUPPORTED_PAYLOAD_INDEX_TYPES:
+                raise ValueError(f"Unsupported payload index type: {field_schema}")
         for field_name, field_value in self.__dict__.items():
-            if field_value is None:
+            if field_value is None or isinstance(field_value, (bool, int, float)):
                 continue
             if isinstance(field_value, str):
                 values = [field_value]
@@ -60,6 +114,48 @@ class QdrantCollectionSchema:
                         f"For field '{field_name}', the value '{value}' in QdrantCollectionSchema is not lowercase."
                     )
 
+    def get_payload_index_types(self) -> dict[str, str | dict]:
+        """Return the payload index type of every field of the schema that can be used in filters."""
+        index_types = {field: "keyword" for field in self.metadata_fields_to_keep or []}
+        if self.last_edited_ts_field:
+            index_types[self.last_edited_ts_field] = "datetime"
+        index_types.update(self.payload_indexes or {})
+        index_types[self.chunk_id_field] = "keyword"
+        if self.file_id_field:
+            index_types[self.file_id_field] = "keyword"
+        for field in self.tenant_fields or {}:
+            index_types[field] = {"type": "keyword", "is_tenant": True}
+        return index_types
+
+    def get_payload_fields(self) -> list[str]:
+        """Return the fields of a chunk stored in the payload of its point."""
+        payload_fields = [self.chunk_id_field, self.content_field, self.file_id_field]
+        if self.url_id_field:
+            payload_fields.append(self.url_id_field)
+        if self.last_edited_ts_field:
+            payload_fields.append(self.last_edited_ts_field)
+        payload_fields.extend(field for field in self.metadata_fields_to_keep or [] if field not in payload_fields)
+        return payload_fields
+
+    def get_tenant_filter(self, filter: Optional[dict] = None) -> Optional[dict]:
+        """Restrict a filter to the points of the tenant of the schema, if it has one."""
+        if not self.tenant_fields:
+            return filter
+        conditions = [{"key": field, "match": {"value": value}} for field, value in self.tenant_fields.items()]
+        if filter:
+            conditions.append(filter)
+        return {"must": conditions}
+
+    def get_point_id(self, chunk_id: str) -> str:
+        """Id of the point of a chunk. Chunk ids are only unique within a tenant, so the tenant is part of it."""
+        if self.tenant_fields:
+            chunk_id = "/".join([*self.tenant_fields.values(), chunk_id])
+        return str(uuid.uuid5(uuid.NAMESPACE_DNS, chunk_id))
+
+    def is_tenant_payload(self, payload: dict) -> bool:
+        """Check that a payload belongs to the tenant of the schema."""
+        return all(payload.get(field) == value for field, value in (self.tenant_fields or {}).items())
+
     def to_dict(self) -> dict:
         """
         Convert the QdrantCollectionSchema to a dictionary.
@@ -85,6 +181,7 @@ class QdrantService:
         default_schema: QdrantCollectionSchema,
         llm_service: Optional[LLMService] = None,
         max_chunks_to_add: int = MAX_BATCH_SIZE_FOR_CHUNK_UPLOAD,
+        embedding_store: Optional[EmbeddingStore] = None,
     ):
         """
         Initialize the Qdrant service.
@@ -94,15 +191,20 @@ class QdrantService:
             - qdrant_cluster_url (str): The URL of the Qdrant cluster.
             - collection_name (str): The name of the collection in Qdrant.
             - collection_schema (QdrantCollectionSchema): The schema configuration for the chunk data.
+            - embedding_store (Optional[EmbeddingStore]): Embeddings of chunk contents reused when adding chunks.
         """
 
         self._headers = {"api-key": qdrant_api_key, "Content-Type": "application/json"}
         self._base_url = qdrant_cluster_url
         self._llm_service = llm_service
         self._max_chunks_to_add = max_chunks_to_add
+        self._embedding_store = embedding_store
+        self.embedding_stats = EmbeddingStats()
 
         self.default_schema = default_schema
         self._schemas: dict[str, QdrantCollectionSchema] = {}
+        # Collections whose payload indexes were checked by this instance
+        self._indexed_collections: set[str] = set()
 
     def register_schema(self, collection_name: str, schema: QdrantCollectionSchema):
         """
@@ -113,6 +215,7 @@ class QdrantService:
             schema (QdrantCollectionSchema): The schema for the collection.
         """
         self._schemas[collection_name] = schema
+        self._indexed_collections.discard(collection_name)
 
     def _get_schema(self, collection_name: str) -> QdrantCollectionSchema:
         """
@@ -128,6 +231,7 @@ class QdrantService:
         cls,
         llm_service: Optional[LLMService] = None,
         default_collection_schema: Optional[QdrantCollectionSchema] = None,
+        embedding_store: Optional[EmbeddingStore] = None,
     ) -> "QdrantService":
         """
         Initialize the Qdrant service using the default settings from the environment variables.
@@ -149,6 +253,7 @@ class QdrantService:
             qdrant_cluster_url=settings.QDRANT_CLUSTER_URL,
             default_schema=default_collection_schema,
             llm_service=llm_service,
+            embedding_store=embedding_store,
         )
 
     def _send_request(
@@ -208,8 +313,10 @@ class QdrantService:
         Returns:
             list[str]: A list of vector IDs from the search results.
         """
-        if filter is None:
-            filter = {}
+        schema = self._get_schema(collection_name)
+        filter = schema.get_tenant_filter(filter) or {}
+        if schema.quantization and schema.oversampling and "params" not in search_params:
+            search_params["params"] = {"quantization": {"rescore": True, "oversampling": schema.oversampling}}
 
         payload = {
             "vector": query_vector,
@@ -224,6 +331,42 @@ class QdrantService:
         vector_results = [(result["id"], result["score"]) for result in response.get("result", [])]
         return vector_results
 
+    def search_sparse_vectors(
+        self,
+        query_sparse_vector: dict[str, list],
+        collection_name: str,
+        filter: Optional[dict] = None,
+        **search_params,
+    ) -> list[tuple[str, float]]:
+        """
+        Search the named sparse vectors of the Qdrant collection.
+
+        Args:
+            query_sparse_vector (dict): The query vector, as {"indices": [...], "values": [...]}.
+            collection_name (str): The name of the collection to search in.
+            filter (Optional[dict]): A filter to apply to the search query.
+            search_params (dict): Additional search parameters, such as 'limit', etc.
+
+        Returns:
+            list[tuple[str, float]]: The IDs and scores of the matching points.
+        """
+        schema = self._get_schema(collection_name)
+        if not schema.sparse_vector_name:
+            raise ValueError(f"Collection {collection_name} has no sparse vector in its schema.")
+        if not query_sparse_vector["indices"]:
+            return []
+        payload = {
+            "vector": {"name": schema.sparse_vector_name, "vector": query_sparse_vector},
+            "filter": schema.get_tenant_filter(filter) or {},
+            **search_params,
+        }
+        response = self._send_request(
+            method="POST",
+            endpoint=f"collections/{collection_name}/points/search",
+            payload=payload,
+        )
+        return [(result["id"], result["score"]) for result in response.get("result", [])]
+
     def get_chunk_data_by_id(
         self,
         vector_ids: list[str],
@@ -231,6 +374,7 @@ class QdrantService:
     ) -> list[dict]:
         """
         Retrieve data for a list of point IDs from the Qdrant collection.
+        Points of other tenants than the one of the collection schema are left out.
         Refer to the Qdrant API documentation for more details:
         https://api.qdrant.tech/api-reference/points/get-points
         """
@@ -248,8 +392,8 @@ class QdrantService:
             endpoint=f"collections/{collection_name}/points",
             payload=payload,
         )
-
-        return response.get("result", [])
+        schema = self._get_schema(collection_name)
+        return [point for point in response.get("result", []) if schema.is_tenant_payload(point.get("payload") or {})]
 
     def _build_vectors(self, input_text: str | list[str]) -> list[list[float]]:
         """Build an embedding vector for the given text using the OpenAI API."""
@@ -258,6 +402,69 @@ class QdrantService:
             input_embeddings = [input_text]
         return [data.embedding for data in self._llm_service.embed(input_embeddings)]
 
+    def _embed_contents(self, contents: list[str]) -> list[list[float]]:
+        """
+        Embed chunk contents, each distinct text once, reusing the embeddings of the embedding store
+        and adding the new ones to it.
+        """
+        content_hashes = [get_content_hash(content) for content in contents]
+        embeddings = {}
+        if self._embedding_store:
+            model, dimensions = self._llm_service._embedding_model, self._llm_service._embedding_dimensions
+            embeddings = self._embedding_store.get_embeddings(model, dimensions, list(set(content_hashes)))
+        contents_to_embed = {
+            content_hash: content
+            for content_hash, content in zip(content_hashes, contents)
+            if content_hash not in embeddings
+        }
+        if contents_to_embed:
+            new_embeddings = dict(zip(contents_to_embed, self._build_vectors(list(contents_to_embed.values()))))
+            if self._embedding_store:
+                self._embedding_store.add_embeddings(model, dimensions, new_embeddings)
+            embeddings.update(new_embeddings)
+            self.embedding_stats.api_calls += 1
+        self.embedding_stats.texts += len(contents)
+        self.embedding_stats.embedded_texts += len(contents_to_embed)
+        return [embeddings[content_hash] for content_hash in content_hashes]
+
+    def _build_sparse_vector(self, input_text: str, is_query: bool = False) -> dict[str, list]:
+        return build_sparse_vector(input_text, is_query=is_query)
+
+    def search_similar_ids(
+        self,
+        query_text: str,
+        collection_name: str,
+        limit: int = DEFAULT_MAX_CHUNKS,
+        filter: Optional[dict] = None,
+        **search_params,
+    ) -> list[tuple[str, float]]:
+        """Dense search of the points closest to the embedding of the given text."""
+        query_vector = self._build_vectors(query_text)[0]
+        return self.search_vectors(
+            query_vector=query_vector,
+            collection_name=collection_name,
+            filter=filter,
+            **search_params,
+            limit=limit,
+        )
+
+    def search_lexical_ids(
+        self,
+        query_text: str,
+        collection_name: str,
+        limit: int = DEFAULT_MAX_CHUNKS,
+        filter: Optional[dict] = None,
+        **search_params,
+    ) -> list[tuple[str, float]]:
+        """Sparse search of the points sharing the most (rare) terms with the given text."""
+        return self.search_sparse_vectors(
+            query_sparse_vector=self._build_sparse_vector(query_text, is_query=True),
+            collection_name=collection_name,
+            filter=filter,
+            **search_params,
+            limit=limit,
+        )
+
     def retrieve_similar_chunks(
         self,
         query_text: str,
@@ -270,32 +477,40 @@ class QdrantService:
         Search for chunks similar to the given text.
         Additional search parameters can be passed as keyword arguments such as limit, filters, etc.
         """
-        schema = self._get_schema(collection_name)
-        query_vector = self._build_vectors(query_text)[0]
-        vector_results = self.search_vectors(
-            query_vector=query_vector,
+        vector_results = self.search_similar_ids(
+            query_text=query_text,
             collection_name=collection_name,
+            limit=limit,
             filter=filter,
             **search_params,
-            limit=limit,
         )
         if not vector_results:
             LOGGER.warning(f"No similar vectors found for query: {query_text}")
             return []
-        vector_ids, scores = zip(*vector_results)
-        LOGGER.debug(f"Retrieved similar vectors with IDs: {vector_ids}")
-        if len(vector_ids) == 0:
-            LOGGER.warning(f"No document matched the filtering criteria {filter}.")
+        return self.get_chunks_by_ids(vector_results, collection_name=collection_name)
+
+    def get_chunks_by_ids(
+        self,
+        vector_results: list[tuple[str, float]],
+        collection_name: str,
+    ) -> list[SourceChunk]:
+        """Fetch the payloads of scored points and build the chunks, keeping the order of the results."""
+        if not vector_results:
             return []
+        schema = self._get_schema(collection_name)
+        vector_ids = [vector_id for vector_id, _ in vector_results]
+        LOGGER.debug(f"Retrieved similar vectors with IDs: {vector_ids}")
         results = self.get_chunk_data_by_id(collection_name=collection_name, vector_ids=vector_ids)
+        results_by_id = {str(result["id"]): result for result in results}
 
         chunks: list[SourceChunk] = []
-        for result, score in zip(results, scores):
+        for vector_id, score in vector_results:
+            result = results_by_id.get(str(vector_id), {})
             if not (chunk_data := result.get("payload")):
                 continue
 
-            query_text = chunk_data.get(schema.content_field)
-            if not query_text:
+            content = chunk_data.get(schema.content_field)
+            if not content:
                 LOGGER.warning(f"Missing text for chunk: {chunk_data}")
                 continue
 
@@ -308,24 +523,51 @@ class QdrantService:
                 SourceChunk(
                     name=chunk_data.get(schema.chunk_id_field, ""),
                     document_name=chunk_data.get(schema.file_id_field, ""),
-                    content=query_text,
+                    content=content,
                     url=str(chunk_data.get(schema.url_id_field, "")),
                     metadata=metadata,
                 )
             )
         return chunks
 
-    def check_index_exists(self, collection_name: str, index_name: str) -> bool:
+    def get_payload_schema(self, collection_name: str) -> dict[str, Any]:
+        """Return the payload indexes of the collection, by field name."""
         results = self._send_request(method="GET", endpoint=f"/collections/{collection_name}")
-        payload_schema = results.get("result", {}).get("payload_schema", {})
-        return index_name in payload_schema
+        return results.get("result", {}).get("payload_schema", {})
+
+    def create_payload_index(
+        self, collection_name: str, field_name: str, field_schema: str | dict = "keyword"
+    ) -> None:
+        LOGGER.info(f"Creating {field_schema} index '{field_name}' for collection '{collection_name}'")
+        endpoint = f"/collections/{collection_name}/index?wait=true"
+        payload = {"field_name": field_name, "field_schema": field_schema}
+        self._send_request(method="PUT", endpoint=endpoint, payload=payload)
+
+    def check_index_exists(self, collection_name: str, index_name: str) -> bool:
+        return index_name in self.get_payload_schema(collection_name)
 
-    def create_index_if_needed(self, collection_name: str, index_name: str) -> None:
+    def create_index_if_needed(self, collection_name: str, index_name: str, field_schema: str = "keyword") -> None:
         if not self.check_index_exists(collection_name, index_name):
-            LOGGER.info(f"Creating index '{index_name}' for collection '{collection_name}'")
-            endpoint = f"/collections/{collection_name}/index"
-            payload = {"field_name": index_name, "field_schema": "keyword"}
-            self._send_request(method="PUT", endpoint=endpoint, payload=payload)
+            self.create_payload_index(collection_name, index_name, field_schema)
+
+    def ensure_payload_indexes(self, collection_name: str) -> list[str]:
+        """
+        Create the payload indexes of the schema missing from the collection, so that filtered searches
+        do not scan every payload. It is idempotent, and only checks the collection once per instance.
+
+        Returns:
+            list[str]: The names of the created indexes.
+        """
+        if collection_name in self._indexed_collections:
+            return []
+        existing_indexes = self.get_payload_schema(collection_name)
+        created_indexes = []
+        for field_name, field_schema in self._get_schema(collection_name).get_payload_index_types().items():
+            if field_name not in existing_indexes:
+                self.create_payload_index(collection_name, field_name, field_schema)
+                created_indexes.append(field_name)
+        self._indexed_collections.add(collection_name)
+        return created_indexes
 
     def add_chunks(
         self,
@@ -344,27 +586,22 @@ class QdrantService:
             str: The status of the operation.
         """
         schema = self._get_schema(collection_name)
-        self.create_index_if_needed(collection_name, index_name=schema.chunk_id_field)
+        self.ensure_payload_indexes(collection_name)
         for i in range(0, len(list_chunks), self._max_chunks_to_add):
             current_chunk_batch = list_chunks[i : i + self._max_chunks_to_add]
-            list_embeddings = self._build_vectors([chunk[schema.content_field] for chunk in current_chunk_batch])
-            metadata_to_keep = set(schema.metadata_fields_to_keep or [])
-            url_field = {schema.url_id_field} if schema.url_id_field else {}
-            payload_fields = {
-                schema.chunk_id_field,
-                schema.content_field,
-                schema.file_id_field,
-                *url_field,
-                *metadata_to_keep,
-            }
-            if schema.last_edited_ts_field:
-                payload_fields.add(schema.last_edited_ts_field)
+            list_embeddings = self._embed_contents([chunk[schema.content_field] for chunk in current_chunk_batch])
+            if schema.sparse_vector_name:
+                list_embeddings = [
+                    {
+                        DEFAULT_DENSE_VECTOR_NAME: embedding,
+                        schema.sparse_vector_name: self._build_sparse_vector(chunk[schema.content_field]),
+                    }
+                    for chunk, embedding in zip(current_chunk_batch, list_embeddings)
+                ]
             list_payloads = [
                 {
-                    "id": self.get_uuid(chunk[schema.chunk_id_field]),
-                    "payload": {
-                        **{field: chunk[field] for field in payload_fields},
-                    },
+                    "id": schema.get_point_id(chunk[schema.chunk_id_field]),
+                    "payload": self._build_payload(schema, chunk),
                     "vector": vector,
                 }
                 for chunk, vector in zip(current_chunk_batch, list_embeddings)
@@ -378,6 +615,11 @@ class QdrantService:
         LOGGER.info(f"Added {len(list_chunks)} chunks to the collection")
         return True
 
+    @staticmethod
+    def _build_payload(schema: QdrantCollectionSchema, chunk: dict[str, Any]) -> dict[str, Any]:
+        """Build the payload of the point of a chunk, from the fields of the schema."""
+        return {**{field: chunk[field] for field in schema.get_payload_fields()}, **(schema.tenant_fields or {})}
+
     def delete_chunks(
         self,
         point_ids: list[str],
@@ -386,12 +628,11 @@ class QdrantService:
     ) -> bool:
         """Delete chunks from the Qdrant collection based on the list
         of IDs for a given field name."""
-        filter_on_qdrant_field = {"should": [{"key": id_field, "match": {"any": point_ids}}]}
-        points = self.get_points(filter=filter_on_qdrant_field, collection_name=collection_name)
-        return self.delete_points(
-            point_ids=[point["id"] for point in points],
-            collection_name=collection_name,
-        )
+        if not point_ids:
+            LOGGER.error("No points provided")
+            return False
+        filter_on_qdrant_field = {"should": [{"key": id_field, "match": {"any": list(point_ids)}}]}
+        return self.delete_points_by_filter(filter=filter_on_qdrant_field, collection_name=collection_name)
 
     @staticmethod
     def get_uuid(string_id: str) -> str:
@@ -454,7 +695,7 @@ class QdrantService:
             list[str]: A list of vector IDs from the search results.
         """
         payload = {
-            "filter": filter,
+            "filter": self._get_schema(collection_name).get_tenant_filter(filter),
             "offset": None,
             "limit": max(self.count_points(filter=filter, collection_name=collection_name), 1),
         }
@@ -463,6 +704,38 @@ class QdrantService:
         )
         return response.get("result", {}).get("points", [])
 
+    def scroll_points(
+        self,
+        collection_name: str,
+        limit: int = 1000,
+        offset: Optional[str | int] = None,
+        filter: Optional[dict] = None,
+        with_vectors: bool = False,
+    ) -> tuple[list[dict], Optional[str | int]]:
+        """
+        Return a page of points of the collection, with their payload and optionally their vectors,
+        and the offset of the next page, None on the last page.
+
+        Args:
+            collection_name (str): The name of the collection to scroll.
+            limit (int): The maximum number of points of the page.
+            offset (Optional[str | int]): The offset returned with the previous page, None for the first page.
+            filter (Optional[dict]): A filter on the points, in the same format as in get_points.
+            with_vectors (bool): Whether to return the vectors of the points.
+        """
+        payload = {
+            "filter": self._get_schema(collection_name).get_tenant_filter(filter),
+            "offset": offset,
+            "limit": limit,
+            "with_payload": True,
+            "with_vector": with_vectors,
+        }
+        response = self._send_request(
+            method="POST", endpoint=f"collections/{collection_name}/points/scroll", payload=payload, timeout=60.0
+        )
+        result = response.get("result", {})
+        return result.get("points", []), result.get("next_page_offset")
+
     def collection_exists(self, collection_name: str) -> bool:
         """
         Check if a collection exists in Qdrant.
@@ -478,15 +751,18 @@ class QdrantService:
     def create_collection(
         self,
         collection_name: str,
-        vector_size: int = 3072,
+        vector_size: Optional[int] = None,
         distance: str = "Cosine",
     ) -> bool:
         """
-        Create a new collection in Qdrant.
+        Create a new collection in Qdrant, with the vector options of its schema.
+        When the schema of the collection has a sparse vector, it is created with the "idf" modifier
+        so that Qdrant weights the terms of the stored BM25 term frequencies.
 
         Args:
             collection_name (str): The name of the collection to create.
-            vector_size (int): The size of the vectors to store in the collection.
+            vector_size (Optional[int]): The size of the vectors to store in the collection.
+            Defaults to the embedding dimensions of the schema, or 3072.
             distance (str): The distance metric to use for the collection.
         Returns:
             message (str): The status of the operation.
@@ -494,16 +770,84 @@ class QdrantService:
         if self.collection_exists(collection_name):
             LOGGER.error(f"Collection {collection_name} already exists.")
             return False
-        payload = {"vectors": {"size": vector_size, "distance": distance}}
+        schema = self._get_schema(collection_name)
+        payload = {
+            "vectors": {
+                "size": vector_size or schema.embedding_dimensions or DEFAULT_VECTOR_SIZE,
+                "distance": distance,
+                "on_disk": schema.on_disk,
+            }
+        }
+        if hnsw_config := self._get_hnsw_config(schema):
+            payload["hnsw_config"] = hnsw_config
+        if schema.quantization == "int8":
+            payload["quantization_config"] = {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": True}}
+        if schema.sparse_vector_name:
+            payload["sparse_vectors"] = {schema.sparse_vector_name: {"modifier": "idf"}}
         response = self._send_request(
             method="PUT", endpoint=f"collections/{collection_name}?wait=true", payload=payload
         )
         if "result" in response:
             LOGGER.info(f"Status of collection creation {collection_name} : {response['result']}")
+            self._indexed_collections.discard(collection_name)
+            self.ensure_payload_indexes(collection_name)
             return True
         LOGGER.error(f"Problem with status of collection creation {collection_name} : {response}")
         return False
 
+    @staticmethod
+    def _get_hnsw_config(schema: QdrantCollectionSchema) -> dict:
+        """HNSW options of the collection of a schema, without the ones left to Qdrant defaults."""
+        hnsw_config = {"m": schema.hnsw_m, "ef_construct": schema.hnsw_ef_construct}
+        if schema.tenant_fields and schema.hnsw_m is None:
+            hnsw_config.update(TENANT_HNSW_CONFIG)
+        return {key: value for key, value in hnsw_config.items() if value is not None}
+
+    def get_collection_config(self, collection_name: str) -> dict:
+        """Return the configuration of an existing collection: "params", "hnsw_config", "quantization_config"..."""
+        response = self._send_request(method="GET", endpoint=f"collections/{collection_name}")
+        return response.get("result", {}).get("config", {})
+
+    def get_collection_params(self, collection_name: str) -> dict:
+        """Return the vector parameters of an existing collection, as {"vectors": ..., "sparse_vectors": ...}."""
+        return self.get_collection_config(collection_name).get("params", {})
+
+    def check_vector_options(self, collection_name: str) -> list[str]:
+        """
+        Compare the quantization, on_disk and HNSW options of the schema with those of the existing collection.
+        These options are set when the collection is created, so a source stored in a shared collection
+        created by another source uses the options of that source: the differences are logged as a warning.
+
+        Args:
+            collection_name (str): The name of the existing collection.
+        Returns:
+            list[str]: The options of the schema that differ from those of the collection.
+        """
+        schema = self._get_schema(collection_name)
+        config = self.get_collection_config(collection_name)
+        differences = []
+        on_disk = bool(config.get("params", {}).get("vectors", {}).get("on_disk"))
+        if on_disk != schema.on_disk:
+            differences.append(f"on_disk={schema.on_disk} (collection: {on_disk})")
+        quantization = "int8" if config.get("quantization_config") else None
+        if quantization != schema.quantization:
+            differences.append(f"quantization={schema.quantization} (collection: {quantization})")
+        collection_hnsw_config = config.get("hnsw_config") or {}
+        for key, value in self._get_hnsw_config(schema).items():
+            if collection_hnsw_config.get(key) != value:
+                differences.append(f"hnsw_config.{key}={value} (collection: {collection_hnsw_config.get(key)})")
+        if differences:
+            LOGGER.warning(
+                f"Collection {collection_name} was created with other vector options, which are kept: "
+                f"{', '.join(differences)}"
+            )
+        return differences
+
+    def get_sparse_vector_names(self, collection_name: str) -> list[str]:
+        """Return the names of the sparse vectors configured on an existing collection."""
+        params = self.get_collection_params(collection_name)
+        return list((params.get("sparse_vectors") or {}).keys())
+
     def delete_collection(self, collection_name: str) -> bool:
         """
         Delete a collection in Qdrant.
@@ -514,6 +858,7 @@ class QdrantService:
             message (str): The status of the operation.
         """
         response = self._send_request(method="DELETE", endpoint=f"collections/{collection_name}?wait=true")
+        self._indexed_collections.discard(collection_name)
         if "result" in response:
             LOGGER.info(f"Status of collection deletion {collection_name} : {response['result']}")
             return True
@@ -537,6 +882,7 @@ class QdrantService:
         """
         if not self.collection_exists(collection_name):
             raise ValueError(f"Collection {collection_name} does not exist.")
+        filter = self._get_schema(collection_name).get_tenant_filter(filter)
         payload = {"filter": filter} if filter else {}
         response = self._send_request(
             method="POST", endpoint=f"collections/{collection_name}/points/count", payload=payload
@@ -572,6 +918,63 @@ class QdrantService:
         LOGGER.error(f"Problem with status of points deletion : {response}")
         return False
 
+    def delete_points_by_filter(self, filter: dict, collection_name: str) -> bool:
+        """
+        Delete the points matching a filter, in a single request.
+
+        Args:
+            filter (dict): The filter of the points to delete. It is restricted to the tenant of the schema.
+            collection_name (str): The name of the collection to delete points from.
+        """
+        filter = self._get_schema(collection_name).get_tenant_filter(filter)
+        if not filter:
+            raise ValueError("A filter is required to delete points.")
+        response = self._send_request(
+            method="POST",
+            endpoint=f"collections/{collection_name}/points/delete?wait=true",
+            payload={"filter": filter},
+        )
+        if "result" in response:
+            LOGGER.info(f"Status of points deletion : {response['result']}")
+            return True
+        LOGGER.error(f"Problem with status of points deletion : {response}")
+        return False
+
+    def delete_tenant_points(self, collection_name: str) -> bool:
+        """
+        Delete all the points of the tenant of the collection schema, e.g. when its source is deleted
+        from a shared collection.
+        """
+        if not self._get_schema(collection_name).tenant_fields:
+            raise ValueError(f"The schema of collection {collection_name} has no tenant.")
+        return self.delete_points_by_filter(filter={}, collection_name=collection_name)
+
+    def set_payloads(self, payloads: dict[str, dict], collection_name: str) -> bool:
+        """
+        Overwrite payload fields of points without touching their vectors, with one set_payload operation
+        per point sent in batches.
+
+        Args:
+            payloads (dict[str, dict]): The payload fields to set, by point ID.
+            collection_name (str): The name of the collection of the points.
+        """
+        items = list(payloads.items())
+        for i in range(0, len(items), MAX_PAYLOAD_OPERATIONS_PER_BATCH):
+            operations = [
+                {"set_payload": {"payload": payload, "points": [point_id]}}
+                for point_id, payload in items[i : i + MAX_PAYLOAD_OPERATIONS_PER_BATCH]
+            ]
+            response = self._send_request(
+                method="POST",
+                endpoint=f"collections/{collection_name}/points/batch?wait=true",
+                payload={"operations": operations},
+            )
+            if "result" not in response:
+                LOGGER.error(f"Problem with status of payload update : {response}")
+                return False
+        LOGGER.info(f"Updated the payload of {len(items)} points")
+        return True
+
     def insert_points_in_collection(
         self,
         points: list[dict],
@@ -612,12 +1015,13 @@ class QdrantService:
 
         return [collection["name"] for collection in collections]
 
-    def get_collection_data(self, collection_name: str) -> pd.DataFrame:
+    def get_collection_data(self, collection_name: str, filter: Optional[dict] = None) -> pd.DataFrame:
         """
         Retrieve all data for a specific collection, organizing metadata into custom columns.
 
         Args:
             collection_name (str): The name of the collection to retrieve data for.
+            filter (Optional[dict]): A filter to retrieve only some of the points, as in get_points.
 
         Returns:
             pd.DataFrame: A DataFrame with all points and metadata in the collection.
@@ -626,7 +1030,7 @@ class QdrantService:
             raise ValueError(f"Collection {collection_name} does not exist.")
 
         schema = self._get_schema(collection_name)
-        all_points = self.get_points(collection_name=collection_name)
+        all_points = self.get_points(collection_name=collection_name, filter=filter)
 
         rows = []
         for point in all_points:
@@ -652,59 +1056,80 @@ class QdrantService:
 
         return pd.DataFrame(rows)
 
-    def sync_df_with_collection(self, df: pd.DataFrame, collection_name: str) -> bool:
+    def sync_df_with_collection(self, df: pd.DataFrame, collection_name: str, delete_missing: bool = True) -> bool:
         """
         Synchronize a DataFrame with a Qdrant collection.
         The DataFrame should have the same schema as the Qdrant collection.
-        The function will update existing points and add new points to the collection.
+        Chunks missing from the DataFrame are deleted and new chunks are added. Existing chunks whose content
+        changed are embedded again, while those where only other payload fields changed (e.g. the last edited
+        timestamp) only get their payload updated. With a last edited timestamp field, chunks older than
+        the ones in the collection are left as they are.
 
         Args:
             df (pd.DataFrame): The DataFrame to synchronize with the collection.
             collection_name (str): The name of the collection to sync with.
+            delete_missing (bool): When False, the DataFrame is one chunk of the data: it is only compared
+            with the points of its own chunks, and no point is deleted (see delete_missing_chunks).
 
         Returns:
             bool: True if the synchronization was successful, False otherwise.
         """
-        old_df = self.get_collection_data(collection_name)
+        schema = self._get_schema(collection_name)
+        id_field = schema.chunk_id_field
+        if delete_missing:
+            old_df = self.get_collection_data(collection_name)
+        else:
+            ids_filter = {"must": [{"key": id_field, "match": {"any": df[id_field].tolist()}}]}
+            old_df = self.get_collection_data(collection_name, filter=ids_filter)
         if old_df.empty:
             self.add_chunks(df.to_dict(orient="records"), collection_name)
             LOGGER.info(f"Qdrant collection is empty. Added {len(df)} chunks to Qdrant")
             return True
 
-        incoming_ids = set(df[self.default_schema.chunk_id_field])
-        existing_ids = set(old_df[self.default_schema.chunk_id_field])
+        incoming_ids = set(df[id_field])
+        existing_ids = set(old_df[id_field])
         ids_to_delete = existing_ids - incoming_ids
         new_ids_to_add = incoming_ids - existing_ids
 
-        # merge the two dataframes to get the dataframes to update
-        common_df = df.merge(old_df, on=self.default_schema.chunk_id_field, how="inner")
-
-        if self.default_schema.last_edited_ts_field:
-            ids_to_update = set(
-                common_df[
-                    common_df[self.default_schema.last_edited_ts_field + "_x"]
-                    > common_df[self.default_schema.last_edited_ts_field + "_y"]
-                ][self.default_schema.chunk_id_field]
-            )
-        else:
-            ids_to_update = set(common_df[self.default_schema.chunk_id_field])
-
-        ids_to_delete = ids_to_delete.union(ids_to_update)
-        ids_to_upsert = new_ids_to_add.union(ids_to_update)
-
-        if len(ids_to_delete) > 0:
+        # merge the two dataframes to compare the chunks present in both
+        common_df = df.merge(old_df, on=id_field, how="inner", suffixes=("_new", "_old"))
+        if schema.last_edited_ts_field:
+            ts_field = schema.last_edited_ts_field
+            common_df = common_df[~(common_df[ts_field + "_new"] < common_df[ts_field + "_old"])]
+        content_changed = _values_differ(common_df, schema.content_field)
+        compared_fields = [
+            field
+            for field in schema.get_payload_fields()
+            if field not in (id_field, schema.content_field) and field in df.columns and field in old_df.columns
+        ]
+        payload_changed = pd.Series(False, index=common_df.index)
+        for field in compared_fields:
+            payload_changed |= _values_differ(common_df, field)
+        ids_to_embed = new_ids_to_add.union(common_df[content_changed][id_field])
+        ids_to_update_payload = set(common_df[payload_changed & ~content_changed][id_field])
+
+        if len(ids_to_delete) > 0 and delete_missing:
             self.delete_chunks(
-                point_ids=list(ids_to_delete),
-                id_field=self.default_schema.chunk_id_field,
+                point_ids=sorted(ids_to_delete),
+                id_field=id_field,
                 collection_name=collection_name,
             )
             LOGGER.info(f"Deleted {len(ids_to_delete)} chunks from Qdrant")
-        if len(ids_to_upsert) > 0:
-            chunks_to_upsert = df[df[self.default_schema.chunk_id_field].isin(ids_to_upsert)]
+        if len(ids_to_embed) > 0:
+            chunks_to_upsert = df[df[id_field].isin(ids_to_embed)]
             list_payloads = chunks_to_upsert.to_dict(orient="records")
             self.add_chunks(list_payloads, collection_name)
-            LOGGER.info(f"Upserted {len(ids_to_upsert)} chunks to Qdrant")
+            LOGGER.info(f"Upserted {len(ids_to_embed)} chunks to Qdrant")
+        if len(ids_to_update_payload) > 0:
+            chunks_to_update = df[df[id_field].isin(ids_to_update_payload)].to_dict(orient="records")
+            payloads = {
+                schema.get_point_id(chunk[id_field]): self._build_payload(schema, chunk) for chunk in chunks_to_update
+            }
+            self.set_payloads(payloads, collection_name)
+            LOGGER.info(f"Updated the payload of {len(ids_to_update_payload)} chunks in Qdrant")
 
+        if not delete_missing:
+            return True
         n_points = self.count_points(collection_name)
         if n_points != len(df):
             LOGGER.error(
@@ -717,3 +1142,35 @@ class QdrantService:
         else:
             LOGGER.info(f"Sync successful : number of points in Qdrant is {n_points}")
             return True
+
+    def delete_missing_chunks(
+        self,
+        collection_name: str,
+        get_existing_ids: Callable[[list[str]], set[str]],
+        page_size: int = 1000,
+    ) -> int:
+        """
+        Delete the chunks whose id is not in the source, reading the collection page by page,
+        after it was synchronized chunk by chunk with sync_df_with_collection(..., delete_missing=False).
+
+        Args:
+            collection_name (str): The name of the collection.
+            get_existing_ids (Callable[[list[str]], set[str]]): Returns the given chunk ids that are in the source.
+            page_size (int): The number of points read per page.
+        Returns:
+            int: The number of deleted chunks.
+        """
+        id_field = self._get_schema(collection_name).chunk_id_field
+        ids_to_delete, offset = [], None
+        while True:
+            points, offset = self.scroll_points(collection_name, limit=page_size, offset=offset)
+            chunk_ids = [point["payload"][id_field] for point in points]
+            existing_ids = get_existing_ids(chunk_ids)
+            ids_to_delete.extend(chunk_id for chunk_id in chunk_ids if chunk_id not in existing_ids)
+            if offset is None:
+                break
+        # Deleted after the scroll, as deletions move the points of the local store between pages
+        if ids_to_delete:
+            self.delete_chunks(point_ids=ids_to_delete, id_field=id_field, collection_name=collection_name)
+            LOGGER.info(f"Deleted {len(ids_to_delete)} chunks missing from the source")
+        return len(ids_to_delete)
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 import logging
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import pandas as pd
 
@@ -9,6 +9,9 @@ from engine.storage_service.db_utils import DBDefinition, convert_to_correct_pan
 
 LOGGER = logging.getLogger(__name__)
 
+# Rows per DataFrame when tables are read or written by chunks
+DEFAULT_CHUNK_SIZE = 50_000
+
 
 class DBService(ABC):
     def __init__(self, dialect: Optional[str] = None):
@@ -44,6 +47,49 @@ class DBService(ABC):
     def get_table_df(self, table_name: str, schema_name: Optional[str] = None) -> pd.DataFrame:
         pass
 
+    def get_table_chunks(
+        self,
+        table_name: str,
+        schema_name: Optional[str] = None,
+        columns: Optional[list[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the rows of a table by DataFrames of at most `chunk_size` rows, with only the given columns.
+        This default implementation reads the whole table at once: services that can stream rows override it.
+        """
+        df = self.get_table_df(table_name, schema_name=schema_name)
+        if columns is not None:
+            df = df[columns]
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start : start + chunk_size]
+
+    def get_rows_by_ids(
+        self,
+        table_name: str,
+        id_column_name: str,
+        ids: list[str | int],
+        schema_name: Optional[str] = None,
+        columns: Optional[list[str]] = None,
+    ) -> pd.DataFrame:
+        """Return the rows of the table whose id is among `ids`, with only the given columns."""
+        chunks = [
+            chunk[chunk[id_column_name].isin(ids)]
+            for chunk in self.get_table_chunks(table_name, schema_name=schema_name, columns=columns)
+        ]
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+
+    def get_existing_ids(
+        self,
+        table_name: str,
+        id_column_name: str,
+        ids: list[str | int],
+        schema_name: Optional[str] = None,
+    ) -> set[str | int]:
+        """Return the ids among `ids` that are in the table."""
+        rows = self.get_rows_by_ids(table_name, id_column_name, ids, schema_name=schema_name, columns=[id_column_name])
+        return set(rows[id_column_name])
+
     @abstractmethod
     def describe_table(self, table_name: str, schema_name: Optional[str] = None) -> list[dict]:
         """
@@ -144,6 +190,35 @@ class DBService(ABC):
                         schema_name=schema_name,
                     )
 
+    def update_table_from_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        table_name: str,
+        table_definition: DBDefinition,
+        id_column_name: str,
+        schema_name: Optional[str] = None,
+        timestamp_column_name: Optional[str] = None,
+        append_mode: bool = True,
+    ) -> None:
+        """
+        Same as update_table, with the new rows given by chunks, as read by get_table_chunks.
+        Ids must be unique across chunks. This default implementation concatenates the chunks:
+        services that can load them one by one override it.
+        """
+        chunks = list(chunks)
+        if not chunks:
+            LOGGER.info(f"No rows to update the table {table_name} with")
+            return
+        self.update_table(
+            new_df=pd.concat(chunks, ignore_index=True),
+            table_name=table_name,
+            table_definition=table_definition,
+            id_column_name=id_column_name,
+            schema_name=schema_name,
+            timestamp_column_name=timestamp_column_name,
+            append_mode=append_mode,
+        )
+
     @abstractmethod
     def _refresh_table_from_df(
         self,
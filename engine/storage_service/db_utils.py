@@ -84,6 +84,17 @@ def create_db_if_not_exists(target_db_url: str, admin_db_name: str = "postgres")
             print(f"Database '{target_db_name}' already exists.")
 
 
+def get_db_service_cache_key(db_service) -> str:
+    """Identify the database behind a DBService so that per-table caches can be shared across instances."""
+    engine = getattr(db_service, "engine", None)
+    if engine is not None:
+        return str(engine.url)
+    database_name = getattr(db_service, "database_name", None)
+    if database_name is not None:
+        return f"{db_service.__class__.__name__}:{database_name}"
+    return f"{db_service.__class__.__name__}:{id(db_service)}"
+
+
 def convert_to_correct_pandas_type(df: pd.DataFrame, column_name: str, db_definition: DBDefinition) -> pd.DataFrame:
     column_type = next((column.type for column in db_definition.columns if column.name == column_name), None)
     if column_type is not None:
@@ -1,15 +1,26 @@
+import csv
+import datetime
+import io
+import json
 import logging
+import threading
+import uuid
 from pathlib import Path
-from typing import Optional, Type
+from typing import Any, Iterable, Iterator, Optional, Type
 
 import sqlalchemy
 from sqlalchemy import MetaData, text, create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql.type_api import TypeEngine
 import pandas as pd
 
-from engine.storage_service.db_service import DBService
-from engine.storage_service.db_utils import DBDefinition, check_columns_matching_between_data_and_database_table
+from engine.storage_service.db_service import DEFAULT_CHUNK_SIZE, DBService
+from engine.storage_service.db_utils import (
+    PROCESSED_DATETIME_FIELD,
+    DBDefinition,
+    check_columns_matching_between_data_and_database_table,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -28,16 +39,76 @@ TYPE_MAPPING: dict[str, Type[TypeEngine]] = {
     "VARIANT": sqlalchemy.JSON,
 }
 DEFAULT_MAPPING = {"CURRENT_TIMESTAMP": sqlalchemy.func.current_timestamp()}
+# Dialects with INSERT ... ON CONFLICT, used by update_table instead of the pandas merge of DBService
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# SQLite limits the number of parameters of a query
+MAX_IDS_PER_QUERY = 500
+# Load order of the rows of a staging table that can hold several versions of an id
+STAGING_ROW_COLUMN = "staging_row"
+
+# Engines shared by the services of a same database, so that they reuse its connection pool
+_ENGINES: dict[str, sqlalchemy.Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(engine_url: str) -> sqlalchemy.Engine:
+    """
+    Return the engine of a database URL, created on first use.
+    In-memory SQLite databases are not shared: each engine is a separate database.
+    """
+    url = sqlalchemy.engine.make_url(engine_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return create_engine(url)
+    key = url.render_as_string(hide_password=False)
+    with _ENGINES_LOCK:
+        if key not in _ENGINES:
+            _ENGINES[key] = create_engine(url)
+        return _ENGINES[key]
+
+
+def to_column_type(column: sqlalchemy.Column, value: Any) -> Any:
+    """Convert a value, e.g. a timestamp saved as an ISO string, to the Python type of a column."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type in (datetime.datetime, datetime.date, datetime.time):
+        return python_type.fromisoformat(str(value))
+    return python_type(value)
+
+
+def rows_after(table: sqlalchemy.Table, values: dict[str, Any], dialect_name: str) -> sqlalchemy.ColumnElement[bool]:
+    """
+    Condition on the rows that come after the given values of the columns, compared in their order:
+    {"ts": t, "id": i} gives ts > t OR (ts = t AND id > i).
+    """
+    conditions, equalities = [], []
+    for column_name, value in values.items():
+        column = table.c[column_name]
+        value = to_column_type(column, value)
+        if dialect_name == "sqlite" and isinstance(value, (datetime.datetime, datetime.date)):
+            # SQLite stores datetimes as text, with or without microseconds: compare them as julian days
+            column, value = sqlalchemy.func.julianday(column), sqlalchemy.func.julianday(value.isoformat())
+        conditions.append(sqlalchemy.and_(*equalities, column > value))
+        equalities.append(column == value)
+    return sqlalchemy.or_(*conditions)
 
 
 class SQLLocalService(DBService):
     def __init__(self, engine_url: str):
         super().__init__()
-        self.engine = create_engine(engine_url)
+        self.engine = get_engine(engine_url)
+        # Tables are reflected when first used, rather than the whole database at startup
         self.metadata = MetaData()
-        self.metadata.reflect(bind=self.engine)
+        self._tables: dict[tuple[Optional[str], str], sqlalchemy.Table] = {}
+        self._tables_lock = threading.Lock()
         self.Session = sessionmaker(bind=self.engine)
         self.database_name = self.engine.url.database
+        # (schema, table, column) known to have a unique index, as needed by ON CONFLICT
+        self._unique_columns: set[tuple[Optional[str], str, str]] = set()
 
     def get_table(self, table_name: str, schema_name: Optional[str] = None) -> sqlalchemy.Table:
         """
@@ -45,12 +116,29 @@ class SQLLocalService(DBService):
         Raises ValueError if the table does not exist.
         """
         table_name = table_name.lower()
-        if not self.table_exists(table_name, schema_name):
-            raise ValueError(f"Table '{table_name}' in schema '{schema_name}' does not exist.")
-        return sqlalchemy.Table(table_name, self.metadata, autoload_with=self.engine, schema=schema_name)
+        key = (schema_name, table_name)
+        with self._tables_lock:
+            if key not in self._tables:
+                if not sqlalchemy.inspect(self.engine).has_table(table_name, schema=schema_name):
+                    raise ValueError(f"Table '{table_name}' in schema '{schema_name}' does not exist.")
+                self._tables[key] = sqlalchemy.Table(
+                    table_name, self.metadata, autoload_with=self.engine, schema=schema_name
+                )
+            return self._tables[key]
+
+    def _forget_table(self, table_name: str, schema_name: Optional[str] = None) -> None:
+        """Drop the reflected table from the cache, after the table is created or dropped."""
+        key = (schema_name, table_name.lower())
+        with self._tables_lock:
+            table = self._tables.pop(key, None)
+            if table is not None:
+                self.metadata.remove(table)
+            self._unique_columns = {column for column in self._unique_columns if column[:2] != key}
 
     def table_exists(self, table_name: str, schema_name: Optional[str] = None) -> bool:
         table_name = table_name.lower()
+        if (schema_name, table_name) in self._tables:
+            return True
         inspector = sqlalchemy.inspect(self.engine)
         return inspector.has_table(table_name, schema=schema_name)
 
@@ -99,6 +187,7 @@ class SQLLocalService(DBService):
             table = sqlalchemy.Table(table_name, sqlalchemy.MetaData(), *columns, schema=schema_name)
             LOGGER.info(f"Creating table {table_name} in schema {schema_name}")
             table.create(self.engine)
+            self._forget_table(table_name, schema_name)
 
     def create_schema(self, schema_name: str):
         with self.engine.connect() as conn:
@@ -128,18 +217,82 @@ class SQLLocalService(DBService):
         table = self.get_table(table_name, schema_name)
         LOGGER.info(f"Dropping table {table_name} from schema {schema_name}")
         table.drop(self.engine)
+        self._forget_table(table_name, schema_name)
+
+    def _select(
+        self,
+        table_name: str,
+        schema_name: Optional[str],
+        columns: Optional[list[str]],
+        after: Optional[dict[str, Any]] = None,
+    ) -> sqlalchemy.Select:
+        table = self.get_table(table_name, schema_name)
+        missing_columns = set(columns or []).union(after or []) - set(table.c.keys())
+        if missing_columns:
+            raise ValueError(f"Columns {sorted(missing_columns)} not found in the columns: {table.c.keys()}")
+        stmt = sqlalchemy.select(table) if columns is None else sqlalchemy.select(*[table.c[c] for c in columns])
+        if after:
+            stmt = stmt.where(rows_after(table, after, self.engine.dialect.name))
+        return stmt
 
     def get_table_df(
         self,
         table_name: str,
         schema_name: Optional[str] = None,
+        columns: Optional[list[str]] = None,
     ) -> pd.DataFrame:
-        table = self.get_table(table_name, schema_name)
+        stmt = self._select(table_name, schema_name, columns)
         with self.Session() as session:
-            stmt = sqlalchemy.select(table)
             result = session.execute(stmt)
             return pd.DataFrame(result.fetchall(), columns=result.keys())
 
+    def get_table_chunks(
+        self,
+        table_name: str,
+        schema_name: Optional[str] = None,
+        columns: Optional[list[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        after: Optional[dict[str, Any]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the rows of a table by DataFrames of at most `chunk_size` rows, with only the given columns.
+        Rows are streamed with a server-side cursor, so that only one chunk is held in memory.
+        With `after`, only the rows after these values of the columns are read (see rows_after).
+        """
+        stmt = self._select(table_name, schema_name, columns, after=after)
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=chunk_size).execute(stmt)
+            column_names = list(result.keys())
+            for rows in result.partitions():
+                yield pd.DataFrame(rows, columns=column_names)
+
+    def get_rows_by_ids(
+        self,
+        table_name: str,
+        id_column_name: str,
+        ids: list[str | int],
+        schema_name: Optional[str] = None,
+        columns: Optional[list[str]] = None,
+    ) -> pd.DataFrame:
+        stmt = self._select(table_name, schema_name, columns)
+        id_column = self.get_table(table_name, schema_name).c[id_column_name]
+        rows, ids = [], list(ids)
+        with self.engine.connect() as connection:
+            for start in range(0, len(ids), MAX_IDS_PER_QUERY):
+                result = connection.execute(stmt.where(id_column.in_(ids[start : start + MAX_IDS_PER_QUERY])))
+                rows.extend(result.fetchall())
+        return pd.DataFrame(rows, columns=list(stmt.selected_columns.keys()))
+
+    def get_existing_ids(
+        self,
+        table_name: str,
+        id_column_name: str,
+        ids: list[str | int],
+        schema_name: Optional[str] = None,
+    ) -> set[str | int]:
+        rows = self.get_rows_by_ids(table_name, id_column_name, ids, schema_name=schema_name, columns=[id_column_name])
+        return set(rows[id_column_name])
+
     def describe_table(self, table_name: str, schema_name: Optional[str] = None) -> list[dict]:
         table_name = table_name.lower()
         if not self.table_exists(table_name, schema_name):
@@ -232,6 +385,219 @@ class SQLLocalService(DBService):
     def _fetch_sql_query_as_dataframe(self, query: str) -> pd.DataFrame:
         return pd.read_sql(query, self.engine)
 
+    def _create_staging_table(
+        self, connection: sqlalchemy.Connection, table: sqlalchemy.Table, id_column: str, unique_ids: bool = True
+    ) -> sqlalchemy.Table:
+        """
+        Create a temporary table with the columns of `table` and `id_column` as primary key, visible only to
+        `connection` and named uniquely so that concurrent updates of the same table do not share it.
+        Without `unique_ids`, `id_column` is only indexed, and the load order of the rows is kept
+        in STAGING_ROW_COLUMN to tell the versions of an id apart.
+        """
+        columns = [
+            sqlalchemy.Column(
+                column.name,
+                column.type,
+                primary_key=unique_ids and column.name == id_column,
+                index=not unique_ids and column.name == id_column,
+            )
+            for column in table.columns
+        ]
+        if not unique_ids:
+            columns.append(sqlalchemy.Column(STAGING_ROW_COLUMN, sqlalchemy.Integer, nullable=False))
+        staging_table = sqlalchemy.Table(
+            f"staging_{table.name}_{uuid.uuid4().hex[:12]}",
+            sqlalchemy.MetaData(),
+            *columns,
+            prefixes=["TEMPORARY"],
+        )
+        staging_table.create(connection)
+        return staging_table
+
+    def _load_staging_table(
+        self, connection: sqlalchemy.Connection, staging_table: sqlalchemy.Table, df: pd.DataFrame
+    ) -> None:
+        """
+        Load a DataFrame into a staging table: with COPY on PostgreSQL, and elsewhere with an executemany
+        of plain tuples, which skips the per-row processing of SQLAlchemy and pandas records.
+        """
+        if df.empty:
+            return
+        df = df.copy()
+        for column in staging_table.columns:
+            if column.name not in df.columns:
+                continue
+            if isinstance(column.type, sqlalchemy.JSON):
+                df[column.name] = df[column.name].map(lambda value: None if value is None else json.dumps(value))
+            # Integer columns with missing values are floats in pandas, which COPY rejects ("1.0")
+            elif isinstance(column.type, sqlalchemy.Integer) and df[column.name].dtype.kind == "f":
+                df[column.name] = df[column.name].astype("Int64")
+            # Timestamps are written as in the CSV of COPY, as the sqlite3 driver cannot bind pandas timestamps
+            elif df[column.name].dtype.kind == "M":
+                df[column.name] = df[column.name].astype(str).where(df[column.name].notna(), None)
+        columns = ", ".join(f'"{column}"' for column in df.columns)
+        cursor = connection.connection.cursor()
+        try:
+            if self.engine.dialect.name == "postgresql":
+                buffer = io.StringIO()
+                df.to_csv(buffer, index=False, header=False, na_rep="\\N", quoting=csv.QUOTE_MINIMAL)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY \"{staging_table.name}\" ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+                )
+            else:
+                rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+                placeholder = "?" if self.engine.dialect.paramstyle == "qmark" else "%s"
+                placeholders = ", ".join([placeholder] * len(df.columns))
+                cursor.executemany(f'INSERT INTO "{staging_table.name}" ({columns}) VALUES ({placeholders})', rows)
+        finally:
+            cursor.close()
+
+    def _ensure_unique_column(self, table: sqlalchemy.Table, column_name: str) -> None:
+        """Create a unique index on the column if it is neither the primary key nor unique already."""
+        key = (table.schema, table.name, column_name)
+        if key in self._unique_columns:
+            return
+        inspector = sqlalchemy.inspect(self.engine)
+        unique_column_sets = [inspector.get_pk_constraint(table.name, schema=table.schema)["constrained_columns"]]
+        unique_column_sets += [
+            constraint["column_names"]
+            for constraint in inspector.get_unique_constraints(table.name, schema=table.schema)
+        ]
+        unique_column_sets += [
+            index["column_names"]
+            for index in inspector.get_indexes(table.name, schema=table.schema)
+            if index["unique"]
+        ]
+        if [column_name] not in unique_column_sets:
+            LOGGER.info(f"Creating a unique index on {table.name}.{column_name}")
+            index = sqlalchemy.Index(f"{table.name}_{column_name}_key", table.c[column_name], unique=True)
+            index.create(self.engine)
+        self._unique_columns.add(key)
+
+    def _can_upsert(self, table_name: str, id_column_name: str, schema_name: Optional[str] = None) -> bool:
+        """Whether the dialect has INSERT ... ON CONFLICT and the table exists, with a unique id column."""
+        if self.engine.dialect.name not in UPSERT_INSERTS or not self.table_exists(table_name, schema_name):
+            return False
+        try:
+            self._ensure_unique_column(self.get_table(table_name, schema_name), id_column_name)
+        except sqlalchemy.exc.IntegrityError:
+            LOGGER.warning(f"Column {id_column_name} of {table_name} has duplicates, it cannot be upserted")
+            return False
+        return True
+
+    def update_table(
+        self,
+        new_df: pd.DataFrame,
+        table_name: str,
+        table_definition: DBDefinition,
+        id_column_name: str,
+        schema_name: Optional[str] = None,
+        timestamp_column_name: Optional[str] = None,
+        append_mode: bool = True,
+    ) -> None:
+        """
+        Update a table with a new DataFrame, in a single transaction on PostgreSQL and SQLite: the rows are
+        loaded into a temporary table (COPY on PostgreSQL), then upserted with INSERT ... ON CONFLICT, only
+        where their timestamp is newer when a timestamp column is given. Without append mode, the rows whose
+        id is not in the new DataFrame are deleted with an anti-join.
+        Other dialects use the pandas merge of DBService.update_table.
+        """
+        self.update_table_from_chunks(
+            [new_df],
+            table_name=table_name,
+            table_definition=table_definition,
+            id_column_name=id_column_name,
+            schema_name=schema_name,
+            timestamp_column_name=timestamp_column_name,
+            append_mode=append_mode,
+        )
+
+    def update_table_from_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        table_name: str,
+        table_definition: DBDefinition,
+        id_column_name: str,
+        schema_name: Optional[str] = None,
+        timestamp_column_name: Optional[str] = None,
+        append_mode: bool = True,
+    ) -> None:
+        """
+        Same as update_table, with the new rows given by chunks. On PostgreSQL and SQLite, each chunk is loaded
+        into the temporary table as it comes, so only one chunk is held in memory, and the upsert and deletions
+        run once all chunks are loaded. An id found in several chunks is upserted once, with its latest version:
+        the one with the newest timestamp, then the last one loaded.
+        """
+        if self.engine.dialect.name in UPSERT_INSERTS and not self.table_exists(table_name, schema_name):
+            LOGGER.info(f"Table {table_name} does not exist. Creating it...")
+            self.create_table(table_name, table_definition=table_definition, schema_name=schema_name)
+        if not self._can_upsert(table_name, id_column_name, schema_name):
+            return super().update_table_from_chunks(
+                chunks,
+                table_name=table_name,
+                table_definition=table_definition,
+                id_column_name=id_column_name,
+                schema_name=schema_name,
+                timestamp_column_name=timestamp_column_name,
+                append_mode=append_mode,
+            )
+        table = self.get_table(table_name, schema_name)
+        table_description = self.describe_table(table_name, schema_name)
+        with self.engine.begin() as connection:
+            staging_table = self._create_staging_table(connection, table, id_column_name, unique_ids=False)
+            columns, loaded_rows = None, 0
+            for new_df in chunks:
+                check_columns_matching_between_data_and_database_table(new_df.columns, table_description)
+                # A row can only be upserted once per statement: keep the latest version of each id
+                if timestamp_column_name:
+                    new_df = new_df.sort_values(timestamp_column_name, kind="stable", na_position="first")
+                new_df = new_df.drop_duplicates(subset=[id_column_name], keep="last")
+                columns = columns or list(new_df.columns)
+                new_df = new_df.assign(**{STAGING_ROW_COLUMN: range(loaded_rows, loaded_rows + len(new_df))})
+                self._load_staging_table(connection, staging_table, new_df)
+                loaded_rows += len(new_df)
+            if columns:
+                # The chunks can hold other versions of an id: keep the latest one
+                order_by = [staging_table.c[STAGING_ROW_COLUMN].desc()]
+                if timestamp_column_name:
+                    order_by.insert(0, staging_table.c[timestamp_column_name].desc().nulls_last())
+                versions = sqlalchemy.select(
+                    *[staging_table.c[column] for column in columns],
+                    sqlalchemy.func.row_number()
+                    .over(partition_by=staging_table.c[id_column_name], order_by=order_by)
+                    .label("version"),
+                ).subquery()
+                upsert = UPSERT_INSERTS[self.engine.dialect.name](table).from_select(
+                    columns,
+                    # The WHERE clause also lifts the parsing ambiguity of INSERT ... SELECT ... ON CONFLICT in SQLite
+                    sqlalchemy.select(*[versions.c[column] for column in columns]).where(versions.c.version == 1),
+                )
+                upsert = upsert.on_conflict_do_update(
+                    index_elements=[id_column_name],
+                    # Columns missing from the DataFrame, like the processed datetime, take their default value
+                    set_={
+                        column.name: upsert.excluded[column.name]
+                        for column in table.columns
+                        if column.name != id_column_name
+                    },
+                    where=(
+                        upsert.excluded[timestamp_column_name] > table.c[timestamp_column_name]
+                        if timestamp_column_name
+                        else None
+                    ),
+                )
+                upserted_rows = connection.execute(upsert).rowcount
+                LOGGER.info(f"Inserted or updated {upserted_rows} rows of {loaded_rows} in the table {table_name}")
+            if not append_mode:
+                deleted_rows = connection.execute(
+                    sqlalchemy.delete(table).where(
+                        ~sqlalchemy.exists().where(staging_table.c[id_column_name] == table.c[id_column_name])
+                    )
+                ).rowcount
+                LOGGER.info(f"Deleted {deleted_rows} rows from the table {table_name}")
+            staging_table.drop(connection)
+
     def _refresh_table_from_df(
         self,
         df: pd.DataFrame,
@@ -246,41 +612,16 @@ class SQLLocalService(DBService):
         df is the DataFrame with ONLY the updated values.
         """
         table = self.get_table(table_name, schema_name)
-        sql_alchemy_columns = self.convert_table_definition_to_sqlalchemy(table_definition)
-
-        # Remove the temporary table if it exists in metadata
-        if "updated_values" in self.metadata.tables:
-            self.metadata.remove(self.metadata.tables["updated_values"])
-
-        # Create new temporary table
-        temp_table = sqlalchemy.Table("updated_values", self.metadata, *sql_alchemy_columns)
-
-        try:
-            # Drop the table if it exists in the database
-            temp_table.drop(self.engine, checkfirst=True)
-            temp_table.create(self.engine)
+        with self.engine.begin() as connection:
+            staging_table = self._create_staging_table(connection, table, id_column)
             LOGGER.info(f"Temporary table created to update {table_name}")
-
-            with self.Session() as session:
-                session.execute(temp_table.insert(), df.to_dict(orient="records"))
-                session.commit()
-
-            update_stmt = (
-                table.update()
-                .where(table.c[id_column] == temp_table.c[id_column])
-                .values({col.name: temp_table.c[col.name] for col in table.columns})
-            )
-
-            with self.Session() as session:
-                session.execute(update_stmt)
-                session.commit()
-        finally:
-            # Always try to drop the temporary table and remove it from metadata
-            try:
-                temp_table.drop(self.engine, checkfirst=True)
-                self.metadata.remove(temp_table)
-            except Exception as e:
-                LOGGER.warning(f"Failed to cleanup temporary table: {str(e)}")
+            self._load_staging_table(connection, staging_table, df)
+            values = {column: staging_table.c[column] for column in df.columns if column != id_column}
+            if PROCESSED_DATETIME_FIELD in table.c and PROCESSED_DATETIME_FIELD not in values:
+                values[PROCESSED_DATETIME_FIELD] = sqlalchemy.func.current_timestamp()
+            update_stmt = table.update().where(table.c[id_column] == staging_table.c[id_column]).values(values)
+            connection.execute(update_stmt)
+            staging_table.drop(connection)
 
     def delete_rows_from_table(
         self,
@@ -308,7 +649,7 @@ class SQLLocalService(DBService):
     ) -> str:
         if table_names is None:
             LOGGER.info("No table names provided. Describing all tables.")
-            table_names = list(self.metadata.tables.keys())
+            table_names = sqlalchemy.inspect(self.engine).get_table_names(schema=schema_name)
 
         if not table_names:
             return "No tables found to describe."
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+ACQUIRE_TIMEOUT_SECONDS = 60
+# Connections idle for longer are checked with a query before being reused
+HEALTH_CHECK_INTERVAL_SECONDS = 60
+
+
+class SnowflakeConnectionPool:
+    """
+    Bounded pool of Snowflake connections: at most `max_size` connections are in use at once, and
+    connections are opened on demand then kept for reuse. A connection that is closed, or that fails
+    the health check after HEALTH_CHECK_INTERVAL_SECONDS of idleness, is replaced by a new one.
+    """
+
+    def __init__(
+        self,
+        open_connection: Callable[[], Any],
+        max_size: int = DEFAULT_POOL_SIZE,
+        acquire_timeout: float = ACQUIRE_TIMEOUT_SECONDS,
+    ):
+        self._open_connection = open_connection
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_size)
+        # Idle connections with the time they were released, the most recent last
+        self._idle: list[tuple[Any, float]] = []
+        self._lock = threading.Lock()
+        self.opened_connections = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of the block."""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No Snowflake connection available after {self.acquire_timeout} seconds")
+        connection = None
+        try:
+            connection = self._take_connection()
+            yield connection
+        finally:
+            if connection is not None:
+                self._release_connection(connection)
+            self._slots.release()
+
+    def _take_connection(self) -> Any:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection, released_at = self._idle.pop()
+            if self._is_healthy(connection, released_at):
+                return connection
+            self._close_connection(connection)
+        connection = self._open_connection()
+        with self._lock:
+            self.opened_connections += 1
+        return connection
+
+    @staticmethod
+    def _is_healthy(connection: Any, released_at: float) -> bool:
+        if connection.is_closed():
+            return False
+        if time.monotonic() - released_at < HEALTH_CHECK_INTERVAL_SECONDS:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception as e:
+            LOGGER.warning(f"Replacing a Snowflake connection that failed its health check: {e}")
+            return False
+
+    def _release_connection(self, connection: Any) -> None:
+        if connection.is_closed():
+            return
+        with self._lock:
+            self._idle.append((connection, time.monotonic()))
+
+    @staticmethod
+    def _close_connection(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception as e:
+            LOGGER.debug(f"Failed to close a Snowflake connection: {e}")
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close_connection(connection)
+
+
+# Pools shared by the services of a same database, warehouse and role
+_POOLS: dict[tuple, SnowflakeConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_connection_pool(
+    connect: Callable[[], Any],
+    database_name: str,
+    warehouse: str,
+    role: str,
+    max_size: int = DEFAULT_POOL_SIZE,
+) -> SnowflakeConnectionPool:
+    """Return the pool of connections opened with `connect` and set up to use the role, warehouse and database."""
+
+    def open_connection() -> Any:
+        LOGGER.info(f"Connecting to Snowflake with {warehouse} warehouse, {database_name} database and {role} role")
+        connection = connect()
+        with connection.cursor() as cursor:
+            cursor.execute(f"USE ROLE {role}")
+            cursor.execute(f"USE WAREHOUSE {warehouse}")
+            cursor.execute(f"USE DATABASE {database_name}")
+        return connection
+
+    key = (connect, database_name, warehouse, role)
+    with _POOLS_LOCK:
+        if key not in _POOLS:
+            _POOLS[key] = SnowflakeConnectionPool(open_connection, max_size=max_size)
+        return _POOLS[key]
@@ -1,13 +1,15 @@
 import logging
-from typing import Optional
 import threading
+import time
+from typing import Any, Callable, Iterator, Optional
 
 import pandas as pd
 from snowflake.connector.pandas_tools import write_pandas
 
 from engine.agent.agent import SourceChunk
-from engine.storage_service.db_service import DBService
+from engine.storage_service.db_service import DEFAULT_CHUNK_SIZE, DBService
 from engine.storage_service.db_utils import DBDefinition, check_columns_matching_between_data_and_database_table
+from engine.storage_service.snowflake_service.snowflake_pool import DEFAULT_POOL_SIZE, get_connection_pool
 from engine.storage_service.snowflake_service.snowflake_utils import (
     connect_to_snowflake,
     dict_to_object_construct,
@@ -17,49 +19,108 @@ from engine.storage_service.snowflake_service.snowflake_utils import (
 
 LOGGER = logging.getLogger(__name__)
 
+METADATA_TTL_SECONDS = 300
+QUERY_POLL_INTERVAL_SECONDS = 1
+DESCRIBE_TABLE_COLUMNS = [
+    "name",
+    "type",
+    "kind",
+    "is_nullable",
+    "default",
+    "is_primary_key",
+    "unique key",
+    "check",
+    "expression",
+    "comment",
+    "policy name",
+    "privacy domain",
+]
+JSON_COLUMN_TYPES = ["OBJECT", "VARIANT", "ARRAY"]
+
+# Results of SHOW TABLES and DESCRIBE TABLE, by connection pool, kind and schema (and table), with their load time
+_METADATA_CACHE: dict[tuple, tuple[float, Any]] = {}
+_METADATA_CACHE_LOCK = threading.Lock()
 
-class SnowflakeService(DBService):
-    _lock = threading.Lock()
 
+class SnowflakeService(DBService):
     def __init__(
         self,
         database_name: str,
         warehouse: str = "AIRBYTE_WAREHOUSE",
         role_to_use: str = "AIRBYTE_ROLE",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect: Callable[[], Any] = connect_to_snowflake,
     ):
         super().__init__(dialect="snowflake sql")
         self.database_name = database_name
-        self.connector = connect_to_snowflake()
-        LOGGER.info(
-            f"Connecting to Snowflake with {warehouse} warehouse, " f"{database_name} database and {role_to_use} role"
-        )
-        self.connector.cursor().execute(f"USE ROLE {role_to_use}")
-        self.connector.cursor().execute(f"USE WAREHOUSE {warehouse}")
-        self.connector.cursor().execute(f"USE DATABASE {database_name}")
+        # Connections are shared with the other services of the database, and opened when first needed
+        self._pool = get_connection_pool(connect, database_name, warehouse, role_to_use, max_size=pool_size)
+
+    def _execute(self, query: str, params: Optional[tuple | list] = None) -> list[tuple]:
+        """Run a statement on a pooled connection and return its rows, if any."""
+        with self._pool.connection() as connection:
+            cursor = connection.cursor().execute(query, params)
+            return cursor.fetchall() if cursor.description else []
+
+    @staticmethod
+    def _fetch_dataframe(cursor) -> pd.DataFrame:
+        """Build the DataFrame of the results of a cursor from their Arrow batches."""
+        batches = list(cursor.fetch_pandas_batches())
+        if not batches:
+            return pd.DataFrame(columns=[column.name for column in cursor.description])
+        return pd.concat(batches, ignore_index=True)
+
+    def _get_metadata(self, key: tuple, load: Callable[[], Any], refresh: bool = False) -> Any:
+        cache_key = (self._pool, *key)
+        with _METADATA_CACHE_LOCK:
+            cached = None if refresh else _METADATA_CACHE.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < METADATA_TTL_SECONDS:
+            return cached[1]
+        value = load()
+        with _METADATA_CACHE_LOCK:
+            _METADATA_CACHE[cache_key] = (time.monotonic(), value)
+        return value
+
+    def invalidate_metadata(self, schema_name: str) -> None:
+        """Drop the cached tables and columns of a schema, after a change of its tables."""
+        with _METADATA_CACHE_LOCK:
+            for cache_key in list(_METADATA_CACHE):
+                if cache_key[0] is self._pool and cache_key[2] == schema_name.upper():
+                    del _METADATA_CACHE[cache_key]
 
     def schema_exists(self, schema_name: str) -> bool:
         """Check if a schema exists in the current database."""
-        result = (
-            self.connector.cursor()
-            .execute(f"SELECT COUNT(*) FROM INFORMATION_SCHEMA.SCHEMATA WHERE SCHEMA_NAME = '{schema_name}'")
-            .fetchone()
-        )
-        return result[0] > 0
+        result = self._execute(f"SELECT COUNT(*) FROM INFORMATION_SCHEMA.SCHEMATA WHERE SCHEMA_NAME = '{schema_name}'")
+        return result[0][0] > 0
 
     def create_schema(self, schema_name: str):
         if not self.schema_exists(schema_name):
             LOGGER.info(f"Schema is not exists, creating schema {schema_name}")
-            self.connector.cursor().execute(f"CREATE SCHEMA IF NOT EXISTS {schema_name}")
+            self._execute(f"CREATE SCHEMA IF NOT EXISTS {schema_name}")
 
     def delete_schema(self, schema_name: str):
         if self.schema_exists(schema_name):
             LOGGER.info(f"Deleting schema {schema_name}")
-            self.connector.cursor().execute(f"DROP SCHEMA {schema_name}")
+            self._execute(f"DROP SCHEMA {schema_name}")
+            self.invalidate_metadata(schema_name)
+
+    def _get_table_names(self, schema_name: str, refresh: bool = False) -> list[str]:
+        """Names of the tables of a schema, cached for METADATA_TTL_SECONDS unless refreshed."""
+        return self._get_metadata(
+            ("tables", schema_name.upper()),
+            lambda: [table[1] for table in self._execute(f"SHOW TABLES IN SCHEMA {schema_name}")],
+            refresh=refresh,
+        )
 
     def table_exists(self, table_name: str, schema_name: str) -> bool:
-        query = f"SHOW TABLES IN SCHEMA {schema_name}"
-        tables = self.connector.cursor().execute(query).fetchall()
-        return any(table[1].lower() == table_name.lower() for table in tables)
+        """
+        Check if a table exists. A table missing from the cached names of its schema is looked up again,
+        as it may have been created since by another process: only tables found are answered from the cache.
+        """
+        for refresh in (False, True):
+            if any(name.lower() == table_name.lower() for name in self._get_table_names(schema_name, refresh)):
+                return True
+        return False
 
     @staticmethod
     def convert_table_definition_to_string(table_definition: DBDefinition) -> str:
@@ -92,58 +153,70 @@ class SnowflakeService(DBService):
 
         if not self.table_exists(table_name, schema_name):
             LOGGER.info(f"Creating table {table_name} in schema {schema_name}")
-            self.connector.cursor().execute(f"CREATE TABLE {schema_name}.{table_name} ({table_definition_str})")
+            self._execute(f"CREATE TABLE {schema_name}.{table_name} ({table_definition_str})")
+            self.invalidate_metadata(schema_name)
 
     def drop_table(self, table_name: str, schema_name: str):
         if self.table_exists(table_name, schema_name):
             LOGGER.info(f"Dropping table {table_name}")
-            self.connector.cursor().execute(f"DROP TABLE {schema_name}.{table_name}")
+            self._execute(f"DROP TABLE {schema_name}.{table_name}")
+            self.invalidate_metadata(schema_name)
+
+    @staticmethod
+    def _format_table_df(df: pd.DataFrame, json_columns_name: list[str]) -> pd.DataFrame:
+        for column_name in json_columns_name:
+            df[column_name] = df[column_name].apply(format_json)
+        return df.rename(columns={col: col.lower() for col in df.columns})
+
+    def _get_json_columns_name(self, table_name: str, schema_name: str) -> list[str]:
+        columns_description = self.describe_table(table_name=table_name, schema_name=schema_name)
+        return [column["name"] for column in columns_description if column["type"] in JSON_COLUMN_TYPES]
 
     def get_table_df(self, table_name: str, schema_name: str) -> pd.DataFrame:
-        if not self.table_exists(table_name, schema_name):
-            raise ValueError(f"Table {table_name} does not exist in schema {schema_name}")
+        json_columns_name = self._get_json_columns_name(table_name, schema_name)
         query = f"SELECT * FROM {schema_name}.{table_name};"
-        with self._lock:
-            df = self.connector.cursor().execute(query).fetch_pandas_all()
+        with self._pool.connection() as connection:
+            df = self._fetch_dataframe(connection.cursor().execute(query))
+        return self._format_table_df(df, json_columns_name)
 
-        columns_description = self.describe_table(table_name=table_name, schema_name=schema_name)
-        json_columns_name = [
-            column["name"] for column in columns_description if column["type"] in ["OBJECT", "VARIANT", "ARRAY"]
-        ]
-        for column_name in json_columns_name:
-            df[column_name] = df[column_name].apply(format_json)
-        df = df.rename(columns={col: col.lower() for col in df.columns})
-        return df
+    def get_table_chunks(
+        self,
+        table_name: str,
+        schema_name: Optional[str] = None,
+        columns: Optional[list[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the rows of a table by DataFrames of at most `chunk_size` rows, split from the Arrow
+        batches of the results, so that the table is never held in memory at once.
+        """
+        json_columns_name = self._get_json_columns_name(table_name, schema_name)
+        if columns is not None:
+            json_columns_name = [name for name in json_columns_name if name in columns]
+        query = f"SELECT {', '.join(columns) if columns else '*'} FROM {schema_name}.{table_name};"
+        with self._pool.connection() as connection:
+            for batch in connection.cursor().execute(query).fetch_pandas_batches():
+                for start in range(0, len(batch), chunk_size):
+                    yield self._format_table_df(batch.iloc[start : start + chunk_size].copy(), json_columns_name)
 
     def describe_table(self, table_name: str, schema_name: str) -> list[dict]:
         """
         Return a list of dict with the columns description of the table
         [{"name": column_name, "type": column_type, ...}, ...]
         See https://docs.snowflake.com/en/sql-reference/sql/desc-table for more information
+        The description is cached for METADATA_TTL_SECONDS.
         """
         if not self.table_exists(table_name, schema_name):
             raise ValueError(f"Table {table_name} does not exist in schema {schema_name}")
-        query = f"DESCRIBE TABLE {schema_name}.{table_name};"
-        with self._lock:
-            columns_description = self.connector.cursor().execute(query).fetchall()
-            df_describe = pd.DataFrame(
-                columns_description,
-                columns=[
-                    "name",
-                    "type",
-                    "kind",
-                    "is_nullable",
-                    "default",
-                    "is_primary_key",
-                    "unique key",
-                    "check",
-                    "expression",
-                    "comment",
-                    "policy name",
-                    "privacy domain",
-                ],
-            )
-        return df_describe.to_dict(orient="records")
+
+        def load_description() -> list[dict]:
+            columns_description = self._execute(f"DESCRIBE TABLE {schema_name}.{table_name};")
+            return [dict(zip(DESCRIBE_TABLE_COLUMNS, column)) for column in columns_description]
+
+        columns_description = self._get_metadata(
+            ("columns", schema_name.upper(), table_name.upper()), load_description
+        )
+        return [dict(column) for column in columns_description]
 
     def insert_data(
         self,
@@ -167,14 +240,17 @@ class SnowflakeService(DBService):
             values.append(formatted_value)
         values_clause = ", ".join(values)
         query = f"INSERT INTO {schema_name}.{table_name} ({keys}) SELECT {values_clause}"
-        with self._lock:
-            self.connector.cursor().execute(query)
+        self._execute(query)
 
     def insert_df_to_table(self, df: pd.DataFrame, table_name: str, schema_name: str) -> None:
         df_table_description = self.describe_table(table_name, schema_name)
         check_columns_matching_between_data_and_database_table(df.columns, df_table_description)
+        with self._pool.connection() as connection:
+            self._write_df(connection, df, table_name, schema_name)
+
+    def _write_df(self, connection, df: pd.DataFrame, table_name: str, schema_name: str) -> None:
         write_pandas(
-            self.connector,
+            connection,
             df,
             table_name,
             database=self.database_name,
@@ -183,8 +259,8 @@ class SnowflakeService(DBService):
         )
 
     def grant_select_on_table(self, table_name: str, schema_name: str, role: str) -> None:
-        self.connector.cursor().execute(f"GRANT USAGE ON SCHEMA {schema_name} TO ROLE {role}")
-        self.connector.cursor().execute(f"GRANT SELECT ON {schema_name}.{table_name} TO ROLE {role}")
+        self._execute(f"GRANT USAGE ON SCHEMA {schema_name} TO ROLE {role}")
+        self._execute(f"GRANT SELECT ON {schema_name}.{table_name} TO ROLE {role}")
 
     def _refresh_table_from_df(
         self,
@@ -200,29 +276,29 @@ class SnowflakeService(DBService):
         df is the DataFrame with the updated values.
         """
         table_definition_str = self.convert_table_definition_to_string(table_definition)
-        query_temporary = f"CREATE TEMPORARY TABLE {schema_name}.updated_values ({table_definition_str});"
-        self.connector.cursor().execute(query_temporary)
-        self.insert_df_to_table(
-            df=df,
-            table_name="updated_values",
-            schema_name=schema_name,
+        check_columns_matching_between_data_and_database_table(
+            df.columns, [{"name": column.name} for column in table_definition.columns]
         )
-        LOGGER.info(f"Temporary table created to update {schema_name}.{table_name}")
-
-        df.columns = [column.upper() for column in df.columns]
-        query = (
-            f"UPDATE {schema_name}.{table_name} SET "
-            + ", ".join([f"{column} = {schema_name}.updated_values.{column}" for column in df.columns])
-            + f" FROM {schema_name}.updated_values "
-            + f"WHERE {schema_name}.{table_name}.{id_column} = "
-            + f"{schema_name}.updated_values.{id_column};"
-        )
-        self.connector.cursor().execute(query)
-        self.connector.cursor().execute(f"DROP TABLE {schema_name}.updated_values;")
+        # Temporary tables only exist in their session: every statement uses the same connection
+        with self._pool.connection() as connection:
+            query_temporary = f"CREATE TEMPORARY TABLE {schema_name}.updated_values ({table_definition_str});"
+            connection.cursor().execute(query_temporary)
+            self._write_df(connection, df, "updated_values", schema_name)
+            LOGGER.info(f"Temporary table created to update {schema_name}.{table_name}")
+
+            df.columns = [column.upper() for column in df.columns]
+            query = (
+                f"UPDATE {schema_name}.{table_name} SET "
+                + ", ".join([f"{column} = {schema_name}.updated_values.{column}" for column in df.columns])
+                + f" FROM {schema_name}.updated_values "
+                + f"WHERE {schema_name}.{table_name}.{id_column} = "
+                + f"{schema_name}.updated_values.{id_column};"
+            )
+            connection.cursor().execute(query)
+            connection.cursor().execute(f"DROP TABLE {schema_name}.updated_values;")
 
     def _fetch_sql_query_as_dataframe(self, query: str) -> pd.DataFrame:
-        with self._lock:
-            df = self.connector.cursor().execute(query).fetch_pandas_all()
+        df = self.run_query(query)
         df.columns = df.columns.str.lower()
         return df
 
@@ -256,7 +332,7 @@ class SnowflakeService(DBService):
     ):
         placeholders = ",".join(["%s"] * len(ids))
         query = f'DELETE FROM {schema_name}.{table_name} WHERE "{id_column_name}" IN ({placeholders})'
-        self.connector.cursor().execute(query, ids)
+        self._execute(query, ids)
 
     def get_db_description(
         self,
@@ -264,8 +340,7 @@ class SnowflakeService(DBService):
         table_names: Optional[list[str]] = None,
     ) -> str:
         if table_names is None:
-            table_info = self.connector.cursor().execute(f"SHOW TABLES in {schema_name}").fetchall()
-            table_names = [table[1] for table in table_info]
+            table_names = self._get_table_names(schema_name)
         db_description = f"Snowflake database {self.database_name} and schema {schema_name}\n"
 
         for table_name in table_names:
@@ -275,10 +350,40 @@ class SnowflakeService(DBService):
             db_description += ", ".join(column_details)
         return db_description
 
-    def run_query(self, query: str) -> pd.DataFrame:
-        with self._lock:
-            df = self.connector.cursor().execute(query).fetch_pandas_all()
-        return df
+    def run_query(self, query: str, timeout: Optional[float] = None) -> pd.DataFrame:
+        """
+        Run a query and return its results. With a timeout, the query is submitted asynchronously,
+        as for long-running statements, and cancelled if it runs for longer (see get_query_results).
+        """
+        if timeout is not None:
+            return self.get_query_results(self.submit_query(query), timeout=timeout)
+        with self._pool.connection() as connection:
+            return self._fetch_dataframe(connection.cursor().execute(query))
+
+    def submit_query(self, query: str) -> str:
+        """Start a query without waiting for its results, which get_query_results returns. Returns its query id."""
+        with self._pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute_async(query)
+            LOGGER.info(f"Submitted Snowflake query {cursor.sfqid}")
+            return cursor.sfqid
+
+    def get_query_results(self, query_id: str, timeout: Optional[float] = None) -> pd.DataFrame:
+        """
+        Wait for a query started by submit_query and return its results.
+        Raises the error of the query if it failed, and TimeoutError after cancelling it if it runs
+        for longer than the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._pool.connection() as connection:
+            while connection.is_still_running(connection.get_query_status_throw_if_error(query_id)):
+                if deadline is not None and time.monotonic() > deadline:
+                    connection.cursor().execute(f"SELECT SYSTEM$CANCEL_QUERY('{query_id}')")
+                    raise TimeoutError(f"Snowflake query {query_id} was cancelled after {timeout} seconds")
+                time.sleep(QUERY_POLL_INTERVAL_SECONDS)
+            cursor = connection.cursor()
+            cursor.get_results_from_sfqid(query_id)
+            return self._fetch_dataframe(cursor)
 
     def upsert_value(self, table_name: str, id_column_name: str, id: str, values: dict, schema_name: str) -> None:
         # Construct the SET part of the SQL query
@@ -287,5 +392,4 @@ class SnowflakeService(DBService):
             f"INSERT INTO {schema_name}.{table_name} ({id_column_name}) VALUES (%s) "
             + f"ON CONFLICT ({id_column_name}) DO UPDATE SET {set_clause}"
         )
-        with self._lock:
-            self.connector.cursor().execute(query, (id,) + tuple(values.values()))
+        self._execute(query, (id,) + tuple(values.values()))
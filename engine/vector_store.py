@@ -0,0 +1,135 @@
+from typing import Any, Callable, Optional, Protocol, runtime_checkable
+
+import pandas as pd
+
+from engine.agent.agent import SourceChunk
+from engine.embedding_store import EmbeddingStats, EmbeddingStore
+from engine.llm_services.llm_service import LLMService
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import DEFAULT_MAX_CHUNKS, QdrantCollectionSchema, QdrantService
+from settings import settings
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """
+    Operations on a vector store used by the retrievers, the RAG builders and the ingestion scripts.
+    Filters follow the Qdrant format, as built by `format_qdrant_filter`.
+    Implemented by QdrantService and LocalVectorStore.
+    """
+
+    default_schema: QdrantCollectionSchema
+    embedding_stats: EmbeddingStats
+
+    def register_schema(self, collection_name: str, schema: QdrantCollectionSchema):
+        """Register the schema of the chunks of a collection."""
+
+    def collection_exists(self, collection_name: str) -> bool:
+        """Check if a collection exists."""
+
+    def create_collection(
+        self, collection_name: str, vector_size: Optional[int] = None, distance: str = "Cosine"
+    ) -> bool:
+        """Create a collection, with the vector options and the sparse vector of its schema."""
+
+    def delete_collection(self, collection_name: str) -> bool:
+        """Delete a collection and all its points."""
+
+    def list_collection_names(self) -> list[str]:
+        """List the names of all the collections."""
+
+    def get_sparse_vector_names(self, collection_name: str) -> list[str]:
+        """Return the names of the sparse vectors configured on a collection."""
+
+    def check_vector_options(self, collection_name: str) -> list[str]:
+        """Warn about the vector options of the schema that differ from those of an existing collection."""
+
+    def ensure_payload_indexes(self, collection_name: str) -> list[str]:
+        """Create the missing payload indexes of the fields of the schema used in filters."""
+
+    def add_chunks(self, list_chunks: list[dict[str, Any]], collection_name: str) -> bool:
+        """Embed and upsert chunks, given as dicts following the schema of the collection."""
+
+    def delete_chunks(self, point_ids: list[str], id_field: str, collection_name: str) -> bool:
+        """Delete the chunks whose id field is in the given list."""
+
+    def get_points(self, collection_name: str, filter: Optional[dict] = None) -> list[dict]:
+        """Return the points (id and payload) matching a filter."""
+
+    def delete_points_by_filter(self, filter: dict, collection_name: str) -> bool:
+        """Delete the points matching a filter."""
+
+    def set_payloads(self, payloads: dict[str, dict], collection_name: str) -> bool:
+        """Overwrite payload fields of points, by point id, keeping their vectors."""
+
+    def delete_tenant_points(self, collection_name: str) -> bool:
+        """Delete the points of the tenant of the schema of a shared collection."""
+
+    def count_points(self, collection_name: str, filter: Optional[dict] = None) -> int:
+        """Count the points matching a filter."""
+
+    def search_similar_ids(
+        self,
+        query_text: str,
+        collection_name: str,
+        limit: int = DEFAULT_MAX_CHUNKS,
+        filter: Optional[dict] = None,
+        **search_params,
+    ) -> list[tuple[str, float]]:
+        """Dense search: ids and scores of the points closest to the embedding of the text."""
+
+    def search_lexical_ids(
+        self,
+        query_text: str,
+        collection_name: str,
+        limit: int = DEFAULT_MAX_CHUNKS,
+        filter: Optional[dict] = None,
+        **search_params,
+    ) -> list[tuple[str, float]]:
+        """Sparse search: ids and scores of the points sharing the most (rare) terms with the text."""
+
+    def retrieve_similar_chunks(
+        self,
+        query_text: str,
+        collection_name: str,
+        limit: int = DEFAULT_MAX_CHUNKS,
+        filter: Optional[dict] = None,
+        **search_params,
+    ) -> list[SourceChunk]:
+        """Dense search of the chunks most similar to the text."""
+
+    def get_chunks_by_ids(self, vector_results: list[tuple[str, float]], collection_name: str) -> list[SourceChunk]:
+        """Build the chunks of scored point ids, keeping their order."""
+
+    def get_collection_data(self, collection_name: str, filter: Optional[dict] = None) -> pd.DataFrame:
+        """Return all the chunks of a collection, or those matching a filter, as a DataFrame."""
+
+    def sync_df_with_collection(self, df: pd.DataFrame, collection_name: str, delete_missing: bool = True) -> bool:
+        """Make the collection match the chunks of the DataFrame, or only update them without delete_missing."""
+
+    def delete_missing_chunks(
+        self, collection_name: str, get_existing_ids: Callable[[list[str]], set[str]], page_size: int = 1000
+    ) -> int:
+        """Delete the chunks whose id is not among the existing ids, reading the collection by pages."""
+
+
+def get_vector_store(
+    llm_service: Optional[LLMService] = None,
+    default_collection_schema: Optional[QdrantCollectionSchema] = None,
+    embedding_store: Optional[EmbeddingStore] = None,
+) -> VectorStore:
+    """
+    Build the vector store configured by the environment: the embedded LocalVectorStore when
+    LOCAL_VECTOR_STORE_PATH is set, otherwise the Qdrant cluster.
+    """
+    if settings.LOCAL_VECTOR_STORE_PATH:
+        return LocalVectorStore.from_defaults(
+            llm_service=llm_service,
+            default_collection_schema=default_collection_schema,
+            embedding_store=embedding_store,
+        )
+    return QdrantService.from_defaults(
+        llm_service=llm_service,
+        default_collection_schema=default_collection_schema,
+        embedding_store=embedding_store,
+    )
@@ -1,13 +1,18 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from functools import partial
+import itertools
+import json
 import logging
-from typing import Optional
+from typing import Any, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import UUID
 
 from engine.llm_services.openai_llm_service import OpenAILLMService
-from engine.qdrant_service import QdrantCollectionSchema, QdrantService
-from engine.storage_service.db_service import DBService
+from engine.qdrant_service import DEFAULT_OVERSAMPLING, DEFAULT_SPARSE_VECTOR_NAME, QdrantCollectionSchema
+from engine.storage_service.db_service import DEFAULT_CHUNK_SIZE, DBService
 from engine.storage_service.db_utils import (
     PROCESSED_DATETIME_FIELD,
     DBColumn,
@@ -16,6 +21,7 @@ from engine.storage_service.db_utils import (
 )
 from engine.storage_service.local_service import SQLLocalService
 from engine.trace.trace_manager import TraceManager
+from engine.vector_store import VectorStore
 from ingestion_script.ingest_folder_source import sync_chunks_to_qdrant
 from ada_backend.database import models as db
 from ingestion_script.utils import upload_source
@@ -23,6 +29,87 @@ from ingestion_script.utils import upload_source
 LOGGER = logging.getLogger(__name__)
 
 LLM_OPENAI = OpenAILLMService(trace_manager=TraceManager(project_name="ingestion"))
+# High-water marks of the synced database sources, in the schema of their storage table
+WATERMARK_TABLE_NAME = "ingestion_watermarks"
+WATERMARK_TABLE_DEFINITION = DBDefinition(
+    columns=[
+        DBColumn(name=PROCESSED_DATETIME_FIELD, type="DATETIME", default="CURRENT_TIMESTAMP"),
+        DBColumn(name="storage_table_name", type="VARCHAR", is_primary=True),
+        DBColumn(name="last_timestamp", type="VARCHAR"),
+        DBColumn(name="last_id", type="VARCHAR"),
+        DBColumn(name="full_sync_at", type="VARCHAR"),
+    ]
+)
+# Incremental syncs miss deleted rows and rows arriving with an older timestamp: a full sync catches them
+FULL_SYNC_INTERVAL = timedelta(days=1)
+
+
+@dataclass
+class Watermark:
+    """
+    Latest row ingested from a source table: its timestamp, with its id as tie-breaker between rows
+    of the same timestamp, and the time of the last full sync of the table.
+    """
+
+    last_timestamp: Any
+    last_id: Any
+    full_sync_at: datetime
+
+    def is_after(self, other: "Watermark") -> bool:
+        return (self.last_timestamp, self.last_id) > (other.last_timestamp, other.last_id)
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def get_watermark(db_service: DBService, schema_name: str, storage_table_name: str) -> Optional[Watermark]:
+    if not db_service.table_exists(WATERMARK_TABLE_NAME, schema_name=schema_name):
+        return None
+    df = db_service.get_table_df(WATERMARK_TABLE_NAME, schema_name=schema_name)
+    rows = df[df["storage_table_name"] == storage_table_name]
+    if rows.empty:
+        return None
+    row = rows.iloc[0]
+    return Watermark(
+        last_timestamp=json.loads(row["last_timestamp"]),
+        last_id=json.loads(row["last_id"]),
+        full_sync_at=datetime.fromisoformat(row["full_sync_at"]),
+    )
+
+
+def save_watermark(db_service: DBService, schema_name: str, storage_table_name: str, watermark: Watermark) -> None:
+    row = {
+        "storage_table_name": storage_table_name,
+        # Saved as JSON, to keep the type of numeric timestamps for the comparisons of the next sync
+        "last_timestamp": json.dumps(_to_json_value(watermark.last_timestamp)),
+        "last_id": json.dumps(_to_json_value(watermark.last_id)),
+        "full_sync_at": watermark.full_sync_at.isoformat(),
+    }
+    db_service.update_table(
+        pd.DataFrame([row]),
+        WATERMARK_TABLE_NAME,
+        table_definition=WATERMARK_TABLE_DEFINITION,
+        id_column_name="storage_table_name",
+        schema_name=schema_name,
+    )
+
+
+def get_chunk_watermark(
+    df: pd.DataFrame, timestamp_column_name: str, id_column_name: str, full_sync_at: datetime
+) -> Optional[Watermark]:
+    """Watermark of the latest row of a chunk, or None if no row has a timestamp."""
+    timestamps = df[timestamp_column_name].dropna()
+    if timestamps.empty:
+        return None
+    last_timestamp = timestamps.max()
+    # Ids are strings once converted to the storage type: when "9" wins over "10", rows are only read twice
+    last_id = df.loc[df[timestamp_column_name] == last_timestamp, id_column_name].max()
+    return Watermark(last_timestamp=last_timestamp, last_id=last_id, full_sync_at=full_sync_at)
 
 
 def get_db_source_definition(
@@ -30,7 +117,7 @@ def get_db_source_definition(
 ) -> DBDefinition:
     columns = [
         DBColumn(name=PROCESSED_DATETIME_FIELD, type="DATETIME", default="CURRENT_TIMESTAMP"),
-        DBColumn(name=id_column_name, type="VARCHAR", is_primary_key=True),
+        DBColumn(name=id_column_name, type="VARCHAR", is_primary=True),
         DBColumn(name="table_name", type="VARCHAR"),
         DBColumn(name="content", type="VARCHAR"),
     ]
@@ -44,7 +131,7 @@ def get_db_source_definition(
     )
 
 
-def get_db_source(
+def get_db_source_chunks(
     db_url: str,
     table_name: str,
     db_definition: DBDefinition,
@@ -53,36 +140,75 @@ def get_db_source(
     source_schema_name: Optional[str] = None,
     metadata_column_names: Optional[list[str]] = None,
     timestamp_column_name: Optional[str] = None,
-) -> pd.DataFrame:
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    watermark: Optional[Watermark] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read the source table by chunks of at most `chunk_size` rows, with only the columns to ingest,
+    and build the content of each row from its text columns. With a watermark, only the rows after it
+    are read, filtered by the source database.
+    Raises ValueError if a column is missing or if the table is empty: the columns are checked and the first
+    chunk is read when called, before the chunks are consumed and the storage table is created.
+    """
     sql_local_service = SQLLocalService(engine_url=db_url)
-    df = sql_local_service.get_table_df(table_name=table_name, schema_name=source_schema_name)
-    if df.empty:
-        raise ValueError(f"The table '{table_name}' is empty. No data to ingest.")
-
-    if id_column_name not in df.columns:
-        raise ValueError(f"ID column '{id_column_name}' not found in the columns: {df.columns.tolist()}")
-    if not set(text_column_names).issubset(df.columns):
-        raise ValueError(f"Text columns {text_column_names} not found in the columns: {df.columns.tolist()}")
-    if metadata_column_names is not None and not set(metadata_column_names).issubset(df.columns):
-        raise ValueError(f"Metadata columns {metadata_column_names} not found in the columns: {df.columns.tolist()}")
+    table_columns = [column.name for column in sql_local_service.get_table(table_name, source_schema_name).columns]
+    if id_column_name not in table_columns:
+        raise ValueError(f"ID column '{id_column_name}' not found in the columns: {table_columns}")
+    if not set(text_column_names).issubset(table_columns):
+        raise ValueError(f"Text columns {text_column_names} not found in the columns: {table_columns}")
+    if metadata_column_names is not None and not set(metadata_column_names).issubset(table_columns):
+        raise ValueError(f"Metadata columns {metadata_column_names} not found in the columns: {table_columns}")
 
-    df["content"] = df[text_column_names].apply(lambda x: " ".join(x.astype(str)), axis=1)
-    df["table_name"] = table_name
     columns = [id_column_name, "content", "table_name"]
-    LOGGER.debug(f"Columns to keep: {columns}")
     if timestamp_column_name:
         columns.append(timestamp_column_name)
     if metadata_column_names:
         columns += metadata_column_names
+    LOGGER.debug(f"Columns to keep: {columns}")
+    source_columns = list(dict.fromkeys([id_column_name, *text_column_names, *columns[3:]]))
+
+    after = None
+    if watermark is not None:
+        after = {timestamp_column_name: watermark.last_timestamp, id_column_name: watermark.last_id}
+    chunks = sql_local_service.get_table_chunks(
+        table_name, schema_name=source_schema_name, columns=source_columns, chunk_size=chunk_size, after=after
+    )
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        if watermark is not None:
+            return iter(())
+        raise ValueError(f"The table '{table_name}' is empty. No data to ingest.")
+    return _build_db_source_chunks(
+        itertools.chain([first_chunk], chunks),
+        table_name=table_name,
+        db_definition=db_definition,
+        id_column_name=id_column_name,
+        text_column_names=text_column_names,
+        columns=columns,
+    )
 
-    df = convert_to_correct_pandas_type(df, id_column_name, db_definition)
 
-    return df[columns].copy()
+def _build_db_source_chunks(
+    chunks: Iterator[pd.DataFrame],
+    table_name: str,
+    db_definition: DBDefinition,
+    id_column_name: str,
+    text_column_names: list[str],
+    columns: list[str],
+) -> Iterator[pd.DataFrame]:
+    for df in chunks:
+        content = df[text_column_names[0]].astype(str)
+        for text_column_name in text_column_names[1:]:
+            content = content + " " + df[text_column_name].astype(str)
+        df["content"] = content
+        df["table_name"] = table_name
+        df = convert_to_correct_pandas_type(df, id_column_name, db_definition)
+        yield df[columns].copy()
 
 
 def upload_db_source(
     db_service: DBService,
-    qdrant_service: QdrantService,
+    qdrant_service: VectorStore,
     db_definition: DBDefinition,
     storage_schema_name: str,
     storage_table_name: str,
@@ -95,8 +221,25 @@ def upload_db_source(
     metadata_column_names: Optional[list[str]] = None,
     timestamp_column_name: Optional[str] = None,
     is_sync_enabled: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    full_sync_interval: timedelta = FULL_SYNC_INTERVAL,
 ):
-    df = get_db_source(
+    """
+    Ingest the source table into the storage table and the collection.
+    Synced sources with a timestamp column keep a watermark of their latest row: until the full sync interval
+    has passed, only the rows after it are read, and the collection is only updated with them.
+    Full syncs read the whole table and also delete the rows removed from the source.
+    """
+    started_at = datetime.now(timezone.utc)
+    watermark = None
+    if is_sync_enabled and timestamp_column_name:
+        watermark = get_watermark(db_service, storage_schema_name, storage_table_name)
+    is_incremental = (
+        watermark is not None
+        and started_at - watermark.full_sync_at < full_sync_interval
+        and db_service.table_exists(storage_table_name, schema_name=storage_schema_name)
+    )
+    chunks = get_db_source_chunks(
         db_url=source_db_url,
         table_name=source_table_name,
         db_definition=db_definition,
@@ -105,25 +248,65 @@ def upload_db_source(
         source_schema_name=source_schema_name,
         metadata_column_names=metadata_column_names,
         timestamp_column_name=timestamp_column_name,
+        chunk_size=chunk_size,
+        watermark=watermark if is_incremental else None,
     )
-    LOGGER.info(f"Retrieved {len(df)} rows from the source table '{source_table_name}'.")
-    db_service.update_table(
-        new_df=df,
-        table_name=storage_table_name,
-        table_definition=db_definition,
-        id_column_name=id_column_name,
-        timestamp_column_name=timestamp_column_name,
-        append_mode=not is_sync_enabled,
-        schema_name=storage_schema_name,
-    )
-    LOGGER.info(f"Updated table '{storage_table_name}' in schema '{storage_schema_name}' with {len(df)} rows.")
-    sync_chunks_to_qdrant(
-        storage_schema_name,
-        storage_table_name,
-        collection_name=qdrant_collection_name,
-        db_service=db_service,
-        qdrant_service=qdrant_service,
-    )
+    full_sync_at = watermark.full_sync_at if is_incremental else started_at
+    # Rows read incrementally are all after the saved watermark: it is only replaced if rows were read
+    new_watermark = None
+    n_rows = 0
+
+    def track_rows(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        nonlocal n_rows, new_watermark
+        for df in chunks:
+            n_rows += len(df)
+            LOGGER.info(f"Retrieved {n_rows} rows from the source table '{source_table_name}'.")
+            if timestamp_column_name:
+                chunk_watermark = get_chunk_watermark(df, timestamp_column_name, id_column_name, full_sync_at)
+                if chunk_watermark and (new_watermark is None or chunk_watermark.is_after(new_watermark)):
+                    new_watermark = chunk_watermark
+            yield df
+
+    if is_incremental:
+        LOGGER.info(f"Syncing the rows of '{source_table_name}' after {watermark.last_timestamp}")
+        for df in track_rows(chunks):
+            db_service.update_table(
+                df,
+                table_name=storage_table_name,
+                table_definition=db_definition,
+                id_column_name=id_column_name,
+                timestamp_column_name=timestamp_column_name,
+                schema_name=storage_schema_name,
+            )
+            sync_chunks_to_qdrant(
+                storage_schema_name,
+                storage_table_name,
+                collection_name=qdrant_collection_name,
+                db_service=db_service,
+                qdrant_service=qdrant_service,
+                ids=df[id_column_name].tolist(),
+            )
+    else:
+        db_service.update_table_from_chunks(
+            track_rows(chunks),
+            table_name=storage_table_name,
+            table_definition=db_definition,
+            id_column_name=id_column_name,
+            timestamp_column_name=timestamp_column_name,
+            append_mode=not is_sync_enabled,
+            schema_name=storage_schema_name,
+        )
+        sync_chunks_to_qdrant(
+            storage_schema_name,
+            storage_table_name,
+            collection_name=qdrant_collection_name,
+            db_service=db_service,
+            qdrant_service=qdrant_service,
+            chunk_size=chunk_size,
+        )
+    LOGGER.info(f"Updated table '{storage_table_name}' in schema '{storage_schema_name}' with {n_rows} rows.")
+    if is_sync_enabled and new_watermark is not None:
+        save_watermark(db_service, storage_schema_name, storage_table_name, new_watermark)
 
 
 def ingestion_database(
@@ -138,18 +321,27 @@ def ingestion_database(
     metadata_column_names: Optional[list[str]] = None,
     timestamp_column_name: Optional[str] = None,
     is_sync_enabled: bool = False,
+    embedding_dimensions: Optional[int] = None,
+    vector_quantization: Optional[str] = None,
+    vectors_on_disk: bool = False,
 ) -> None:
+    db_definition = get_db_source_definition(
+        id_column_name=id_column_name,
+        timestamp_column_name=timestamp_column_name,
+        metadata_column_names=metadata_column_names,
+    )
     qdrant_schema = QdrantCollectionSchema(
         chunk_id_field=id_column_name,
         content_field="content",
         file_id_field="table_name",
         last_edited_ts_field=timestamp_column_name,
+        # Metadata columns are stored as VARCHAR, so their payload values are strings indexed as keywords
         metadata_fields_to_keep=set(metadata_column_names) if metadata_column_names else None,
-    )
-    db_definition = get_db_source_definition(
-        id_column_name=id_column_name,
-        timestamp_column_name=timestamp_column_name,
-        metadata_column_names=metadata_column_names,
+        sparse_vector_name=DEFAULT_SPARSE_VECTOR_NAME,
+        embedding_dimensions=embedding_dimensions,
+        quantization=vector_quantization,
+        on_disk=vectors_on_disk,
+        oversampling=DEFAULT_OVERSAMPLING if vector_quantization else None,
     )
     source_type = db.SourceType.DATABASE
     LOGGER.info("Start ingestion data from the database source...")
@@ -1,5 +1,7 @@
+import dataclasses
 import logging
 from functools import partial
+from typing import Optional
 from uuid import UUID
 
 from ada_backend.database import models as db
@@ -14,14 +16,22 @@ from data_ingestion.document.folder_management.google_drive_folder_management im
 from data_ingestion.document.folder_management.local_folder_management import LocalFolderManager
 from data_ingestion.document.supabase_file_uploader import sync_files_to_supabase
 from data_ingestion.document.summary_from_document import add_summary_in_chunks, get_summary_from_document
+from engine.embedding_store import get_embedding_store
 from engine.llm_services.google_llm_service import GoogleLLMService
 from engine.llm_services.openai_llm_service import OpenAILLMService
-from engine.qdrant_service import QdrantCollectionSchema, QdrantService
+from engine.qdrant_service import DEFAULT_OVERSAMPLING, DEFAULT_SPARSE_VECTOR_NAME, QdrantCollectionSchema
 from engine.storage_service.db_service import DBService
 from engine.storage_service.db_utils import PROCESSED_DATETIME_FIELD, DBColumn, DBDefinition, create_db_if_not_exists
 from engine.storage_service.local_service import SQLLocalService
 from engine.trace.trace_manager import TraceManager
-from ingestion_script.utils import create_source, get_sanitize_names, update_ingestion_task
+from engine.vector_store import VectorStore, get_vector_store
+from ingestion_script.utils import (
+    create_source,
+    get_sanitize_names,
+    get_shared_collection_storage,
+    source_exists_in_vector_store,
+    update_ingestion_task,
+)
 from settings import settings
 
 LOGGER = logging.getLogger(__name__)
@@ -38,7 +48,7 @@ META_DATA_TO_KEEP = [
 FILE_TABLE_DEFINITION = DBDefinition(
     columns=[
         DBColumn(name=PROCESSED_DATETIME_FIELD, type="DATETIME", default="CURRENT_TIMESTAMP"),
-        DBColumn(name=ID_COLUMN_NAME, type="VARCHAR", is_primary_key=True),
+        DBColumn(name=ID_COLUMN_NAME, type="VARCHAR", is_primary=True),
         DBColumn(name="file_id", type="VARCHAR"),
         DBColumn(name="content", type="VARCHAR"),
         DBColumn(name="document_title", type="VARCHAR"),
@@ -56,6 +66,7 @@ QDRANT_SCHEMA = QdrantCollectionSchema(
     file_id_field="file_id",
     last_edited_ts_field=TIMESTAMP_COLUMN_NAME,
     metadata_fields_to_keep=["metadata"],
+    sparse_vector_name=DEFAULT_SPARSE_VECTOR_NAME,
 )
 
 
@@ -64,13 +75,49 @@ def sync_chunks_to_qdrant(
     table_name: str,
     collection_name: str,
     db_service: DBService,
-    qdrant_service: QdrantService,
+    qdrant_service: VectorStore,
+    chunk_size: Optional[int] = None,
+    ids: Optional[list[str]] = None,
 ) -> None:
-    chunks_df = db_service.get_table_df(table_name, schema_name=table_schema)
-    LOGGER.info(f"Syncing chunks to Qdrant collection {collection_name} with {len(chunks_df)} rows")
+    """
+    Sync the chunks of the table with the collection. With a chunk size, the table is read and synced
+    by chunks of at most `chunk_size` rows, then the chunks missing from the table are deleted.
+    With ids, only the chunks of these ids are synced, and no chunk is deleted.
+    """
+    schema = qdrant_service._get_schema(collection_name)
     if not qdrant_service.collection_exists(collection_name):
         qdrant_service.create_collection(collection_name)
-    qdrant_service.sync_df_with_collection(df=chunks_df, collection_name=collection_name)
+    else:
+        qdrant_service.check_vector_options(collection_name)
+        if schema.sparse_vector_name and schema.sparse_vector_name not in qdrant_service.get_sparse_vector_names(
+            collection_name
+        ):
+            LOGGER.warning(
+                f"Collection {collection_name} was created without sparse vectors, syncing dense vectors only. "
+                "Re-create the collection to enable hybrid search."
+            )
+            qdrant_service.register_schema(collection_name, dataclasses.replace(schema, sparse_vector_name=None))
+    if ids is not None:
+        chunks_df = db_service.get_rows_by_ids(table_name, schema.chunk_id_field, ids, schema_name=table_schema)
+        LOGGER.info(f"Syncing {len(chunks_df)} updated chunks to Qdrant collection {collection_name}")
+        qdrant_service.sync_df_with_collection(df=chunks_df, collection_name=collection_name, delete_missing=False)
+        return
+    if chunk_size is None:
+        chunks_df = db_service.get_table_df(table_name, schema_name=table_schema)
+        LOGGER.info(f"Syncing chunks to Qdrant collection {collection_name} with {len(chunks_df)} rows")
+        qdrant_service.sync_df_with_collection(df=chunks_df, collection_name=collection_name)
+        return
+
+    n_rows = 0
+    for chunks_df in db_service.get_table_chunks(table_name, schema_name=table_schema, chunk_size=chunk_size):
+        n_rows += len(chunks_df)
+        LOGGER.info(f"Syncing chunks to Qdrant collection {collection_name}: {n_rows} rows")
+        qdrant_service.sync_df_with_collection(df=chunks_df, collection_name=collection_name, delete_missing=False)
+    qdrant_service.delete_missing_chunks(
+        collection_name,
+        partial(db_service.get_existing_ids, table_name, schema.chunk_id_field, schema_name=table_schema),
+        page_size=chunk_size,
+    )
 
 
 def ingest_google_drive_source(
@@ -81,6 +128,9 @@ def ingest_google_drive_source(
     save_supabase: bool = True,
     access_token: str = None,
     add_doc_description_to_chunks: bool = False,
+    embedding_dimensions: Optional[int] = None,
+    vector_quantization: Optional[str] = None,
+    vectors_on_disk: bool = False,
 ) -> None:
     # TODO: see how we can change whole code to use id instead of path
     path = "https://drive.google.com/drive/folders/" + folder_id
@@ -94,6 +144,9 @@ def ingest_google_drive_source(
         task_id=task_id,
         save_supabase=save_supabase,
         add_doc_description_to_chunks=add_doc_description_to_chunks,
+        embedding_dimensions=embedding_dimensions,
+        vector_quantization=vector_quantization,
+        vectors_on_disk=vectors_on_disk,
     )
 
 
@@ -104,6 +157,9 @@ def ingest_local_folder_source(
     task_id: UUID,
     save_supabase: bool = True,
     add_doc_description_to_chunks: bool = False,
+    embedding_dimensions: Optional[int] = None,
+    vector_quantization: Optional[str] = None,
+    vectors_on_disk: bool = False,
 ) -> None:
     folder_manager = LocalFolderManager(path=path)
     source_type = db.SourceType.LOCAL
@@ -115,6 +171,9 @@ def ingest_local_folder_source(
         task_id=task_id,
         save_supabase=save_supabase,
         add_doc_description_to_chunks=add_doc_description_to_chunks,
+        embedding_dimensions=embedding_dimensions,
+        vector_quantization=vector_quantization,
+        vectors_on_disk=vectors_on_disk,
     )
 
 
@@ -126,6 +185,9 @@ def _ingest_folder_source(
     task_id: UUID,
     save_supabase: bool = True,
     add_doc_description_to_chunks: bool = False,
+    embedding_dimensions: Optional[int] = None,
+    vector_quantization: Optional[str] = None,
+    vectors_on_disk: bool = False,
 ) -> None:
     db_table_schema, db_table_name, qdrant_collection_name = get_sanitize_names(
         source_name=source_name,
@@ -136,9 +198,25 @@ def _ingest_folder_source(
         raise ValueError("INGESTION_DB_URL is not set")
     create_db_if_not_exists(settings.INGESTION_DB_URL)
     db_service = SQLLocalService(engine_url=settings.INGESTION_DB_URL)
-    qdrant_service = QdrantService.from_defaults(
-        llm_service=LLM_OPENAI,
-        default_collection_schema=QDRANT_SCHEMA,
+    qdrant_schema = dataclasses.replace(
+        QDRANT_SCHEMA,
+        embedding_dimensions=embedding_dimensions,
+        quantization=vector_quantization,
+        on_disk=vectors_on_disk,
+        oversampling=DEFAULT_OVERSAMPLING if vector_quantization else None,
+    )
+    embedding_service = LLM_OPENAI
+    if embedding_dimensions:
+        embedding_service = OpenAILLMService(trace_manager=TraceManager, embedding_dimensions=embedding_dimensions)
+    source_id = None
+    if settings.QDRANT_SHARED_COLLECTIONS:
+        qdrant_collection_name, qdrant_schema, source_id = get_shared_collection_storage(
+            source_name, organization_id, qdrant_schema, embedding_service._embedding_model
+        )
+    qdrant_service = get_vector_store(
+        llm_service=embedding_service,
+        default_collection_schema=qdrant_schema,
+        embedding_store=get_embedding_store(),
     )
 
     LOGGER.info(f"Table schema in ingestion : {db_table_schema}")
@@ -162,7 +240,7 @@ def _ingest_folder_source(
         )
         return
 
-    if qdrant_service.collection_exists(qdrant_collection_name):
+    if source_exists_in_vector_store(qdrant_service, qdrant_collection_name):
         LOGGER.error(f"Source {source_name} already exists in Qdrant")
         update_ingestion_task(
             organization_id=organization_id,
@@ -232,14 +310,16 @@ def _ingest_folder_source(
             ingestion_task=ingestion_task,
         )
         return
+    LOGGER.info(f"Embeddings of source {source_name}: {qdrant_service.embedding_stats}")
     source_data = DataSourceSchema(
+        id=source_id,
         name=source_name,
         type=source_type,
         database_schema=db_table_schema,
         database_table_name=db_table_name,
         qdrant_collection_name=qdrant_collection_name,
-        qdrant_schema=QDRANT_SCHEMA.to_dict(),
-        embedding_model_name=LLM_OPENAI._embedding_model,
+        qdrant_schema=qdrant_schema.to_dict(),
+        embedding_model_name=embedding_service._embedding_model,
     )
     LOGGER.info(f"Creating source {source_name} for organization {organization_id} in database")
     source_id = create_source(
@@ -59,6 +59,9 @@ def ingestion_main(
                 save_supabase=True,
                 access_token=access_token,
                 add_doc_description_to_chunks=False,
+                embedding_dimensions=source_attributes.get("embedding_dimensions"),
+                vector_quantization=source_attributes.get("vector_quantization"),
+                vectors_on_disk=source_attributes.get("vectors_on_disk") or False,
             )
         except Exception as e:
             LOGGER.error(f"Error during google drive ingestion: {str(e)}")
@@ -85,6 +88,9 @@ def ingestion_main(
                 task_id=task_id,
                 save_supabase=True,
                 add_doc_description_to_chunks=False,
+                embedding_dimensions=source_attributes.get("embedding_dimensions"),
+                vector_quantization=source_attributes.get("vector_quantization"),
+                vectors_on_disk=source_attributes.get("vectors_on_disk") or False,
             )
         except Exception as e:
             LOGGER.error(f"Error during local ingestion: {str(e)}")
@@ -123,6 +129,9 @@ def ingestion_main(
                 metadata_column_names=source_attributes.get("metadata_column_names"),
                 timestamp_column_name=source_attributes.get("timestamp_column_name"),
                 is_sync_enabled=source_attributes.get("is_sync_enabled", False),
+                embedding_dimensions=source_attributes.get("embedding_dimensions"),
+                vector_quantization=source_attributes.get("vector_quantization"),
+                vectors_on_disk=source_attributes.get("vectors_on_disk") or False,
             )
         except Exception as e:
             LOGGER.error(f"Error during database ingestion: {str(e)}")
@@ -1,5 +1,8 @@
+import dataclasses
 import logging
 import inspect
+import uuid
+from typing import Optional
 
 import requests
 
@@ -8,9 +11,11 @@ from ada_backend.database import models as db
 from ada_backend.schemas.source_schema import DataSourceSchema
 from data_ingestion.utils import sanitize_filename
 from engine.llm_services.openai_llm_service import OpenAILLMService
-from engine.qdrant_service import QdrantCollectionSchema, QdrantService
+from engine.qdrant_service import QdrantCollectionSchema
 from engine.storage_service.local_service import SQLLocalService
+from engine.embedding_store import get_embedding_store
 from engine.trace.trace_manager import TraceManager
+from engine.vector_store import VectorStore, get_vector_store
 from settings import settings
 
 LOGGER = logging.getLogger(__name__)
@@ -29,6 +34,37 @@ def get_sanitize_names(source_name: str, organization_id: str) -> tuple[str, str
     )
 
 
+def get_shared_collection_name(embedding_model_name: str, embedding_dimensions: Optional[int] = None) -> str:
+    """Name of the collection shared by all the sources embedded with a model, at a given size."""
+    return f"shared_{sanitize_filename(embedding_model_name)}_{embedding_dimensions or 'full'}_collection"
+
+
+def get_shared_collection_storage(
+    source_name: str,
+    organization_id: str,
+    qdrant_schema: QdrantCollectionSchema,
+    embedding_model_name: str,
+) -> tuple[str, QdrantCollectionSchema, uuid.UUID]:
+    """
+    Collection, schema and id of a source stored in the collection shared by the sources of its embedding model.
+    The source id is derived from its name, so that the chunks of a synced source keep the same tenant.
+    """
+    source_id = uuid.uuid5(uuid.NAMESPACE_URL, f"{organization_id}/{source_name}")
+    tenant_schema = dataclasses.replace(
+        qdrant_schema,
+        tenant_fields={"organization_id": str(organization_id), "source_id": str(source_id)},
+    )
+    collection_name = get_shared_collection_name(embedding_model_name, qdrant_schema.embedding_dimensions)
+    return collection_name, tenant_schema, source_id
+
+
+def source_exists_in_vector_store(qdrant_service: VectorStore, collection_name: str) -> bool:
+    """Check if a source is already ingested: its collection exists, or it has points in the shared collection."""
+    if not qdrant_service.collection_exists(collection_name):
+        return False
+    return not qdrant_service.default_schema.tenant_fields or qdrant_service.count_points(collection_name) > 0
+
+
 def check_signature(fn: callable, required_params: list[str]):
     sig = inspect.signature(fn)
     fn_params = list(sig.parameters.keys())
@@ -121,10 +157,19 @@ def upload_source(
         source_type=source_type,
         status=db.TaskStatus.FAILED,
     )
-    llm_service = OpenAILLMService(trace_manager=TraceManager(project_name="ingestion"))
-    qdrant_service = QdrantService.from_defaults(
+    llm_service = OpenAILLMService(
+        trace_manager=TraceManager(project_name="ingestion"),
+        embedding_dimensions=qdrant_schema.embedding_dimensions,
+    )
+    source_id = None
+    if settings.QDRANT_SHARED_COLLECTIONS:
+        qdrant_collection_name, qdrant_schema, source_id = get_shared_collection_storage(
+            source_name, organization_id, qdrant_schema, llm_service._embedding_model
+        )
+    qdrant_service = get_vector_store(
         llm_service=llm_service,
         default_collection_schema=qdrant_schema,
+        embedding_store=get_embedding_store(),
     )
 
     if not is_sync_enabled and db_service.schema_exists(schema_name=schema_name):
@@ -135,7 +180,7 @@ def upload_source(
                 ingestion_task=ingestion_task,
             )
             return
-    elif not is_sync_enabled and qdrant_service.collection_exists(qdrant_collection_name):
+    elif not is_sync_enabled and source_exists_in_vector_store(qdrant_service, qdrant_collection_name):
         LOGGER.error(f"Source {source_name} already exists in Qdrant")
         update_ingestion_task(
             organization_id=organization_id,
@@ -165,8 +210,10 @@ def upload_source(
             ingestion_task=ingestion_task,
         )
         return
+    LOGGER.info(f"Embeddings of source {source_name}: {qdrant_service.embedding_stats}")
 
     source_data = DataSourceSchema(
+        id=source_id,
         name=source_name,
         type=source_type,
         database_schema=schema_name,
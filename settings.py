@@ -48,6 +48,12 @@ class BaseConfig(BaseSettings):
 
     QDRANT_CLUSTER_URL: Optional[str] = None
     QDRANT_API_KEY: Optional[str] = None
+    # Directory of the embedded vector store, used instead of Qdrant when set
+    LOCAL_VECTOR_STORE_PATH: Optional[str] = None
+    # Store the chunks of all the sources embedded with a same model in one collection, partitioned by tenant
+    QDRANT_SHARED_COLLECTIONS: bool = False
+    # SQLite file of the embeddings of chunk contents, reused by ingestions instead of embedding them again
+    EMBEDDING_STORE_PATH: Optional[str] = None
 
     TAVILY_API_KEY: Optional[str] = None
 
@@ -71,6 +77,11 @@ class BaseConfig(BaseSettings):
     ADA_DB_PASSWORD: Optional[str] = None
     ADA_DB_NAME: Optional[str] = None
     ADA_DB_URL: Optional[str] = None
+    # Connection pool of each engine of the database (synchronous and asyncio), unused with SQLite
+    ADA_DB_POOL_SIZE: int = 5
+    ADA_DB_MAX_OVERFLOW: int = 10
+    ADA_DB_POOL_TIMEOUT: int = 30
+    ADA_DB_POOL_RECYCLE: int = 1800
 
     # Ingestion database settings
     INGESTION_DB_URL: Optional[str] = None
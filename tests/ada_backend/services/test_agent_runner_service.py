@@ -0,0 +1,31 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from ada_backend.database import models as db
+from ada_backend.services.agent_runner_service import run_agent, run_env_agent
+
+
+def run_in_session(async_session_factory, run, **kwargs):
+    async def run_with_session():
+        async with async_session_factory() as session:
+            return await run(session=session, input_data={"messages": []}, **kwargs)
+
+    return asyncio.run(run_with_session())
+
+
+def test_run_agent_requires_a_graph_runner(test_file_db):
+    SessionLocal, AsyncSessionLocal = test_file_db
+    with SessionLocal() as session:
+        project = db.Project(id=uuid4(), name="Runner project", organization_id=uuid4())
+        session.add(project)
+        session.commit()
+        project_id = project.id
+
+    with pytest.raises(ValueError, match="Project .* not found"):
+        run_in_session(AsyncSessionLocal, run_agent, project_id=uuid4(), graph_runner_id=uuid4())
+    with pytest.raises(ValueError, match="Graph runner does not exist"):
+        run_in_session(AsyncSessionLocal, run_agent, project_id=project_id, graph_runner_id=uuid4())
+    with pytest.raises(ValueError, match="graph runner not found"):
+        run_in_session(AsyncSessionLocal, run_env_agent, project_id=project_id, env=db.EnvType.PRODUCTION)
@@ -0,0 +1,45 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from ada_backend.database import models as db
+from ada_backend.services import api_key_service
+from ada_backend.services.api_key_service import deactivate_api_key_service, generate_api_key, verify_api_key
+
+
+@pytest.fixture
+def project_api_key(test_file_db, monkeypatch):
+    monkeypatch.setattr(api_key_service.settings, "BACKEND_SECRET_KEY", "backend_secret")
+    SessionLocal, _ = test_file_db
+    with SessionLocal() as session:
+        project = db.Project(id=uuid4(), name="API key project", organization_id=uuid4())
+        session.add(project)
+        session.commit()
+        api_key = generate_api_key(session, project.id, key_name="Key", creator_user_id=uuid4())
+        return project.id, api_key
+
+
+def verify(async_session_factory, private_key: str):
+    async def verify_in_session():
+        async with async_session_factory() as session:
+            return await verify_api_key(session, private_key=private_key)
+
+    return asyncio.run(verify_in_session())
+
+
+def test_verify_api_key(test_file_db, project_api_key):
+    SessionLocal, AsyncSessionLocal = test_file_db
+    project_id, api_key = project_api_key
+
+    verified_api_key = verify(AsyncSessionLocal, api_key.private_key)
+    assert verified_api_key.api_key_id == api_key.key_id
+    assert verified_api_key.project_id == project_id
+
+    with pytest.raises(ValueError, match="Invalid API key"):
+        verify(AsyncSessionLocal, api_key.private_key + "x")
+
+    with SessionLocal() as session:
+        deactivate_api_key_service(session, api_key.key_id, revoker_user_id=uuid4())
+    with pytest.raises(ValueError, match="API key is not active"):
+        verify(AsyncSessionLocal, api_key.private_key)
@@ -0,0 +1,34 @@
+from ada_backend.repositories.component_repository import (
+    bump_component_catalog_version,
+    get_all_components_with_parameters,
+)
+from ada_backend.services.components_service import get_components_catalog
+from tests.mocks.ada_backend_db import count_statements
+
+
+def test_components_are_loaded_in_a_fixed_number_of_queries(ada_backend_seed_session):
+    ada_backend_seed_session.expire_all()
+    with count_statements(ada_backend_seed_session) as statements:
+        components = get_all_components_with_parameters(ada_backend_seed_session)
+    assert len(components) > 10
+    assert len(statements) <= 3
+
+    components = {component.name: component for component in components}
+    assert components["AI Agent"].tool_parameter_name == "agent_tools"
+    assert {sub.parameter_name for sub in components["RAG"].subcomponents_info} >= {"retriever", "synthesizer"}
+    assert all(parameter.type != "component" for parameter in components["RAG"].parameters)
+
+
+def test_catalog_is_rebuilt_when_its_version_changes(ada_backend_seed_session):
+    catalog = get_components_catalog(ada_backend_seed_session)
+    with count_statements(ada_backend_seed_session) as statements:
+        same_catalog = get_components_catalog(ada_backend_seed_session)
+    assert same_catalog is catalog
+    assert len(statements) == 1
+
+    bump_component_catalog_version(ada_backend_seed_session)
+    new_catalog = get_components_catalog(ada_backend_seed_session)
+    assert new_catalog is not catalog
+    assert new_catalog.version == catalog.version + 1
+    assert new_catalog.etag == catalog.etag
+    assert new_catalog.body == new_catalog.response.model_dump_json().encode()
@@ -0,0 +1,78 @@
+import asyncio
+from uuid import uuid4
+
+from ada_backend.database import models as db
+from ada_backend.services.graph.deploy_graph_service import clone_graph_runner
+from ada_backend.services.graph.update_graph_service import update_graph_service
+from tests.mocks.ada_backend_db import build_graph, count_statements
+
+
+def create_graph(session, project_id, agents: int):
+    graph_runner_id = uuid4()
+    asyncio.run(update_graph_service(session, graph_runner_id, project_id, build_graph(session, agents)))
+    return graph_runner_id
+
+
+def describe_graph(session, graph_runner_id) -> dict:
+    """Structure of a graph, with its component instances identified by their names instead of their IDs."""
+    nodes = session.query(db.GraphRunnerNode).filter(db.GraphRunnerNode.graph_runner_id == graph_runner_id).all()
+    instances = {}
+    instance_ids = [node.node_id for node in nodes]
+    while instance_ids:
+        instance = session.get(db.ComponentInstance, instance_ids.pop())
+        instances[instance.id] = instance
+        instance_ids += [sub_input.child_component_instance_id for sub_input in instance.sub_inputs]
+    names = {instance_id: instance.name for instance_id, instance in instances.items()}
+    return {
+        "nodes": sorted((names[node.node_id], node.node_type, node.is_start_node) for node in nodes),
+        "instances": sorted(
+            (
+                instance.name,
+                instance.component_id,
+                instance.ref,
+                instance.tool_description_id,
+                sorted(
+                    (parameter.parameter_definition_id, parameter.value, parameter.order)
+                    for parameter in instance.basic_parameters
+                ),
+            )
+            for instance in instances.values()
+        ),
+        "sub_inputs": sorted(
+            (instance.name, names[sub_input.child_component_instance_id], sub_input.parameter_definition_id)
+            for instance in instances.values()
+            for sub_input in instance.sub_inputs
+        ),
+        "edges": sorted(
+            (names[edge.source_node_id], names[edge.target_node_id], edge.order)
+            for edge in session.query(db.GraphRunnerEdge).filter(db.GraphRunnerEdge.graph_runner_id == graph_runner_id)
+        ),
+    }
+
+
+def count_clone_statements(session, graph_runner_id) -> tuple:
+    with count_statements(session) as statements:
+        new_graph_runner_id = clone_graph_runner(session, graph_runner_id)
+    return new_graph_runner_id, len(statements)
+
+
+def test_clone_graph_runner(ada_backend_seed_session, graph_project_id):
+    session = ada_backend_seed_session
+    small_graph_runner_id = create_graph(session, graph_project_id, agents=1)
+    graph_runner_id = create_graph(session, graph_project_id, agents=10)
+    # A sub-component that is not a node of the graph is cloned with its parent
+    synthesizer = session.query(db.ComponentInstance).filter(db.ComponentInstance.name == "Synthesizer 3").one()
+    session.query(db.GraphRunnerNode).filter(db.GraphRunnerNode.node_id == synthesizer.id).delete()
+    session.commit()
+
+    _, small_statements = count_clone_statements(session, small_graph_runner_id)
+    new_graph_runner_id, statements = count_clone_statements(session, graph_runner_id)
+    assert statements == small_statements <= 12
+
+    assert describe_graph(session, new_graph_runner_id) == describe_graph(session, graph_runner_id)
+    new_nodes = session.query(db.GraphRunnerNode).filter(db.GraphRunnerNode.graph_runner_id == new_graph_runner_id)
+    assert {node.node_id for node in new_nodes}.isdisjoint(
+        node.node_id
+        for node in session.query(db.GraphRunnerNode).filter(db.GraphRunnerNode.graph_runner_id == graph_runner_id)
+    )
+    assert session.query(db.ComponentInstance).filter(db.ComponentInstance.name == "Synthesizer 3").count() == 2
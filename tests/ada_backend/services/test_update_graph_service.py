@@ -0,0 +1,70 @@
+import asyncio
+from collections import Counter
+from uuid import uuid4
+
+import pytest
+
+from ada_backend.database import models as db
+from ada_backend.schemas.pipeline.graph_schema import GraphUpdateSchema
+from ada_backend.services.graph.update_graph_service import update_graph_service
+from tests.mocks.ada_backend_db import build_graph, count_statements
+
+
+def save_graph(session, graph_runner_id, project_id, graph: GraphUpdateSchema) -> Counter:
+    """Save the graph and count the statements run, by their first word."""
+    with count_statements(session) as statements:
+        asyncio.run(update_graph_service(session, graph_runner_id, project_id, graph))
+    return Counter(statement.split()[0].upper() for statement in statements)
+
+
+def test_statements_do_not_grow_with_the_graph(ada_backend_seed_session, graph_project_id):
+    small_graph = build_graph(ada_backend_seed_session, agents=1)
+    large_graph = build_graph(ada_backend_seed_session, agents=10)
+
+    small_statements = save_graph(ada_backend_seed_session, uuid4(), graph_project_id, small_graph)
+    large_statements = save_graph(ada_backend_seed_session, uuid4(), graph_project_id, large_graph)
+    assert large_statements == small_statements
+    assert sum(large_statements.values()) <= 20
+
+    assert ada_backend_seed_session.query(db.GraphRunnerNode).count() == 33
+    assert ada_backend_seed_session.query(db.BasicParameter).count() == 55
+    assert ada_backend_seed_session.query(db.ComponentSubInput).count() == 11
+    assert ada_backend_seed_session.query(db.GraphRunnerEdge).count() == 11
+
+
+def test_only_changed_rows_are_written(ada_backend_seed_session, graph_project_id):
+    graph_runner_id = uuid4()
+    graph = build_graph(ada_backend_seed_session, agents=10)
+    save_graph(ada_backend_seed_session, graph_runner_id, graph_project_id, graph)
+
+    statements = save_graph(ada_backend_seed_session, graph_runner_id, graph_project_id, graph)
+    assert statements.keys() == {"SELECT"}
+
+    graph.component_instances[1].parameters[2].value = 0.9
+    graph.component_instances[4].is_start_node = True
+    statements = save_graph(ada_backend_seed_session, graph_runner_id, graph_project_id, graph)
+    assert statements["UPDATE"] == 2
+    assert statements["INSERT"] == statements["DELETE"] == 0
+    stored_values = {parameter.value for parameter in ada_backend_seed_session.query(db.BasicParameter)}
+    assert {"0.9", "0.5"} <= stored_values
+
+    # Removing an agent deletes its nodes, with their parameters, sub-inputs and edges
+    del graph.component_instances[:3]
+    del graph.relationships[0]
+    del graph.edges[0]
+    save_graph(ada_backend_seed_session, graph_runner_id, graph_project_id, graph)
+    assert ada_backend_seed_session.query(db.GraphRunnerNode).count() == 27
+    assert ada_backend_seed_session.query(db.ComponentInstance).count() == 27
+    assert ada_backend_seed_session.query(db.BasicParameter).count() == 45
+    assert ada_backend_seed_session.query(db.ComponentSubInput).count() == 9
+    assert ada_backend_seed_session.query(db.GraphRunnerEdge).count() == 9
+
+
+def test_invalid_graph_is_not_saved(ada_backend_seed_session, graph_project_id):
+    graph_runner_id = uuid4()
+    graph = build_graph(ada_backend_seed_session, agents=2)
+    graph.relationships[1].parameter_name = "unknown"
+    with pytest.raises(ValueError, match="Parameter 'unknown' not found"):
+        save_graph(ada_backend_seed_session, graph_runner_id, graph_project_id, graph)
+    assert ada_backend_seed_session.query(db.GraphRunner).filter(db.GraphRunner.id == graph_runner_id).count() == 0
+    assert ada_backend_seed_session.query(db.ComponentInstance).count() == 0
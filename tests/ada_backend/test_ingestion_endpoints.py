@@ -30,7 +30,7 @@ DATABASE_TABLE_NAME = "test_table"
 QDRANT_COLLECTION_NAME = "customer_service"
 
 
-@patch("ada_backend.services.source_service.QdrantService")
+@patch("ada_backend.services.source_service.get_vector_store")
 @patch("ada_backend.services.source_service.SQLLocalService")
 def test_ingestion_endpoints(mock_sql_local_service, mock_qdrant_service):
     mock_qdrant_instance = mock_qdrant_service.return_value
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from engine.agent.agent import SourceChunk
+from engine.agent.rag.bm25_reranker import BM25Reranker, bm25_scores
+from engine.agent.rag.cohere_reranker import CohereReranker
+from engine.lexical import tokenize
+from tests.mocks.trace_manager import MockTraceManager
+
+
+def _chunk(name: str, content: str) -> SourceChunk:
+    return SourceChunk(name=name, document_name=name, content=content, metadata={})
+
+
+@pytest.fixture
+def chunks():
+    return [
+        _chunk("pricing", "Our pricing plans start at 10 euros per month."),
+        _chunk("pump", "The hydraulic pump must be serviced every six months."),
+        _chunk("holidays", "Employees get twenty five days of holidays."),
+        _chunk("pump_parts", "Spare parts for the pump: seals, filters and the hydraulic motor."),
+    ]
+
+
+def test_tokenize_normalizes_words():
+    assert tokenize("L'été, à Paris!") == ["l", "ete", "a", "paris"]
+    assert tokenize("The pump of the boat", language="english") == ["pump", "boat"]
+    with pytest.raises(ValueError):
+        tokenize("text", language="klingon")
+
+
+def test_bm25_scores_favour_rare_and_frequent_terms():
+    scores = bm25_scores(["pump"], [["pump", "pump"], ["pump", "motor"], ["motor", "seal"]])
+
+    assert scores[0] > scores[1] > scores[2] == 0
+
+
+def test_bm25_reranker_orders_chunks_by_relevance(chunks):
+    reranker = BM25Reranker(
+        trace_manager=MockTraceManager(project_name="test"), num_doc_reranked=2, language="english"
+    )
+
+    reranked_chunks = reranker.rerank("How often should the hydraulic pump be serviced?", chunks)
+
+    assert [chunk.name for chunk in reranked_chunks] == ["pump", "pump_parts"]
+    assert reranked_chunks[0].metadata["reranked_score"] > reranked_chunks[1].metadata["reranked_score"]
+
+
+def test_bm25_reranker_applies_score_threshold(chunks):
+    reranker = BM25Reranker(trace_manager=MockTraceManager(project_name="test"), score_threshold=0.1)
+
+    assert [chunk.name for chunk in reranker.rerank("pricing", chunks)] == ["pricing"]
+    assert reranker.rerank("pricing", []) == []
+
+
+def test_bm25_reranker_as_first_pass_for_cohere(chunks, mocker):
+    cohere_client = MagicMock()
+    mocker.patch("engine.agent.rag.cohere_reranker.cohere.ClientV2", return_value=cohere_client)
+    cohere_client.rerank.return_value.results = [MagicMock(index=1, relevance_score=0.9)]
+    reranker = CohereReranker(
+        trace_manager=MockTraceManager(project_name="test"),
+        cohere_api_key="key",
+        num_doc_reranked=1,
+        first_pass_reranker=BM25Reranker(trace_manager=MockTraceManager(project_name="test"), num_doc_reranked=2),
+    )
+
+    reranked_chunks = reranker.rerank("hydraulic pump", chunks)
+
+    sent_documents = cohere_client.rerank.call_args.kwargs["documents"]
+    assert sent_documents == [chunks[1].content, chunks[3].content]
+    assert [chunk.name for chunk in reranked_chunks] == ["pump_parts"]
+    assert reranked_chunks[0].metadata["reranked_score"] == 0.9
@@ -0,0 +1,93 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from engine.agent.document_enhanced_llm_call import (
+    DEFAULT_DOCUMENT_ENHANCED_LLM_CALL_TOOL_DESCRIPTION,
+    DocumentEnhancedLLMCallAgent,
+)
+from engine.agent.rag.document_catalog import invalidate_document_catalog
+from engine.agent.rag.document_search import DocumentSearch
+from engine.agent.synthesizer import Synthesizer
+from engine.storage_service.local_service import SQLLocalService
+from tests.mocks.trace_manager import MockTraceManager
+
+DOCUMENTS_SCHEMA = "main"
+DOCUMENTS_TABLE = "documents"
+
+
+@pytest.fixture
+def documents_db_service(tmp_path):
+    db_service = SQLLocalService(engine_url=f"sqlite:///{tmp_path / 'documents.db'}")
+    pd.DataFrame(
+        {
+            "document_name": ["reports/2023/annual.pdf", "reports/2024/annual.pdf", "manuals/setup.docx"],
+            "document_content": ["annual report 2023", "annual report 2024", "setup manual"],
+        }
+    ).to_sql(DOCUMENTS_TABLE, db_service.engine, index=False)
+    invalidate_document_catalog()
+    yield db_service
+    invalidate_document_catalog()
+
+
+@pytest.fixture
+def document_search(documents_db_service):
+    return DocumentSearch(
+        trace_manager=MockTraceManager(project_name="project_name"),
+        db_service=documents_db_service,
+        table_name=DOCUMENTS_TABLE,
+        schema_name=DOCUMENTS_SCHEMA,
+    )
+
+
+def test_documents_catalog_is_cached(document_search, documents_db_service, mocker):
+    fetch_query = mocker.spy(documents_db_service, "_fetch_sql_query_as_dataframe")
+
+    for _ in range(3):
+        assert sorted(document_search.get_documents_names()) == [
+            "manuals/setup.docx",
+            "reports/2023/annual.pdf",
+            "reports/2024/annual.pdf",
+        ]
+    assert document_search.get_closest_documents_to_queried_documents_name(
+        ["manuals/setup.docx", "reports/2024/anual.pdf"]
+    ) == ["manuals/setup.docx", "reports/2024/annual.pdf"]
+
+    assert fetch_query.call_count == 1
+
+
+def test_documents_catalog_is_reloaded_after_invalidation(document_search, documents_db_service):
+    assert "manuals/install.docx" not in document_search.get_documents_catalog()
+    pd.DataFrame({"document_name": ["manuals/install.docx"], "document_content": ["install manual"]}).to_sql(
+        DOCUMENTS_TABLE, documents_db_service.engine, index=False, if_exists="append"
+    )
+    assert "manuals/install.docx" not in document_search.get_documents_catalog()
+
+    invalidate_document_catalog(schema_name=DOCUMENTS_SCHEMA, table_name=DOCUMENTS_TABLE)
+
+    assert "manuals/install.docx" in document_search.get_documents_catalog()
+
+
+def test_document_enhanced_llm_call_agent_uses_cached_catalog(document_search, documents_db_service, mocker):
+    fetch_query = mocker.spy(documents_db_service, "_fetch_sql_query_as_dataframe")
+
+    for _ in range(2):
+        agent = DocumentEnhancedLLMCallAgent(
+            trace_manager=MockTraceManager(project_name="project_name"),
+            component_instance_name="document_enhanced_llm_call",
+            tool_description=DEFAULT_DOCUMENT_ENHANCED_LLM_CALL_TOOL_DESCRIPTION.model_copy(deep=True),
+            synthesizer=MagicMock(spec=Synthesizer),
+            document_search=document_search,
+        )
+
+    assert fetch_query.call_count == 1
+    assert agent.tree_of_documents == (
+        "├── manuals\n"
+        "│   └── setup.docx\n"
+        "└── reports\n"
+        "    ├── 2023\n"
+        "    │   └── annual.pdf\n"
+        "    └── 2024\n"
+        "        └── annual.pdf"
+    )
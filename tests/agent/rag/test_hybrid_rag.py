@@ -0,0 +1,112 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from engine.agent.agent import SourceChunk
+from engine.agent.hybrid_synthesizer import HybridSynthesizer, ResponseLLM
+from engine.agent.rag.hybrid_rag import process_image_responses
+from tests.mocks.trace_manager import MockTraceManager
+
+FAKE_LLM_LATENCY = 0.2
+NUMBER_OF_IMAGES = 5
+
+
+class FakeMultimodalLLMService:
+    def __init__(self, latency: float):
+        self._latency = latency
+
+    def get_image_description(self, image_content_list, text_prompt, response_format=None):
+        time.sleep(self._latency)
+        image_content = image_content_list[0].decode()
+        return ResponseLLM(response=f"answer for {image_content}", score_image=1, image_id=image_content)
+
+
+@pytest.fixture
+def image_sources(tmp_path):
+    sources = []
+    for i in range(NUMBER_OF_IMAGES):
+        image_path = tmp_path / f"image_{i}.jpg"
+        image_path.write_bytes(f"image_{i}".encode())
+        sources.append(
+            SourceChunk(
+                name=f"chunk_{i}",
+                document_name=f"chunk_{i}",
+                content=f"content {i}",
+                metadata={"image_ids": [str(image_path)]},
+            )
+        )
+    return sources
+
+
+@pytest.fixture
+def hybrid_synthesizer():
+    return HybridSynthesizer(
+        llm_service=FakeMultimodalLLMService(latency=FAKE_LLM_LATENCY),
+        trace_manager=MockTraceManager(project_name="project_name"),
+    )
+
+
+def test_process_image_responses_runs_concurrently(image_sources, hybrid_synthesizer):
+    start = time.perf_counter()
+    responses = asyncio.run(
+        process_image_responses(
+            relevant_image_sources=image_sources,
+            hybrid_synthesizer=hybrid_synthesizer,
+            query_str="question",
+            max_concurrency=NUMBER_OF_IMAGES,
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2 * FAKE_LLM_LATENCY
+    assert len(responses) == NUMBER_OF_IMAGES
+    # Answers are merged back in the order of the sources
+    for i, (source, response) in enumerate(zip(image_sources, responses)):
+        image_id = source.metadata["image_ids"][0]
+        assert response == {image_id: f"answer for image_{i}"}
+
+
+def test_process_image_responses_respects_concurrency_limit(image_sources, hybrid_synthesizer):
+    start = time.perf_counter()
+    asyncio.run(
+        process_image_responses(
+            relevant_image_sources=image_sources,
+            hybrid_synthesizer=hybrid_synthesizer,
+            query_str="question",
+            max_concurrency=1,
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= NUMBER_OF_IMAGES * FAKE_LLM_LATENCY
+
+
+def test_hybrid_synthesizer_caches_images_per_path(image_sources, hybrid_synthesizer, monkeypatch):
+    image_id = image_sources[0].metadata["image_ids"][0]
+    open_mock = MagicMock(wraps=open)
+    monkeypatch.setattr("engine.agent.hybrid_synthesizer.open", open_mock, raising=False)
+
+    hybrid_synthesizer._llm_service = FakeMultimodalLLMService(latency=0)
+    for _ in range(3):
+        hybrid_synthesizer.get_response(image_id=image_id, chunks=[image_sources[0]], query_str="question")
+
+    assert open_mock.call_count == 1
+
+
+def test_hybrid_synthesizer_image_cache_is_bounded(image_sources):
+    image_ids = [source.metadata["image_ids"][0] for source in image_sources]
+    # Room for two of the 7-byte images
+    hybrid_synthesizer = HybridSynthesizer(
+        llm_service=FakeMultimodalLLMService(latency=0),
+        trace_manager=MockTraceManager(project_name="project_name"),
+        image_cache_max_bytes=15,
+    )
+    for image_id in image_ids[:3]:
+        hybrid_synthesizer._load_image(image_id)
+    hybrid_synthesizer._load_image(image_ids[1])
+    hybrid_synthesizer._load_image(image_ids[3])
+
+    assert list(hybrid_synthesizer._image_cache) == [image_ids[1], image_ids[3]]
+    assert hybrid_synthesizer._image_cache_bytes == 14
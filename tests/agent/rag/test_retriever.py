@@ -1,10 +1,14 @@
+import random
 from unittest.mock import Mock
 
 import pytest
 
 from engine.agent.agent import SourceChunk
-from engine.agent.rag.retriever import Retriever
-from engine.qdrant_service import QdrantService
+from engine.agent.rag.retriever import Retriever, reciprocal_rank_fusion
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import DEFAULT_SPARSE_VECTOR_NAME, QdrantCollectionSchema, QdrantService
+from tests.mocks.embeddings import HashEmbeddings
+from tests.mocks.qdrant import InMemoryQdrant
 from tests.mocks.trace_manager import MockTraceManager
 
 TEST_MAX_RETRIEVED_CHUNKS = 2
@@ -48,3 +52,102 @@ def test_get_chunks_(retriever, mock_qdrant_service):
         limit=TEST_MAX_RETRIEVED_CHUNKS,
         filter=None,
     )
+
+
+def test_reciprocal_rank_fusion_merges_and_weights_rankings():
+    dense = [("a", 0.9), ("b", 0.8), ("c", 0.7)]
+    sparse = [("c", 12.0), ("d", 3.0)]
+
+    fused = reciprocal_rank_fusion([dense, sparse], k=60)
+
+    assert [item_id for item_id, _ in fused] == ["c", "a", "b", "d"]
+    assert fused[0][1] == pytest.approx(1 / 63 + 1 / 61)
+
+    weighted = reciprocal_rank_fusion([dense, sparse], weights=[1.0, 0.0], k=60)
+    assert [item_id for item_id, _ in weighted][:3] == ["a", "b", "c"]
+
+
+@pytest.fixture(params=["qdrant", "local"])
+def keyword_heavy_collection(request, tmp_path):
+    rng = random.Random(0)
+    templates = [
+        "Technical sheet of part {code}: hydraulic valve regulating the pressure of the cooling circuit.",
+        "Part {code} is a hydraulic valve for the cooling circuit, check the pressure every month.",
+        "Maintenance of the cooling circuit hydraulic valve {code}: replace seals when pressure drops.",
+    ]
+    codes = [f"{rng.choice(['AX', 'BX', 'QV'])}{rng.randint(1000, 9999)}" for _ in range(30)]
+    chunks = [
+        {"chunk_id": str(i), "content": templates[i % len(templates)].format(code=code), "file_id": "sheets"}
+        for i, code in enumerate(codes)
+    ]
+    schema = QdrantCollectionSchema(
+        chunk_id_field="chunk_id",
+        content_field="content",
+        file_id_field="file_id",
+        sparse_vector_name=DEFAULT_SPARSE_VECTOR_NAME,
+    )
+    # Bag of alphabetic words: like many embedding models, it is blind to codes and part numbers
+    llm_service = HashEmbeddings(dimension=64, token_pattern=r"[a-z]+")
+    if request.param == "qdrant":
+        qdrant_service = QdrantService(
+            qdrant_api_key="key",
+            qdrant_cluster_url="http://qdrant",
+            default_schema=schema,
+            llm_service=llm_service,
+        )
+        qdrant_service._send_request = InMemoryQdrant()
+    else:
+        qdrant_service = LocalVectorStore(path=tmp_path, default_schema=schema, llm_service=llm_service)
+    qdrant_service.create_collection("parts", vector_size=64)
+    qdrant_service.add_chunks(chunks, collection_name="parts")
+    queries = {f"What does the documentation say about {code}?": str(i) for i, code in enumerate(codes)}
+    return qdrant_service, queries
+
+
+def _recall(retriever: Retriever, queries: dict[str, str]) -> float:
+    hits = sum(
+        expected_id in [chunk.name for chunk in retriever.get_chunks(query_text=query)]
+        for query, expected_id in queries.items()
+    )
+    return hits / len(queries)
+
+
+def test_hybrid_search_improves_recall_on_keyword_queries(mock_trace_manager, keyword_heavy_collection):
+    qdrant_service, queries = keyword_heavy_collection
+    retrievers = {
+        enable_hybrid_search: Retriever(
+            trace_manager=mock_trace_manager,
+            qdrant_service=qdrant_service,
+            collection_name="parts",
+            max_retrieved_chunks=3,
+            enable_hybrid_search=enable_hybrid_search,
+        )
+        for enable_hybrid_search in [False, True]
+    }
+
+    dense_recall = _recall(retrievers[False], queries)
+    hybrid_recall = _recall(retrievers[True], queries)
+
+    assert hybrid_recall == 1.0
+    assert dense_recall < 0.5
+
+
+def test_hybrid_search_falls_back_to_dense_without_sparse_vectors(mock_trace_manager, mock_qdrant_service):
+    mock_qdrant_service.search_similar_ids.return_value = [("id1", 0.9)]
+    mock_qdrant_service.search_lexical_ids.side_effect = ValueError("Collection has no sparse vector in its schema.")
+    mock_qdrant_service.get_chunks_by_ids.return_value = [
+        SourceChunk(content="chunk1", name="1", document_name="1", url="url1", metadata={}),
+    ]
+    retriever = Retriever(
+        trace_manager=mock_trace_manager,
+        qdrant_service=mock_qdrant_service,
+        collection_name="test_collection",
+        max_retrieved_chunks=TEST_MAX_RETRIEVED_CHUNKS,
+        enable_hybrid_search=True,
+    )
+
+    chunks = retriever.get_chunks(query_text="test query")
+
+    assert [chunk.name for chunk in chunks] == ["1"]
+    fused_results = mock_qdrant_service.get_chunks_by_ids.call_args.args[0]
+    assert [item_id for item_id, _ in fused_results] == ["id1"]
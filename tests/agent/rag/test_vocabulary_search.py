@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+from engine.agent.agent import TermDefinition
+from engine.agent.rag import vocabulary_index
+from engine.agent.rag.vocabulary_index import VocabularyIndex, invalidate_vocabulary_cache
+from engine.agent.rag.vocabulary_search import VocabularySearch
+from engine.storage_service.local_service import SQLLocalService
+from tests.mocks.trace_manager import MockTraceManager
+
+VOCABULARY_TABLE = "vocabulary"
+
+
+@pytest.fixture
+def vocabulary_db_service(tmp_path):
+    db_service = SQLLocalService(engine_url=f"sqlite:///{tmp_path / 'vocabulary.db'}")
+    pd.DataFrame(
+        {
+            "term": ["RAG", "Retrieval", "Embedding", "Vector Store"],
+            "definition": [
+                "Retrieval augmented generation",
+                "Fetching relevant chunks",
+                "Numerical representation of a text",
+                "Database of embeddings",
+            ],
+        }
+    ).to_sql(VOCABULARY_TABLE, db_service.engine, index=False)
+    invalidate_vocabulary_cache()
+    yield db_service
+    invalidate_vocabulary_cache()
+
+
+def build_vocabulary_search(db_service: SQLLocalService) -> VocabularySearch:
+    return VocabularySearch(
+        trace_manager=MockTraceManager(project_name="project_name"),
+        db_service=db_service,
+        table_name=VOCABULARY_TABLE,
+        schema_name=None,
+    )
+
+
+def test_vocabulary_search_matches_terms(vocabulary_db_service):
+    vocabulary_search = build_vocabulary_search(vocabulary_db_service)
+
+    chunks = vocabulary_search.get_chunks("How does a vector store work?")
+
+    assert [chunk.term for chunk in chunks] == ["Vector Store"]
+
+
+def test_vocabulary_is_loaded_once_per_table(vocabulary_db_service, mocker):
+    get_table_df = mocker.spy(vocabulary_db_service, "get_table_df")
+
+    build_vocabulary_search(vocabulary_db_service).get_chunks("rag")
+    build_vocabulary_search(vocabulary_db_service).get_chunks("embedding")
+
+    assert get_table_df.call_count == 1
+
+
+def test_vocabulary_cache_detects_changes(vocabulary_db_service, monkeypatch):
+    monkeypatch.setattr(vocabulary_index, "VOCABULARY_CACHE_REVALIDATE_SECONDS", 0)
+    vocabulary_search = build_vocabulary_search(vocabulary_db_service)
+    assert vocabulary_search.get_chunks("what is a knowledge graph") == []
+
+    pd.DataFrame({"term": ["Knowledge Graph"], "definition": ["Graph of entities"]}).to_sql(
+        VOCABULARY_TABLE, vocabulary_db_service.engine, index=False, if_exists="append"
+    )
+
+    assert [chunk.term for chunk in vocabulary_search.get_chunks("what is a knowledge graph")] == ["Knowledge Graph"]
+
+    # An update keeps the row count, the fingerprint still changes
+    with vocabulary_db_service.engine.begin() as connection:
+        connection.exec_driver_sql(
+            f"UPDATE {VOCABULARY_TABLE} SET definition = 'Graph of entities and of their relations' "
+            "WHERE term = 'Knowledge Graph'"
+        )
+    [chunk] = vocabulary_search.get_chunks("what is a knowledge graph")
+    assert chunk.definition == "Graph of entities and of their relations"
+
+
+def test_trigram_prefilter_returns_same_matches_as_full_scan():
+    vocabulary = {
+        f"term {i} alpha{i}": TermDefinition(term=f"Term {i} alpha{i}", definition=f"definition {i}")
+        for i in range(500)
+    }
+    vocabulary["rag"] = TermDefinition(term="RAG", definition="Retrieval augmented generation")
+    full_scan_index = VocabularyIndex(vocabulary, use_trigram_prefilter=False)
+    prefiltered_index = VocabularyIndex(vocabulary, use_trigram_prefilter=True)
+
+    for query in ["tell me about term 42 alpha42", "what is rag", "nothing related"]:
+        assert prefiltered_index.search(query, limit=5, score_cutoff=90) == full_scan_index.search(
+            query, limit=5, score_cutoff=90
+        )
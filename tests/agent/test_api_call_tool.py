@@ -1,7 +1,9 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 import json
+
+import httpx
 import pytest
-from requests.exceptions import RequestException
 
 from engine.agent.api_tools.api_call_tool import APICallTool, API_CALL_TOOL_DESCRIPTION
 from engine.agent.agent import AgentPayload, ChatMessage
@@ -45,13 +47,13 @@ def test_api_tool_initialization(api_tool):
     assert api_tool.tool_description == API_CALL_TOOL_DESCRIPTION
 
 
-@patch("requests.request")
+@patch("engine.agent.api_tools.api_call_tool.send_request", new_callable=AsyncMock)
 def test_make_api_call_with_fixed_and_dynamic_params(mock_request, api_tool, mock_response):
     # Dynamic parameters provided by LLM
     dynamic_params = {"query": "test", "page": 1, "limit": 10, "filter": "active", "sort": "date"}
     mock_request.return_value = mock_response
 
-    result = api_tool.make_api_call(**dynamic_params)
+    result = asyncio.run(api_tool.make_api_call(**dynamic_params))
 
     # Verify all parameters are included
     expected_params = {
@@ -70,6 +72,7 @@ def test_make_api_call_with_fixed_and_dynamic_params(mock_request, api_tool, moc
         method="GET",
         headers={"Content-Type": "application/json", "Authorization": "Bearer test_token"},
         timeout=30,
+        cache_ttl=None,
         params=expected_params,
     )
 
@@ -78,7 +81,7 @@ def test_make_api_call_with_fixed_and_dynamic_params(mock_request, api_tool, moc
     assert result["success"] is True
 
 
-@patch("requests.request")
+@patch("engine.agent.api_tools.api_call_tool.send_request", new_callable=AsyncMock)
 def test_make_api_call_post_with_fixed_and_dynamic_params(mock_request, api_tool, mock_response):
     # Change method to POST
     api_tool.method = "POST"
@@ -87,7 +90,7 @@ def test_make_api_call_post_with_fixed_and_dynamic_params(mock_request, api_tool
     dynamic_params = {"data": {"name": "test", "value": 123}}
     mock_request.return_value = mock_response
 
-    result = api_tool.make_api_call(**dynamic_params)
+    result = asyncio.run(api_tool.make_api_call(**dynamic_params))
 
     # Verify all parameters are included
     expected_params = {
@@ -102,6 +105,7 @@ def test_make_api_call_post_with_fixed_and_dynamic_params(mock_request, api_tool
         method="POST",
         headers={"Content-Type": "application/json", "Authorization": "Bearer test_token"},
         timeout=30,
+        cache_ttl=None,
         json=expected_params,
     )
 
@@ -110,12 +114,12 @@ def test_make_api_call_post_with_fixed_and_dynamic_params(mock_request, api_tool
     assert result["success"] is True
 
 
-@patch("requests.request")
+@patch("engine.agent.api_tools.api_call_tool.send_request", new_callable=AsyncMock)
 def test_make_api_call_with_only_fixed_params(mock_request, api_tool, mock_response):
     # Test with only fixed parameters
     mock_request.return_value = mock_response
 
-    result = api_tool.make_api_call()
+    result = asyncio.run(api_tool.make_api_call())
 
     expected_params = {"api_version": "v2", "format": "json", "language": "en"}
 
@@ -124,6 +128,7 @@ def test_make_api_call_with_only_fixed_params(mock_request, api_tool, mock_respo
         method="GET",
         headers={"Content-Type": "application/json", "Authorization": "Bearer test_token"},
         timeout=30,
+        cache_ttl=None,
         params=expected_params,
     )
 
@@ -132,7 +137,7 @@ def test_make_api_call_with_only_fixed_params(mock_request, api_tool, mock_respo
     assert result["success"] is True
 
 
-@patch("requests.request")
+@patch("engine.agent.api_tools.api_call_tool.send_request", new_callable=AsyncMock)
 def test_make_api_call_post_with_empty_params(mock_request, mock_trace_manager, mock_response):
     # Test POST with no parameters (should still send empty JSON)
     api_tool = APICallTool(
@@ -145,13 +150,14 @@ def test_make_api_call_post_with_empty_params(mock_request, mock_trace_manager,
 
     mock_request.return_value = mock_response
 
-    result = api_tool.make_api_call()
+    result = asyncio.run(api_tool.make_api_call())
 
     mock_request.assert_called_once_with(
         url="https://api.example.com/test",
         method="POST",
         headers={"Content-Type": "application/json"},
         timeout=30,
+        cache_ttl=None,
         json={},  # Empty JSON should still be sent for POST
     )
 
@@ -159,7 +165,7 @@ def test_make_api_call_post_with_empty_params(mock_request, mock_trace_manager,
     assert result["success"] is True
 
 
-@patch("requests.request")
+@patch("engine.agent.api_tools.api_call_tool.send_request", new_callable=AsyncMock)
 def test_make_api_call_get_with_empty_params(mock_request, mock_trace_manager, mock_response):
     # Test GET with no parameters (should not send params)
     api_tool = APICallTool(
@@ -172,13 +178,14 @@ def test_make_api_call_get_with_empty_params(mock_request, mock_trace_manager, m
 
     mock_request.return_value = mock_response
 
-    result = api_tool.make_api_call()
+    result = asyncio.run(api_tool.make_api_call())
 
     mock_request.assert_called_once_with(
         url="https://api.example.com/test",
         method="GET",
         headers={"Content-Type": "application/json"},
         timeout=30,
+        cache_ttl=None,
         # No params should be included for GET with empty parameters
     )
 
@@ -186,18 +193,18 @@ def test_make_api_call_get_with_empty_params(mock_request, mock_trace_manager, m
     assert result["success"] is True
 
 
-@patch("requests.request")
+@patch("engine.agent.api_tools.api_call_tool.send_request", new_callable=AsyncMock)
 def test_make_api_call_error_handling(mock_request, api_tool):
-    mock_request.side_effect = RequestException("API Error")
+    mock_request.side_effect = httpx.ConnectError("API Error")
 
-    result = api_tool.make_api_call()
+    result = asyncio.run(api_tool.make_api_call())
 
     assert result["success"] is False
     assert result["error"] == "API Error"
     assert result["status_code"] is None
 
 
-@patch("requests.request")
+@patch("engine.agent.api_tools.api_call_tool.send_request", new_callable=AsyncMock)
 def test_make_api_call_non_json_response(mock_request, api_tool):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -206,7 +213,7 @@ def test_make_api_call_non_json_response(mock_request, api_tool):
     mock_response.headers = {"Content-Type": "text/plain"}
     mock_request.return_value = mock_response
 
-    result = api_tool.make_api_call()
+    result = asyncio.run(api_tool.make_api_call())
 
     assert result["status_code"] == 200
     assert result["data"] == {"text": "plain text response"}
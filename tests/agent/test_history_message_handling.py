@@ -0,0 +1,113 @@
+import json
+
+import pytest
+from openai.types.chat import ChatCompletionMessageToolCall
+
+from engine.agent.agent import ChatMessage
+from engine.agent.history_message_handling import HistoryMessageHandler, TRUNCATED_CONTENT_SUFFIX
+from engine.llm_services.tokenizer import Tokenizer
+
+
+class WordEncoding:
+    """One token per word."""
+
+    def encode(self, text, **kwargs):
+        return text.split()
+
+    def encode_batch(self, texts, **kwargs):
+        return [self.encode(text) for text in texts]
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.fixture
+def tokenizer():
+    return Tokenizer(encoding=WordEncoding())
+
+
+def _tool_call(call_id: str) -> ChatCompletionMessageToolCall:
+    return ChatCompletionMessageToolCall(
+        id=call_id,
+        type="function",
+        function={"name": "search", "arguments": json.dumps({"query": "weather"})},
+    )
+
+
+def _conversation(number_turns: int, words_per_message: int = 20) -> list[ChatMessage]:
+    messages = [ChatMessage(role="system", content="You are a helpful assistant.")]
+    for i in range(number_turns):
+        messages.append(ChatMessage(role="user", content=" ".join([f"question{i}"] * words_per_message)))
+        messages.append(ChatMessage(role="assistant", content=None, tool_calls=[_tool_call(f"call_{i}")]))
+        messages.append(
+            ChatMessage(role="tool", content=" ".join(["result"] * words_per_message), tool_call_id=f"call_{i}")
+        )
+        messages.append(ChatMessage(role="assistant", content=" ".join([f"answer{i}"] * words_per_message)))
+    messages.append(ChatMessage(role="user", content="What about tomorrow?"))
+    return messages
+
+
+def test_count_based_truncation_is_unchanged():
+    messages = [ChatMessage(role="system", content="system")] + [
+        ChatMessage(role="user" if i % 2 == 0 else "assistant", content=str(i)) for i in range(10)
+    ]
+    handler = HistoryMessageHandler(number_first_messages=1, number_last_messages=4)
+
+    assert handler.get_truncated_messages_history(messages) == [messages[0]] + messages[-4:]
+
+
+@pytest.mark.parametrize("max_history_tokens", [60, 150, 300, 1000])
+def test_packed_history_never_exceeds_budget(tokenizer, max_history_tokens):
+    messages = _conversation(number_turns=10)
+    handler = HistoryMessageHandler(
+        number_first_messages=1,
+        number_last_messages=100,
+        max_history_tokens=max_history_tokens,
+        tokenizer=tokenizer,
+    )
+
+    packed_messages = handler.get_truncated_messages_history(messages)
+
+    assert sum(handler.count_messages_tokens(packed_messages)) <= max_history_tokens
+    assert packed_messages[0] == messages[0]
+    assert packed_messages[-1] == messages[-1]
+    # Tool outputs are never separated from the assistant message calling them
+    for i, message in enumerate(packed_messages):
+        if message.role == "tool":
+            assert packed_messages[i - 1].tool_calls[0].id == message.tool_call_id
+
+
+def test_oldest_turns_are_dropped_first(tokenizer):
+    messages = _conversation(number_turns=3)
+    handler = HistoryMessageHandler(max_history_tokens=180, tokenizer=tokenizer)
+
+    packed_messages = handler.get_truncated_messages_history(messages)
+
+    assert packed_messages == [messages[0]] + messages[5:]
+
+
+def test_history_within_budget_is_kept_whole(tokenizer):
+    messages = _conversation(number_turns=2)
+    handler = HistoryMessageHandler(max_history_tokens=10_000, tokenizer=tokenizer)
+
+    assert handler.get_truncated_messages_history(messages) == messages
+
+
+def test_oversized_tool_outputs_are_capped(tokenizer):
+    messages = _conversation(number_turns=1, words_per_message=500)
+    handler = HistoryMessageHandler(max_tokens_per_tool_message=50, tokenizer=tokenizer)
+
+    packed_messages = handler.get_truncated_messages_history(messages)
+
+    tool_message = next(message for message in packed_messages if message.role == "tool")
+    assert tool_message.content == " ".join(["result"] * 50) + TRUNCATED_CONTENT_SUFFIX
+    # The original history is left untouched
+    assert messages[3].content == " ".join(["result"] * 500)
+    assert [message.content for message in packed_messages if message.role != "tool"] == [
+        message.content for message in messages if message.role != "tool"
+    ]
+
+
+def test_token_budget_requires_a_tokenizer():
+    with pytest.raises(ValueError):
+        HistoryMessageHandler(max_history_tokens=100)
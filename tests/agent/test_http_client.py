@@ -0,0 +1,114 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from engine.agent.api_tools.api_call_tool import APICallTool
+from engine.agent.api_tools.http_client import (
+    close_http_client,
+    get_http_client,
+    invalidate_response_cache,
+    send_request,
+)
+from engine.trace.trace_manager import TraceManager
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address))
+        body = json.dumps({"path": self.path, "count": len(self.server.requests)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def mock_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    invalidate_response_cache()
+    yield server
+    invalidate_response_cache()
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_connections_are_reused_across_calls(mock_server):
+    tools = [
+        APICallTool(
+            trace_manager=MagicMock(spec=TraceManager),
+            component_instance_name=f"api_tool_{i}",
+            endpoint=_url(mock_server, f"/items/{i}"),
+        )
+        for i in range(2)
+    ]
+
+    async def call_tools():
+        return [await tool.make_api_call(page=page) for page in range(3) for tool in tools]
+
+    results = asyncio.run(call_tools())
+
+    assert all(result["success"] for result in results)
+    assert len(mock_server.requests) == 6
+    # Every request went through the same pooled keep-alive connection
+    assert len({client_address for _, client_address in mock_server.requests}) == 1
+
+
+def test_get_responses_are_cached(mock_server):
+    tool = APICallTool(
+        trace_manager=MagicMock(spec=TraceManager),
+        component_instance_name="api_tool",
+        endpoint=_url(mock_server, "/items"),
+        cache_ttl=60,
+    )
+
+    async def call_tool():
+        return [
+            await tool.make_api_call(query="a"),
+            await tool.make_api_call(query="a"),
+            await tool.make_api_call(query="b"),
+        ]
+
+    first, second, third = asyncio.run(call_tool())
+
+    assert first["data"] == second["data"]
+    assert third["data"]["path"] == "/items?query=b"
+    assert [path for path, _ in mock_server.requests] == ["/items?query=a", "/items?query=b"]
+
+
+def test_cache_key_includes_headers(mock_server):
+    async def call_with_tokens():
+        for token in ["first", "second"]:
+            await send_request("GET", _url(mock_server, "/me"), headers={"Authorization": token}, cache_ttl=60)
+
+    asyncio.run(call_with_tokens())
+
+    assert len(mock_server.requests) == 2
+
+
+def test_close_http_client(mock_server):
+    async def send_and_close():
+        await send_request("GET", f"http://127.0.0.1:{mock_server.server_port}/close")
+        client = get_http_client()
+        await close_http_client()
+        return client, get_http_client()
+
+    closed_client, new_client = asyncio.run(send_and_close())
+    assert closed_client.is_closed
+    assert new_client is not closed_client
@@ -0,0 +1,232 @@
+import json
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+import pytest
+
+from engine.storage_service.snowflake_service import snowflake_pool, snowflake_service
+from engine.storage_service.snowflake_service.snowflake_service import SnowflakeService
+
+Column = namedtuple("Column", ["name"])
+
+
+class FakeSnowflake:
+    """Fake connector: counts the connections it opens and the queries run on them, by their first words."""
+
+    def __init__(self, tables: dict[str, pd.DataFrame]):
+        self.tables = tables
+        # Duration of the queries, and of those submitted asynchronously
+        self.query_seconds = 0.0
+        self.async_query_seconds = 0.0
+        self.connections: list[FakeConnection] = []
+        self.cursors: list[FakeCursor] = []
+        self.queries: list[str] = []
+        self.async_queries: dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def connect(self) -> "FakeConnection":
+        connection = FakeConnection(self)
+        with self.lock:
+            self.connections.append(connection)
+        return connection
+
+    def count(self, prefix: str) -> int:
+        return sum(query.startswith(prefix) for query in self.queries)
+
+
+class FakeConnection:
+    def __init__(self, snowflake: FakeSnowflake):
+        self.snowflake = snowflake
+        self.closed = False
+        self.in_use = False
+
+    def cursor(self) -> "FakeCursor":
+        cursor = FakeCursor(self)
+        with self.snowflake.lock:
+            self.snowflake.cursors.append(cursor)
+        return cursor
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+    def get_query_status_throw_if_error(self, query_id: str) -> bool:
+        return time.monotonic() < self.snowflake.async_queries[query_id]
+
+    def is_still_running(self, status: bool) -> bool:
+        return status
+
+
+class FakeCursor:
+    def __init__(self, connection: FakeConnection):
+        self.connection = connection
+        self.description = None
+        self.rows: list[tuple] = []
+        self.df = None
+        self.sfqid = None
+        self.query = None
+        self.closed = False
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+    def execute(self, query: str, params=None) -> "FakeCursor":
+        snowflake = self.connection.snowflake
+        self.query = query
+        assert not self.connection.in_use, "A connection is used by two threads at once"
+        self.connection.in_use = True
+        try:
+            with snowflake.lock:
+                snowflake.queries.append(query)
+            time.sleep(snowflake.query_seconds)
+            if query.startswith("SELECT COUNT(*)"):
+                self.rows = [(1,)]
+            elif query.startswith("SHOW TABLES"):
+                self.rows = [("2024-01-01", name.upper()) for name in snowflake.tables]
+            elif query.startswith("DESCRIBE TABLE"):
+                df = snowflake.tables[query.split(".")[-1].rstrip(";").lower()]
+                self.rows = [
+                    (column.upper(), "VARIANT" if column == "metadata" else "VARCHAR", *[None] * 10)
+                    for column in df.columns
+                ]
+            elif query.startswith("SELECT * FROM"):
+                self.df = snowflake.tables[query.split(".")[-1].rstrip(";").lower()]
+            elif query.startswith("SELECT SYSTEM$CANCEL_QUERY"):
+                self.rows = [("cancelled",)]
+            self.description = [Column("name")] if self.rows else None
+            if self.df is not None:
+                self.description = [Column(column.upper()) for column in self.df.columns]
+            return self
+        finally:
+            self.connection.in_use = False
+
+    def fetchall(self) -> list[tuple]:
+        return self.rows
+
+    def fetch_pandas_batches(self):
+        # Two Arrow batches, with the upper case column names of Snowflake
+        df = self.df.rename(columns=str.upper)
+        yield df.iloc[: len(df) // 2]
+        yield df.iloc[len(df) // 2 :]
+
+    def execute_async(self, query: str):
+        snowflake = self.connection.snowflake
+        self.sfqid = f"query_{len(snowflake.queries)}"
+        with snowflake.lock:
+            snowflake.queries.append(query)
+        snowflake.async_queries[self.sfqid] = time.monotonic() + snowflake.async_query_seconds
+        self.df = snowflake.tables[query.split(".")[-1].rstrip(";").lower()]
+
+    def get_results_from_sfqid(self, query_id: str):
+        self.df = next(iter(self.connection.snowflake.tables.values()))
+
+
+@pytest.fixture
+def fake_snowflake(monkeypatch):
+    monkeypatch.setattr(snowflake_service, "QUERY_POLL_INTERVAL_SECONDS", 0.01)
+    tables = {
+        "documents": pd.DataFrame(
+            {
+                "file_id": [f"file_{i}" for i in range(10)],
+                "metadata": [json.dumps({"page": i}, indent=2) for i in range(10)],
+            }
+        )
+    }
+    return FakeSnowflake(tables)
+
+
+def build_service(fake_snowflake: FakeSnowflake, pool_size: int = 2) -> SnowflakeService:
+    return SnowflakeService(database_name="DB", pool_size=pool_size, connect=fake_snowflake.connect)
+
+
+def test_connections_are_pooled_and_bounded(fake_snowflake):
+    fake_snowflake.query_seconds = 0.01
+    service = build_service(fake_snowflake, pool_size=2)
+    assert fake_snowflake.connections == []
+
+    for _ in range(3):
+        service.schema_exists("SCHEMA")
+    assert len(fake_snowflake.connections) == 1
+    assert fake_snowflake.count("USE ") == 3
+
+    threads = [threading.Thread(target=service.schema_exists, args=("SCHEMA",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fake_snowflake.connections) == 2
+    # Services of the same database share the pool
+    build_service(fake_snowflake).schema_exists("SCHEMA")
+    assert len(fake_snowflake.connections) == 2
+
+
+def test_unhealthy_connections_are_replaced(fake_snowflake, monkeypatch):
+    service = build_service(fake_snowflake)
+    service.schema_exists("SCHEMA")
+    fake_snowflake.connections[0].close()
+    service.schema_exists("SCHEMA")
+    assert len(fake_snowflake.connections) == 2
+
+    # Connections idle for longer than the health check interval are checked before being reused
+    monkeypatch.setattr(snowflake_pool, "HEALTH_CHECK_INTERVAL_SECONDS", 0)
+    service.schema_exists("SCHEMA")
+    assert fake_snowflake.count("SELECT 1") == 1
+    assert [cursor.closed for cursor in fake_snowflake.cursors if cursor.query == "SELECT 1"] == [True]
+    assert len(fake_snowflake.connections) == 2
+
+
+def test_table_metadata_is_cached(fake_snowflake, monkeypatch):
+    service = build_service(fake_snowflake)
+    for _ in range(3):
+        assert service.table_exists("documents", "schema")
+        assert [column["name"] for column in service.describe_table("documents", "schema")] == ["FILE_ID", "METADATA"]
+    assert (fake_snowflake.count("SHOW TABLES"), fake_snowflake.count("DESCRIBE TABLE")) == (1, 1)
+
+    # A missing table is looked up again, as it may have been created since by another process
+    assert not service.table_exists("other", "SCHEMA")
+    assert fake_snowflake.count("SHOW TABLES") == 2
+    fake_snowflake.tables["other"] = fake_snowflake.tables["documents"]
+    assert service.table_exists("other", "SCHEMA")
+    assert fake_snowflake.count("SHOW TABLES") == 3
+
+    # Dropping a table invalidates the metadata of its schema
+    service.drop_table("documents", "SCHEMA")
+    service.describe_table("documents", "SCHEMA")
+    assert (fake_snowflake.count("SHOW TABLES"), fake_snowflake.count("DESCRIBE TABLE")) == (4, 2)
+
+    monkeypatch.setattr(snowflake_service, "METADATA_TTL_SECONDS", 0)
+    service.table_exists("documents", "SCHEMA")
+    assert fake_snowflake.count("SHOW TABLES") == 5
+
+
+def test_get_table_df_from_arrow_batches(fake_snowflake):
+    service = build_service(fake_snowflake)
+    df = service.get_table_df("documents", "SCHEMA")
+    assert df.columns.tolist() == ["file_id", "metadata"]
+    assert df["file_id"].tolist() == [f"file_{i}" for i in range(10)]
+    assert df["metadata"][3] == '{"page": 3}'
+
+    chunks = list(service.get_table_chunks("documents", "SCHEMA", chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 2, 3, 2]
+
+
+def test_long_running_queries_are_submitted_asynchronously(fake_snowflake):
+    service = build_service(fake_snowflake)
+    fake_snowflake.async_query_seconds = 0.05
+    df = service.run_query("SELECT * FROM SCHEMA.DOCUMENTS;", timeout=5)
+    assert len(df) == 10
+
+    fake_snowflake.async_query_seconds = 5
+    with pytest.raises(TimeoutError):
+        service.run_query("SELECT * FROM SCHEMA.DOCUMENTS;", timeout=0.05)
+    assert fake_snowflake.count("SELECT SYSTEM$CANCEL_QUERY") == 1
@@ -1,6 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import pytest
+import sqlalchemy
 
+from engine.storage_service.db_utils import PROCESSED_DATETIME_FIELD, DBColumn, DBDefinition
+from engine.storage_service.local_service import SQLLocalService
 from tests.mocks.db_service import TEST_SCHEMA_NAME
 
 
@@ -175,3 +180,229 @@ def test_error_when_inserting_new_column(postgres_service, sample_table_definiti
             data={"id": 1, "name": "value2", "created_at": "2024-12-10 11:45:45", "metadata": "tag"},
             schema_name=TEST_SCHEMA_NAME,
         )
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def upsert_service(request, tmp_path):
+    """SQLLocalService on a SQLite file or on PostgreSQL, with the schema to use for the test tables."""
+    if request.param == "postgres":
+        return request.getfixturevalue("postgres_service"), TEST_SCHEMA_NAME
+    return SQLLocalService(engine_url=f"sqlite:///{tmp_path / 'ingestion.db'}"), None
+
+
+def test_update_table_upserts_newer_rows_and_deletes_missing_ones(upsert_service, sample_table_definition):
+    service, schema_name = upsert_service
+    service.create_table("test_table", table_definition=sample_table_definition, schema_name=schema_name)
+    service.insert_df_to_table(
+        pd.DataFrame(
+            [
+                {"id": 1, "name": "Alice", "created_at": "2021-01-01 11:10:00"},
+                {"id": 2, "name": "Bob", "created_at": "2021-01-01 11:10:00"},
+                {"id": 3, "name": "Carol", "created_at": "2021-01-01 11:10:00"},
+            ]
+        ),
+        "test_table",
+        schema_name=schema_name,
+    )
+
+    new_df = pd.DataFrame(
+        [
+            {"id": 1, "name": "Alice Updated", "created_at": "2021-02-01 11:15:00"},
+            {"id": 2, "name": "Bob Outdated", "created_at": "2020-12-01 11:15:00"},
+            {"id": 4, "name": "Dan", "created_at": "2021-02-01 11:15:00"},
+        ]
+    )
+    service.update_table(
+        new_df,
+        "test_table",
+        table_definition=sample_table_definition,
+        id_column_name="id",
+        schema_name=schema_name,
+        timestamp_column_name="created_at",
+        append_mode=False,
+    )
+
+    result_df = service.get_table_df("test_table", schema_name=schema_name).sort_values("id")
+    assert result_df[["id", "name"]].values.tolist() == [[1, "Alice Updated"], [2, "Bob"], [4, "Dan"]]
+    assert result_df[PROCESSED_DATETIME_FIELD].notna().all()
+    # No staging table is left behind
+    assert sorted(sqlalchemy.inspect(service.engine).get_table_names(schema=schema_name)) == ["test_table"]
+
+
+def test_update_table_adds_a_unique_index_to_tables_without_primary_key(upsert_service):
+    service, schema_name = upsert_service
+    table_definition = DBDefinition(
+        columns=[
+            DBColumn(name=PROCESSED_DATETIME_FIELD, type="DATETIME", default="CURRENT_TIMESTAMP"),
+            DBColumn(name="chunk_id", type="VARCHAR"),
+            DBColumn(name="content", type="VARCHAR"),
+        ]
+    )
+    service.create_table("chunks", table_definition=table_definition, schema_name=schema_name)
+    for contents in [["a", "b"], ["a updated", "b", "c"]]:
+        service.update_table(
+            pd.DataFrame({"chunk_id": ["1", "2", "3"][: len(contents)], "content": contents}),
+            "chunks",
+            table_definition=table_definition,
+            id_column_name="chunk_id",
+            schema_name=schema_name,
+        )
+
+    result_df = service.get_table_df("chunks", schema_name=schema_name).sort_values("chunk_id")
+    assert result_df["content"].tolist() == ["a updated", "b", "c"]
+
+
+def test_concurrent_updates_of_a_table(upsert_service, sample_table_definition):
+    service, schema_name = upsert_service
+    service.create_table("test_table", table_definition=sample_table_definition, schema_name=schema_name)
+    service.insert_df_to_table(
+        pd.DataFrame([{"id": 0, "name": "initial", "created_at": "2021-01-01 11:10:00"}]),
+        "test_table",
+        schema_name=schema_name,
+    )
+
+    def ingest(worker: int) -> None:
+        # Each ingestion uses its own service, as separate ingestion processes do
+        worker_service = SQLLocalService(engine_url=service.engine.url.render_as_string(hide_password=False))
+        df = pd.DataFrame(
+            [
+                {"id": worker * 1000 + i, "name": f"worker {worker}", "created_at": "2021-01-01 11:10:00"}
+                for i in range(200)
+            ]
+        )
+        worker_service.update_table(
+            df,
+            "test_table",
+            table_definition=sample_table_definition,
+            id_column_name="id",
+            schema_name=schema_name,
+            timestamp_column_name="created_at",
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(ingest, range(1, 5)))
+
+    result_df = service.get_table_df("test_table", schema_name=schema_name)
+    assert len(result_df) == 801
+    assert result_df["name"].value_counts().to_dict() == {
+        "worker 1": 200,
+        "worker 2": 200,
+        "worker 3": 200,
+        "worker 4": 200,
+        "initial": 1,
+    }
+
+
+def test_tables_are_reflected_when_used_and_forgotten_when_recreated(tmp_path, sample_table_definition):
+    engine_url = f"sqlite:///{tmp_path / 'tables.db'}"
+    SQLLocalService(engine_url=engine_url).create_table("other_table", table_definition=sample_table_definition)
+    service = SQLLocalService(engine_url=engine_url)
+    assert not service.metadata.tables
+
+    service.create_table("test_table", table_definition=sample_table_definition)
+    assert service.get_table("test_table") is service.get_table("TEST_TABLE")
+    assert list(service.metadata.tables) == ["test_table"]
+
+    new_definition = DBDefinition(columns=[*sample_table_definition.columns, DBColumn(name="tag", type="STRING")])
+    service.create_table("test_table", table_definition=new_definition, replace_if_exists=True)
+    assert "tag" in service.get_table("test_table").columns
+    service.drop_table("test_table")
+    assert not service.table_exists("test_table")
+    assert service.table_exists("other_table")
+
+
+def test_services_of_a_database_share_its_engine(tmp_path):
+    engine_url = f"sqlite:///{tmp_path / 'shared.db'}"
+    assert SQLLocalService(engine_url=engine_url).engine is SQLLocalService(engine_url=engine_url).engine
+    # Each in-memory SQLite engine is its own database
+    assert SQLLocalService(engine_url="sqlite://").engine is not SQLLocalService(engine_url="sqlite://").engine
+
+
+def test_table_is_read_and_updated_by_chunks(upsert_service, sample_table_definition):
+    service, schema_name = upsert_service
+    service.create_table("test_table", table_definition=sample_table_definition, schema_name=schema_name)
+    service.insert_df_to_table(
+        pd.DataFrame([{"id": i, "name": f"name {i}", "created_at": "2021-01-01 11:10:00"} for i in range(5)]),
+        "test_table",
+        schema_name=schema_name,
+    )
+
+    chunks = list(service.get_table_chunks("test_table", schema_name, columns=["id", "name"], chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert all(chunk.columns.tolist() == ["id", "name"] for chunk in chunks)
+    with pytest.raises(ValueError):
+        next(service.get_table_chunks("test_table", schema_name, columns=["id", "unknown"]))
+
+    new_chunks = (
+        pd.DataFrame([{"id": i, "name": f"new name {i}", "created_at": "2021-02-01 11:10:00"} for i in ids])
+        for ids in [[1, 2], [4, 5]]
+    )
+    service.update_table_from_chunks(
+        new_chunks,
+        "test_table",
+        table_definition=sample_table_definition,
+        id_column_name="id",
+        schema_name=schema_name,
+        timestamp_column_name="created_at",
+        append_mode=False,
+    )
+
+    result_df = service.get_table_df("test_table", schema_name=schema_name).sort_values("id")
+    assert result_df["name"].tolist() == ["new name 1", "new name 2", "new name 4", "new name 5"]
+    assert service.get_existing_ids("test_table", "id", [0, 1, 5, 6], schema_name=schema_name) == {1, 5}
+
+
+def test_update_from_chunks_keeps_the_latest_version_of_an_id_found_in_several_chunks(
+    upsert_service, sample_table_definition
+):
+    service, schema_name = upsert_service
+    service.create_table("test_table", table_definition=sample_table_definition, schema_name=schema_name)
+    chunks = [
+        pd.DataFrame(
+            [
+                {"id": 1, "name": "newest 1", "created_at": "2021-03-01 11:10:00"},
+                {"id": 2, "name": "first 2", "created_at": "2021-01-01 11:10:00"},
+            ]
+        ),
+        pd.DataFrame(
+            [
+                {"id": 1, "name": "older 1", "created_at": "2021-02-01 11:10:00"},
+                {"id": 2, "name": "last 2", "created_at": "2021-01-01 11:10:00"},
+                {"id": 3, "name": "only 3", "created_at": "2021-01-01 11:10:00"},
+            ]
+        ),
+    ]
+    service.update_table_from_chunks(
+        chunks,
+        "test_table",
+        table_definition=sample_table_definition,
+        id_column_name="id",
+        schema_name=schema_name,
+        timestamp_column_name="created_at",
+    )
+
+    result_df = service.get_table_df("test_table", schema_name=schema_name).sort_values("id")
+    assert result_df["name"].tolist() == ["newest 1", "last 2", "only 3"]
+
+
+def test_get_table_chunks_after_a_timestamp_and_id(upsert_service, sample_table_definition):
+    service, schema_name = upsert_service
+    service.create_table("test_table", table_definition=sample_table_definition, schema_name=schema_name)
+    service.insert_df_to_table(
+        pd.DataFrame(
+            [
+                {"id": 1, "name": "older", "created_at": "2021-01-01 11:10:00"},
+                {"id": 2, "name": "same time, lower id", "created_at": "2021-01-02 11:10:00"},
+                {"id": 3, "name": "watermark", "created_at": "2021-01-02 11:10:00"},
+                {"id": 4, "name": "same time, higher id", "created_at": "2021-01-02 11:10:00"},
+                {"id": 5, "name": "newer", "created_at": "2021-01-03 11:10:00"},
+            ]
+        ),
+        "test_table",
+        schema_name=schema_name,
+    )
+
+    # Values read back from JSON are converted to the type of their column
+    after = {"created_at": "2021-01-02 11:10:00", "id": "3"}
+    df = pd.concat(service.get_table_chunks("test_table", schema_name, columns=["id"], after=after))
+    assert sorted(df["id"]) == [4, 5]
@@ -3,19 +3,21 @@ from unittest.mock import MagicMock
 
 from data_ingestion.markdown.markdown_parser import MarkdownLevel, MarkdownNode
 from data_ingestion.markdown.tree_chunker import TreeChunker
+from engine.llm_services.tokenizer import Tokenizer
 
 
 @pytest.fixture
 def mock_encoding():
     mock_encoding = MagicMock()
-    mock_encoding.encode.side_effect = lambda text: list(text.encode("utf-8"))
+    mock_encoding.encode.side_effect = lambda text, **kwargs: list(text.encode("utf-8"))
+    mock_encoding.encode_batch.side_effect = lambda texts, **kwargs: [list(text.encode("utf-8")) for text in texts]
     return mock_encoding
 
 
 @pytest.fixture
 def chunker(mock_encoding):
     chunker = TreeChunker(model_name="gpt-4o-mini", chunk_size=80)
-    chunker._encoding = mock_encoding
+    chunker._tokenizer = Tokenizer(encoding=mock_encoding)
     return chunker
 
 
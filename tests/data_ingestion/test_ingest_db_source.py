@@ -0,0 +1,105 @@
+import sqlite3
+from datetime import timedelta
+
+import pytest
+
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import QdrantCollectionSchema
+from engine.storage_service.local_service import SQLLocalService
+from ingestion_script.ingest_db_source import get_db_source_definition, get_watermark, upload_db_source
+from tests.mocks.embeddings import HashEmbeddings
+
+COLLECTION_NAME = "articles_collection"
+STORAGE_TABLE_NAME = "articles_table"
+
+
+@pytest.fixture
+def source_db(tmp_path):
+    path = tmp_path / "source.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, title VARCHAR, updated_at DATETIME)")
+        connection.executemany(
+            "INSERT INTO articles VALUES (?, ?, ?)",
+            [
+                (1, "first", "2024-01-01 10:00:00"),
+                (2, "second", "2024-01-02 10:00:00"),
+                (3, "third", "2024-01-02 10:00:00"),
+            ],
+        )
+    return path
+
+
+@pytest.fixture
+def ingest(source_db, tmp_path):
+    db_service = SQLLocalService(engine_url=f"sqlite:///{tmp_path / 'storage.db'}")
+    schema = QdrantCollectionSchema(
+        chunk_id_field="id", content_field="content", file_id_field="table_name", last_edited_ts_field="updated_at"
+    )
+    embeddings = HashEmbeddings(dimension=16)
+    vector_store = LocalVectorStore(path=tmp_path / "vectors", default_schema=schema, llm_service=embeddings)
+    vector_store.create_collection(COLLECTION_NAME, vector_size=16)
+
+    def ingest(full_sync_interval: timedelta = timedelta(days=1), text_column_names: tuple[str, ...] = ("title",)):
+        embeddings.embedded_texts.clear()
+        upload_db_source(
+            db_service=db_service,
+            qdrant_service=vector_store,
+            db_definition=get_db_source_definition(id_column_name="id", timestamp_column_name="updated_at"),
+            storage_schema_name=None,
+            storage_table_name=STORAGE_TABLE_NAME,
+            qdrant_collection_name=COLLECTION_NAME,
+            source_db_url=f"sqlite:///{source_db}",
+            source_table_name="articles",
+            id_column_name="id",
+            text_column_names=list(text_column_names),
+            timestamp_column_name="updated_at",
+            is_sync_enabled=True,
+            full_sync_interval=full_sync_interval,
+        )
+        stored = db_service.get_table_df(STORAGE_TABLE_NAME).sort_values("id")
+        collection = vector_store.get_collection_data(COLLECTION_NAME).sort_values("id")
+        assert stored["content"].tolist() == collection["content"].tolist()
+        return dict(zip(stored["id"], stored["content"])), sorted(embeddings.embedded_texts)
+
+    return db_service, ingest
+
+
+def test_incremental_sync_reads_rows_after_the_watermark(source_db, ingest):
+    db_service, ingest = ingest
+    assert ingest() == ({"1": "first", "2": "second", "3": "third"}, ["first", "second", "third"])
+    watermark = get_watermark(db_service, None, STORAGE_TABLE_NAME)
+    assert (watermark.last_timestamp, watermark.last_id) == ("2024-01-02T10:00:00", "3")
+
+    with sqlite3.connect(source_db) as connection:
+        connection.execute("INSERT INTO articles VALUES (4, 'inserted', '2024-01-03 10:00:00')")
+        connection.execute(
+            "UPDATE articles SET title = 'first edited', updated_at = '2024-01-03 10:00:00' WHERE id = 1"
+        )
+        connection.execute("DELETE FROM articles WHERE id = 2")
+        # Arrives after the sync, with a timestamp older than the watermark
+        connection.execute("INSERT INTO articles VALUES (0, 'late', '2024-01-01 09:00:00')")
+
+    # Only the inserted and updated rows are read: deletions and late rows wait for the next full sync
+    contents, embedded_texts = ingest()
+    assert contents == {"1": "first edited", "2": "second", "3": "third", "4": "inserted"}
+    assert embedded_texts == ["first edited", "inserted"]
+    assert get_watermark(db_service, None, STORAGE_TABLE_NAME).last_id == "4"
+
+    # Nothing changed since the last sync
+    assert ingest()[1] == []
+
+    contents, embedded_texts = ingest(full_sync_interval=timedelta(0))
+    assert contents == {"0": "late", "1": "first edited", "3": "third", "4": "inserted"}
+    assert embedded_texts == ["late"]
+
+
+@pytest.mark.parametrize("text_column_names, empty_source", [(("summary",), False), (("title",), True)])
+def test_empty_or_misconfigured_source_leaves_no_storage_table(source_db, ingest, text_column_names, empty_source):
+    db_service, ingest = ingest
+    if empty_source:
+        with sqlite3.connect(source_db) as connection:
+            connection.execute("DELETE FROM articles")
+
+    with pytest.raises(ValueError):
+        ingest(text_column_names=text_column_names)
+    assert not db_service.table_exists(STORAGE_TABLE_NAME)
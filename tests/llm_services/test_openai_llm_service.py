@@ -0,0 +1,19 @@
+from unittest.mock import MagicMock
+
+from openai import NOT_GIVEN
+
+from engine.llm_services.openai_llm_service import OpenAILLMService
+from tests.mocks.trace_manager import MockTraceManager
+
+
+def test_embed_requests_shortened_embeddings_only_when_configured(mocker):
+    client = MagicMock()
+    mocker.patch("engine.llm_services.openai_llm_service.OpenAI", return_value=client)
+
+    OpenAILLMService(trace_manager=MockTraceManager(project_name="test"), api_key="key").embed(["text"])
+    assert client.embeddings.create.call_args.kwargs["dimensions"] is NOT_GIVEN
+
+    OpenAILLMService(
+        trace_manager=MockTraceManager(project_name="test"), api_key="key", embedding_dimensions=1024
+    ).embed(["text"])
+    assert client.embeddings.create.call_args.kwargs["dimensions"] == 1024
@@ -0,0 +1,62 @@
+import pytest
+
+from engine.llm_services import tokenizer as tokenizer_module
+from engine.llm_services.tokenizer import Tokenizer, get_tokenizer
+
+
+class FakeEncoding:
+    def __init__(self):
+        self.encoded_texts = []
+
+    def encode(self, text, **kwargs):
+        self.encoded_texts.append(text)
+        return text.split()
+
+    def encode_batch(self, texts, **kwargs):
+        return [self.encode(text) for text in texts]
+
+
+@pytest.fixture
+def fake_encoding():
+    return FakeEncoding()
+
+
+def test_count_is_memoized(fake_encoding):
+    tokenizer = Tokenizer(encoding=fake_encoding)
+
+    assert tokenizer.count("one two three") == 3
+    assert tokenizer.count("one two three") == 3
+
+    assert fake_encoding.encoded_texts == ["one two three"]
+
+
+def test_count_many_only_encodes_unknown_texts(fake_encoding):
+    tokenizer = Tokenizer(encoding=fake_encoding)
+    tokenizer.count("already counted")
+
+    assert tokenizer.count_many(["a b", "already counted", "c d e"]) == [2, 2, 3]
+    assert fake_encoding.encoded_texts == ["already counted", "a b", "c d e"]
+
+
+def test_count_cache_is_bounded(fake_encoding):
+    tokenizer = Tokenizer(encoding=fake_encoding, cache_size=2)
+    for text in ["a", "b", "c", "a"]:
+        tokenizer.count(text)
+
+    assert fake_encoding.encoded_texts == ["a", "b", "c", "a"]
+
+
+def test_tokenizers_are_shared_per_model(fake_encoding, monkeypatch):
+    monkeypatch.setattr(tokenizer_module, "_TOKENIZERS", {})
+    get_encoding_calls = []
+
+    def fake_get_encoding(model_name):
+        get_encoding_calls.append(model_name)
+        return fake_encoding
+
+    monkeypatch.setattr(tokenizer_module, "get_encoding", fake_get_encoding)
+
+    assert get_tokenizer("gpt-4o-mini") is get_tokenizer("gpt-4o-mini")
+    assert get_tokenizer("gpt-4o-mini").count("a b") == 2
+    assert get_tokenizer("gpt-4o-mini").count("a b c") == 3
+    assert get_encoding_calls == ["gpt-4o-mini"]
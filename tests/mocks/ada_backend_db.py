@@ -1,12 +1,21 @@
+from contextlib import contextmanager
+from typing import Iterator
+from unittest.mock import AsyncMock
 from uuid import UUID, uuid4
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 
 from ada_backend.database.seed_db import seed_db
 from ada_backend.database.models import Base, ParameterType
 from ada_backend.database import models as db
+from ada_backend.schemas.parameter_schema import PipelineParameterSchema
+from ada_backend.schemas.pipeline.base import ComponentInstanceSchema, ComponentRelationshipSchema
+from ada_backend.schemas.pipeline.graph_schema import EdgeSchema, GraphUpdateSchema
+from ada_backend.services.graph import update_graph_service as update_graph_module
 
 
 @pytest.fixture(scope="function")
@@ -25,6 +34,23 @@ def test_db():
     Base.metadata.drop_all(bind=engine)  # Drop tables after the test
 
 
+@pytest.fixture(scope="function")
+def test_file_db(tmp_path):
+    """
+    Creates a SQLite database file for testing, with a session factory for each of its engines,
+    synchronous and asyncio.
+    """
+    path = tmp_path / "ada_backend.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    # Each test runs its coroutines in new event loops, which cannot reuse pooled connections
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+    yield sessionmaker(bind=engine), async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    engine.dispose()
+
+
 MOCK_UUIDS: dict[str, UUID] = {
     "project_1": uuid4(),
     "project_2": uuid4(),
@@ -222,6 +248,80 @@ def populate_ada_backend_db_from_seed(session: Session):
     seed_db(session)
 
 
+def build_graph(session, agents: int) -> GraphUpdateSchema:
+    """Graph of document agents, each with a synthesizer sub-component, followed by an LLM call."""
+    components = {component.name: component.id for component in session.query(db.Component)}
+    instances, relationships, edges = [], [], []
+    for i in range(agents):
+        agent, synthesizer, llm_call = uuid4(), uuid4(), uuid4()
+        instances += [
+            ComponentInstanceSchema(
+                id=agent,
+                name=f"Agent {i}",
+                is_start_node=i == 0,
+                component_id=components["Document Enhanced LLM Agent"],
+                parameters=[],
+            ),
+            ComponentInstanceSchema(
+                id=synthesizer,
+                name=f"Synthesizer {i}",
+                component_id=components["Synthesizer"],
+                parameters=[
+                    PipelineParameterSchema(name="prompt_template", value="Answer {question}"),
+                    PipelineParameterSchema(name="model_name", value="openai:gpt-4o-mini"),
+                    PipelineParameterSchema(name="default_temperature", value=0.5),
+                ],
+            ),
+            ComponentInstanceSchema(
+                id=llm_call,
+                name=f"LLM Call {i}",
+                component_id=components["LLM Call"],
+                parameters=[
+                    PipelineParameterSchema(name="prompt_template", value="Summarize {input}"),
+                    PipelineParameterSchema(name="model_name", value="openai:gpt-4o-mini"),
+                ],
+            ),
+        ]
+        relationships.append(
+            ComponentRelationshipSchema(
+                parent_component_instance_id=agent,
+                child_component_instance_id=synthesizer,
+                parameter_name="synthesizer",
+            )
+        )
+        edges.append(EdgeSchema(id=uuid4(), origin=agent, destination=llm_call))
+    return GraphUpdateSchema(component_instances=instances, relationships=relationships, edges=edges)
+
+
+@contextmanager
+def count_statements(session: Session) -> Iterator[list[str]]:
+    """Collect the statements run on the connection of the session within the block."""
+    statements = []
+    connection = session.connection()
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", count_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", count_statement)
+
+
+@pytest.fixture(scope="function")
+def graph_project_id(ada_backend_seed_session, monkeypatch):
+    """
+    Provides the ID of a project of the seeded database, to save graphs built with build_graph in.
+    """
+    # Building the agent of the graph is not what is tested here
+    monkeypatch.setattr(update_graph_module, "get_agent_for_project", AsyncMock())
+    project = db.Project(id=uuid4(), name="Graph project", organization_id=uuid4())
+    ada_backend_seed_session.add(project)
+    ada_backend_seed_session.commit()
+    return project.id
+
+
 @pytest.fixture(scope="function")
 def ada_backend_mock_session(test_db):
     """
@@ -0,0 +1,29 @@
+import hashlib
+import re
+from types import SimpleNamespace
+
+import numpy as np
+
+
+class HashEmbeddings:
+    """
+    Deterministic bag-of-words embeddings standing in for an LLMService in vector store tests:
+    each token of the text is hashed to one dimension.
+    """
+
+    def __init__(self, dimension: int = 3072, token_pattern: str = r"\w+"):
+        self.dimension = dimension
+        self.token_pattern = token_pattern
+        self._embedding_model = "hash"
+        self._embedding_dimensions = dimension
+        self.embedded_texts: list[str] = []
+
+    def embed(self, texts: list[str]):
+        embeddings = []
+        for text in texts:
+            self.embedded_texts.append(text)
+            vector = np.zeros(self.dimension)
+            for word in re.findall(self.token_pattern, text.lower()):
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dimension] += 1.0
+            embeddings.append(SimpleNamespace(embedding=(vector / (np.linalg.norm(vector) or 1.0)).tolist()))
+        return embeddings
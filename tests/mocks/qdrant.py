@@ -0,0 +1,127 @@
+import math
+import re
+
+import numpy as np
+
+from engine.local_vector_store import match_filter
+
+
+class InMemoryQdrant:
+    """
+    Minimal in-memory stand-in for the Qdrant REST API, to be plugged as `QdrantService._send_request`.
+    Supports what QdrantService uses for collections, points, payload indexes and dense/sparse searches.
+    Filters are evaluated like in LocalVectorStore.
+    """
+
+    def __init__(self):
+        self.collections: dict[str, dict] = {}
+        self.requests: list[tuple[str, str, dict]] = []
+
+    def __call__(self, method: str, endpoint: str, payload: dict = None, timeout: float = 10.0) -> dict:
+        self.requests.append((method, endpoint, payload))
+        path = endpoint.strip("/").split("?")[0]
+        match = re.fullmatch(r"collections/([^/]+)(/.*)?", path)
+        if path == "collections":
+            return {"result": {"collections": [{"name": name} for name in self.collections]}}
+        name, action = match.group(1), (match.group(2) or "")
+        if action == "/exists":
+            return {"result": {"exists": name in self.collections}}
+        if action == "" and method == "PUT":
+            self.collections[name] = {"config": payload, "points": {}, "payload_schema": {}}
+            return {"result": True}
+        if action == "" and method == "DELETE":
+            self.collections.pop(name, None)
+            return {"result": True}
+        collection = self.collections[name]
+        if action == "" and method == "GET":
+            return {
+                "result": {
+                    "config": {
+                        "params": {
+                            key: value
+                            for key, value in collection["config"].items()
+                            if key in ("vectors", "sparse_vectors")
+                        },
+                        "hnsw_config": collection["config"].get("hnsw_config", {}),
+                        "quantization_config": collection["config"].get("quantization_config"),
+                    },
+                    "payload_schema": collection["payload_schema"],
+                    "points_count": len(collection["points"]),
+                }
+            }
+        if action == "/index":
+            collection["payload_schema"][payload["field_name"]] = payload["field_schema"]
+            return {"result": True}
+        if action == "/points" and method == "PUT":
+            for point in payload["points"]:
+                collection["points"][str(point["id"])] = point
+            return {"result": {"status": "completed"}}
+        if action == "/points" and method == "POST":
+            points = [collection["points"].get(str(point_id)) for point_id in payload["ids"]]
+            return {"result": [point for point in points if point]}
+        if action == "/points/count":
+            return {"result": {"count": len(self._filter(collection, payload.get("filter")))}}
+        if action == "/points/scroll":
+            # Pages are ordered by id, and the offset is the id of the first point of the page
+            points = sorted(self._filter(collection, payload.get("filter")), key=lambda point: str(point["id"]))
+            if payload.get("offset") is not None:
+                points = [point for point in points if str(point["id"]) >= str(payload["offset"])]
+            limit = payload.get("limit", 10)
+            page = [
+                point if payload.get("with_vector") else {key: point[key] for key in ("id", "payload")}
+                for point in points[:limit]
+            ]
+            next_page_offset = points[limit]["id"] if len(points) > limit else None
+            return {"result": {"points": page, "next_page_offset": next_page_offset}}
+        if action == "/points/delete":
+            if "filter" in payload:
+                point_ids = [point["id"] for point in self._filter(collection, payload["filter"])]
+            else:
+                point_ids = payload["points"]
+            for point_id in point_ids:
+                collection["points"].pop(str(point_id), None)
+            return {"result": {"status": "completed"}}
+        if action == "/points/batch":
+            for operation in payload["operations"]:
+                set_payload = operation["set_payload"]
+                for point_id in set_payload["points"]:
+                    collection["points"][str(point_id)]["payload"].update(set_payload["payload"])
+            return {"result": [{"status": "completed"}] * len(payload["operations"])}
+        if action == "/points/search":
+            return {"result": self._search(collection, payload)[: payload.get("limit", 10)]}
+        raise NotImplementedError(f"{method} {endpoint}")
+
+    @staticmethod
+    def _filter(collection: dict, filter: dict = None) -> list[dict]:
+        points = list(collection["points"].values())
+        if not filter:
+            return points
+        return [point for point in points if match_filter(str(point["id"]), point.get("payload", {}), filter)]
+
+    def _search(self, collection: dict, payload: dict) -> list[dict]:
+        query = payload["vector"]
+        points = self._filter(collection, payload.get("filter"))
+        if isinstance(query, dict):
+            # Named sparse vector with the "idf" modifier
+            name, query_vector = query["name"], query["vector"]
+            documents = [
+                dict(zip(point["vector"][name]["indices"], point["vector"][name]["values"])) for point in points
+            ]
+            scores = []
+            for document in documents:
+                score = 0.0
+                for index, value in zip(query_vector["indices"], query_vector["values"]):
+                    if index in document:
+                        frequency = sum(1 for other in documents if index in other)
+                        idf = math.log((len(documents) - frequency + 0.5) / (frequency + 0.5) + 1)
+                        score += idf * value * document[index]
+                scores.append(score)
+        else:
+            query = np.asarray(query)
+            scores = []
+            for point in points:
+                vector = point["vector"][""] if isinstance(point["vector"], dict) else point["vector"]
+                vector = np.asarray(vector)
+                scores.append(float(query @ vector / (np.linalg.norm(query) * np.linalg.norm(vector) or 1.0)))
+        ranked = sorted(zip(points, scores), key=lambda item: item[1], reverse=True)
+        return [{"id": point["id"], "score": score} for point, score in ranked if score > 0]
@@ -0,0 +1,123 @@
+import dataclasses
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from engine.collection_snapshot import export_collection, import_collection
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import DEFAULT_SPARSE_VECTOR_NAME, QdrantCollectionSchema, QdrantService
+from tests.mocks.embeddings import HashEmbeddings
+from tests.mocks.qdrant import InMemoryQdrant
+
+COLLECTION_NAME = "snapshot_collection"
+SCHEMA = QdrantCollectionSchema(
+    chunk_id_field="chunk_id",
+    content_field="content",
+    file_id_field="file_id",
+    metadata_fields_to_keep={"tags"},
+    sparse_vector_name=DEFAULT_SPARSE_VECTOR_NAME,
+)
+CHUNKS = [
+    {"chunk_id": str(i), "content": f"chunk number {i}", "file_id": f"file_{i % 3}", "tags": ["a", {"n": i}]}
+    for i in range(25)
+]
+
+
+def build_vector_store(backend: str, path) -> QdrantService:
+    if backend == "local":
+        return LocalVectorStore(path=path, default_schema=SCHEMA, llm_service=HashEmbeddings(dimension=16))
+    qdrant_service = QdrantService(
+        qdrant_api_key="key",
+        qdrant_cluster_url="http://qdrant",
+        default_schema=SCHEMA,
+        llm_service=HashEmbeddings(dimension=16),
+    )
+    qdrant_service._send_request = InMemoryQdrant()
+    return qdrant_service
+
+
+def get_all_points(vector_store: QdrantService) -> dict[str, dict]:
+    points, offset = vector_store.scroll_points(COLLECTION_NAME, limit=100, with_vectors=True)
+    assert offset is None
+    return {str(point["id"]): point for point in points}
+
+
+@pytest.mark.parametrize("source, target", [("local", "in_memory_qdrant"), ("in_memory_qdrant", "local")])
+def test_snapshot_round_trip(tmp_path, source, target):
+    source_store = build_vector_store(source, tmp_path / "source")
+    source_store.create_collection(COLLECTION_NAME, vector_size=16)
+    source_store.add_chunks(CHUNKS, COLLECTION_NAME)
+
+    export_stats = export_collection(
+        source_store, COLLECTION_NAME, tmp_path / "snapshot", page_size=4, rows_per_file=10
+    )
+    assert (export_stats.points, export_stats.files) == (25, 3)
+    # One row group per scroll page, split at the file boundaries
+    row_groups = [
+        [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.metadata.num_row_groups)]
+        for parquet_file in map(pq.ParquetFile, sorted((tmp_path / "snapshot").glob("*.parquet")))
+    ]
+    assert row_groups == [[4, 4, 2], [2, 4, 4], [4, 1]]
+    assert sorted(path.name for path in (tmp_path / "snapshot").iterdir()) == [
+        "collection.json",
+        "part-00000.parquet",
+        "part-00001.parquet",
+        "part-00002.parquet",
+    ]
+
+    target_store = build_vector_store(target, tmp_path / "target")
+    import_stats = import_collection(target_store, tmp_path / "snapshot", batch_size=4, max_workers=3)
+    assert import_stats.points == 25
+    assert import_stats.rows_per_second > 0
+
+    source_points, target_points = get_all_points(source_store), get_all_points(target_store)
+    assert target_points.keys() == source_points.keys()
+    for point_id, point in source_points.items():
+        assert target_points[point_id]["payload"] == point["payload"]
+        source_vector, target_vector = point["vector"], target_points[point_id]["vector"]
+        assert target_vector[DEFAULT_SPARSE_VECTOR_NAME] == source_vector[DEFAULT_SPARSE_VECTOR_NAME]
+        np.testing.assert_allclose(
+            np.asarray(target_vector[""]) / np.linalg.norm(target_vector[""]),
+            np.asarray(source_vector[""]) / np.linalg.norm(source_vector[""]),
+            rtol=1e-6,
+        )
+    assert (
+        target_store.get_payload_schema(COLLECTION_NAME).keys()
+        == source_store.get_payload_schema(COLLECTION_NAME).keys()
+    )
+    for query in ["chunk number 7", "number 12"]:
+        # The hash embeddings have ties, compare the scores by point
+        source_scores = dict(source_store.search_similar_ids(query, COLLECTION_NAME, limit=3))
+        target_scores = dict(target_store.search_similar_ids(query, COLLECTION_NAME, limit=len(CHUNKS)))
+        assert {point_id: target_scores[point_id] for point_id in source_scores} == pytest.approx(source_scores)
+
+
+@pytest.mark.parametrize("target", ["local", "in_memory_qdrant"])
+def test_import_without_the_sparse_vectors_of_the_snapshot_creates_no_collection(tmp_path, target):
+    source_store = build_vector_store("local", tmp_path / "source")
+    source_store.create_collection(COLLECTION_NAME, vector_size=16)
+    source_store.add_chunks(CHUNKS, COLLECTION_NAME)
+    export_collection(source_store, COLLECTION_NAME, tmp_path / "snapshot")
+
+    target_store = build_vector_store(target, tmp_path / "target")
+    target_store.register_schema(COLLECTION_NAME, dataclasses.replace(SCHEMA, sparse_vector_name=None))
+    with pytest.raises(ValueError):
+        import_collection(target_store, tmp_path / "snapshot")
+    assert not target_store.collection_exists(COLLECTION_NAME)
+
+
+def test_scroll_points_pages_through_the_whole_collection(tmp_path):
+    vector_store = build_vector_store("local", tmp_path)
+    vector_store.create_collection(COLLECTION_NAME, vector_size=16)
+    vector_store.add_chunks(CHUNKS, COLLECTION_NAME)
+
+    file_filter = {"must": [{"key": "file_id", "match": {"value": "file_0"}}]}
+    ids, offset = [], None
+    while True:
+        points, offset = vector_store.scroll_points(COLLECTION_NAME, limit=2, offset=offset, filter=file_filter)
+        assert all("vector" not in point for point in points)
+        ids.extend(point["payload"]["chunk_id"] for point in points)
+        if offset is None:
+            break
+    assert sorted(ids, key=int) == [str(i) for i in range(0, 25, 3)]
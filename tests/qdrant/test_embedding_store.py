@@ -0,0 +1,60 @@
+import pandas as pd
+
+from engine.embedding_store import EmbeddingStore, get_content_hash
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import QdrantCollectionSchema
+from tests.mocks.embeddings import HashEmbeddings
+
+COLLECTION_NAME = "embedding_store_collection"
+SCHEMA = QdrantCollectionSchema(chunk_id_field="chunk_id", content_field="content", file_id_field="file_id")
+BOILERPLATE = "confidential, do not distribute"
+CHUNKS = [
+    {"chunk_id": "1", "content": "first page", "file_id": "a"},
+    {"chunk_id": "2", "content": BOILERPLATE, "file_id": "a"},
+    {"chunk_id": "3", "content": "second page", "file_id": "b"},
+    {"chunk_id": "4", "content": BOILERPLATE, "file_id": "b"},
+]
+
+
+def build_vector_store(path, embedding_store: EmbeddingStore, embeddings: HashEmbeddings) -> LocalVectorStore:
+    return LocalVectorStore(path=path, default_schema=SCHEMA, llm_service=embeddings, embedding_store=embedding_store)
+
+
+def test_embedding_store_is_keyed_by_model_and_dimensions(tmp_path):
+    embedding_store = EmbeddingStore(tmp_path / "embeddings.sqlite3")
+    content_hash = get_content_hash("text")
+    embedding_store.add_embeddings("model", None, {content_hash: [0.5, 0.25]})
+
+    assert embedding_store.get_embeddings("model", None, [content_hash, get_content_hash("other")]) == {
+        content_hash: [0.5, 0.25]
+    }
+    assert embedding_store.get_embeddings("model", 256, [content_hash]) == {}
+    assert embedding_store.get_embeddings("other-model", None, [content_hash]) == {}
+    # Reopening the file keeps the embeddings
+    assert EmbeddingStore(tmp_path / "embeddings.sqlite3").get_embeddings("model", None, [content_hash])
+
+
+def test_reingestion_reuses_the_stored_embeddings(tmp_path):
+    embedding_store = EmbeddingStore(tmp_path / "embeddings.sqlite3")
+    embeddings = HashEmbeddings(dimension=16)
+    vector_store = build_vector_store(tmp_path / "first", embedding_store, embeddings)
+    vector_store.create_collection(COLLECTION_NAME, vector_size=16)
+    vector_store.add_chunks(CHUNKS, COLLECTION_NAME)
+
+    # The repeated boilerplate is embedded once
+    assert sorted(embeddings.embedded_texts) == sorted(["first page", BOILERPLATE, "second page"])
+    assert (vector_store.embedding_stats.texts, vector_store.embedding_stats.embedded_texts) == (4, 3)
+    assert vector_store.embedding_stats.api_calls == 1
+
+    # A new ingestion of the same source, with one edited chunk, only embeds that chunk
+    embeddings.embedded_texts.clear()
+    reingested = build_vector_store(tmp_path / "second", embedding_store, embeddings)
+    reingested.create_collection(COLLECTION_NAME, vector_size=16)
+    edited_chunks = pd.DataFrame(CHUNKS).replace({"second page": "second page, edited"})
+    assert reingested.sync_df_with_collection(edited_chunks, COLLECTION_NAME)
+
+    assert embeddings.embedded_texts == ["second page, edited"]
+    assert reingested.embedding_stats.reuse_ratio == 0.75
+    assert str(reingested.embedding_stats) == "4 chunks, 1 embedded in 1 API calls, 3 reused (75.0%)"
+    results = reingested.retrieve_similar_chunks("first page", COLLECTION_NAME, limit=1)
+    assert [chunk.name for chunk in results] == ["1"]
@@ -0,0 +1,164 @@
+import inspect
+
+import pytest
+
+from engine import local_vector_store
+from engine.local_vector_store import LocalVectorStore, match_filter
+from engine.qdrant_service import DEFAULT_SPARSE_VECTOR_NAME, QdrantCollectionSchema, QdrantService
+from engine.vector_store import VectorStore, get_vector_store
+from tests.mocks.embeddings import HashEmbeddings
+
+COLLECTION_NAME = "local_collection"
+SCHEMA = QdrantCollectionSchema(
+    chunk_id_field="chunk_id",
+    content_field="content",
+    file_id_field="file_id",
+    metadata_fields_to_keep={"year", "tags"},
+    sparse_vector_name=DEFAULT_SPARSE_VECTOR_NAME,
+)
+CHUNKS = [
+    {"chunk_id": "1", "content": "red apple pie", "file_id": "a", "year": 2021, "tags": ["fruit", "dessert"]},
+    {"chunk_id": "2", "content": "green apple", "file_id": "a", "year": 2022, "tags": ["fruit"]},
+    {"chunk_id": "3", "content": "chocolate cake", "file_id": "b", "year": 2023, "tags": ["dessert"]},
+    {"chunk_id": "4", "content": "carrot soup", "file_id": "b", "year": 2024, "tags": []},
+]
+
+
+@pytest.fixture
+def vector_store(tmp_path):
+    store = LocalVectorStore(path=tmp_path, default_schema=SCHEMA, llm_service=HashEmbeddings(dimension=32))
+    store.create_collection(COLLECTION_NAME, vector_size=32)
+    store.add_chunks(CHUNKS, collection_name=COLLECTION_NAME)
+    return store
+
+
+def _names(chunks) -> list[str]:
+    return [chunk.name for chunk in chunks]
+
+
+def test_local_vector_store_is_a_vector_store(vector_store):
+    assert isinstance(vector_store, VectorStore)
+    assert vector_store.list_collection_names() == [COLLECTION_NAME]
+    assert vector_store.get_sparse_vector_names(COLLECTION_NAME) == [DEFAULT_SPARSE_VECTOR_NAME]
+
+
+def test_get_vector_store_uses_local_store_when_configured(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_vector_store.settings, "LOCAL_VECTOR_STORE_PATH", str(tmp_path))
+    assert isinstance(get_vector_store(default_collection_schema=SCHEMA), LocalVectorStore)
+
+    monkeypatch.setattr(local_vector_store.settings, "LOCAL_VECTOR_STORE_PATH", None)
+    monkeypatch.setattr(local_vector_store.settings, "QDRANT_API_KEY", "key")
+    monkeypatch.setattr(local_vector_store.settings, "QDRANT_CLUSTER_URL", "http://qdrant")
+    vector_store = get_vector_store(default_collection_schema=SCHEMA)
+    assert type(vector_store) is QdrantService
+
+
+def test_exact_search_and_filters(vector_store):
+    assert _names(vector_store.retrieve_similar_chunks("apple pie", COLLECTION_NAME, limit=2)) == ["1", "2"]
+
+    recent = {
+        "must": [{"key": "year", "range": {"gte": 2022}}],
+        "must_not": [{"key": "tags", "match": {"value": "fruit"}}],
+    }
+    assert sorted(_names(vector_store.retrieve_similar_chunks("apple", COLLECTION_NAME, filter=recent))) == ["3", "4"]
+
+    nested = {
+        "should": [
+            {"has_id": [LocalVectorStore.get_uuid("4")]},
+            {"must": [{"key": "file_id", "match": {"value": "a"}}]},
+        ]
+    }
+    assert vector_store.count_points(COLLECTION_NAME, filter=nested) == 3
+    assert match_filter("id", {"tags": []}, {"must": [{"is_empty": {"key": "tags"}}]})
+
+
+def test_sparse_search_ranks_rare_terms_first(vector_store):
+    results = vector_store.search_lexical_ids("chocolate apple", COLLECTION_NAME)
+
+    ids = [point_id for point_id, _ in results]
+    assert ids[0] == LocalVectorStore.get_uuid("3")
+    assert set(ids) == {LocalVectorStore.get_uuid(chunk_id) for chunk_id in ["1", "2", "3"]}
+
+
+def test_deletes_keep_vectors_aligned_and_persist(vector_store, tmp_path):
+    assert vector_store.delete_chunks(["1"], id_field="chunk_id", collection_name=COLLECTION_NAME)
+    vector_store.add_chunks([{**CHUNKS[0], "chunk_id": "5", "content": "apple crumble"}], COLLECTION_NAME)
+
+    assert vector_store.count_points(COLLECTION_NAME) == 4
+    assert _names(vector_store.retrieve_similar_chunks("carrot soup", COLLECTION_NAME, limit=1)) == ["4"]
+
+    # Reopening the directory in a new process reloads the collection from the SQLite and vectors files
+    local_vector_store._STORAGES.pop(tmp_path.resolve())
+    reopened = LocalVectorStore(path=tmp_path, default_schema=SCHEMA, llm_service=HashEmbeddings(dimension=32))
+    assert reopened.count_points(COLLECTION_NAME) == 4
+    assert _names(reopened.retrieve_similar_chunks("apple crumble", COLLECTION_NAME, limit=1)) == ["5"]
+    assert _names(reopened.retrieve_similar_chunks("carrot soup", COLLECTION_NAME, limit=1)) == ["4"]
+
+    assert reopened.delete_collection(COLLECTION_NAME)
+    assert not reopened.collection_exists(COLLECTION_NAME)
+    assert not (tmp_path / f"{COLLECTION_NAME}.f32").exists()
+
+
+def test_failed_write_leaves_the_vectors_file_untouched(vector_store, tmp_path):
+    vectors_path = tmp_path / f"{COLLECTION_NAME}.f32"
+    vectors = vectors_path.read_bytes()
+    # The payload of the second point cannot be stored, after the vector of the first one was staged
+    points = [
+        {"id": "1", "payload": {"content": "updated"}, "vector": [1.0] * 32},
+        {"id": "5", "payload": {"tags": {"not", "json"}}, "vector": [1.0] * 32},
+    ]
+    with pytest.raises(TypeError):
+        vector_store.insert_points_in_collection(points, COLLECTION_NAME)
+
+    assert vectors_path.read_bytes() == vectors
+    assert vector_store.count_points(COLLECTION_NAME) == 4
+    assert _names(vector_store.retrieve_similar_chunks("red apple pie", COLLECTION_NAME, limit=1)) == ["1"]
+
+
+def test_filters_on_indexed_fields_use_the_inverted_index(vector_store, tmp_path):
+    collection = vector_store._get_collection(COLLECTION_NAME)
+    assert vector_store.get_payload_schema(COLLECTION_NAME)["tags"] == "keyword"
+    assert collection.inverted_indexes["tags"]["dessert"] == {LocalVectorStore.get_uuid(i) for i in ["1", "3"]}
+
+    desserts = {"must": [{"key": "tags", "match": {"any": ["dessert"]}}, {"key": "year", "range": {"gte": 2022}}]}
+    assert collection._candidate_ids(desserts) == {LocalVectorStore.get_uuid(i) for i in ["1", "3"]}
+    assert _names(vector_store.retrieve_similar_chunks("cake", COLLECTION_NAME, filter=desserts)) == ["3"]
+
+    # Updates and deletes keep the index in sync, and it is rebuilt when the store is reopened
+    vector_store.add_chunks([{**CHUNKS[2], "tags": ["chocolate"]}], COLLECTION_NAME)
+    vector_store.delete_chunks(["1"], id_field="chunk_id", collection_name=COLLECTION_NAME)
+    assert "dessert" not in collection.inverted_indexes["tags"]
+    local_vector_store._STORAGES.pop(tmp_path.resolve())
+    reopened = LocalVectorStore(path=tmp_path, default_schema=SCHEMA, llm_service=HashEmbeddings(dimension=32))
+    chocolate = {"must": [{"key": "tags", "match": {"value": "chocolate"}}]}
+    assert reopened.count_points(COLLECTION_NAME, filter=chocolate) == 1
+    assert reopened._get_collection(COLLECTION_NAME).inverted_indexes["tags"] == {
+        "fruit": {LocalVectorStore.get_uuid("2")},
+        "chocolate": {LocalVectorStore.get_uuid("3")},
+    }
+
+
+def test_writes_of_another_process_are_reloaded(vector_store, tmp_path):
+    # A store with its own connection and collections, as in the ingestion process
+    local_vector_store._STORAGES.pop(tmp_path.resolve())
+    writer = LocalVectorStore(path=tmp_path, default_schema=SCHEMA, llm_service=HashEmbeddings(dimension=32))
+    assert vector_store.count_points(COLLECTION_NAME) == 4
+
+    writer.delete_chunks(["1"], id_field="chunk_id", collection_name=COLLECTION_NAME)
+    writer.add_chunks([{**CHUNKS[0], "chunk_id": "5", "content": "apple crumble"}], COLLECTION_NAME)
+    assert vector_store.count_points(COLLECTION_NAME) == 4
+    assert _names(vector_store.retrieve_similar_chunks("apple crumble", COLLECTION_NAME, limit=1)) == ["5"]
+
+    # The vectors file of a collection created again is rewritten, the old memory map must not be read
+    writer.delete_collection(COLLECTION_NAME)
+    assert not vector_store.collection_exists(COLLECTION_NAME)
+    writer.create_collection(COLLECTION_NAME, vector_size=32)
+    writer.add_chunks([CHUNKS[3]], COLLECTION_NAME)
+    assert vector_store.count_points(COLLECTION_NAME) == 1
+    assert _names(vector_store.retrieve_similar_chunks("carrot soup", COLLECTION_NAME, limit=4)) == ["4"]
+
+
+def test_every_qdrant_request_is_overridden():
+    for name, method in inspect.getmembers(QdrantService, inspect.isfunction):
+        if name != "_send_request" and "_send_request" in inspect.getsource(method):
+            assert name in LocalVectorStore.__dict__, f"LocalVectorStore.{name} would send a request to Qdrant"
@@ -2,22 +2,38 @@ import pandas as pd
 import pytest
 from typing import Union
 
+from engine.local_vector_store import LocalVectorStore
 from engine.qdrant_service import QdrantCollectionSchema, QdrantService
 from engine.llm_services.openai_llm_service import OpenAILLMService
 from engine.agent.agent import SourceChunk
 from engine.agent.utils import format_qdrant_filter
+from tests.mocks.embeddings import HashEmbeddings
+from tests.mocks.qdrant import InMemoryQdrant
 from tests.mocks.trace_manager import MockTraceManager
 
 TEST_COLLECTION_NAME = "test_agentic_ci_collection"
 
 
-def test_qdrant_service():
-    mock_trace_manager = MockTraceManager(project_name="test")
-    llm_service = OpenAILLMService(
-        trace_manager=mock_trace_manager,
-        default_temperature=0.0,
-    )
+@pytest.fixture(params=["qdrant", "local"])
+def build_vector_store(request, tmp_path):
+    """Build the vector store under test: the Qdrant cluster, or the embedded store with hash embeddings."""
+
+    def build(schema: QdrantCollectionSchema):
+        if request.param == "local":
+            return LocalVectorStore(path=tmp_path, default_schema=schema, llm_service=HashEmbeddings())
+        llm_service = OpenAILLMService(
+            trace_manager=MockTraceManager(project_name="test"),
+            default_temperature=0.0,
+        )
+        return QdrantService.from_defaults(
+            llm_service=llm_service,
+            default_collection_schema=schema,
+        )
+
+    return build
 
+
+def test_qdrant_service(build_vector_store):
     qdrant_schema = QdrantCollectionSchema(
         chunk_id_field="chunk_id",
         content_field="content",
@@ -41,10 +57,7 @@ def test_qdrant_service():
             "last_edited_ts": "2024-11-26 10:40:40",
         },
     ]
-    qdrant_agentic_service = QdrantService.from_defaults(
-        llm_service=llm_service,
-        default_collection_schema=qdrant_schema,
-    )
+    qdrant_agentic_service = build_vector_store(qdrant_schema)
 
     # Ensure a clean state
     if qdrant_agentic_service.collection_exists(TEST_COLLECTION_NAME):
@@ -145,7 +158,7 @@ def test_qdrant_service():
     ],
 )
 def test_qdrant_filtering(
-    filter_dict: dict[str, Union[list[str], str]], filtering_condition: str, expected_chunk: str
+    filter_dict: dict[str, Union[list[str], str]], filtering_condition: str, expected_chunk: str, build_vector_store
 ):
     """Tests the Qdrant filtering functionality using different filter conditions.
 
@@ -154,11 +167,6 @@ def test_qdrant_filtering(
         filtering_condition (str): The filtering condition, either "AND" or "OR".
         expected_chunk (str): The expected chunk name to be retrieved.
     """
-    mock_trace_manager = MockTraceManager(project_name="test")
-    llm_service = OpenAILLMService(
-        trace_manager=mock_trace_manager,
-        default_temperature=0.0,
-    )
     # Define the Qdrant schema
     qdrant_schema = QdrantCollectionSchema(
         chunk_id_field="chunk_id",
@@ -192,10 +200,7 @@ def test_qdrant_filtering(
     ]
 
     # Initialize Qdrant service
-    qdrant_agentic_service = QdrantService.from_defaults(
-        llm_service=llm_service,
-        default_collection_schema=qdrant_schema,
-    )
+    qdrant_agentic_service = build_vector_store(qdrant_schema)
 
     # Ensure a clean state before testing
     if qdrant_agentic_service.collection_exists(TEST_COLLECTION_NAME):
@@ -224,3 +229,161 @@ def test_qdrant_filtering(
     assert expected_chunk == set_chunks
     assert qdrant_agentic_service.delete_collection(TEST_COLLECTION_NAME)
     assert not qdrant_agentic_service.collection_exists(TEST_COLLECTION_NAME)
+
+
+def test_create_collection_applies_vector_options_of_the_schema():
+    schema = QdrantCollectionSchema(
+        chunk_id_field="chunk_id",
+        content_field="content",
+        file_id_field="file_id",
+        embedding_dimensions=256,
+        quantization="int8",
+        on_disk=True,
+        hnsw_m=32,
+        oversampling=3.0,
+    )
+    qdrant_service = QdrantService(
+        qdrant_api_key="key",
+        qdrant_cluster_url="http://qdrant",
+        default_schema=schema,
+        llm_service=HashEmbeddings(dimension=256),
+    )
+    qdrant_service._send_request = fake_qdrant = InMemoryQdrant()
+
+    qdrant_service.create_collection(TEST_COLLECTION_NAME)
+    qdrant_service.search_similar_ids("chunk", TEST_COLLECTION_NAME)
+
+    collection_config = fake_qdrant.collections[TEST_COLLECTION_NAME]["config"]
+    assert collection_config["vectors"] == {"size": 256, "distance": "Cosine", "on_disk": True}
+    assert collection_config["hnsw_config"] == {"m": 32}
+    assert collection_config["quantization_config"]["scalar"]["type"] == "int8"
+    _, _, search_payload = fake_qdrant.requests[-1]
+    assert search_payload["params"] == {"quantization": {"rescore": True, "oversampling": 3.0}}
+    assert len(search_payload["vector"]) == 256
+
+
+def test_collection_schema_rejects_unknown_quantization():
+    with pytest.raises(ValueError):
+        QdrantCollectionSchema(chunk_id_field="id", content_field="content", file_id_field="file", quantization="int4")
+
+
+def test_payload_indexes_are_created_once_for_the_filtered_fields():
+    schema = QdrantCollectionSchema(
+        chunk_id_field="chunk_id",
+        content_field="content",
+        file_id_field="file_id",
+        last_edited_ts_field="updated_at",
+        metadata_fields_to_keep={"folder", "year"},
+        payload_indexes={"year": "integer"},
+    )
+    qdrant_service = QdrantService(
+        qdrant_api_key="key",
+        qdrant_cluster_url="http://qdrant",
+        default_schema=schema,
+        llm_service=HashEmbeddings(dimension=8),
+    )
+    qdrant_service._send_request = fake_qdrant = InMemoryQdrant()
+
+    qdrant_service.create_collection(TEST_COLLECTION_NAME, vector_size=8)
+    assert fake_qdrant.collections[TEST_COLLECTION_NAME]["payload_schema"] == {
+        "chunk_id": "keyword",
+        "file_id": "keyword",
+        "folder": "keyword",
+        "year": "integer",
+        "updated_at": "datetime",
+    }
+
+    qdrant_service.add_chunks(
+        [{"chunk_id": "1", "content": "chunk", "file_id": "a", "folder": "x", "year": 2024, "updated_at": "2024"}],
+        TEST_COLLECTION_NAME,
+    )
+    index_requests = [request for request in fake_qdrant.requests if "/index" in request[1]]
+    assert len(index_requests) == 5
+
+    # Another instance finds the indexes already declared on the collection
+    other_service = QdrantService(qdrant_api_key="key", qdrant_cluster_url="http://qdrant", default_schema=schema)
+    other_service._send_request = fake_qdrant
+    assert other_service.ensure_payload_indexes(TEST_COLLECTION_NAME) == []
+
+
+@pytest.mark.parametrize("backend", ["in_memory_qdrant", "local"])
+def test_sync_updates_payloads_without_embedding_unchanged_contents(backend, tmp_path):
+    schema = QdrantCollectionSchema(
+        chunk_id_field="chunk_id",
+        content_field="content",
+        file_id_field="file_id",
+        last_edited_ts_field="last_edited_ts",
+        metadata_fields_to_keep={"folder"},
+    )
+    embeddings = HashEmbeddings(dimension=16)
+    if backend == "local":
+        vector_store = LocalVectorStore(path=tmp_path, default_schema=schema, llm_service=embeddings)
+    else:
+        vector_store = QdrantService(
+            qdrant_api_key="key", qdrant_cluster_url="http://qdrant", default_schema=schema, llm_service=embeddings
+        )
+        vector_store._send_request = fake_qdrant = InMemoryQdrant()
+    vector_store.create_collection(TEST_COLLECTION_NAME, vector_size=16)
+    chunks_df = pd.DataFrame(
+        [
+            {"chunk_id": str(i), "content": f"chunk {i}", "file_id": "f", "folder": "a", "last_edited_ts": "2024"}
+            for i in range(5)
+        ]
+    )
+    vector_store.sync_df_with_collection(chunks_df, TEST_COLLECTION_NAME)
+    assert len(embeddings.embedded_texts) == 5
+
+    # Metadata-only changes: new timestamps and a moved file
+    moved_df = chunks_df.assign(last_edited_ts="2025", folder="b")
+    embeddings.embedded_texts.clear()
+    assert vector_store.sync_df_with_collection(moved_df, TEST_COLLECTION_NAME)
+    assert embeddings.embedded_texts == []
+    synced_df = vector_store.get_collection_data(TEST_COLLECTION_NAME).sort_values("chunk_id", ignore_index=True)
+    assert synced_df[["last_edited_ts", "folder"]].drop_duplicates().values.tolist() == [["2025", "b"]]
+    folder_b = {"must": [{"key": "folder", "match": {"value": "b"}}]}
+    assert vector_store.count_points(TEST_COLLECTION_NAME, filter=folder_b) == 5
+
+    # Only the chunk whose content changed is embedded again, and removed chunks are deleted with one request
+    edited_df = moved_df.drop(index=[0, 1]).reset_index(drop=True)
+    edited_df.loc[0, ["content", "last_edited_ts"]] = ["chunk 2 edited", "2026"]
+    assert vector_store.sync_df_with_collection(edited_df, TEST_COLLECTION_NAME)
+    assert embeddings.embedded_texts == ["chunk 2 edited"]
+    assert sorted(vector_store.get_collection_data(TEST_COLLECTION_NAME)["chunk_id"]) == ["2", "3", "4"]
+    if backend == "in_memory_qdrant":
+        delete_requests = [payload for _, endpoint, payload in fake_qdrant.requests if "/points/delete" in endpoint]
+        assert delete_requests == [{"filter": {"should": [{"key": "chunk_id", "match": {"any": ["0", "1"]}}]}}]
+
+
+@pytest.mark.parametrize("backend", ["in_memory_qdrant", "local"])
+def test_sync_by_chunks_deletes_missing_chunks_at_the_end(backend, tmp_path):
+    schema = QdrantCollectionSchema(chunk_id_field="chunk_id", content_field="content", file_id_field="file_id")
+    embeddings = HashEmbeddings(dimension=16)
+    if backend == "local":
+        vector_store = LocalVectorStore(path=tmp_path, default_schema=schema, llm_service=embeddings)
+    else:
+        vector_store = QdrantService(
+            qdrant_api_key="key", qdrant_cluster_url="http://qdrant", default_schema=schema, llm_service=embeddings
+        )
+        vector_store._send_request = InMemoryQdrant()
+    vector_store.create_collection(TEST_COLLECTION_NAME, vector_size=16)
+    chunks_df = pd.DataFrame([{"chunk_id": str(i), "content": f"chunk {i}", "file_id": "f"} for i in range(6)])
+    vector_store.sync_df_with_collection(chunks_df, TEST_COLLECTION_NAME)
+
+    # The source now has chunks 2 to 7, synced two by two: each chunk only adds and updates its own points
+    source_df = pd.DataFrame([{"chunk_id": str(i), "content": f"chunk {i}", "file_id": "f"} for i in range(2, 8)])
+    source_df.loc[0, "content"] = "chunk 2 edited"
+    embeddings.embedded_texts.clear()
+    for start in range(0, len(source_df), 2):
+        chunk_df = source_df.iloc[start : start + 2].reset_index(drop=True)
+        assert vector_store.sync_df_with_collection(chunk_df, TEST_COLLECTION_NAME, delete_missing=False)
+    assert sorted(embeddings.embedded_texts) == ["chunk 2 edited", "chunk 6", "chunk 7"]
+    assert vector_store.count_points(TEST_COLLECTION_NAME) == 8
+
+    source_ids = set(source_df["chunk_id"])
+    deleted = vector_store.delete_missing_chunks(
+        TEST_COLLECTION_NAME, lambda ids: source_ids.intersection(ids), page_size=3
+    )
+    assert deleted == 2
+    synced_df = vector_store.get_collection_data(TEST_COLLECTION_NAME).sort_values("chunk_id", ignore_index=True)
+    assert synced_df["chunk_id"].tolist() == ["2", "3", "4", "5", "6", "7"]
+    assert synced_df["content"].tolist()[0] == "chunk 2 edited"
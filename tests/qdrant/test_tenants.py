@@ -0,0 +1,143 @@
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from engine.agent.rag.retriever import Retriever
+from engine.local_vector_store import LocalVectorStore
+from engine.qdrant_service import DEFAULT_SPARSE_VECTOR_NAME, QdrantCollectionSchema, QdrantService
+from ingestion_script.utils import get_shared_collection_storage, source_exists_in_vector_store
+from tests.mocks.embeddings import HashEmbeddings
+from tests.mocks.qdrant import InMemoryQdrant
+from tests.mocks.trace_manager import MockTraceManager
+
+SHARED_COLLECTION_NAME = "shared_text_embedding_3_large_full_collection"
+SCHEMA = QdrantCollectionSchema(
+    chunk_id_field="chunk_id",
+    content_field="content",
+    file_id_field="file_id",
+    metadata_fields_to_keep={"folder"},
+    sparse_vector_name=DEFAULT_SPARSE_VECTOR_NAME,
+)
+# Both sources have chunks with the same ids, and one of them has the same content
+CHUNKS = {
+    "source_a": [
+        {"chunk_id": "1", "content": "quarterly revenue report", "file_id": "a.pdf", "folder": "finance"},
+        {"chunk_id": "2", "content": "holiday planning", "file_id": "a.pdf", "folder": "hr"},
+    ],
+    "source_b": [
+        {"chunk_id": "1", "content": "quarterly revenue report", "file_id": "b.pdf", "folder": "finance"},
+        {"chunk_id": "2", "content": "secret merger plans", "file_id": "b.pdf", "folder": "finance"},
+    ],
+}
+
+
+@pytest.fixture(params=["qdrant", "local"])
+def build_tenant_store(request, tmp_path):
+    """Build the vector store of a source of the shared collection, on an in-memory Qdrant or the local store."""
+    fake_qdrant = InMemoryQdrant()
+
+    def build(source_name: str, organization_id: str = "org_1"):
+        _, schema, _ = get_shared_collection_storage(
+            source_name, organization_id, SCHEMA, embedding_model_name="text-embedding-3-large"
+        )
+        if request.param == "local":
+            return LocalVectorStore(path=tmp_path, default_schema=schema, llm_service=HashEmbeddings(dimension=16))
+        qdrant_service = QdrantService(
+            qdrant_api_key="key",
+            qdrant_cluster_url="http://qdrant",
+            default_schema=schema,
+            llm_service=HashEmbeddings(dimension=16),
+        )
+        qdrant_service._send_request = fake_qdrant
+        return qdrant_service
+
+    return build
+
+
+@pytest.fixture
+def tenant_stores(build_tenant_store):
+    stores = {source_name: build_tenant_store(source_name) for source_name in CHUNKS}
+    stores["source_a"].create_collection(SHARED_COLLECTION_NAME, vector_size=16)
+    for source_name, chunks in CHUNKS.items():
+        stores[source_name].add_chunks(chunks, SHARED_COLLECTION_NAME)
+    return stores
+
+
+def test_shared_collection_storage_of_a_source():
+    collection_name, schema, source_id = get_shared_collection_storage(
+        "Sales Docs", "org_1", dataclasses.replace(SCHEMA, embedding_dimensions=1024), "text-embedding-3-large"
+    )
+
+    assert collection_name == "shared_text_embedding_3_large_1024_collection"
+    assert schema.tenant_fields == {"organization_id": "org_1", "source_id": str(source_id)}
+    assert get_shared_collection_storage("Sales Docs", "org_1", SCHEMA, "text-embedding-3-large")[2] == source_id
+    assert get_shared_collection_storage("Sales Docs", "org_2", SCHEMA, "text-embedding-3-large")[2] != source_id
+    assert schema.get_payload_index_types()["source_id"] == {"type": "keyword", "is_tenant": True}
+
+
+def test_tenants_do_not_see_each_other_chunks(tenant_stores):
+    store_a, store_b = tenant_stores["source_a"], tenant_stores["source_b"]
+
+    assert store_a.count_points(SHARED_COLLECTION_NAME) == 2
+    assert store_b.count_points(SHARED_COLLECTION_NAME) == 2
+    assert {point["payload"]["content"] for point in store_a.get_points(SHARED_COLLECTION_NAME)} == {
+        "quarterly revenue report",
+        "holiday planning",
+    }
+
+    retriever = Retriever(
+        trace_manager=MockTraceManager(project_name="test"),
+        qdrant_service=store_a,
+        collection_name=SHARED_COLLECTION_NAME,
+        max_retrieved_chunks=10,
+        enable_hybrid_search=True,
+    )
+    finance = {"must": [{"key": "folder", "match": {"any": ["finance"]}}]}
+    chunks = retriever.get_chunks("secret merger revenue", filters=finance)
+    assert [(chunk.document_name, chunk.content) for chunk in chunks] == [("a.pdf", "quarterly revenue report")]
+
+    # Even given the ids of the points of another tenant, no payload is returned
+    ids_of_b = store_b.search_similar_ids("secret merger plans", SHARED_COLLECTION_NAME)
+    assert store_a.get_chunks_by_ids(ids_of_b, SHARED_COLLECTION_NAME) == []
+
+
+def test_sync_and_deletion_are_scoped_to_the_tenant(tenant_stores):
+    store_a, store_b = tenant_stores["source_a"], tenant_stores["source_b"]
+
+    chunks_a = pd.DataFrame([CHUNKS["source_a"][0], {**CHUNKS["source_a"][1], "chunk_id": "3"}])
+    assert store_a.sync_df_with_collection(chunks_a, SHARED_COLLECTION_NAME)
+    assert sorted(store_a.get_collection_data(SHARED_COLLECTION_NAME)["chunk_id"]) == ["1", "3"]
+    assert sorted(store_b.get_collection_data(SHARED_COLLECTION_NAME)["chunk_id"]) == ["1", "2"]
+
+    assert store_a.delete_chunks(["1"], id_field="chunk_id", collection_name=SHARED_COLLECTION_NAME)
+    assert store_b.count_points(SHARED_COLLECTION_NAME) == 2
+
+    assert store_a.delete_tenant_points(SHARED_COLLECTION_NAME)
+    assert not source_exists_in_vector_store(store_a, SHARED_COLLECTION_NAME)
+    assert source_exists_in_vector_store(store_b, SHARED_COLLECTION_NAME)
+    assert store_b.count_points(SHARED_COLLECTION_NAME) == 2
+
+
+def test_other_vector_options_of_a_source_of_a_shared_collection_are_reported(caplog):
+    fake_qdrant = InMemoryQdrant()
+    stores = []
+    for source_name, source_schema in [
+        ("source_a", SCHEMA),
+        ("source_b", dataclasses.replace(SCHEMA, quantization="int8")),
+    ]:
+        _, schema, _ = get_shared_collection_storage(source_name, "org_1", source_schema, "text-embedding-3-large")
+        qdrant_service = QdrantService(
+            qdrant_api_key="key",
+            qdrant_cluster_url="http://qdrant",
+            default_schema=schema,
+            llm_service=HashEmbeddings(dimension=16),
+        )
+        qdrant_service._send_request = fake_qdrant
+        stores.append(qdrant_service)
+    store_a, store_b = stores
+    store_a.create_collection(SHARED_COLLECTION_NAME, vector_size=16)
+
+    assert store_a.check_vector_options(SHARED_COLLECTION_NAME) == []
+    assert store_b.check_vector_options(SHARED_COLLECTION_NAME) == ["quantization=int8 (collection: None)"]
+    assert "quantization=int8" in caplog.text